@@ -15,9 +15,21 @@ import argparse
 import subprocess
 import threading
 import logging
-from typing import Dict, Any, Optional, List, Union, Tuple
+from typing import Dict, Any, Optional, List, Union, Tuple, Callable
 from datetime import datetime
 
+from doc40_ambiente import sondar_ambiente
+from doc40_stream import executar_com_progresso, progresso_console
+from doc40_incremental import atualizar_incremental
+from doc40_compressao import comprimir_diretorio
+from doc40_indice import construir_indice
+from doc40_busca import atualizar_indice_busca
+from doc40_watcher import GitRefWatcher
+from doc40_fila import (CoalescingUpdateQueue, DEBOUNCE, MAX_LATENCY, registrar_agente,
+                        remover_registro_agente, agente_em_execucao, executar_agrupado)
+from doc40_git import obter_intervalo, ler_head
+from doc40_supervisor import RepoSupervisor, carregar_configuracao, tabela_status, INTERVALO_STATUS
+
 # Configuração de logging
 logging.basicConfig(
     level=logging.INFO,
@@ -47,24 +59,18 @@ def verificar_claude_code() -> bool:
     Returns:
         bool: True se estiver instalado, False caso contrário
     """
-    try:
-        result = subprocess.run(
-            ["claude-code", "--version"], 
-            capture_output=True, 
-            text=True
-        )
-        if result.returncode == 0:
-            version = result.stdout.strip()
-            logger.info(f"Claude Code instalado: {version}")
-            return True
+    ambiente = sondar_ambiente()
+    if ambiente["installed"]:
+        if ambiente["version"]:
+            logger.info(f"Claude Code instalado: {ambiente['version']}")
         else:
             logger.warning("Claude Code instalado, mas não foi possível obter a versão")
-            return True
-    except Exception as e:
-        logger.error(f"Claude Code não está instalado ou não está no PATH: {e}")
-        print(f"\n{Colors.RED}Claude Code CLI não encontrado. Por favor, instale:"+
-              f"\n\ncurl -sSL https://raw.githubusercontent.com/anthropic/claude-code/main/install.sh | bash{Colors.ENDC}\n")
-        return False
+        return True
+    
+    logger.error("Claude Code não está instalado ou não está no PATH")
+    print(f"\n{Colors.RED}Claude Code CLI não encontrado. Por favor, instale:"+
+          f"\n\ncurl -sSL https://raw.githubusercontent.com/anthropic/claude-code/main/install.sh | bash{Colors.ENDC}\n")
+    return False
 
 def verificar_git(diretorio: str) -> bool:
     """
@@ -77,9 +83,9 @@ def verificar_git(diretorio: str) -> bool:
         bool: True se for um repositório Git, False caso contrário
     """
     try:
-        os.chdir(diretorio)
         result = subprocess.run(
             ["git", "rev-parse", "--is-inside-work-tree"],
+            cwd=diretorio,
             capture_output=True,
             text=True
         )
@@ -99,19 +105,13 @@ def verificar_mudancas(diretorio: str, ultimo_commit: Optional[str] = None) -> T
     Returns:
         tuple: (houve_mudancas, commit_atual)
     """
-    # Mudar para o diretório do projeto
-    os.chdir(diretorio)
+    # Obter o último commit (lido de .git, sem executar o Git enquanto nada muda)
+    commit_atual = ler_head(diretorio)
     
-    # Obter o último commit
-    comando = ["git", "rev-parse", "HEAD"]
-    resultado = subprocess.run(comando, capture_output=True, text=True)
-    
-    if resultado.returncode != 0:
-        logger.error(f"Erro ao obter o último commit: {resultado.stderr}")
+    if commit_atual is None:
+        logger.error(f"Erro ao obter o último commit em {diretorio}")
         return False, None
     
-    commit_atual = resultado.stdout.strip()
-    
     # Se não temos um commit anterior para comparar, apenas retornar o atual
     if ultimo_commit is None:
         return False, commit_atual
@@ -119,7 +119,8 @@ def verificar_mudancas(diretorio: str, ultimo_commit: Optional[str] = None) -> T
     # Se o commit atual é diferente do último, houve mudanças
     return commit_atual != ultimo_commit, commit_atual
 
-def obter_arquivos_alterados(diretorio: str, commit_anterior: str, commit_atual: str) -> List[str]:
+def obter_arquivos_alterados(diretorio: str, commit_anterior: str, commit_atual: str,
+                             incluir_removidos: bool = False) -> List[str]:
     """
     Obtém a lista de arquivos alterados entre dois commits.
     
@@ -127,21 +128,24 @@ def obter_arquivos_alterados(diretorio: str, commit_anterior: str, commit_atual:
         diretorio: O diretório do repositório
         commit_anterior: O commit anterior
         commit_atual: O commit atual
+        incluir_removidos: Também retorna arquivos excluídos entre os commits
         
     Returns:
         list: Lista de arquivos alterados
     """
     try:
-        os.chdir(diretorio)
         comando = ["git", "diff", "--name-only", commit_anterior, commit_atual]
-        resultado = subprocess.run(comando, capture_output=True, text=True)
+        resultado = subprocess.run(comando, cwd=diretorio, capture_output=True, text=True)
         
         if resultado.returncode != 0:
             logger.error(f"Erro ao obter arquivos alterados: {resultado.stderr}")
             return []
         
-        # Filtrar apenas arquivos existentes (pode haver arquivos excluídos)
         arquivos = resultado.stdout.strip().split('\n')
+        if incluir_removidos:
+            return [f for f in arquivos if f]
+        
+        # Filtrar apenas arquivos existentes (pode haver arquivos excluídos)
         arquivos_existentes = [f for f in arquivos if f and os.path.exists(os.path.join(diretorio, f))]
         
         return arquivos_existentes
@@ -161,9 +165,8 @@ def obter_mensagem_commit(diretorio: str, commit_id: str) -> Optional[str]:
         str: A mensagem do commit ou None em caso de erro
     """
     try:
-        os.chdir(diretorio)
         comando = ["git", "log", "-1", "--pretty=%B", commit_id]
-        resultado = subprocess.run(comando, capture_output=True, text=True)
+        resultado = subprocess.run(comando, cwd=diretorio, capture_output=True, text=True)
         
         if resultado.returncode != 0:
             logger.error(f"Erro ao obter mensagem do commit: {resultado.stderr}")
@@ -174,14 +177,19 @@ def obter_mensagem_commit(diretorio: str, commit_id: str) -> Optional[str]:
         logger.error(f"Exceção ao obter mensagem do commit: {e}")
         return None
 
-def atualizar_documentacao(diretorio: str, commit_id: str, saida: str = "docs") -> Dict[str, Any]:
+def atualizar_documentacao(diretorio: str, commit_id: str, saida: str = "docs",
+                           progresso: Optional[Callable[[Dict[str, Any]], None]] = progresso_console) -> Dict[str, Any]:
     """
     Atualiza a documentação com base nas mudanças do commit.
     
+    A saída do Claude Code é acompanhada em tempo real e gravada em
+    `<saida>/progresso.log`.
+    
     Args:
         diretorio: O diretório do repositório
         commit_id: O ID do commit
         saida: O diretório de saída para a documentação atualizada
+        progresso: Callback chamado com cada evento de progresso (None desativa)
         
     Returns:
         dict: Resultado da operação
@@ -189,7 +197,8 @@ def atualizar_documentacao(diretorio: str, commit_id: str, saida: str = "docs")
     logger.info(f"Atualizando documentação para commit: {commit_id[:8] if commit_id else 'N/A'}")
     print(f"\n{Colors.BLUE}🔄 Atualizando documentação para commit: {commit_id[:8] if commit_id else 'N/A'}{Colors.ENDC}")
     
-    # Criar diretório de saída se não existir
+    # Criar diretório de saída se não existir (relativo ao repositório)
+    saida = os.path.join(diretorio, saida)
     os.makedirs(saida, exist_ok=True)
     
     # Obter mensagem do commit para análise de contexto
@@ -212,35 +221,40 @@ def atualizar_documentacao(diretorio: str, commit_id: str, saida: str = "docs")
     
     # Executar o comando
     try:
-        resultado = subprocess.run(comando, capture_output=True, text=True)
+        resultado = executar_com_progresso(comando, progresso, os.path.join(saida, "progresso.log"),
+                                           cwd=diretorio)
         
         # Registrar fim
         fim = datetime.now()
         duracao = (fim - inicio).total_seconds()
         
         # Verificar resultado
-        if resultado.returncode == 0:
+        if resultado["returncode"] == 0:
             logger.info(f"Documentação atualizada com sucesso em: {saida}")
             print(f"{Colors.GREEN}✅ Documentação atualizada com sucesso em: {saida}{Colors.ENDC}")
             print(f"{Colors.BLUE}⏱️ Tempo de execução: {duracao:.2f} segundos{Colors.ENDC}")
             
-            # Registrar a atualização
+            # Registrar a atualização, atualizar os índices e refazer as cópias .gz/.br
             registro_atualizacao(saida, commit_id, mensagem_commit, duracao)
+            construir_indice(saida, resultado["written"])
+            atualizar_indice_busca(saida, resultado["written"])
+            comprimir_diretorio(saida)
             
             return {
                 "success": True,
                 "output_dir": saida,
                 "commit_id": commit_id,
                 "message": mensagem_commit,
+                "files_written": resultado["written"],
                 "duration_seconds": duracao
             }
         else:
-            logger.error(f"Erro ao atualizar documentação: {resultado.stderr}")
-            print(f"{Colors.RED}❌ Erro ao atualizar documentação: {resultado.stderr}{Colors.ENDC}")
+            logger.error(f"Erro ao atualizar documentação: {resultado['stderr']}")
+            print(f"{Colors.RED}❌ Erro ao atualizar documentação: {resultado['stderr']}{Colors.ENDC}")
             return {
                 "success": False,
                 "error": "UpdateError",
-                "message": resultado.stderr,
+                "message": resultado["stderr"],
                 "duration_seconds": duracao
             }
     except Exception as e:
@@ -257,6 +271,63 @@ def atualizar_documentacao(diretorio: str, commit_id: str, saida: str = "docs")
             "duration_seconds": duracao
         }
 
+def atualizar_documentacao_incremental(diretorio: str, commit_id: str, saida: str = "docs",
+                                       arquivos: Optional[List[str]] = None,
+                                       completo: bool = False,
+                                       mensagem_commit: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Regenera apenas a documentação dos arquivos alterados.
+    
+    Os documentos de cada arquivo-fonte são conhecidos pelo manifesto em
+    `.doc40/manifest.json`; na primeira execução tudo é gerado e o
+    manifesto é criado.
+    
+    Args:
+        diretorio: O diretório do repositório
+        commit_id: O ID do commit
+        saida: O diretório de saída para a documentação atualizada
+        arquivos: Arquivos alterados (padrão: detectar pelo Git desde a última atualização)
+        completo: Força a geração completa
+        mensagem_commit: Mensagem do commit, se já conhecida (evita um `git log`)
+        
+    Returns:
+        dict: Resultado da operação
+    """
+    logger.info(f"Atualização incremental para commit: {commit_id[:8] if commit_id else 'N/A'}")
+    print(f"\n{Colors.BLUE}🔄 Atualizando documentação para commit: {commit_id[:8] if commit_id else 'N/A'}{Colors.ENDC}")
+    
+    if mensagem_commit is None:
+        mensagem_commit = obter_mensagem_commit(diretorio, commit_id)
+    
+    try:
+        resultado = atualizar_incremental(diretorio, saida, arquivos, commit_id, completo=completo)
+    except Exception as e:
+        logger.error(f"Exceção ao atualizar documentação: {e}")
+        print(f"{Colors.RED}❌ Exceção ao atualizar documentação: {str(e)}{Colors.ENDC}")
+        return {
+            "success": False,
+            "error": "Exception",
+            "message": str(e)
+        }
+    
+    if not resultado["success"]:
+        logger.error(f"Erro ao atualizar documentação: {resultado['message']}")
+        print(f"{Colors.RED}❌ Erro ao atualizar documentação: {resultado['message']}{Colors.ENDC}")
+        return resultado
+    
+    if resultado["mode"] == "noop":
+        print(f"{Colors.GREEN}✓ Documentação já atualizada ({len(resultado['skipped'])} arquivo(s) sem mudanças){Colors.ENDC}")
+    else:
+        print(f"{Colors.GREEN}✅ Documentação atualizada: {len(resultado['regenerated'])} regenerado(s), "
+              f"{len(resultado['removed'])} removido(s){Colors.ENDC}")
+        print(f"{Colors.BLUE}⏱️ Tempo de execução: {resultado['duration_seconds']:.2f} segundos{Colors.ENDC}")
+        registro_atualizacao(os.path.join(diretorio, saida), commit_id, mensagem_commit,
+                             resultado["duration_seconds"])
+    
+    resultado["commit_id"] = commit_id
+    resultado["message"] = mensagem_commit
+    return resultado
+
 def registro_atualizacao(diretorio_saida: str, commit_id: str, 
                       mensagem_commit: Optional[str], duracao: float) -> None:
     """
@@ -289,7 +360,6 @@ def configurar_git_hook(diretorio: str) -> bool:
         bool: True se o hook foi configurado com sucesso, False caso contrário
     """
     try:
-        os.chdir(diretorio)
         hooks_dir = os.path.join(diretorio, ".git", "hooks")
         
         # Verificar se o diretório de hooks existe
@@ -306,8 +376,12 @@ def configurar_git_hook(diretorio: str) -> bool:
 # Obter diretório raiz do repositório
 REPO_ROOT=$(git rev-parse --show-toplevel)
 
-# Executar o script de atualização da documentação
-python3 "$REPO_ROOT/doc40-agente.py" atualizar --dir "$REPO_ROOT"
+# Executar o script de atualização da documentação em segundo plano:
+# commits em sequência são agrupados em uma única atualização, e nada é
+# feito se o agente já estiver rodando
+mkdir -p "$REPO_ROOT/.doc40"
+nohup python3 "$REPO_ROOT/doc40-agente.py" atualizar --dir "$REPO_ROOT" --hook \
+    > "$REPO_ROOT/.doc40/hook.log" 2>&1 &
 
 # Ou usar diretamente o Claude Code CLI
 # claude-code update-docs --directory "$REPO_ROOT" --commit HEAD --output-dir "$REPO_ROOT/docs"
@@ -332,20 +406,31 @@ python3 "$REPO_ROOT/doc40-agente.py" atualizar --dir "$REPO_ROOT"
         print(f"{Colors.RED}❌ Erro ao configurar hook Git: {str(e)}{Colors.ENDC}")
         return False
 
-def executar_agente(diretorio: str, saida: str = "docs", intervalo: int = 300) -> None:
+def executar_agente(diretorio: str, saida: str = "docs", intervalo: int = 300,
+                    observar: bool = False, debounce: float = DEBOUNCE,
+                    latencia_maxima: float = MAX_LATENCY) -> None:
     """
     Executa o agente de manutenção de documentação em um loop contínuo.
     
+    Commits em sequência são agrupados em uma única atualização do último
+    commit documentado até o HEAD, feita depois de `debounce` segundos sem
+    mudanças (ou `latencia_maxima` segundos após a primeira mudança).
+    
     Args:
         diretorio: O diretório do repositório
         saida: O diretório de saída para a documentação
         intervalo: O intervalo em segundos entre verificações
+        observar: Reage a cada commit observando `.git` (inotify ou stat)
+            em vez de verificar a cada intervalo
+        debounce: Silêncio exigido antes de atualizar, em segundos
+        latencia_maxima: Espera máxima por uma atualização pendente, em segundos
     """
     logger.info(f"Iniciando agente de manutenção de documentação")
     print(f"\n{Colors.BLUE}🤖 Iniciando agente de manutenção de documentação{Colors.ENDC}")
     print(f"{Colors.BLUE}📁 Diretório: {diretorio}{Colors.ENDC}")
     print(f"{Colors.BLUE}📂 Saída: {saida}{Colors.ENDC}")
-    print(f"{Colors.BLUE}⏱️ Intervalo: {intervalo} segundos{Colors.ENDC}")
+    if not observar:
+        print(f"{Colors.BLUE}⏱️ Intervalo: {intervalo} segundos{Colors.ENDC}")
     
     # Verificar se o diretório é um repositório Git
     if not verificar_git(diretorio):
@@ -361,9 +446,39 @@ def executar_agente(diretorio: str, saida: str = "docs", intervalo: int = 300) -
     logger.info(f"Commit inicial: {ultimo_commit[:8] if ultimo_commit else 'Nenhum'}")
     print(f"{Colors.BLUE}📌 Commit inicial: {ultimo_commit[:8] if ultimo_commit else 'Nenhum'}{Colors.ENDC}")
     
+    # Observador de commits (sem processos enquanto nada muda)
+    observador = None
+    if observar:
+        observador = GitRefWatcher(diretorio)
+        logger.info(f"Observando commits em {observador.git_dir} (modo {observador.mode})")
+        print(f"{Colors.BLUE}👀 Observando commits ({observador.mode}){Colors.ENDC}")
+    
+    # Fila que agrupa as mudanças detectadas
+    fila = CoalescingUpdateQueue(debounce, latencia_maxima)
+    
+    def detectar() -> None:
+        while True:
+            try:
+                if observador is not None:
+                    if observador.esperar():
+                        fila.notify()
+                else:
+                    time.sleep(intervalo)
+                    fila.notify()
+            except Exception as e:
+                # Uma falha na detecção não pode encerrar a thread em silêncio
+                logger.exception(f"Erro ao detectar commits: {e}")
+                time.sleep(1.0)
+    
+    threading.Thread(target=detectar, daemon=True).start()
+    registrar_agente(diretorio)
+    fila.notify()
+    
     try:
         # Loop principal do agente
         while True:
+            if not fila.wait_batch(timeout=1.0):
+                continue
             try:
                 # Verificar mudanças
                 houve_mudancas, commit_atual = verificar_mudancas(diretorio, ultimo_commit)
@@ -373,24 +488,28 @@ def executar_agente(diretorio: str, saida: str = "docs", intervalo: int = 300) -
                     logger.info(f"Detectadas mudanças! Novo commit: {commit_atual[:8]}")
                     print(f"\n{Colors.YELLOW}🔍 Detectadas mudanças! Novo commit: {commit_atual[:8]}{Colors.ENDC}")
                     
-                    # Obter arquivos alterados
-                    arquivos_alterados = obter_arquivos_alterados(diretorio, ultimo_commit, commit_atual)
-                    logger.info(f"Arquivos alterados: {len(arquivos_alterados)}")
+                    # Commits, mensagens e arquivos alterados de todo o intervalo em um único git log
+                    faixa = obter_intervalo(diretorio, ultimo_commit, commit_atual)
+                    arquivos_alterados = faixa["changed"] + faixa["removed"]
+                    mensagem = faixa["commits"][0].message if faixa["commits"] else None
+                    logger.info(f"Commits: {len(faixa['commits'])}, arquivos alterados: {len(arquivos_alterados)}")
                     
-                    if arquivos_alterados:
+                    if not faixa["linear"]:
+                        # Histórico reescrito (rebase, reset): comparar com o último commit documentado
+                        print(f"{Colors.YELLOW}⚠️ Histórico reescrito desde {ultimo_commit[:8]}; comparando com a última documentação{Colors.ENDC}")
+                        arquivos_alterados = None
+                    elif arquivos_alterados:
                         print(f"{Colors.BLUE}📄 Arquivos alterados: {len(arquivos_alterados)}{Colors.ENDC}")
                         for arquivo in arquivos_alterados[:5]:  # Mostrar apenas os primeiros 5
                             print(f"  - {arquivo}")
                         if len(arquivos_alterados) > 5:
                             print(f"  ... e mais {len(arquivos_alterados) - 5} arquivo(s)")
                     
-                    # Atualizar a documentação
-                    atualizar_documentacao(diretorio, commit_atual, saida)
+                    # Regenerar só a documentação dos arquivos alterados
+                    atualizar_documentacao_incremental(diretorio, commit_atual, saida, arquivos_alterados,
+                                                       mensagem_commit=mensagem)
                     ultimo_commit = commit_atual
                 
-                # Aguardar o próximo ciclo
-                time.sleep(intervalo)
-                
             except KeyboardInterrupt:
                 raise  # Repassar para ser tratado no bloco principal
                 
@@ -398,11 +517,54 @@ def executar_agente(diretorio: str, saida: str = "docs", intervalo: int = 300) -
                 logger.error(f"Erro no ciclo do agente: {e}")
                 print(f"{Colors.RED}❌ Erro no ciclo do agente: {str(e)}{Colors.ENDC}")
                 print(f"{Colors.YELLOW}⚠️ Aguardando próximo ciclo...{Colors.ENDC}")
-                time.sleep(intervalo)
     
     except KeyboardInterrupt:
         logger.info("Agente interrompido pelo usuário")
         print(f"\n{Colors.YELLOW}⏹️ Agente interrompido pelo usuário{Colors.ENDC}")
+    finally:
+        remover_registro_agente(diretorio)
+        if observador is not None:
+            observador.close()
+
+def executar_supervisor(arquivo_config: str, workers: Optional[int] = None,
+                        intervalo_status: float = INTERVALO_STATUS, polling: bool = False) -> int:
+    """
+    Supervisiona vários repositórios a partir de um único processo.
+    
+    Args:
+        arquivo_config: Lista de repositórios (JSON ou YAML)
+        workers: Máximo de atualizações simultâneas (padrão: valor do arquivo)
+        intervalo_status: Intervalo entre tabelas de status, em segundos (0 desativa)
+        polling: Usa a comparação por stat em vez do inotify
+        
+    Returns:
+        int: Código de saída
+    """
+    try:
+        config = carregar_configuracao(arquivo_config)
+    except (OSError, ValueError) as e:
+        logger.error(f"Configuração inválida: {e}")
+        print(f"{Colors.RED}❌ Configuração inválida: {e}{Colors.ENDC}")
+        return 1
+    
+    supervisor = RepoSupervisor(config["repositories"], workers or config["workers"],
+                                config["debounce"], config["max_latency"], polling)
+    
+    logger.info(f"Supervisionando {len(supervisor.repos)} repositório(s)")
+    print(f"\n{Colors.BLUE}🤖 Supervisionando {len(supervisor.repos)} repositório(s) "
+          f"com {supervisor.workers} worker(s) ({supervisor.watcher.mode}){Colors.ENDC}")
+    
+    def mostrar_status(s: RepoSupervisor) -> None:
+        print(f"\n{Colors.BOLD}{tabela_status(s.status())}{Colors.ENDC}", flush=True)
+    
+    try:
+        supervisor.run(intervalo_status, mostrar_status)
+    except KeyboardInterrupt:
+        logger.info("Supervisor interrompido pelo usuário")
+        print(f"\n{Colors.YELLOW}⏹️ Supervisor interrompido pelo usuário{Colors.ENDC}")
+    
+    mostrar_status(supervisor)
+    return 0
 
 def main():
     """Função principal do script."""
@@ -422,6 +584,12 @@ def main():
                                help="Diretório de saída")
     parser_iniciar.add_argument("--intervalo", "-i", type=int, default=300,
                                help="Intervalo entre verificações em segundos")
+    parser_iniciar.add_argument("--observar", "--watch", "-w", action="store_true",
+                               help="Reagir a cada commit observando .git em vez de usar intervalo")
+    parser_iniciar.add_argument("--debounce", type=float, default=DEBOUNCE,
+                               help="Segundos sem commits antes de atualizar")
+    parser_iniciar.add_argument("--latencia-maxima", type=float, default=MAX_LATENCY,
+                               help="Espera máxima por uma atualização pendente, em segundos")
     
     # Comando: atualizar
     parser_atualizar = subparsers.add_parser("atualizar", help="Atualizar documentação manualmente")
@@ -431,6 +599,24 @@ def main():
                                  help="Diretório de saída")
     parser_atualizar.add_argument("--commit", "-c", type=str, default="HEAD",
                                  help="ID do commit (padrão: HEAD)")
+    parser_atualizar.add_argument("--arquivos", "-a", nargs="*",
+                                 help="Arquivos alterados (padrão: detectar pelo Git)")
+    parser_atualizar.add_argument("--completo", action="store_true",
+                                 help="Regenerar toda a documentação")
+    parser_atualizar.add_argument("--hook", action="store_true",
+                                 help="Execução pelo hook post-commit (não faz nada se o agente estiver rodando)")
+    
+    # Comando: supervisionar
+    parser_supervisor = subparsers.add_parser("supervisionar",
+                                              help="Supervisionar vários repositórios em um único processo")
+    parser_supervisor.add_argument("--config", "-c", type=str, required=True,
+                                   help="Lista de repositórios (JSON ou YAML)")
+    parser_supervisor.add_argument("--workers", type=int,
+                                   help="Máximo de atualizações simultâneas (padrão: valor do arquivo)")
+    parser_supervisor.add_argument("--status-intervalo", type=float, default=INTERVALO_STATUS,
+                                   help="Intervalo entre tabelas de status em segundos (0 desativa)")
+    parser_supervisor.add_argument("--polling", action="store_true",
+                                   help="Comparar o stat de .git em vez de usar inotify")
     
     # Comando: configurar-hook
     parser_hook = subparsers.add_parser("configurar-hook", help="Configurar hook Git para atualização automática")
@@ -450,7 +636,21 @@ def main():
             print(f"{Colors.RED}❌ O diretório {args.dir} não é um repositório Git{Colors.ENDC}")
             return 1
         
-        atualizar_documentacao(args.dir, args.commit, args.saida)
+        if args.hook and agente_em_execucao(args.dir):
+            print(f"{Colors.BLUE}ℹ️ Agente em execução; ele fará a atualização{Colors.ENDC}")
+            return 0
+        
+        # Agrupar com atualizações concorrentes (hooks de commits em sequência)
+        resultado = executar_agrupado(
+            args.dir,
+            lambda: atualizar_documentacao_incremental(args.dir, args.commit, args.saida,
+                                                       args.arquivos, args.completo)
+        )
+        if resultado is None:
+            print(f"{Colors.BLUE}ℹ️ Atualização já em andamento; este commit será incluído nela{Colors.ENDC}")
+    
+    elif args.command == "supervisionar":
+        return executar_supervisor(args.config, args.workers, args.status_intervalo, args.polling)
     
     elif args.command == "configurar-hook":
         if not verificar_git(args.dir):
@@ -464,7 +664,10 @@ def main():
         executar_agente(
             args.dir if hasattr(args, 'dir') else os.getcwd(),
             args.saida if hasattr(args, 'saida') else "docs",
-            args.intervalo if hasattr(args, 'intervalo') else 300
+            args.intervalo if hasattr(args, 'intervalo') else 300,
+            args.observar if hasattr(args, 'observar') else False,
+            args.debounce if hasattr(args, 'debounce') else DEBOUNCE,
+            args.latencia_maxima if hasattr(args, 'latencia_maxima') else MAX_LATENCY
         )
     
     return 0
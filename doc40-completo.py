@@ -12,18 +12,33 @@ import os
 import sys
 import json
 import time
+import asyncio
 import argparse
 import subprocess
 import threading
 import logging
 import re
 import shutil
+import weakref
 from datetime import datetime
 from pathlib import Path
-import http.server
-import socketserver
 import webbrowser
-from typing import Dict, List, Optional, Tuple, Union, Any
+from typing import Dict, List, Optional, Tuple, Union, Any, Callable
+
+from doc40_ambiente import sondar_ambiente, api_key_configurada
+from doc40_indice import construir_indice
+from doc40_busca import buscar, LIMITE as LIMITE_BUSCA
+from doc40_recuperacao import TOP_K, anexar_fontes, consulta_hibrida, montar_pergunta, recuperar
+from doc40_servidor import criar_servidor, ler_politicas_cache, WORKERS, TIMEOUT
+from doc40_pool import ClaudeCodeWorkerPool
+from doc40_cache import QueryCache, DEFAULT_BACKEND, MEMORY_CACHE
+from doc40_stream import executar_com_progresso, progresso_console
+from doc40_incremental import atualizar_incremental
+from doc40_compressao import comprimir_diretorio
+from doc40_watcher import GitRefWatcher
+from doc40_git import obter_intervalo, ler_head
+from doc40_fila import (CoalescingUpdateQueue, DEBOUNCE, MAX_LATENCY, registrar_agente,
+                        remover_registro_agente, agente_em_execucao, executar_agrupado)
 
 # Configuração de logging
 logging.basicConfig(
@@ -58,11 +73,21 @@ class ClaudeCodeIntegration:
         Inicializa a integração com Claude Code.
         
         Args:
-            config: Configuração opcional
+            config: Configuração opcional. As chaves `workers` e `worker_command`
+                ativam um pool de processos claude-code persistentes para `query`;
+                `cache_backend` escolhe o backend do cache (sqlite, json).
         """
         self.config = config or {}
         self.check_installation()
         
+        # Pool de workers persistentes (opcional)
+        self.pool = None
+        if self.config.get('workers', 0) > 0:
+            self.pool = ClaudeCodeWorkerPool(
+                self.config['workers'],
+                self.config.get('worker_command')
+            )
+        
     def check_installation(self) -> bool:
         """
         Verifica se o Claude Code CLI está instalado.
@@ -70,24 +95,18 @@ class ClaudeCodeIntegration:
         Returns:
             bool: True se estiver instalado, False caso contrário
         """
-        try:
-            result = subprocess.run(
-                ["claude-code", "--version"], 
-                capture_output=True, 
-                text=True
-            )
-            if result.returncode == 0:
-                version = result.stdout.strip()
-                logger.info(f"Claude Code instalado: {version}")
-                return True
+        ambiente = sondar_ambiente()
+        if ambiente["installed"]:
+            if ambiente["version"]:
+                logger.info(f"Claude Code instalado: {ambiente['version']}")
             else:
                 logger.warning("Claude Code instalado, mas não foi possível obter a versão")
-                return True
-        except Exception as e:
-            logger.error(f"Claude Code não está instalado ou não está no PATH: {e}")
-            print(f"\n{Colors.RED}Claude Code CLI não encontrado. Por favor, instale:"+
-                  f"\n\ncurl -sSL https://raw.githubusercontent.com/anthropic/claude-code/main/install.sh | bash{Colors.ENDC}\n")
-            return False
+            return True
+        
+        logger.error("Claude Code não está instalado ou não está no PATH")
+        print(f"\n{Colors.RED}Claude Code CLI não encontrado. Por favor, instale:"+
+              f"\n\ncurl -sSL https://raw.githubusercontent.com/anthropic/claude-code/main/install.sh | bash{Colors.ENDC}\n")
+        return False
             
     def check_api_key(self) -> bool:
         """
@@ -96,23 +115,14 @@ class ClaudeCodeIntegration:
         Returns:
             bool: True se a API key estiver configurada, False caso contrário
         """
-        try:
-            result = subprocess.run(
-                ["claude-code", "config", "get", "api_key"], 
-                capture_output=True, 
-                text=True
-            )
-            if result.returncode == 0 and "api_key" in result.stdout:
-                logger.info("API key configurada corretamente")
-                return True
-            else:
-                logger.warning("API key não está configurada")
-                print(f"\n{Colors.YELLOW}API key não configurada. Por favor, configure:"+
-                      f"\n\nclaude-code config set api_key sk_ant_your_key_here{Colors.ENDC}\n")
-                return False
-        except Exception as e:
-            logger.error(f"Erro ao verificar API key: {e}")
-            return False
+        if api_key_configurada():
+            logger.info("API key configurada corretamente")
+            return True
+        
+        logger.warning("API key não está configurada")
+        print(f"\n{Colors.YELLOW}API key não configurada. Por favor, configure:"+
+              f"\n\nclaude-code config set api_key sk_ant_your_key_here{Colors.ENDC}\n")
+        return False
     
     def query(self, question: str, directory: str, cache: bool = True) -> Dict[str, Any]:
         """
@@ -129,38 +139,35 @@ class ClaudeCodeIntegration:
         logger.info(f"Consultando: {question}")
         print(f"\n{Colors.BLUE}📝 Consultando: {question}{Colors.ENDC}")
         
-        # Criar diretório de cache se não existir e cache estiver ativado
-        cache_dir = os.path.join(directory, ".doc40", "cache", "queries")
-        cache_file = None
+        # Cache endereçado pela pergunta, diretório, estado do repositório e formato
+        query_cache = None
+        cache_key = None
         
         if cache:
-            os.makedirs(cache_dir, exist_ok=True)
-            # Hash da pergunta para nome do arquivo de cache
-            import hashlib
-            question_hash = hashlib.md5(question.encode()).hexdigest()
-            cache_file = os.path.join(cache_dir, f"{question_hash}.json")
+            query_cache = QueryCache(directory, backend=self.config.get('cache_backend', DEFAULT_BACKEND))
+            cache_key = query_cache.key(question, "json")
+            response = query_cache.get(cache_key)
+            if response is not None:
+                logger.info(f"Usando resposta em cache para: {question}")
+                print(f"{Colors.GREEN}✓ Usando resposta em cache{Colors.ENDC}")
+                return response
+        
+        # Usar um worker persistente quando houver pool
+        if self.pool is not None:
+            response = self.pool.query(directory, question)
+            if "error" in response:
+                logger.error(f"Erro ao executar consulta no pool: {response.get('message')}")
+                print(f"{Colors.RED}❌ Erro: {response.get('message')}{Colors.ENDC}")
+                return response
+            
+            # Salvar no cache se ativado
+            if query_cache is not None:
+                query_cache.set(cache_key, response, question)
             
-            # Verificar se existe cache válido (menos de 24h)
-            if os.path.exists(cache_file):
-                file_time = os.path.getmtime(cache_file)
-                if time.time() - file_time < 86400:  # 24 horas
-                    try:
-                        with open(cache_file, 'r') as f:
-                            response = json.load(f)
-                        logger.info(f"Usando resposta em cache para: {question}")
-                        print(f"{Colors.GREEN}✓ Usando resposta em cache{Colors.ENDC}")
-                        return response
-                    except Exception as e:
-                        logger.error(f"Erro ao ler cache: {e}")
+            return response
         
         # Comando para o Claude Code CLI
-        command = [
-            "claude-code",
-            "query",
-            "--directory", directory,
-            "--query", question,
-            "--output", "json"
-        ]
+        command = self._query_command(question, directory)
         
         # Executar o comando
         try:
@@ -172,9 +179,8 @@ class ClaudeCodeIntegration:
                     response = json.loads(result.stdout)
                     
                     # Salvar no cache se ativado
-                    if cache and cache_file:
-                        with open(cache_file, 'w') as f:
-                            json.dump(response, f)
+                    if query_cache is not None:
+                        query_cache.set(cache_key, response, question)
                     
                     return response
                 except json.JSONDecodeError as e:
@@ -191,14 +197,19 @@ class ClaudeCodeIntegration:
             return {"error": "Exception", "message": str(e)}
     
     def generate_documentation(self, directory: str, format: str = "markdown", 
-                              output_dir: str = "docs") -> Dict[str, Any]:
+                              output_dir: str = "docs",
+                              progress: Optional[Callable[[Dict[str, Any]], None]] = progresso_console) -> Dict[str, Any]:
         """
         Gera documentação automaticamente a partir do código.
         
+        A saída do Claude Code é acompanhada em tempo real e gravada em
+        `<output_dir>/progresso.log`.
+        
         Args:
             directory: O diretório do projeto
             format: O formato da documentação (markdown, html)
             output_dir: O diretório de saída
+            progress: Callback chamado com cada evento de progresso (None desativa)
             
         Returns:
             dict: Resultado da operação
@@ -211,24 +222,19 @@ class ClaudeCodeIntegration:
         os.makedirs(output_dir, exist_ok=True)
         
         # Comando para o Claude Code CLI
-        command = [
-            "claude-code",
-            "document",
-            "--directory", directory,
-            "--format", format,
-            "--output-dir", output_dir
-        ]
+        command = self._document_command(directory, format, output_dir)
         
         # Executar o comando
         try:
-            result = subprocess.run(command, capture_output=True, text=True)
+            result = executar_com_progresso(command, progress, os.path.join(output_dir, "progresso.log"))
             
-            if result.returncode == 0:
+            if result["returncode"] == 0:
                 logger.info(f"Documentação gerada com sucesso em: {output_dir}")
                 print(f"{Colors.GREEN}✅ Documentação gerada com sucesso em: {output_dir}{Colors.ENDC}")
                 
-                # Registrar a geração
+                # Registrar a geração e gravar as cópias .gz/.br
                 self._log_documentation_update(output_dir, "Geração inicial")
+                comprimir_diretorio(output_dir)
                 
                 return {
                     "success": True, 
@@ -236,11 +242,11 @@ class ClaudeCodeIntegration:
                     "format": format
                 }
             else:
-                logger.error(f"Erro ao gerar documentação: {result.stderr}")
-                print(f"{Colors.RED}❌ Erro: {result.stderr}{Colors.ENDC}")
+                logger.error(f"Erro ao gerar documentação: {result['stderr']}")
+                print(f"{Colors.RED}❌ Erro: {result['stderr']}{Colors.ENDC}")
                 return {
                     "success": False, 
-                    "error": result.stderr
+                    "error": result["stderr"]
                 }
         except Exception as e:
             logger.error(f"Exceção ao gerar documentação: {e}")
@@ -251,14 +257,19 @@ class ClaudeCodeIntegration:
             }
     
     def update_documentation(self, directory: str, commit_id: str, 
-                           output_dir: str = "docs") -> Dict[str, Any]:
+                           output_dir: str = "docs",
+                           progress: Optional[Callable[[Dict[str, Any]], None]] = progresso_console) -> Dict[str, Any]:
         """
         Atualiza a documentação com base nas mudanças do commit.
         
+        A saída do Claude Code é acompanhada em tempo real e gravada em
+        `<output_dir>/progresso.log`.
+        
         Args:
             directory: O diretório do projeto
             commit_id: O ID do commit
             output_dir: O diretório de saída
+            progress: Callback chamado com cada evento de progresso (None desativa)
             
         Returns:
             dict: Resultado da operação
@@ -270,24 +281,19 @@ class ClaudeCodeIntegration:
         os.makedirs(output_dir, exist_ok=True)
         
         # Comando para o Claude Code CLI
-        command = [
-            "claude-code",
-            "update-docs",
-            "--directory", directory,
-            "--commit", commit_id,
-            "--output-dir", output_dir
-        ]
+        command = self._update_command(directory, commit_id, output_dir)
         
         # Executar o comando
         try:
-            result = subprocess.run(command, capture_output=True, text=True)
+            result = executar_com_progresso(command, progress, os.path.join(output_dir, "progresso.log"))
             
-            if result.returncode == 0:
+            if result["returncode"] == 0:
                 logger.info(f"Documentação atualizada com sucesso em: {output_dir}")
                 print(f"{Colors.GREEN}✅ Documentação atualizada com sucesso em: {output_dir}{Colors.ENDC}")
                 
-                # Registrar a atualização
+                # Registrar a atualização e refazer as cópias .gz/.br
                 self._log_documentation_update(output_dir, f"Atualização para commit {commit_id[:8]}")
+                comprimir_diretorio(output_dir)
                 
                 return {
                     "success": True, 
@@ -295,11 +301,11 @@ class ClaudeCodeIntegration:
                     "commit_id": commit_id
                 }
             else:
-                logger.error(f"Erro ao atualizar documentação: {result.stderr}")
-                print(f"{Colors.RED}❌ Erro: {result.stderr}{Colors.ENDC}")
+                logger.error(f"Erro ao atualizar documentação: {result['stderr']}")
+                print(f"{Colors.RED}❌ Erro: {result['stderr']}{Colors.ENDC}")
                 return {
                     "success": False, 
-                    "error": result.stderr
+                    "error": result["stderr"]
                 }
         except Exception as e:
             logger.error(f"Exceção ao atualizar documentação: {e}")
@@ -309,14 +315,78 @@ class ClaudeCodeIntegration:
                 "error": str(e)
             }
     
-    def generate_code_with_docs(self, prompt: str, output_file: str, language: str = "python") -> Dict[str, Any]:
+    def update_documentation_incremental(self, directory: str, commit_id: str = "HEAD",
+                                         output_dir: str = "docs", files: Optional[List[str]] = None,
+                                         format: str = "markdown", full: bool = False,
+                                         progress: Optional[Callable[[Dict[str, Any]], None]] = progresso_console) -> Dict[str, Any]:
+        """
+        Regenera apenas a documentação dos arquivos alterados.
+        
+        Usa o manifesto fonte → documentos em `.doc40/manifest.json`; na
+        primeira execução (ou com `full=True`) gera tudo e cria o manifesto.
+        
+        Args:
+            directory: O diretório do projeto
+            commit_id: O ID do commit
+            output_dir: O diretório de saída
+            files: Arquivos alterados (padrão: detectar pelo Git desde a última atualização)
+            format: O formato da documentação (usado na geração completa)
+            full: Força a geração completa
+            progress: Callback chamado com cada evento de progresso (None desativa)
+            
+        Returns:
+            dict: Resultado da operação
+        """
+        logger.info(f"Atualização incremental para commit: {commit_id[:8] if commit_id else 'N/A'}")
+        print(f"\n{Colors.BLUE}🔄 Atualizando documentação para commit: {commit_id[:8] if commit_id else 'N/A'}{Colors.ENDC}")
+        
+        try:
+            result = atualizar_incremental(directory, output_dir, files, commit_id, format, progress, full)
+        except Exception as e:
+            logger.error(f"Exceção ao atualizar documentação: {e}")
+            print(f"{Colors.RED}❌ Exceção: {str(e)}{Colors.ENDC}")
+            return {
+                "success": False, 
+                "error": str(e)
+            }
+        
+        if not result["success"]:
+            logger.error(f"Erro ao atualizar documentação: {result['message']}")
+            print(f"{Colors.RED}❌ Erro: {result['message']}{Colors.ENDC}")
+            return {
+                "success": False, 
+                "error": result["message"]
+            }
+        
+        if result["mode"] == "noop":
+            print(f"{Colors.GREEN}✓ Documentação já atualizada ({len(result['skipped'])} arquivo(s) sem mudanças){Colors.ENDC}")
+        else:
+            print(f"{Colors.GREEN}✅ Documentação atualizada: {len(result['regenerated'])} regenerado(s), "
+                  f"{len(result['removed'])} removido(s){Colors.ENDC}")
+            self._log_documentation_update(
+                os.path.join(directory, output_dir),
+                f"Atualização {'completa' if result['mode'] == 'full' else 'incremental'} "
+                f"para commit {commit_id[:8]} ({len(result['regenerated'])} arquivo(s))"
+            )
+        
+        result["output_dir"] = output_dir
+        result["commit_id"] = commit_id
+        return result
+    
+    def generate_code_with_docs(self, prompt: str, output_file: str, language: str = "python",
+                                progress: Optional[Callable[[Dict[str, Any]], None]] = progresso_console) -> Dict[str, Any]:
         """
         Gera código com documentação integrada.
         
+        A saída parcial do Claude Code vai para `<output_file>.progresso.log`
+        enquanto a geração roda; o arquivo é removido em caso de sucesso e
+        mantido em caso de erro.
+        
         Args:
             prompt: O prompt para geração
             output_file: O arquivo de saída
             language: A linguagem de programação
+            progress: Callback chamado com cada evento de progresso (None desativa)
             
         Returns:
             dict: Resultado da operação
@@ -327,34 +397,16 @@ class ClaudeCodeIntegration:
         # Criar diretório de saída se não existir
         os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
         
-        # Adicionar contexto sobre documentação SOTA ao prompt
-        enhanced_prompt = f"""
-        {prompt}
-        
-        IMPORTANTE:
-        1. O código deve seguir as melhores práticas de Documentação 4.0, incluindo:
-           - Docstrings completos para classes, métodos e funções
-           - Anotações de tipo (type hints) para todos os parâmetros e retornos
-           - Exemplos de uso embutidos na documentação
-           - Explicações claras do propósito e comportamento
-        2. O código deve ser bem estruturado e seguir princípios SOLID
-        3. Inclua validação robusta de entradas e tratamento de erros
-        4. A linguagem é {language}
-        """
-        
         # Comando para o Claude Code CLI
-        command = [
-            "claude-code",
-            "generate",
-            "--prompt", enhanced_prompt,
-            "--output", output_file
-        ]
+        command = self._generate_command(prompt, output_file, language)
+        partial_log = output_file + ".progresso.log"
         
         # Executar o comando
         try:
-            result = subprocess.run(command, capture_output=True, text=True)
+            result = executar_com_progresso(command, progress, partial_log)
             
-            if result.returncode == 0:
+            if result["returncode"] == 0:
+                os.remove(partial_log)
                 logger.info(f"Código gerado com sucesso em: {output_file}")
                 print(f"{Colors.GREEN}✅ Código gerado com sucesso em: {output_file}{Colors.ENDC}")
                 
@@ -368,11 +420,11 @@ class ClaudeCodeIntegration:
                     "content": content
                 }
             else:
-                logger.error(f"Erro ao gerar código: {result.stderr}")
-                print(f"{Colors.RED}❌ Erro: {result.stderr}{Colors.ENDC}")
+                logger.error(f"Erro ao gerar código: {result['stderr']}")
+                print(f"{Colors.RED}❌ Erro: {result['stderr']}{Colors.ENDC}")
                 return {
                     "success": False, 
-                    "error": result.stderr
+                    "error": result["stderr"]
                 }
         except Exception as e:
             logger.error(f"Exceção ao gerar código: {e}")
@@ -382,7 +434,80 @@ class ClaudeCodeIntegration:
                 "error": str(e)
             }
     
-    def _log_documentation_update(self, output_dir: str, description: str) -> None:
+    def cache_stats(self) -> Dict[str, int]:
+        """
+        Retorna os contadores da camada de cache em memória.
+        
+        Returns:
+            dict: entries, bytes, hits, misses e evictions
+        """
+        return MEMORY_CACHE.stats()
+    
+    def close(self) -> None:
+        """Encerra o pool de workers persistentes, se houver."""
+        if self.pool is not None:
+            self.pool.close()
+            self.pool = None
+    
+    @staticmethod
+    def _query_command(question: str, directory: str) -> List[str]:
+        """Monta o comando de consulta do Claude Code CLI."""
+        return [
+            "claude-code",
+            "query",
+            "--directory", directory,
+            "--query", question,
+            "--output", "json"
+        ]
+    
+    @staticmethod
+    def _document_command(directory: str, format: str, output_dir: str) -> List[str]:
+        """Monta o comando de geração de documentação do Claude Code CLI."""
+        return [
+            "claude-code",
+            "document",
+            "--directory", directory,
+            "--format", format,
+            "--output-dir", output_dir
+        ]
+    
+    @staticmethod
+    def _update_command(directory: str, commit_id: str, output_dir: str) -> List[str]:
+        """Monta o comando de atualização de documentação do Claude Code CLI."""
+        return [
+            "claude-code",
+            "update-docs",
+            "--directory", directory,
+            "--commit", commit_id,
+            "--output-dir", output_dir
+        ]
+    
+    @staticmethod
+    def _generate_command(prompt: str, output_file: str, language: str) -> List[str]:
+        """Monta o comando de geração de código, com o contexto de Documentação 4.0 no prompt."""
+        enhanced_prompt = f"""
+        {prompt}
+        
+        IMPORTANTE:
+        1. O código deve seguir as melhores práticas de Documentação 4.0, incluindo:
+           - Docstrings completos para classes, métodos e funções
+           - Anotações de tipo (type hints) para todos os parâmetros e retornos
+           - Exemplos de uso embutidos na documentação
+           - Explicações claras do propósito e comportamento
+        2. O código deve ser bem estruturado e seguir princípios SOLID
+        3. Inclua validação robusta de entradas e tratamento de erros
+        4. A linguagem é {language}
+        """
+        
+        return [
+            "claude-code",
+            "generate",
+            "--prompt", enhanced_prompt,
+            "--output", output_file
+        ]
+    
+    @staticmethod
+    def _log_documentation_update(output_dir: str, description: str) -> None:
         """
         Registra uma atualização de documentação no log.
         
@@ -397,6 +522,276 @@ class ClaudeCodeIntegration:
             f.write(f"{timestamp} - {description}\n")
 
 
+class AsyncClaudeCodeIntegration:
+    """
+    Integração assíncrona com Claude Code CLI.
+    
+    Mesma interface e mesmos dicionários de retorno de `ClaudeCodeIntegration`,
+    mas sobre `asyncio.create_subprocess_exec`: várias operações podem ficar
+    pendentes no mesmo event loop, limitadas por um semáforo, cada uma com
+    timeout e cancelamento (o processo filho é encerrado junto). As mensagens
+    vão apenas para o log, já que as chamadas costumam rodar intercaladas.
+    
+    Exemplo:
+        claude = AsyncClaudeCodeIntegration(max_concurrency=8)
+        respostas = await asyncio.gather(*(claude.query(p, ".") for p in perguntas))
+    """
+    
+    def __init__(self, config: Dict[str, Any] = None, max_concurrency: int = 4,
+                 timeout: Optional[float] = 300):
+        """
+        Inicializa a integração assíncrona.
+        
+        Args:
+            config: Configuração opcional (`cache_backend` escolhe o backend do cache)
+            max_concurrency: Número máximo de processos claude-code simultâneos
+            timeout: Tempo máximo padrão de cada operação, em segundos (None desativa)
+        """
+        self.config = config or {}
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout = timeout
+        # Loops encerrados saem sozinhos do dicionário
+        self._semaphores = weakref.WeakKeyDictionary()
+    
+    def _semaphore(self) -> asyncio.Semaphore:
+        """Semáforo do event loop atual (no Python 3.8/3.9 ele fica preso ao loop)."""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+    
+    async def _run(self, command: List[str], timeout: Optional[float] = None) -> Tuple[int, str, str]:
+        """
+        Executa um comando do Claude Code CLI sem bloquear o event loop.
+        
+        Args:
+            command: O comando e seus argumentos
+            timeout: Tempo máximo em segundos (padrão: o da instância)
+            
+        Returns:
+            tuple: (código de saída, stdout, stderr)
+            
+        Raises:
+            asyncio.TimeoutError: Se o comando exceder o tempo limite
+            asyncio.CancelledError: Se a tarefa for cancelada
+        """
+        timeout = self.timeout if timeout is None else timeout
+        
+        async with self._semaphore():
+            process = await asyncio.create_subprocess_exec(
+                *command,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+            except BaseException:
+                # Timeout ou cancelamento: não deixar o processo órfão
+                if process.returncode is None:
+                    process.kill()
+                    await asyncio.shield(process.wait())
+                raise
+        
+        return process.returncode, stdout.decode(errors="replace"), stderr.decode(errors="replace")
+    
+    async def query(self, question: str, directory: str, cache: bool = True,
+                    timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Consulta o código usando Claude Code.
+        
+        Args:
+            question: A pergunta a ser feita
+            directory: O diretório do projeto
+            cache: Se deve usar cache (padrão: True)
+            timeout: Tempo máximo em segundos (padrão: o da instância)
+            
+        Returns:
+            dict: A resposta processada
+        """
+        logger.info(f"Consultando: {question}")
+        
+        loop = asyncio.get_running_loop()
+        query_cache = None
+        cache_key = None
+        
+        if cache:
+            # Estado do Git e SQLite fora do event loop, como a compressão
+            query_cache = await loop.run_in_executor(
+                None, lambda: QueryCache(directory, backend=self.config.get('cache_backend', DEFAULT_BACKEND)))
+            cache_key = await loop.run_in_executor(None, query_cache.key, question, "json")
+            response = await loop.run_in_executor(None, query_cache.get, cache_key)
+            if response is not None:
+                logger.info(f"Usando resposta em cache para: {question}")
+                return response
+        
+        try:
+            returncode, stdout, stderr = await self._run(
+                ClaudeCodeIntegration._query_command(question, directory), timeout
+            )
+        except asyncio.TimeoutError:
+            logger.error(f"Tempo esgotado ao executar consulta: {question}")
+            return {"error": "Timeout", "message": f"Consulta excedeu {timeout or self.timeout}s"}
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Exceção ao executar consulta: {e}")
+            return {"error": "Exception", "message": str(e)}
+        
+        if returncode != 0:
+            logger.error(f"Erro ao executar consulta: {stderr}")
+            return {"error": "CommandError", "message": stderr}
+        
+        try:
+            response = json.loads(stdout)
+        except json.JSONDecodeError as e:
+            logger.error(f"Erro ao processar resposta JSON: {e}")
+            return {"error": "JSONDecodeError", "message": str(e)}
+        
+        if query_cache is not None:
+            await loop.run_in_executor(None, query_cache.set, cache_key, response, question)
+        
+        return response
+    
+    async def query_many(self, questions: List[str], directory: str,
+                         cache: bool = True) -> List[Dict[str, Any]]:
+        """
+        Consulta várias perguntas concorrentemente, respeitando o limite da instância.
+        
+        Args:
+            questions: As perguntas
+            directory: O diretório do projeto
+            cache: Se deve usar cache (padrão: True)
+            
+        Returns:
+            list: As respostas, na ordem das perguntas
+        """
+        return await asyncio.gather(*(self.query(q, directory, cache) for q in questions))
+    
+    async def _run_operation(self, command: List[str], timeout: Optional[float],
+                             description: str) -> Dict[str, Any]:
+        """
+        Executa uma operação que retorna `{"success": ...}`.
+        
+        Args:
+            command: O comando e seus argumentos
+            timeout: Tempo máximo em segundos
+            description: Descrição da operação para o log
+            
+        Returns:
+            dict: `{"success": True}` ou `{"success": False, "error": ...}`
+        """
+        try:
+            returncode, _, stderr = await self._run(command, timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"Tempo esgotado ao {description}")
+            return {"success": False, "error": f"Tempo esgotado ({timeout or self.timeout}s)"}
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Exceção ao {description}: {e}")
+            return {"success": False, "error": str(e)}
+        
+        if returncode != 0:
+            logger.error(f"Erro ao {description}: {stderr}")
+            return {"success": False, "error": stderr}
+        return {"success": True}
+    
+    async def generate_documentation(self, directory: str, format: str = "markdown",
+                                     output_dir: str = "docs",
+                                     timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Gera documentação automaticamente a partir do código.
+        
+        Args:
+            directory: O diretório do projeto
+            format: O formato da documentação (markdown, html)
+            output_dir: O diretório de saída
+            timeout: Tempo máximo em segundos (padrão: o da instância)
+            
+        Returns:
+            dict: Resultado da operação
+        """
+        logger.info(f"Gerando documentação para: {directory}")
+        os.makedirs(output_dir, exist_ok=True)
+        
+        result = await self._run_operation(
+            ClaudeCodeIntegration._document_command(directory, format, output_dir),
+            timeout, "gerar documentação"
+        )
+        if not result["success"]:
+            return result
+        
+        logger.info(f"Documentação gerada com sucesso em: {output_dir}")
+        ClaudeCodeIntegration._log_documentation_update(output_dir, "Geração inicial")
+        await asyncio.get_running_loop().run_in_executor(None, comprimir_diretorio, output_dir)
+        return {"success": True, "output_dir": output_dir, "format": format}
+    
+    async def update_documentation(self, directory: str, commit_id: str,
+                                   output_dir: str = "docs",
+                                   timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Atualiza a documentação com base nas mudanças do commit.
+        
+        Args:
+            directory: O diretório do projeto
+            commit_id: O ID do commit
+            output_dir: O diretório de saída
+            timeout: Tempo máximo em segundos (padrão: o da instância)
+            
+        Returns:
+            dict: Resultado da operação
+        """
+        logger.info(f"Atualizando documentação para commit: {commit_id[:8] if commit_id else 'N/A'}")
+        os.makedirs(output_dir, exist_ok=True)
+        
+        result = await self._run_operation(
+            ClaudeCodeIntegration._update_command(directory, commit_id, output_dir),
+            timeout, "atualizar documentação"
+        )
+        if not result["success"]:
+            return result
+        
+        logger.info(f"Documentação atualizada com sucesso em: {output_dir}")
+        ClaudeCodeIntegration._log_documentation_update(output_dir, f"Atualização para commit {commit_id[:8]}")
+        await asyncio.get_running_loop().run_in_executor(None, comprimir_diretorio, output_dir)
+        return {"success": True, "output_dir": output_dir, "commit_id": commit_id}
+    
+    async def generate_code_with_docs(self, prompt: str, output_file: str, language: str = "python",
+                                      timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Gera código com documentação integrada.
+        
+        Args:
+            prompt: O prompt para geração
+            output_file: O arquivo de saída
+            language: A linguagem de programação
+            timeout: Tempo máximo em segundos (padrão: o da instância)
+            
+        Returns:
+            dict: Resultado da operação
+        """
+        logger.info(f"Gerando código para: {prompt}")
+        os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+        
+        result = await self._run_operation(
+            ClaudeCodeIntegration._generate_command(prompt, output_file, language),
+            timeout, "gerar código"
+        )
+        if not result["success"]:
+            return result
+        
+        logger.info(f"Código gerado com sucesso em: {output_file}")
+        try:
+            with open(output_file, 'r') as f:
+                content = f.read()
+        except OSError as e:
+            return {"success": False, "error": str(e)}
+        
+        return {"success": True, "output_file": output_file, "content": content}
+
+
 class GitIntegration:
     """Classe para integração com Git."""
     
@@ -418,9 +813,9 @@ class GitIntegration:
             bool: True se for um repositório Git, False caso contrário
         """
         try:
-            os.chdir(self.directory)
             result = subprocess.run(
-                ["git", "rev-parse", "--is-inside-work-tree"], 
+                ["git", "rev-parse", "--is-inside-work-tree"],
+                cwd=self.directory,
                 capture_output=True, 
                 text=True
             )
@@ -441,18 +836,11 @@ class GitIntegration:
             return None
         
         try:
-            os.chdir(self.directory)
-            result = subprocess.run(
-                ["git", "rev-parse", "HEAD"], 
-                capture_output=True, 
-                text=True
-            )
-            
-            if result.returncode == 0:
-                return result.stdout.strip()
-            else:
-                logger.error(f"Erro ao obter commit atual: {result.stderr}")
-                return None
+            # Lido diretamente de .git (com cache por stat); usa o Git só em layouts não suportados
+            commit = ler_head(self.directory)
+            if commit is None:
+                logger.error(f"Erro ao obter commit atual: HEAD não encontrado em {self.directory}")
+            return commit
         except Exception as e:
             logger.error(f"Exceção ao obter commit atual: {e}")
             return None
@@ -473,9 +861,9 @@ class GitIntegration:
             return []
         
         try:
-            os.chdir(self.directory)
             result = subprocess.run(
-                ["git", "diff", "--name-only", from_commit, to_commit], 
+                ["git", "diff", "--name-only", from_commit, to_commit],
+                cwd=self.directory,
                 capture_output=True, 
                 text=True
             )
@@ -504,9 +892,9 @@ class GitIntegration:
             return None
         
         try:
-            os.chdir(self.directory)
             result = subprocess.run(
-                ["git", "log", "-1", "--pretty=%B", commit_id], 
+                ["git", "log", "-1", "--pretty=%B", commit_id],
+                cwd=self.directory,
                 capture_output=True, 
                 text=True
             )
@@ -520,6 +908,30 @@ class GitIntegration:
             logger.error(f"Exceção ao obter mensagem do commit: {e}")
             return None
     
+    def get_commit_range(self, from_commit: Optional[str], to_commit: str = "HEAD") -> Optional[Dict[str, Any]]:
+        """
+        Obtém commits, autores, mensagens e arquivos alterados de um intervalo.
+        
+        Usa um único `git log --name-status -z` para todo o intervalo, em vez
+        de um processo para cada informação.
+        
+        Args:
+            from_commit: O commit de origem (exclusivo; None considera apenas `to_commit`)
+            to_commit: O commit de destino (padrão: HEAD)
+            
+        Returns:
+            dict: head, commits, changed, removed e linear, ou None se ocorrer um erro
+        """
+        if not self.is_git_repo:
+            logger.warning(f"O diretório {self.directory} não é um repositório Git")
+            return None
+        
+        try:
+            return obter_intervalo(self.directory, from_commit, to_commit)
+        except Exception as e:
+            logger.error(f"Exceção ao obter intervalo de commits: {e}")
+            return None
+    
     def setup_git_hooks(self, hooks_dir: str = None) -> bool:
         """
         Configura hooks Git para integração com o sistema de documentação.
@@ -535,7 +947,6 @@ class GitIntegration:
             return False
         
         try:
-            os.chdir(self.directory)
             git_hooks_dir = os.path.join(self.directory, ".git", "hooks")
             
             # Conteúdo do hook post-commit
@@ -547,8 +958,12 @@ class GitIntegration:
 DOC40_SCRIPT="$(git rev-parse --show-toplevel)/doc40-completo.py"
 
 if [ -f "$DOC40_SCRIPT" ]; then
-    echo "Atualizando documentação após commit..."
-    python3 "$DOC40_SCRIPT" update-docs
+    # Em segundo plano: commits em sequência são agrupados em uma única
+    # atualização, e nada é feito se o agente já estiver rodando
+    echo "Atualizando documentação após commit (log em .doc40/hook.log)..."
+    mkdir -p "$(git rev-parse --show-toplevel)/.doc40"
+    nohup python3 "$DOC40_SCRIPT" update-docs --hook \
+        > "$(git rev-parse --show-toplevel)/.doc40/hook.log" 2>&1 &
 else
     echo "Script doc40-completo.py não encontrado em $DOC40_SCRIPT"
     exit 1
@@ -575,16 +990,23 @@ fi
 class DocumentationServer:
     """Servidor HTTP simples para visualizar a documentação gerada."""
     
-    def __init__(self, docs_dir: str, port: int = 8000):
+    def __init__(self, docs_dir: str, port: int = 8000, workers: Optional[int] = WORKERS,
+                 timeout: Optional[float] = TIMEOUT, cache_control: Optional[Dict[str, str]] = None):
         """
         Inicializa o servidor de documentação.
         
         Args:
             docs_dir: O diretório da documentação
             port: A porta para o servidor (padrão: 8000)
+            workers: Máximo de conexões atendidas ao mesmo tempo (None: uma thread por conexão)
+            timeout: Tempo limite de conexões ociosas, em segundos
+            cache_control: Políticas de Cache-Control por extensão ou nome de arquivo
         """
         self.docs_dir = docs_dir
         self.port = port
+        self.workers = workers
+        self.timeout = timeout
+        self.cache_control = cache_control
         self.server = None
         self.server_thread = None
     
@@ -596,16 +1018,13 @@ class DocumentationServer:
             bool: True se o servidor iniciou com sucesso, False caso contrário
         """
         try:
-            os.chdir(self.docs_dir)
+            # Gerar (ou atualizar) o index.html com todos os diretórios da documentação
+            construir_indice(self.docs_dir)
             
-            # Criar um arquivo index.html se não existir
-            index_path = os.path.join(self.docs_dir, "index.html")
-            if not os.path.exists(index_path):
-                self._create_index_html()
-            
-            # Iniciar o servidor em uma thread separada
-            handler = http.server.SimpleHTTPRequestHandler
-            self.server = socketserver.TCPServer(("", self.port), handler)
+            # Iniciar o servidor em uma thread separada: conexões atendidas em
+            # um pool de workers, com keep-alive e tempo limite
+            self.server = criar_servidor(self.docs_dir, self.port, self.workers, self.timeout,
+                                         cache_control=self.cache_control)
             
             self.server_thread = threading.Thread(target=self.server.serve_forever)
             self.server_thread.daemon = True
@@ -642,140 +1061,37 @@ class DocumentationServer:
             logger.error(f"Erro ao parar servidor: {e}")
             print(f"{Colors.RED}❌ Erro ao parar servidor: {e}{Colors.ENDC}")
             return False
-    
-    def _create_index_html(self) -> None:
-        """Cria um arquivo index.html para navegar pela documentação."""
-        
-        # Listar arquivos de documentação
-        md_files = [f for f in os.listdir(self.docs_dir) if f.endswith('.md')]
-        html_files = [f for f in os.listdir(self.docs_dir) if f.endswith('.html') and f != "index.html"]
-        other_files = [f for f in os.listdir(self.docs_dir) if not f.endswith(('.md', '.html', '.log'))]
-        
-        # Criar HTML
-        html_content = """<!DOCTYPE html>
-<html lang="pt-BR">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Documentação 4.0</title>
-    <style>
-        body {
-            font-family: Arial, sans-serif;
-            line-height: 1.6;
-            margin: 0;
-            padding: 20px;
-            background-color: #f4f5f7;
-        }
-        .container {
-            max-width: 800px;
-            margin: 0 auto;
-            background-color: white;
-            padding: 20px;
-            border-radius: 5px;
-            box-shadow: 0 2px 5px rgba(0,0,0,0.1);
-        }
-        h1 {
-            color: #2a67c2;
-            border-bottom: 2px solid #eaecef;
-            padding-bottom: 10px;
-        }
-        h2 {
-            color: #2a67c2;
-            margin-top: 20px;
-        }
-        ul {
-            list-style-type: none;
-            padding: 0;
-        }
-        li {
-            margin-bottom: 10px;
-            padding: 5px 10px;
-            background-color: #f6f8fa;
-            border-radius: 3px;
-        }
-        a {
-            color: #2a67c2;
-            text-decoration: none;
-        }
-        a:hover {
-            text-decoration: underline;
-        }
-        footer {
-            margin-top: 30px;
-            font-size: 0.8em;
-            color: #6a737d;
-            text-align: center;
-        }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>Documentação 4.0</h1>
-        <p>Documentação gerada automaticamente pelo sistema Documentação 4.0.</p>
-"""
-        
-        # Adicionar seção de arquivos Markdown
-        if md_files:
-            html_content += """
-        <h2>Documentação Markdown</h2>
-        <ul>
-"""
-            for file in md_files:
-                html_content += f'            <li><a href="{file}">{file}</a></li>\n'
-            html_content += "        </ul>\n"
-        
-        # Adicionar seção de arquivos HTML
-        if html_files:
-            html_content += """
-        <h2>Documentação HTML</h2>
-        <ul>
-"""
-            for file in html_files:
-                html_content += f'            <li><a href="{file}">{file}</a></li>\n'
-            html_content += "        </ul>\n"
-        
-        # Adicionar seção de outros arquivos
-        if other_files:
-            html_content += """
-        <h2>Outros Arquivos</h2>
-        <ul>
-"""
-            for file in other_files:
-                html_content += f'            <li><a href="{file}">{file}</a></li>\n'
-            html_content += "        </ul>\n"
-        
-        # Adicionar rodapé
-        html_content += """
-        <footer>
-            <p>Gerado por Documentação 4.0 - Campus Party 2025</p>
-        </footer>
-    </div>
-</body>
-</html>
-"""
-        
-        # Salvar o arquivo
-        with open(os.path.join(self.docs_dir, "index.html"), 'w') as f:
-            f.write(html_content)
 
 
 class DocumentationAgent:
     """Agente de monitoramento e manutenção de documentação."""
     
     def __init__(self, directory: str, output_dir: str = "docs", 
-                 interval: int = 300, claude: ClaudeCodeIntegration = None):
+                 interval: int = 300, claude: ClaudeCodeIntegration = None,
+                 watch: bool = False, debounce: float = DEBOUNCE,
+                 max_latency: float = MAX_LATENCY):
         """
         Inicializa o agente de documentação.
         
+        Commits que chegam em sequência são agrupados: a atualização só
+        começa após `debounce` segundos sem mudanças (ou `max_latency`
+        segundos após a primeira mudança pendente) e cobre de uma vez o
+        intervalo entre o último commit documentado e o HEAD.
+        
         Args:
             directory: O diretório do projeto
             output_dir: O diretório de saída
             interval: O intervalo de verificação em segundos
             claude: Instância de ClaudeCodeIntegration
+            watch: Reage aos commits observando `.git` em vez de verificar a cada intervalo
+            debounce: Silêncio exigido antes de atualizar, em segundos
+            max_latency: Espera máxima por uma atualização pendente, em segundos
         """
         self.directory = directory
         self.output_dir = output_dir
         self.interval = interval
+        self.watch = watch
+        self.queue = CoalescingUpdateQueue(debounce, max_latency)
         self.claude = claude or ClaudeCodeIntegration()
         self.git = GitIntegration(directory)
         self.running = False
@@ -800,12 +1116,17 @@ class DocumentationAgent:
             return False
         
         self.running = True
+        registrar_agente(self.directory)
         self.agent_thread = threading.Thread(target=self._run)
         self.agent_thread.daemon = True
         self.agent_thread.start()
         
-        logger.info(f"Agente iniciado com intervalo de {self.interval} segundos")
-        print(f"{Colors.GREEN}✅ Agente iniciado com intervalo de {self.interval} segundos{Colors.ENDC}")
+        if self.watch:
+            logger.info("Agente iniciado observando commits")
+            print(f"{Colors.GREEN}✅ Agente iniciado observando commits{Colors.ENDC}")
+        else:
+            logger.info(f"Agente iniciado com intervalo de {self.interval} segundos")
+            print(f"{Colors.GREEN}✅ Agente iniciado com intervalo de {self.interval} segundos{Colors.ENDC}")
         
         return True
     
@@ -823,56 +1144,110 @@ class DocumentationAgent:
         
         self.running = False
         self.agent_thread.join(timeout=2.0)
+        remover_registro_agente(self.directory)
         
         logger.info("Agente parado")
         print(f"{Colors.YELLOW}ℹ️ Agente parado{Colors.ENDC}")
         
         return True
     
+    def _produce_changes(self, watcher: Optional[GitRefWatcher]) -> None:
+        """
+        Notifica a fila sempre que pode haver um commit novo.
+        
+        Com observador, a cada mudança de referência do Git; sem ele, a cada
+        `interval` segundos. Termina em até 1 segundo depois de o agente parar.
+        
+        Args:
+            watcher: Observador de referências do Git (opcional)
+        """
+        while self.running:
+            if watcher is not None:
+                if watcher.esperar(timeout=1.0):
+                    self.queue.notify()
+                continue
+            
+            for _ in range(self.interval):
+                if not self.running:
+                    return
+                time.sleep(1)
+            self.queue.notify()
+    
     def _run(self) -> None:
         """Loop principal do agente."""
-        while self.running:
+        watcher = None
+        if self.watch:
             try:
-                # Obter o commit atual
-                current_commit = self.git.get_current_commit()
+                watcher = GitRefWatcher(self.directory)
+                logger.info(f"Observando commits em {watcher.git_dir} (modo {watcher.mode})")
+                print(f"{Colors.BLUE}👀 Observando commits ({watcher.mode}){Colors.ENDC}")
+            except ValueError as e:
+                logger.warning(f"Observação indisponível, usando intervalo: {e}")
+        
+        producer = threading.Thread(target=self._produce_changes, args=(watcher,), daemon=True)
+        producer.start()
+        
+        # Verificar imediatamente ao iniciar
+        self.queue.notify()
+        
+        try:
+            while self.running:
+                batch = self.queue.wait_batch(timeout=1.0)
+                if batch:
+                    self._process_changes(batch)
+        finally:
+            producer.join(timeout=2.0)
+            if watcher is not None:
+                watcher.close()
+    
+    def _process_changes(self, batch: int = 1) -> None:
+        """
+        Documenta de uma só vez tudo o que mudou entre o último commit e o HEAD.
+        
+        Args:
+            batch: Número de notificações agrupadas neste lote
+        """
+        try:
+            # Obter o commit atual
+            current_commit = self.git.get_current_commit()
+            
+            # Se houve mudança no commit
+            if current_commit and current_commit != self.last_commit:
+                logger.info(f"Detectada mudança de commit: {self.last_commit[:8] if self.last_commit else 'Nenhum'} -> {current_commit[:8]}"
+                            f" ({batch} notificação(ões) agrupada(s))")
+                print(f"{Colors.BLUE}🔍 Detectada mudança de commit: {self.last_commit[:8] if self.last_commit else 'Nenhum'} -> {current_commit[:8]}{Colors.ENDC}")
                 
-                # Se houve mudança no commit
-                if current_commit and current_commit != self.last_commit:
-                    logger.info(f"Detectada mudança de commit: {self.last_commit[:8] if self.last_commit else 'Nenhum'} -> {current_commit[:8]}")
-                    print(f"{Colors.BLUE}🔍 Detectada mudança de commit: {self.last_commit[:8] if self.last_commit else 'Nenhum'} -> {current_commit[:8]}{Colors.ENDC}")
-                    
-                    # Obter arquivos alterados
-                    changed_files = self.git.get_changed_files(
-                        self.last_commit if self.last_commit else current_commit + "^", 
-                        current_commit
-                    )
-                    
-                    # Obter mensagem do commit
-                    commit_message = self.git.get_commit_message(current_commit)
-                    
-                    print(f"{Colors.BLUE}📄 Arquivos alterados: {len(changed_files)}{Colors.ENDC}")
-                    print(f"{Colors.BLUE}📝 Mensagem do commit: {commit_message}{Colors.ENDC}")
-                    
-                    # Atualizar a documentação
-                    self.claude.update_documentation(
-                        self.directory, 
-                        current_commit,
-                        self.output_dir
-                    )
-                    
-                    # Atualizar o último commit
-                    self.last_commit = current_commit
+                # Commits, mensagem e arquivos alterados de todo o intervalo em um único git log
+                commit_range = self.git.get_commit_range(self.last_commit, current_commit)
+                if commit_range is None:
+                    return
                 
-                # Aguardar o próximo ciclo
-                for _ in range(self.interval):
-                    if not self.running:
-                        break
-                    time.sleep(1)
-            
-            except Exception as e:
-                logger.error(f"Erro no agente: {e}")
-                print(f"{Colors.RED}❌ Erro no agente: {e}{Colors.ENDC}")
-                time.sleep(10)  # Esperar um pouco antes de tentar novamente
+                changed_files = commit_range["changed"] + commit_range["removed"]
+                commit_message = commit_range["commits"][0].message if commit_range["commits"] else None
+                
+                print(f"{Colors.BLUE}📄 Arquivos alterados: {len(changed_files)} em {len(commit_range['commits'])} commit(s){Colors.ENDC}")
+                print(f"{Colors.BLUE}📝 Mensagem do commit: {commit_message}{Colors.ENDC}")
+                
+                if not commit_range["linear"]:
+                    # Histórico reescrito (rebase, reset): comparar com a última documentação
+                    logger.info("Histórico reescrito; comparando com o último commit documentado")
+                    changed_files = None
+                
+                # Regenerar só a documentação dos arquivos alterados
+                self.claude.update_documentation_incremental(
+                    self.directory, 
+                    current_commit,
+                    self.output_dir,
+                    changed_files
+                )
+                
+                # Atualizar o último commit
+                self.last_commit = current_commit
+        
+        except Exception as e:
+            logger.error(f"Erro no agente: {e}")
+            print(f"{Colors.RED}❌ Erro no agente: {e}{Colors.ENDC}")
+            time.sleep(10)  # Esperar um pouco antes de tentar novamente
 
 
 class DocumentationSystem:
@@ -902,9 +1277,15 @@ class DocumentationSystem:
             self.directory, 
             self.output_dir,
             self.interval,
-            self.claude
+            self.claude,
+            self.config.get('watch', False),
+            self.config.get('debounce', DEBOUNCE),
+            self.config.get('max_latency', MAX_LATENCY)
         )
-        self.server = DocumentationServer(self.output_dir, self.port)
+        self.server = DocumentationServer(self.output_dir, self.port,
+                                          self.config.get('workers', WORKERS),
+                                          self.config.get('timeout', TIMEOUT),
+                                          self.config.get('cache_control'))
     
     def check_environment(self) -> Dict[str, bool]:
         """
@@ -947,6 +1328,26 @@ class DocumentationSystem:
         
         return result
     
+    def update_documentation(self, files: Optional[List[str]] = None, full: bool = False) -> Dict[str, Any]:
+        """
+        Atualiza a documentação de forma incremental.
+        
+        Args:
+            files: Arquivos alterados (padrão: detectar pelo Git)
+            full: Força a geração completa
+            
+        Returns:
+            dict: Resultado da operação
+        """
+        return self.claude.update_documentation_incremental(
+            self.directory,
+            "HEAD",
+            self.output_dir,
+            files,
+            self.format,
+            full
+        )
+    
     def start_agent(self) -> bool:
         """
         Inicia o agente de manutenção.
@@ -1006,17 +1407,73 @@ class DocumentationSystem:
         """
         return self.claude.generate_code_with_docs(prompt, output_file, language)
     
-    def search_documentation(self, query: str) -> Dict[str, Any]:
+    def search_documentation(self, query: str, local: bool = False,
+                             limit: int = LIMITE_BUSCA, retrieval: bool = True) -> Dict[str, Any]:
         """
         Pesquisa na documentação.
         
         Args:
             query: A consulta de pesquisa
+            local: Usa só o índice de busca da documentação gerada, sem o Claude Code
+            limit: Número máximo de fontes na busca local
+            retrieval: Restringe o Claude Code aos arquivos escolhidos pelos índices locais
+            
+        Returns:
+            dict: Resultado da pesquisa (response e sources com file e relevance)
+        """
+        if not local and not retrieval:
+            return self.claude.query(query, self.directory)
+        if not local:
+            # Índices locais escolhem os arquivos; o Claude Code só sintetiza a resposta
+            return consulta_hibrida(query, self.directory, self.claude.query, saida=self.output_dir)
+
+        resultado = buscar(self.output_dir, query, limit)
+        if not resultado["success"]:
+            return resultado
+        return {
+            "response": f"{len(resultado['results'])} documento(s) encontrado(s) em {resultado['took_ms']} ms",
+            "sources": [{"file": item["file"], "relevance": item["relevance"],
+                         "title": item["title"], "snippet": item.get("snippet", "")}
+                        for item in resultado["results"]]
+        }
+    
+    def search_many(self, queries: List[str], retrieval: bool = True,
+                    concurrency: int = 4) -> List[Dict[str, Any]]:
+        """
+        Pesquisa várias perguntas concorrentemente com o Claude Code.
+        
+        As chamadas ao CLI rodam em um único event loop
+        (`AsyncClaudeCodeIntegration`, limitado por `concurrency`); só a
+        recuperação local de cada pergunta vai para o executor padrão, que
+        nunca fica esperando uma corrotina (ela também usa o executor para o
+        cache).
+        
+        Args:
+            queries: As consultas de pesquisa
+            retrieval: Restringe o Claude Code aos arquivos escolhidos pelos índices locais
+            concurrency: Máximo de processos claude-code simultâneos
             
         Returns:
-            dict: Resultado da pesquisa
+            list: Os resultados, na ordem das consultas
         """
-        return self.claude.query(query, self.directory)
+        claude = AsyncClaudeCodeIntegration(self.config, max_concurrency=concurrency)
+        
+        async def pesquisar() -> List[Dict[str, Any]]:
+            if not retrieval:
+                return await claude.query_many(queries, self.directory)
+            loop = asyncio.get_running_loop()
+            
+            async def pesquisar_uma(pergunta: str) -> Dict[str, Any]:
+                recuperacao = await loop.run_in_executor(
+                    None, recuperar, pergunta, self.directory, TOP_K, self.output_dir)
+                if not recuperacao["files"]:
+                    return await claude.query(pergunta, self.directory)
+                response = await claude.query(montar_pergunta(pergunta, recuperacao), recuperacao["directory"])
+                return anexar_fontes(response, recuperacao, self.directory)
+            
+            return await asyncio.gather(*(pesquisar_uma(q) for q in queries))
+        
+        return asyncio.run(pesquisar())
     
     def shutdown(self) -> None:
         """Encerra todos os componentes do sistema."""
@@ -1025,6 +1482,7 @@ class DocumentationSystem:
         
         self.stop_agent()
         self.stop_server()
+        self.claude.close()
 
 
 def print_welcome():
@@ -1059,6 +1517,9 @@ def print_help():
     --dir DIR               Diretório do projeto (padrão: diretório atual)
     --output OUTPUT         Diretório de saída (padrão: ./docs)
     --interval INTERVAL     Intervalo de verificação em segundos (padrão: 300)
+    --watch                 Reage a cada commit observando .git em vez de usar intervalo
+    --debounce SECONDS      Segundos sem commits antes de atualizar (padrão: 2)
+    --max-latency SECONDS   Espera máxima por uma atualização pendente (padrão: 30)
     
   {Colors.GREEN}stop-agent{Colors.ENDC}            Para o agente de manutenção de documentação
     
@@ -1081,7 +1542,7 @@ def print_help():
     --language LANGUAGE     Linguagem de programação (padrão: python)
     
   {Colors.GREEN}search{Colors.ENDC}                Pesquisa na documentação
-    --query QUERY           Consulta de pesquisa
+    --query QUERY           Consulta de pesquisa (repita para consultas simultâneas)
     --dir DIR               Diretório do projeto (padrão: diretório atual)
 
 {Colors.YELLOW}Exemplos:{Colors.ENDC}
@@ -1092,6 +1553,9 @@ def print_help():
   # Iniciar o agente de manutenção
   python doc40-completo.py start-agent --interval 600
   
+  # Iniciar o agente reagindo a cada commit
+  python doc40-completo.py start-agent --watch
+  
   # Iniciar o servidor de documentação
   python doc40-completo.py start-server --port 8080
   
@@ -1143,6 +1607,12 @@ def parse_args():
                              help='Diretório de saída (padrão: ./docs)')
     agent_parser.add_argument('--interval', type=int, default=300,
                              help='Intervalo de verificação em segundos (padrão: 300)')
+    agent_parser.add_argument('--watch', action='store_true',
+                             help='Reagir aos commits observando .git (inotify) em vez de usar intervalo')
+    agent_parser.add_argument('--debounce', type=float, default=DEBOUNCE,
+                             help=f'Segundos sem commits antes de atualizar (padrão: {DEBOUNCE:g})')
+    agent_parser.add_argument('--max-latency', type=float, default=MAX_LATENCY,
+                             help=f'Espera máxima por uma atualização pendente (padrão: {MAX_LATENCY:g})')
     
     # Comando: stop-agent
     subparsers.add_parser('stop-agent',
@@ -1155,6 +1625,12 @@ def parse_args():
                               help='Diretório da documentação (padrão: ./docs)')
     server_parser.add_argument('--port', type=int, default=8000,
                               help='Porta do servidor (padrão: 8000)')
+    server_parser.add_argument('--workers', type=int, default=WORKERS,
+                              help=f'Conexões atendidas ao mesmo tempo, 0 para uma thread por conexão (padrão: {WORKERS})')
+    server_parser.add_argument('--timeout', type=float, default=TIMEOUT,
+                              help=f'Tempo limite de conexões ociosas em segundos (padrão: {TIMEOUT:g})')
+    server_parser.add_argument('--cache-control', action='append', default=[], metavar='CHAVE=VALOR',
+                              help="Cache-Control por extensão, nome, 'hash' ou '*' (ex.: .html=no-cache)")
     
     # Comando: stop-server
     subparsers.add_parser('stop-server',
@@ -1167,6 +1643,12 @@ def parse_args():
                               help='Diretório do projeto (padrão: diretório atual)')
     update_parser.add_argument('--output', default='docs',
                               help='Diretório de saída (padrão: ./docs)')
+    update_parser.add_argument('--files', nargs='*',
+                              help='Arquivos alterados (padrão: detectar pelo Git)')
+    update_parser.add_argument('--full', action='store_true',
+                              help='Regenerar toda a documentação')
+    update_parser.add_argument('--hook', action='store_true',
+                              help='Execução pelo hook post-commit (não faz nada se o agente estiver rodando)')
     
     # Comando: setup-hooks
     hooks_parser = subparsers.add_parser('setup-hooks',
@@ -1187,10 +1669,18 @@ def parse_args():
     # Comando: search
     search_parser = subparsers.add_parser('search',
                                           help='Pesquisa na documentação')
-    search_parser.add_argument('--query', required=True,
-                              help='Consulta de pesquisa')
+    search_parser.add_argument('--query', required=True, action='append',
+                              help='Consulta de pesquisa (repita para várias consultas simultâneas)')
+    search_parser.add_argument('--concurrency', type=int, default=4,
+                              help='Consultas simultâneas ao Claude Code com várias --query (padrão: 4)')
     search_parser.add_argument('--dir', default=os.getcwd(),
                               help='Diretório do projeto (padrão: diretório atual)')
+    search_parser.add_argument('--local', action='store_true',
+                              help='Buscar só no índice da documentação gerada, sem o Claude Code')
+    search_parser.add_argument('--limit', type=int, default=LIMITE_BUSCA,
+                              help=f'Número máximo de resultados da busca local (padrão: {LIMITE_BUSCA})')
+    search_parser.add_argument('--no-retrieval', action='store_true',
+                              help='Consultar o projeto inteiro, sem restringir pelos índices locais')
     
     return parser.parse_args()
 
@@ -1251,7 +1741,10 @@ def main():
             config = {
                 'directory': args.dir,
                 'output_dir': os.path.join(args.dir, args.output),
-                'interval': args.interval
+                'interval': args.interval,
+                'watch': args.watch,
+                'debounce': args.debounce,
+                'max_latency': args.max_latency
             }
             system = DocumentationSystem(config)
             
@@ -1272,7 +1765,10 @@ def main():
             # Configurar o sistema
             config = {
                 'output_dir': args.output,
-                'port': args.port
+                'port': args.port,
+                'workers': args.workers or None,
+                'timeout': args.timeout,
+                'cache_control': ler_politicas_cache(args.cache_control)
             }
             system = DocumentationSystem(config)
             
@@ -1306,8 +1802,11 @@ def main():
             # Verificar ambiente
             system.check_environment()
             
-            # Gerar documentação inicial
-            system.generate_initial_documentation()
+            # Regenerar só o que mudou, agrupando com atualizações concorrentes
+            if args.hook and agente_em_execucao(args.dir):
+                print(f"{Colors.BLUE}ℹ️ Agente em execução; ele fará a atualização{Colors.ENDC}")
+            elif executar_agrupado(args.dir, lambda: system.update_documentation(args.files, args.full)) is None:
+                print(f"{Colors.BLUE}ℹ️ Atualização já em andamento; este commit será incluído nela{Colors.ENDC}")
         
         elif args.command == 'setup-hooks':
             # Configurar o sistema
@@ -1348,18 +1847,30 @@ def main():
             }
             system = DocumentationSystem(config)
             
-            # Verificar ambiente
-            system.check_environment()
+            # Verificar ambiente (a busca local não usa o Claude Code)
+            if not args.local:
+                system.check_environment()
             
-            # Pesquisar na documentação
-            result = system.search_documentation(args.query)
+            # Pesquisar na documentação (várias consultas ao Claude Code rodam juntas)
+            if len(args.query) > 1 and not args.local:
+                results = system.search_many(args.query, retrieval=not args.no_retrieval,
+                                             concurrency=args.concurrency)
+            else:
+                results = [system.search_documentation(query, local=args.local, limit=args.limit,
+                                                       retrieval=not args.no_retrieval)
+                           for query in args.query]
             
-            if 'error' not in result:
-                print(f"\n{Colors.GREEN}=== Resposta para: {args.query} ==={Colors.ENDC}")
-                print(result.get("response", "Sem resposta"))
-                print(f"\n{Colors.BLUE}Fontes:{Colors.ENDC}")
-                for source in result.get("sources", []):
-                    print(f"- {source.get('file')} (relevância: {source.get('relevance', 'N/A')})")
+            for query, result in zip(args.query, results):
+                if 'error' not in result:
+                    print(f"\n{Colors.GREEN}=== Resposta para: {query} ==={Colors.ENDC}")
+                    print(result.get("response", "Sem resposta"))
+                    print(f"\n{Colors.BLUE}Fontes:{Colors.ENDC}")
+                    for source in result.get("sources", []):
+                        print(f"- {source.get('file')} (relevância: {source.get('relevance', 'N/A')})")
+                        if source.get("snippet"):
+                            print(f"    {source['snippet']}")
+                elif args.local or len(args.query) > 1:
+                    print(f"{Colors.RED}❌ {query}: {result.get('message', result['error'])}{Colors.ENDC}")
         
         else:
             # Comando não especificado, mostrar ajuda resumida
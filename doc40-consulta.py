@@ -9,11 +9,21 @@ permitindo que os desenvolvedores façam perguntas em linguagem natural sobre o
 
 import os
 import sys
+import csv
 import json
+import time
 import argparse
 import subprocess
+import threading
 import logging
-from typing import Dict, Any, Optional, List
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, Optional, List, TextIO
+
+from doc40_ambiente import sondar_ambiente
+from doc40_pool import ClaudeCodeWorkerPool
+from doc40_cache import QueryCache, DEFAULT_BACKEND, MEMORY_CACHE, normalizar_pergunta
+from doc40_semantico import abrir_cache_semantico, SemanticCache
+from doc40_recuperacao import consulta_hibrida
 
 # Configuração de logging
 logging.basicConfig(
@@ -40,26 +50,23 @@ def verificar_claude_code() -> bool:
     Returns:
         bool: True se estiver instalado, False caso contrário
     """
-    try:
-        result = subprocess.run(
-            ["claude-code", "--version"], 
-            capture_output=True, 
-            text=True
-        )
-        if result.returncode == 0:
-            version = result.stdout.strip()
-            logger.info(f"Claude Code instalado: {version}")
-            return True
+    ambiente = sondar_ambiente()
+    if ambiente["installed"]:
+        if ambiente["version"]:
+            logger.info(f"Claude Code instalado: {ambiente['version']}")
         else:
             logger.warning("Claude Code instalado, mas não foi possível obter a versão")
-            return True
-    except Exception as e:
-        logger.error(f"Claude Code não está instalado ou não está no PATH: {e}")
-        print(f"\n{Colors.RED}Claude Code CLI não encontrado. Por favor, instale:"+
-              f"\n\ncurl -sSL https://raw.githubusercontent.com/anthropic/claude-code/main/install.sh | bash{Colors.ENDC}\n")
-        return False
+        return True
+    
+    logger.error("Claude Code não está instalado ou não está no PATH")
+    print(f"\n{Colors.RED}Claude Code CLI não encontrado. Por favor, instale:"+
+          f"\n\ncurl -sSL https://raw.githubusercontent.com/anthropic/claude-code/main/install.sh | bash{Colors.ENDC}\n")
+    return False
 
-def consultar_codigo(pergunta: str, diretorio: str, formato: str = "text", cache: bool = True) -> Dict[str, Any]:
+def consultar_codigo(pergunta: str, diretorio: str, formato: str = "text", cache: bool = True,
+                     pool: Optional[ClaudeCodeWorkerPool] = None,
+                     cache_backend: str = DEFAULT_BACKEND,
+                     limiar_semantico: float = 0.0, recuperacao: bool = True) -> Dict[str, Any]:
     """
     Consulta o código usando Claude Code com busca agêntica avançada.
     
@@ -71,6 +78,12 @@ def consultar_codigo(pergunta: str, diretorio: str, formato: str = "text", cache
         diretorio: O diretório do projeto a ser consultado
         formato: O formato da saída (text, json, markdown)
         cache: Se deve usar cache para consultas (padrão: True)
+        pool: Pool de workers persistentes (padrão: um processo por consulta)
+        cache_backend: Backend do cache (sqlite, json)
+        limiar_semantico: Similaridade mínima (0 a 1) para reaproveitar a resposta
+            de uma pergunta semelhante (0: cache semântico desativado)
+        recuperacao: Se deve escolher os arquivos relevantes nos índices locais
+            antes de chamar o Claude Code (padrão: True)
         
     Returns:
         dict: A resposta processada contendo informações e fontes
@@ -84,34 +97,80 @@ def consultar_codigo(pergunta: str, diretorio: str, formato: str = "text", cache
         print(f"{Colors.RED}❌ Diretório não encontrado: {diretorio}{Colors.ENDC}")
         return {"error": "DirectoryNotFound", "message": f"Diretório não encontrado: {diretorio}"}
     
-    # Criar diretório de cache se não existir e cache estiver ativado
-    cache_dir = os.path.join(diretorio, ".doc40", "cache", "queries")
-    cache_file = None
+    # Cache endereçado pela pergunta, diretório, estado do repositório e formato
+    query_cache = None
+    cache_key = None
+    semantic = None
     
     if cache:
-        os.makedirs(cache_dir, exist_ok=True)
-        # Hash da pergunta para nome do arquivo de cache
-        import hashlib
-        question_hash = hashlib.md5(pergunta.encode()).hexdigest()
-        cache_file = os.path.join(cache_dir, f"{question_hash}.json")
+        query_cache = QueryCache(diretorio, backend=cache_backend)
+        cache_key = query_cache.key(pergunta, formato)
+        response = query_cache.get(cache_key)
+        if response is not None:
+            logger.info(f"Usando resposta em cache para: {pergunta}")
+            print(f"{Colors.GREEN}✓ Usando resposta em cache{Colors.ENDC}")
+            
+            # Exibir a resposta
+            _exibir_resposta(response, pergunta, formato)
+            
+            return response
         
-        # Verificar se existe cache válido (menos de 24h)
-        if os.path.exists(cache_file):
-            file_time = os.path.getmtime(cache_file)
-            import time
-            if time.time() - file_time < 86400:  # 24 horas
-                try:
-                    with open(cache_file, 'r') as f:
-                        response = json.load(f)
-                    logger.info(f"Usando resposta em cache para: {pergunta}")
-                    print(f"{Colors.GREEN}✓ Usando resposta em cache{Colors.ENDC}")
-                    
-                    # Exibir a resposta
-                    _exibir_resposta(response, pergunta, formato)
-                    
-                    return response
-                except Exception as e:
-                    logger.error(f"Erro ao ler cache: {e}")
+        # Procurar uma pergunta semelhante já respondida
+        if limiar_semantico > 0:
+            semantic = abrir_cache_semantico(diretorio)
+        if semantic is not None:
+            response = semantic.get(pergunta, query_cache, formato, limiar_semantico)
+            if response is not None:
+                similaridade = response["semantic_cache"]["similarity"]
+                logger.info(f"Usando resposta de pergunta semelhante para: {pergunta}")
+                print(f"{Colors.GREEN}✓ Usando resposta em cache de pergunta semelhante: "
+                      f"\"{response['semantic_cache']['matched_question']}\" "
+                      f"(similaridade: {similaridade:.2f}){Colors.ENDC}")
+                
+                _exibir_resposta(response, pergunta, formato)
+                
+                return response
+    
+    # Executar a consulta (worker persistente ou processo avulso)
+    response = _executar_consulta(pergunta, diretorio, pool, recuperacao)
+    if "error" in response:
+        print(f"{Colors.RED}❌ Erro: {response.get('message')}{Colors.ENDC}")
+        return response
+    
+    # Salvar no cache se ativado
+    _armazenar_resposta(response, pergunta, formato, query_cache, cache_key, semantic)
+    
+    # Exibir a resposta
+    _exibir_resposta(response, pergunta, formato)
+    
+    return response
+
+def _executar_consulta(pergunta: str, diretorio: str,
+                       pool: Optional[ClaudeCodeWorkerPool] = None,
+                       recuperacao: bool = False) -> Dict[str, Any]:
+    """
+    Executa uma consulta no Claude Code, sem cache e sem exibir nada.
+    
+    Args:
+        pergunta: A pergunta em linguagem natural
+        diretorio: O diretório do projeto
+        pool: Pool de workers persistentes (padrão: um processo por consulta)
+        recuperacao: Se deve restringir a consulta aos arquivos escolhidos
+            pelos índices locais (fontes com relevância vindas do índice)
+        
+    Returns:
+        dict: A resposta do Claude Code ou um dicionário com a chave "error"
+    """
+    if recuperacao:
+        return consulta_hibrida(pergunta, diretorio,
+                                lambda texto, escopo: _executar_consulta(texto, escopo, pool))
+    
+    # Usar um worker persistente quando houver pool
+    if pool is not None:
+        response = pool.query(diretorio, pergunta)
+        if "error" in response:
+            logger.error(f"Erro ao executar consulta no pool: {response.get('message')}")
+        return response
     
     # Comando para o Claude Code CLI
     command = [
@@ -129,30 +188,37 @@ def consultar_codigo(pergunta: str, diretorio: str, formato: str = "text", cache
         # Processar a resposta
         if result.returncode == 0:
             try:
-                response = json.loads(result.stdout)
-                
-                # Salvar no cache se ativado
-                if cache and cache_file:
-                    with open(cache_file, 'w') as f:
-                        json.dump(response, f)
-                
-                # Exibir a resposta
-                _exibir_resposta(response, pergunta, formato)
-                
-                return response
+                return json.loads(result.stdout)
             except json.JSONDecodeError as e:
                 logger.error(f"Erro ao processar resposta JSON: {e}")
-                print(f"{Colors.RED}❌ Erro ao processar a resposta{Colors.ENDC}")
-                return {"error": "JSONDecodeError", "message": str(e)}
+                return {"error": "JSONDecodeError", "message": f"Erro ao processar a resposta: {e}"}
         else:
             logger.error(f"Erro ao executar consulta: {result.stderr}")
-            print(f"{Colors.RED}❌ Erro: {result.stderr}{Colors.ENDC}")
             return {"error": "CommandError", "message": result.stderr}
     except Exception as e:
         logger.error(f"Exceção ao executar consulta: {e}")
-        print(f"{Colors.RED}❌ Exceção: {str(e)}{Colors.ENDC}")
         return {"error": "Exception", "message": str(e)}
 
+def _armazenar_resposta(response: Dict[str, Any], pergunta: str, formato: str,
+                        query_cache: Optional[QueryCache], cache_key: Optional[str],
+                        semantic: Optional[SemanticCache]) -> None:
+    """
+    Armazena uma resposta nova no cache exato e a indexa no cache semântico.
+    
+    Args:
+        response: A resposta da consulta
+        pergunta: A pergunta original
+        formato: O formato da saída
+        query_cache: O cache exato (None se desativado)
+        cache_key: A chave da consulta no cache exato
+        semantic: O cache semântico (None se desativado)
+    """
+    if query_cache is None:
+        return
+    query_cache.set(cache_key, response, pergunta)
+    if semantic is not None:
+        semantic.add(pergunta, cache_key, formato)
+
 def _exibir_resposta(response: Dict[str, Any], pergunta: str, formato: str = "text") -> None:
     """
     Exibe a resposta da consulta no formato especificado.
@@ -189,8 +255,23 @@ def _exibir_resposta(response: Dict[str, Any], pergunta: str, formato: str = "te
         relevancia = fonte.get("relevance", "N/A")
         relevancia_formatada = relevancia if isinstance(relevancia, str) else f"{relevancia:.2f}"
         print(f"- {fonte.get('file')} (relevância: {relevancia_formatada})")
+    
+    recuperacao = response.get("retrieval")
+    if recuperacao:
+        print(f"{Colors.BLUE}Recuperação local:{Colors.ENDC} {recuperacao['files']} arquivo(s) em "
+              f"{recuperacao['took_ms']} ms, escopo {recuperacao['directory']}")
 
-def modo_interativo(diretorio: str, formato: str = "text", cache: bool = True) -> None:
+def _exibir_estatisticas_cache() -> None:
+    """Exibe os contadores da camada de cache em memória."""
+    stats = MEMORY_CACHE.stats()
+    print(f"{Colors.BLUE}Cache em memória:{Colors.ENDC} {stats['entries']} entradas, "
+          f"{stats['bytes'] / 1024:.1f} KB | acertos: {stats['hits']} | "
+          f"falhas: {stats['misses']} | descartes: {stats['evictions']}")
+
+def modo_interativo(diretorio: str, formato: str = "text", cache: bool = True,
+                    pool: Optional[ClaudeCodeWorkerPool] = None,
+                    cache_backend: str = DEFAULT_BACKEND,
+                    limiar_semantico: float = 0.0, recuperacao: bool = True) -> None:
     """
     Inicia um modo interativo para consultas contínuas.
     
@@ -198,9 +279,13 @@ def modo_interativo(diretorio: str, formato: str = "text", cache: bool = True) -
         diretorio: O diretório do projeto
         formato: O formato da saída
         cache: Se deve usar cache
+        pool: Pool de workers persistentes (opcional)
+        cache_backend: Backend do cache (sqlite, json)
+        limiar_semantico: Similaridade mínima do cache semântico (0: desativado)
+        recuperacao: Se deve usar a recuperação local antes do Claude Code
     """
     print(f"\n{Colors.BOLD}=== Modo Interativo de Consulta à Documentação ==={Colors.ENDC}")
-    print(f"Digite suas perguntas ou 'sair' para encerrar.")
+    print(f"Digite suas perguntas, 'cache' para ver as estatísticas do cache ou 'sair' para encerrar.")
     print(f"Diretório: {diretorio}")
     
     try:
@@ -209,13 +294,178 @@ def modo_interativo(diretorio: str, formato: str = "text", cache: bool = True) -
             if pergunta.lower() in ['sair', 'exit', 'quit', 'q']:
                 break
             
+            if pergunta.strip().lower() == 'cache':
+                _exibir_estatisticas_cache()
+                continue
+            
             if not pergunta.strip():
                 continue
                 
-            consultar_codigo(pergunta, diretorio, formato, cache)
+            consultar_codigo(pergunta, diretorio, formato, cache, pool, cache_backend, limiar_semantico,
+                             recuperacao)
     except KeyboardInterrupt:
         print("\nModo interativo encerrado.")
 
+def _ler_perguntas_lote(arquivo: str) -> List[str]:
+    """
+    Lê as perguntas de um arquivo de lote.
+    
+    Formatos aceitos:
+        - JSONL: uma string ou um objeto com "question", "pergunta" ou "query" por linha
+        - JSON: uma lista de strings ou de objetos como os do JSONL
+        - CSV: coluna "question", "pergunta" ou "query" (ou a primeira coluna)
+        - Texto: uma pergunta por linha
+    
+    Args:
+        arquivo: Caminho do arquivo
+        
+    Returns:
+        list: As perguntas, na ordem do arquivo
+        
+    Raises:
+        ValueError: Se o arquivo não puder ser lido ou tiver conteúdo inválido
+            (com o número da linha)
+    """
+    campos = ("question", "pergunta", "query")
+    perguntas = []
+    
+    def extrair(item: Any) -> None:
+        if isinstance(item, dict):
+            item = next((item[c] for c in campos if c in item), None)
+        if item:
+            perguntas.append(str(item))
+    
+    try:
+        with open(arquivo, 'r', newline='') as f:
+            if arquivo.endswith('.csv'):
+                leitor = csv.reader(f)
+                try:
+                    linhas = list(leitor)
+                except csv.Error as e:
+                    raise ValueError(f"{arquivo}, linha {leitor.line_num}: CSV inválido ({e})")
+                if not linhas:
+                    return []
+                cabecalho = [c.strip().lower() for c in linhas[0]]
+                coluna = next((cabecalho.index(c) for c in campos if c in cabecalho), None)
+                if coluna is None:
+                    coluna = 0
+                else:
+                    linhas = linhas[1:]
+                perguntas = [linha[coluna] for linha in linhas if len(linha) > coluna]
+            elif arquivo.endswith('.json'):
+                try:
+                    itens = json.load(f)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"{arquivo}, linha {e.lineno}: JSON inválido ({e.msg})")
+                if not isinstance(itens, list):
+                    raise ValueError(f"{arquivo}: o arquivo .json deve conter uma lista de perguntas")
+                for item in itens:
+                    extrair(item)
+            else:
+                for numero, linha in enumerate(f, 1):
+                    linha = linha.strip()
+                    if not linha:
+                        continue
+                    if arquivo.endswith('.jsonl'):
+                        try:
+                            extrair(json.loads(linha))
+                        except json.JSONDecodeError as e:
+                            raise ValueError(f"{arquivo}, linha {numero}: JSON inválido ({e.msg})")
+                    else:
+                        perguntas.append(linha)
+    except OSError as e:
+        raise ValueError(f"Não foi possível ler o arquivo de lote: {e}")
+    
+    return [p.strip() for p in perguntas if p and p.strip()]
+
+def consultar_lote(arquivo: str, diretorio: str, saida: TextIO, concorrencia: int = 4,
+                   cache: bool = True, pool: Optional[ClaudeCodeWorkerPool] = None,
+                   cache_backend: str = DEFAULT_BACKEND, recuperacao: bool = True) -> Dict[str, Any]:
+    """
+    Responde um lote de perguntas com execução concorrente.
+    
+    Perguntas repetidas (após normalização) são consultadas uma única vez,
+    acertos de cache são emitidos imediatamente e as demais são executadas
+    em até `concorrencia` consultas simultâneas. Cada resultado é escrito
+    em `saida` como uma linha JSON assim que fica pronto.
+    
+    Args:
+        arquivo: Arquivo com as perguntas (JSONL, JSON, CSV ou texto)
+        diretorio: O diretório do projeto
+        saida: Destino das linhas JSONL de resultado
+        concorrencia: Número máximo de consultas simultâneas
+        cache: Se deve usar cache
+        pool: Pool de workers persistentes (opcional)
+        cache_backend: Backend do cache (sqlite, json)
+        recuperacao: Se deve usar a recuperação local antes do Claude Code
+        
+    Returns:
+        dict: Estatísticas do lote
+    """
+    inicio = time.perf_counter()
+    
+    # Agrupar perguntas equivalentes
+    grupos: Dict[str, List[str]] = {}
+    perguntas = _ler_perguntas_lote(arquivo)
+    for pergunta in perguntas:
+        grupos.setdefault(normalizar_pergunta(pergunta), []).append(pergunta)
+    
+    stats = {"questions": len(perguntas), "unique": len(grupos), "cached": 0, "executed": 0, "errors": 0}
+    lock_saida = threading.Lock()
+    
+    def emitir(variantes: List[str], response: Dict[str, Any], cached: bool, segundos: float) -> None:
+        registro = {
+            "question": variantes[0],
+            "duplicates": variantes[1:],
+            "cached": cached,
+            "seconds": round(segundos, 4)
+        }
+        if "error" in response:
+            registro["error"] = response["error"]
+            registro["message"] = response.get("message")
+        else:
+            registro["response"] = response
+        with lock_saida:
+            saida.write(json.dumps(registro, ensure_ascii=False) + "\n")
+            saida.flush()
+    
+    query_cache = QueryCache(diretorio, backend=cache_backend) if cache else None
+    
+    # Servir acertos de cache imediatamente
+    pendentes = []
+    for variantes in grupos.values():
+        t0 = time.perf_counter()
+        chave = query_cache.key(variantes[0]) if query_cache else None
+        response = query_cache.get(chave) if query_cache else None
+        if response is not None:
+            stats["cached"] += 1
+            emitir(variantes, response, True, time.perf_counter() - t0)
+        else:
+            pendentes.append((variantes, chave))
+    
+    logger.info(f"Lote: {stats['unique']} perguntas únicas, {stats['cached']} em cache, "
+                f"{len(pendentes)} a executar com concorrência {concorrencia}")
+    
+    def executar(variantes: List[str], chave: Optional[str]) -> tuple:
+        t0 = time.perf_counter()
+        response = _executar_consulta(variantes[0], diretorio, pool, recuperacao)
+        if query_cache is not None and "error" not in response:
+            query_cache.set(chave, response, variantes[0])
+        return variantes, response, time.perf_counter() - t0
+    
+    # Executar as demais, emitindo na ordem em que terminam
+    with ThreadPoolExecutor(max_workers=max(1, concorrencia)) as executor:
+        futuros = [executor.submit(executar, variantes, chave) for variantes, chave in pendentes]
+        for futuro in as_completed(futuros):
+            variantes, response, segundos = futuro.result()
+            stats["executed"] += 1
+            if "error" in response:
+                stats["errors"] += 1
+            emitir(variantes, response, False, segundos)
+    
+    stats["seconds"] = round(time.perf_counter() - inicio, 4)
+    return stats
+
 def main():
     """Função principal do script."""
     parser = argparse.ArgumentParser(
@@ -233,6 +483,21 @@ def main():
                         help="Desativar cache de consultas")
     parser.add_argument("--interactive", "-i", action="store_true",
                         help="Iniciar modo interativo para consultas contínuas")
+    parser.add_argument("--cache-backend", type=str, choices=["sqlite", "json"],
+                        default=DEFAULT_BACKEND, help="Backend do cache de consultas")
+    parser.add_argument("--semantic-threshold", type=float, default=0.0,
+                        help="Similaridade mínima (0 a 1) para reaproveitar respostas de perguntas "
+                             "semelhantes; 0 desativa o cache semântico (requer NumPy)")
+    parser.add_argument("--batch", "-b", type=str,
+                        help="Arquivo com perguntas em lote (JSONL, lista JSON, CSV ou uma por linha)")
+    parser.add_argument("--batch-output", "-o", type=str,
+                        help="Arquivo JSONL de resultados do lote (padrão: saída padrão)")
+    parser.add_argument("--concurrency", "-c", type=int, default=4,
+                        help="Número máximo de consultas simultâneas no modo lote")
+    parser.add_argument("--workers", "-w", type=int, default=0,
+                        help="Número de workers claude-code persistentes (0: um processo por consulta)")
+    parser.add_argument("--no-retrieval", action="store_true",
+                        help="Não usar os índices locais para restringir o contexto do Claude Code")
     
     args = parser.parse_args()
     
@@ -240,15 +505,44 @@ def main():
     if not verificar_claude_code():
         return 1
     
-    # Executar no modo interativo ou com uma única consulta
-    if args.interactive:
-        modo_interativo(args.dir, args.format, not args.no_cache)
-    elif args.query:
-        consultar_codigo(args.query, args.dir, args.format, not args.no_cache)
-    else:
-        parser.print_help()
-        print(f"\n{Colors.YELLOW}⚠️ Forneça uma pergunta ou use o modo interativo.{Colors.ENDC}")
-        return 1
+    # Workers persistentes evitam a inicialização do CLI a cada pergunta
+    pool = ClaudeCodeWorkerPool(args.workers) if args.workers > 0 else None
+    
+    try:
+        # Executar em lote, no modo interativo ou com uma única consulta
+        if args.batch:
+            try:
+                saida = open(args.batch_output, 'w') if args.batch_output else sys.stdout
+            except OSError as e:
+                print(f"{Colors.RED}❌ Não foi possível abrir o arquivo de saída: {e}{Colors.ENDC}",
+                      file=sys.stderr)
+                return 1
+            try:
+                stats = consultar_lote(args.batch, args.dir, saida, args.concurrency,
+                                       not args.no_cache, pool, args.cache_backend, not args.no_retrieval)
+            except ValueError as e:
+                print(f"{Colors.RED}❌ {e}{Colors.ENDC}", file=sys.stderr)
+                return 1
+            finally:
+                if saida is not sys.stdout:
+                    saida.close()
+            print(f"{Colors.GREEN}✅ Lote concluído: {stats['questions']} perguntas, "
+                  f"{stats['unique']} únicas, {stats['cached']} em cache, "
+                  f"{stats['executed']} executadas ({stats['errors']} erros) "
+                  f"em {stats['seconds']:.2f}s{Colors.ENDC}", file=sys.stderr)
+        elif args.interactive:
+            modo_interativo(args.dir, args.format, not args.no_cache, pool, args.cache_backend,
+                            args.semantic_threshold, not args.no_retrieval)
+        elif args.query:
+            consultar_codigo(args.query, args.dir, args.format, not args.no_cache, pool, args.cache_backend,
+                             args.semantic_threshold, not args.no_retrieval)
+        else:
+            parser.print_help()
+            print(f"\n{Colors.YELLOW}⚠️ Forneça uma pergunta ou use o modo interativo.{Colors.ENDC}")
+            return 1
+    finally:
+        if pool is not None:
+            pool.close()
     
     return 0
 
@@ -11,11 +11,16 @@ import os
 import sys
 import json
 import argparse
-import subprocess
 import logging
-from typing import Dict, Any, Optional, List, Union, Tuple
+from typing import Dict, Any, Optional, List, Union, Tuple, Callable
 from datetime import datetime
 
+from doc40_ambiente import sondar_ambiente
+from doc40_stream import executar_com_progresso, progresso_console
+from doc40_compressao import comprimir_diretorio
+from doc40_incremental import FILES_PER_CALL
+from doc40_referencia import gerar_referencia
+
 # Configuração de logging
 logging.basicConfig(
     level=logging.INFO,
@@ -41,38 +46,35 @@ def verificar_claude_code() -> bool:
     Returns:
         bool: True se estiver instalado, False caso contrário
     """
-    try:
-        result = subprocess.run(
-            ["claude-code", "--version"], 
-            capture_output=True, 
-            text=True
-        )
-        if result.returncode == 0:
-            version = result.stdout.strip()
-            logger.info(f"Claude Code instalado: {version}")
-            return True
+    ambiente = sondar_ambiente()
+    if ambiente["installed"]:
+        if ambiente["version"]:
+            logger.info(f"Claude Code instalado: {ambiente['version']}")
         else:
             logger.warning("Claude Code instalado, mas não foi possível obter a versão")
-            return True
-    except Exception as e:
-        logger.error(f"Claude Code não está instalado ou não está no PATH: {e}")
-        print(f"\n{Colors.RED}Claude Code CLI não encontrado. Por favor, instale:"+
-              f"\n\ncurl -sSL https://raw.githubusercontent.com/anthropic/claude-code/main/install.sh | bash{Colors.ENDC}\n")
-        return False
+        return True
+    
+    logger.error("Claude Code não está instalado ou não está no PATH")
+    print(f"\n{Colors.RED}Claude Code CLI não encontrado. Por favor, instale:"+
+          f"\n\ncurl -sSL https://raw.githubusercontent.com/anthropic/claude-code/main/install.sh | bash{Colors.ENDC}\n")
+    return False
 
 def gerar_documentacao(diretorio: str, formato: str = "markdown", 
-                     saida: str = "docs", escopo: str = "all") -> Dict[str, Any]:
+                     saida: str = "docs", escopo: str = "all",
+                     progresso: Optional[Callable[[Dict[str, Any]], None]] = progresso_console) -> Dict[str, Any]:
     """
     Gera documentação completa a partir do código-fonte.
     
     Esta função utiliza o Claude Code CLI para analisar o código-fonte e
-    gerar documentação estruturada no formato especificado.
+    gerar documentação estruturada no formato especificado. A saída do CLI
+    é acompanhada em tempo real e gravada em `<saida>/progresso.log`.
     
     Args:
         diretorio: Diretório do projeto
         formato: Formato da documentação (markdown, html, pdf)
         saida: Diretório de saída para a documentação
         escopo: Escopo da documentação (all, api, internal, public)
+        progresso: Callback chamado com cada evento de progresso (None desativa)
         
     Returns:
         dict: Resultado da operação com detalhes e estatísticas
@@ -127,14 +129,14 @@ def gerar_documentacao(diretorio: str, formato: str = "markdown",
     # Executar o comando
     try:
         print(f"\n{Colors.YELLOW}Analisando o código-fonte...{Colors.ENDC}")
-        result = subprocess.run(base_command, capture_output=True, text=True)
+        result = executar_com_progresso(base_command, progresso, os.path.join(saida, "progresso.log"))
         
         # Registrar fim
         fim = datetime.now()
         duracao = (fim - inicio).total_seconds()
         
         # Verificar resultado
-        if result.returncode == 0:
+        if result["returncode"] == 0:
             logger.info(f"Documentação gerada com sucesso em: {saida}")
             print(f"\n{Colors.GREEN}✅ Documentação gerada com sucesso em: {saida}{Colors.ENDC}")
             print(f"{Colors.BLUE}⏱️ Tempo de execução: {duracao:.2f} segundos{Colors.ENDC}")
@@ -151,6 +153,9 @@ def gerar_documentacao(diretorio: str, formato: str = "markdown",
             for arquivo in sorted(arquivos_gerados):
                 print(f"  - {arquivo}")
             
+            # Cópias .gz/.br servidas diretamente pelo servidor da documentação
+            compressao = comprimir_diretorio(saida)
+            
             # Registrar a geração no log
             log_file = os.path.join(saida, "geracoes.log")
             with open(log_file, "a") as f:
@@ -164,17 +169,19 @@ def gerar_documentacao(diretorio: str, formato: str = "markdown",
                 "output_dir": saida,
                 "format": formato,
                 "duration_seconds": duracao,
+                "files_analyzed": len(result["analyzed"]),
                 "files_generated": len(arquivos_gerados),
-                "file_list": arquivos_gerados
+                "file_list": arquivos_gerados,
+                "compressed_files": compressao.get("written", 0)
             }
         else:
-            logger.error(f"Erro ao gerar documentação: {result.stderr}")
+            logger.error(f"Erro ao gerar documentação: {result['stderr']}")
             print(f"\n{Colors.RED}❌ Erro ao gerar documentação:{Colors.ENDC}")
-            print(result.stderr)
+            print(result["stderr"])
             return {
                 "success": False,
                 "error": "GenerationError",
-                "message": result.stderr,
+                "message": result["stderr"],
                 "duration_seconds": duracao
             }
     except Exception as e:
@@ -191,18 +198,119 @@ def gerar_documentacao(diretorio: str, formato: str = "markdown",
             "duration_seconds": duracao
         }
 
+def gerar_documentacao_local(diretorio: str, formato: str = "markdown",
+                             saida: str = "docs", escopo: str = "all",
+                             prosa: bool = False, workers: Optional[int] = None,
+                             progresso: Optional[Callable[[Dict[str, Any]], None]] = progresso_console) -> Dict[str, Any]:
+    """
+    Gera a referência da API localmente, a partir das docstrings.
+    
+    As classes, funções e métodos são lidos com `ast` e as docstrings no
+    estilo Google viram páginas Markdown ou HTML, em vários processos e sem
+    chamar o Claude Code. Com `prosa`, o Claude Code é chamado só para os
+    módulos sem docstring ou com símbolos sem docstring, e o texto gerado
+    fica em `<saida>/prosa`.
+    
+    Args:
+        diretorio: Diretório do projeto
+        formato: Formato da documentação (markdown, html)
+        saida: Diretório de saída para a documentação
+        escopo: Escopo da documentação (all, api, internal, public)
+        prosa: Gera com o Claude Code o texto dos módulos sem docstrings
+        workers: Processos para a análise e a renderização
+        progresso: Callback chamado com cada evento de progresso do Claude Code
+        
+    Returns:
+        dict: Resultado da operação com detalhes e estatísticas
+    """
+    logger.info(f"Gerando referência local para: {diretorio}")
+    print(f"\n{Colors.BLUE}🚀 Gerando referência da API (local) para: {diretorio}{Colors.ENDC}")
+    print(f"{Colors.BLUE}📄 Formato: {formato}{Colors.ENDC}")
+    print(f"{Colors.BLUE}📂 Saída: {saida}{Colors.ENDC}")
+    
+    inicio = datetime.now()
+    resultado = gerar_referencia(diretorio, saida, formato, escopo, workers)
+    if not resultado["success"]:
+        logger.error(resultado["message"])
+        print(f"{Colors.RED}❌ {resultado['message']}{Colors.ENDC}")
+        return resultado
+    
+    print(f"\n{Colors.GREEN}✅ Referência gerada em: {os.path.join(saida, 'referencia')}{Colors.ENDC}")
+    print(f"{Colors.BLUE}📄 {resultado['modules']} módulos, {resultado['symbols']} símbolos "
+          f"({resultado['written']} páginas gravadas, {resultado['unchanged']} inalteradas){Colors.ENDC}")
+    for arquivo in resultado["errors"]:
+        print(f"{Colors.YELLOW}⚠️ Não foi possível analisar: {arquivo}{Colors.ENDC}")
+    
+    # Texto do Claude Code só para o que as docstrings não cobrem
+    sem_docstring = sorted(resultado["undocumented"])
+    prosa_gerada: List[str] = []
+    if prosa and sem_docstring:
+        print(f"\n{Colors.YELLOW}Gerando texto para {len(sem_docstring)} módulos sem docstrings...{Colors.ENDC}")
+        saida_prosa = os.path.join(saida, "prosa")
+        os.makedirs(saida_prosa, exist_ok=True)
+        for inicio_lote in range(0, len(sem_docstring), FILES_PER_CALL):
+            lote = sem_docstring[inicio_lote:inicio_lote + FILES_PER_CALL]
+            comando = ["claude-code", "document", "--directory", diretorio, "--format", formato,
+                       "--output-dir", saida_prosa, "--scope", escopo, "--files", *lote]
+            execucao = executar_com_progresso(comando, progresso, os.path.join(saida, "progresso.log"))
+            if execucao["returncode"] != 0:
+                logger.error(f"Erro ao gerar o texto dos módulos: {execucao['stderr']}")
+                print(f"\n{Colors.RED}❌ Erro ao gerar o texto dos módulos:{Colors.ENDC}")
+                print(execucao["stderr"])
+                return {
+                    "success": False,
+                    "error": "GenerationError",
+                    "message": execucao["stderr"],
+                    "duration_seconds": (datetime.now() - inicio).total_seconds()
+                }
+            prosa_gerada.extend(os.path.join("prosa", escrito) for escrito in execucao["written"])
+    elif sem_docstring:
+        print(f"{Colors.YELLOW}ℹ️ {len(sem_docstring)} módulos sem docstring completa "
+              f"(use --prosa para gerar o texto com o Claude Code){Colors.ENDC}")
+    
+    duracao = (datetime.now() - inicio).total_seconds()
+    print(f"{Colors.BLUE}⏱️ Tempo de execução: {duracao:.2f} segundos{Colors.ENDC}")
+    
+    # Cópias .gz/.br servidas diretamente pelo servidor da documentação
+    compressao = comprimir_diretorio(saida)
+    
+    # Registrar a geração no log
+    log_file = os.path.join(saida, "geracoes.log")
+    with open(log_file, "a") as f:
+        f.write(f"{inicio.strftime('%Y-%m-%d %H:%M:%S')} - Referência local em formato {formato}\n")
+        f.write(f"  Duração: {duracao:.2f} segundos\n")
+        f.write(f"  Módulos: {resultado['modules']} ({resultado['written']} páginas gravadas)\n")
+        f.write(f"  Texto gerado pelo Claude Code: {len(prosa_gerada)} arquivos\n")
+        f.write("\n")
+    
+    return {
+        "success": True,
+        "output_dir": saida,
+        "format": formato,
+        "duration_seconds": duracao,
+        "files_analyzed": resultado["modules"],
+        "files_generated": len(resultado["file_list"]) + len(prosa_gerada),
+        "file_list": resultado["file_list"] + prosa_gerada,
+        "compressed_files": compressao.get("written", 0),
+        "symbols": resultado["symbols"],
+        "undocumented": resultado["undocumented"]
+    }
+
 def gerar_documentacao_api(diretorio: str, formato: str = "openapi", 
-                        saida: str = "docs/api") -> Dict[str, Any]:
+                        saida: str = "docs/api",
+                        progresso: Optional[Callable[[Dict[str, Any]], None]] = progresso_console) -> Dict[str, Any]:
     """
     Gera documentação específica para APIs.
     
     Esta função foca na geração de documentação para APIs,
-    utilizando formatos como OpenAPI (Swagger).
+    utilizando formatos como OpenAPI (Swagger). A saída do CLI é
+    acompanhada em tempo real e gravada em `<saida>/progresso.log`.
     
     Args:
         diretorio: Diretório do projeto
         formato: Formato da documentação (openapi, markdown, html)
         saida: Diretório de saída para a documentação
+        progresso: Callback chamado com cada evento de progresso (None desativa)
         
     Returns:
         dict: Resultado da operação com detalhes e estatísticas
@@ -241,14 +349,14 @@ def gerar_documentacao_api(diretorio: str, formato: str = "openapi",
     # Executar o comando
     try:
         print(f"\n{Colors.YELLOW}Analisando APIs e endpoints...{Colors.ENDC}")
-        result = subprocess.run(command, capture_output=True, text=True)
+        result = executar_com_progresso(command, progresso, os.path.join(saida, "progresso.log"))
         
         # Registrar fim
         fim = datetime.now()
         duracao = (fim - inicio).total_seconds()
         
         # Verificar resultado
-        if result.returncode == 0:
+        if result["returncode"] == 0:
             logger.info(f"Documentação de API gerada com sucesso em: {saida}")
             print(f"\n{Colors.GREEN}✅ Documentação de API gerada com sucesso em: {saida}{Colors.ENDC}")
             print(f"{Colors.BLUE}⏱️ Tempo de execução: {duracao:.2f} segundos{Colors.ENDC}")
@@ -275,23 +383,28 @@ def gerar_documentacao_api(diretorio: str, formato: str = "openapi",
             if arquivo_openapi:
                 print(f"\n{Colors.GREEN}📄 Arquivo principal OpenAPI: {arquivo_openapi}{Colors.ENDC}")
             
+            # Cópias .gz/.br servidas diretamente pelo servidor da documentação
+            compressao = comprimir_diretorio(saida)
+            
             return {
                 "success": True,
                 "output_dir": saida,
                 "format": formato,
                 "duration_seconds": duracao,
+                "files_analyzed": len(result["analyzed"]),
                 "files_generated": len(arquivos_gerados),
                 "file_list": arquivos_gerados,
-                "openapi_file": arquivo_openapi
+                "openapi_file": arquivo_openapi,
+                "compressed_files": compressao.get("written", 0)
             }
         else:
-            logger.error(f"Erro ao gerar documentação de API: {result.stderr}")
+            logger.error(f"Erro ao gerar documentação de API: {result['stderr']}")
             print(f"\n{Colors.RED}❌ Erro ao gerar documentação de API:{Colors.ENDC}")
-            print(result.stderr)
+            print(result["stderr"])
             return {
                 "success": False,
                 "error": "APIDocGenerationError",
-                "message": result.stderr,
+                "message": result["stderr"],
                 "duration_seconds": duracao
             }
     except Exception as e:
@@ -330,6 +443,12 @@ def main():
     parser_geral.add_argument("--escopo", "-s", type=str, default="all",
                              choices=["all", "api", "internal", "public"],
                              help="Escopo da documentação")
+    parser_geral.add_argument("--local", action="store_true",
+                             help="Gerar a referência da API a partir das docstrings, sem o Claude Code")
+    parser_geral.add_argument("--prosa", action="store_true",
+                             help="Com --local, gerar com o Claude Code o texto dos módulos sem docstrings")
+    parser_geral.add_argument("--workers", "-w", type=int, default=None,
+                             help="Processos para a geração local (padrão: número de CPUs)")
     
     # Comando: api
     parser_api = subparsers.add_parser("api", help="Gerar documentação específica para APIs")
@@ -350,8 +469,9 @@ def main():
     
     args = parser.parse_args()
     
-    # Verificar se o Claude Code está instalado
-    if not verificar_claude_code():
+    # Verificar se o Claude Code está instalado (a geração local não o usa)
+    local = getattr(args, "local", False)
+    if not (local and not args.prosa) and not verificar_claude_code():
         return 1
     
     # Executar o comando especificado ou o padrão (geral)
@@ -370,6 +490,10 @@ def main():
         print(f"\n{Colors.BOLD}=== Resumo da Geração ==={Colors.ENDC}")
         print(f"Documentação Geral: {'✅ Sucesso' if geral_result.get('success') else '❌ Falha'}")
         print(f"Documentação API: {'✅ Sucesso' if api_result.get('success') else '❌ Falha'}")
+    elif local:
+        resultado = gerar_documentacao_local(args.dir, args.formato, args.saida, args.escopo,
+                                             args.prosa, args.workers)
+        return 0 if resultado.get("success") else 1
     else:  # Padrão: "geral" ou nenhum comando
         gerar_documentacao(
             args.dir if hasattr(args, 'dir') else os.getcwd(),
@@ -15,14 +15,16 @@ import time
 import argparse
 import subprocess
 import threading
-import http.server
-import socketserver
 import webbrowser
 import logging
 import signal
 from typing import Dict, Any, Optional, List, Union, Tuple
 from datetime import datetime
 
+from doc40_ambiente import claude_code_instalado
+from doc40_indice import construir_indice
+from doc40_servidor import criar_servidor, WORKERS, TIMEOUT
+
 # Importar módulos do sistema Documentação 4.0
 # Você pode usar importação direta se os módulos estiverem instalados
 # como pacotes, ou usar importação relativa se estiverem no mesmo diretório.
@@ -38,15 +40,7 @@ except ImportError:
     
     def verificar_claude_code():
         """Verifica se o Claude Code CLI está instalado."""
-        try:
-            result = subprocess.run(
-                ["claude-code", "--version"], 
-                capture_output=True, 
-                text=True
-            )
-            return result.returncode == 0
-        except Exception:
-            return False
+        return claude_code_instalado()
             
     def consultar_codigo(pergunta, diretorio, formato="text", cache=True):
         """Consulta o código usando Claude Code."""
@@ -118,9 +112,9 @@ except ImportError:
     def verificar_git(diretorio):
         """Verifica se o diretório é um repositório Git."""
         try:
-            os.chdir(diretorio)
             result = subprocess.run(
                 ["git", "rev-parse", "--is-inside-work-tree"],
+                cwd=diretorio,
                 capture_output=True,
                 text=True
             )
@@ -154,9 +148,8 @@ except ImportError:
     def executar_agente_thread(diretorio, saida="docs", intervalo=300):
         """Executa o agente de manutenção em uma thread separada."""
         def verificar_mudancas(dir, ultimo_commit=None):
-            os.chdir(dir)
             cmd = ["git", "rev-parse", "HEAD"]
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            result = subprocess.run(cmd, cwd=dir, capture_output=True, text=True)
             if result.returncode != 0:
                 return False, None
                 
@@ -214,16 +207,23 @@ class Colors:
 class DocumentationServer:
     """Servidor HTTP simples para visualizar a documentação gerada."""
     
-    def __init__(self, docs_dir: str, port: int = 8000):
+    def __init__(self, docs_dir: str, port: int = 8000, workers: Optional[int] = WORKERS,
+                 timeout: Optional[float] = TIMEOUT, cache_control: Optional[Dict[str, str]] = None):
         """
         Inicializa o servidor de documentação.
         
         Args:
             docs_dir: O diretório da documentação
             port: A porta para o servidor (padrão: 8000)
+            workers: Máximo de conexões atendidas ao mesmo tempo (None: uma thread por conexão)
+            timeout: Tempo limite de conexões ociosas, em segundos
+            cache_control: Políticas de Cache-Control por extensão ou nome de arquivo
         """
         self.docs_dir = os.path.abspath(docs_dir)
         self.port = port
+        self.workers = workers
+        self.timeout = timeout
+        self.cache_control = cache_control
         self.server = None
         self.server_thread = None
         self.running = False
@@ -246,16 +246,13 @@ class DocumentationServer:
                 print(f"{Colors.RED}❌ Diretório de documentação não encontrado: {self.docs_dir}{Colors.ENDC}")
                 return False
             
-            os.chdir(self.docs_dir)
+            # Gerar (ou atualizar) o index.html com todos os diretórios da documentação
+            construir_indice(self.docs_dir)
             
-            # Criar um arquivo index.html se não existir
-            index_path = os.path.join(self.docs_dir, "index.html")
-            if not os.path.exists(index_path):
-                self._create_index_html()
-            
-            # Iniciar o servidor em uma thread separada
-            handler = http.server.SimpleHTTPRequestHandler
-            self.server = socketserver.TCPServer(("", self.port), handler)
+            # Iniciar o servidor em uma thread separada: conexões atendidas em
+            # um pool de workers, com keep-alive e tempo limite
+            self.server = criar_servidor(self.docs_dir, self.port, self.workers, self.timeout,
+                                         cache_control=self.cache_control)
             
             self.server_thread = threading.Thread(target=self._run_server)
             self.server_thread.daemon = True
@@ -306,123 +303,6 @@ class DocumentationServer:
             self.server.serve_forever()
         except Exception as e:
             logger.error(f"Erro no servidor: {e}")
-    
-    def _create_index_html(self) -> None:
-        """Cria um arquivo index.html para navegar pela documentação."""
-        # Listar arquivos de documentação
-        md_files = [f for f in os.listdir(self.docs_dir) if f.endswith('.md')]
-        html_files = [f for f in os.listdir(self.docs_dir) if f.endswith('.html') and f != "index.html"]
-        other_files = [f for f in os.listdir(self.docs_dir) if not f.endswith(('.md', '.html', '.log'))]
-        
-        # Criar HTML
-        html_content = """<!DOCTYPE html>
-<html lang="pt-BR">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Documentação 4.0</title>
-    <style>
-        body {
-            font-family: Arial, sans-serif;
-            line-height: 1.6;
-            margin: 0;
-            padding: 20px;
-            background-color: #f4f5f7;
-        }
-        .container {
-            max-width: 800px;
-            margin: 0 auto;
-            background-color: white;
-            padding: 20px;
-            border-radius: 5px;
-            box-shadow: 0 2px 5px rgba(0,0,0,0.1);
-        }
-        h1 {
-            color: #2a67c2;
-            border-bottom: 2px solid #eaecef;
-            padding-bottom: 10px;
-        }
-        h2 {
-            color: #2a67c2;
-            margin-top: 20px;
-        }
-        ul {
-            list-style-type: none;
-            padding: 0;
-        }
-        li {
-            margin-bottom: 10px;
-            padding: 5px 10px;
-            background-color: #f6f8fa;
-            border-radius: 3px;
-        }
-        a {
-            color: #2a67c2;
-            text-decoration: none;
-        }
-        a:hover {
-            text-decoration: underline;
-        }
-        footer {
-            margin-top: 30px;
-            font-size: 0.8em;
-            color: #6a737d;
-            text-align: center;
-        }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>Documentação 4.0</h1>
-        <p>Documentação gerada automaticamente pelo sistema Documentação 4.0.</p>
-"""
-        
-        # Adicionar seção de arquivos Markdown
-        if md_files:
-            html_content += """
-        <h2>Documentação Markdown</h2>
-        <ul>
-"""
-            for file in sorted(md_files):
-                html_content += f'            <li><a href="{file}">{file}</a></li>\n'
-            html_content += "        </ul>\n"
-        
-        # Adicionar seção de arquivos HTML
-        if html_files:
-            html_content += """
-        <h2>Documentação HTML</h2>
-        <ul>
-"""
-            for file in sorted(html_files):
-                html_content += f'            <li><a href="{file}">{file}</a></li>\n'
-            html_content += "        </ul>\n"
-        
-        # Adicionar seção de outros arquivos
-        if other_files:
-            html_content += """
-        <h2>Outros Arquivos</h2>
-        <ul>
-"""
-            for file in sorted(other_files):
-                html_content += f'            <li><a href="{file}">{file}</a></li>\n'
-            html_content += "        </ul>\n"
-        
-        # Adicionar rodapé
-        html_content += """
-        <footer>
-            <p>Gerado por Documentação 4.0 - Campus Party 2025</p>
-            <p>Lucas Dórea Cardoso e Aulus Diniz</p>
-        </footer>
-    </div>
-</body>
-</html>
-"""
-        
-        # Salvar o arquivo
-        with open(os.path.join(self.docs_dir, "index.html"), 'w') as f:
-            f.write(html_content)
-        
-        logger.info(f"Arquivo index.html criado em {self.docs_dir}")
 
 class DocumentationSystem:
     """Sistema completo de Documentação 4.0."""
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Documentação 4.0 - Teste de Carga do Servidor de Documentação
+Campus Party 2025 - Lucas Dórea Cardoso e Aulus Diniz
+
+Este script mede a vazão e a latência do servidor de documentação com vários
+clientes simultâneos (com ou sem keep-alive), opcionalmente mantendo
+conexões "lentas" abertas durante o teste. Com --comparar, sobe o servidor
+antigo (socketserver.TCPServer, uma requisição por vez) e o servidor com
+pool de threads no mesmo diretório e compara os dois; a fase do servidor
+antigo é interrompida no primeiro tempo esgotado ou após --limite-antigo
+segundos, já que com clientes lentos cada requisição espera o tempo limite.
+"""
+
+import os
+import sys
+import time
+import socket
+import argparse
+import functools
+import http.client
+import http.server
+import socketserver
+import threading
+import logging
+from urllib.parse import urlsplit
+from typing import Dict, Any, List, Optional
+
+from doc40_servidor import criar_servidor, iniciar_em_thread, WORKERS, TIMEOUT
+
+# Duração máxima (segundos) da fase do servidor antigo em --comparar
+LIMITE_ANTIGO = 30.0
+
+# Configuração de logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger('doc40-teste-carga')
+
+# Cores para terminal
+class Colors:
+    HEADER = '\033[95m'
+    BLUE = '\033[94m'
+    GREEN = '\033[92m'
+    YELLOW = '\033[93m'
+    RED = '\033[91m'
+    ENDC = '\033[0m'
+    BOLD = '\033[1m'
+    UNDERLINE = '\033[4m'
+
+def percentil(valores: List[float], p: float) -> float:
+    """
+    Calcula um percentil de uma lista já ordenada.
+
+    Args:
+        valores: Valores em ordem crescente
+        p: Percentil (0 a 100)
+
+    Returns:
+        float: O valor do percentil (0.0 para lista vazia)
+    """
+    if not valores:
+        return 0.0
+    indice = min(len(valores) - 1, max(0, int(round(p / 100 * (len(valores) - 1)))))
+    return valores[indice]
+
+def manter_cliente_lento(host: str, porta: int, parar: threading.Event) -> None:
+    """
+    Abre uma conexão e envia o cabeçalho da requisição um byte por segundo.
+
+    Simula um cliente em rede ruim: em um servidor de uma requisição por vez,
+    ele bloqueia todos os outros enquanto estiver conectado.
+
+    Args:
+        host: Host do servidor
+        porta: Porta do servidor
+        parar: Evento que encerra o cliente
+    """
+    try:
+        with socket.create_connection((host, porta), timeout=5) as conexao:
+            for byte in b"GET / HTTP/1.1\r\nHost: lento\r\nX-Lento: " + b"a" * 1000:
+                if parar.wait(1.0):
+                    return
+                conexao.sendall(bytes([byte]))
+    except OSError:
+        pass
+
+def executar_carga(url: str, caminhos: List[str], concorrencia: int = 10,
+                   requisicoes: Optional[int] = 1000, duracao: Optional[float] = None,
+                   keepalive: bool = True, clientes_lentos: int = 0,
+                   timeout: float = 30.0, prazo_maximo: Optional[float] = None,
+                   abortar_apos_timeouts: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Executa o teste de carga contra um servidor.
+
+    Args:
+        url: URL base do servidor (ex.: http://localhost:8000)
+        caminhos: Caminhos requisitados em rodízio
+        concorrencia: Número de clientes simultâneos
+        requisicoes: Total de requisições (ignorado se `duracao` for informado)
+        duracao: Duração do teste em segundos
+        keepalive: Reutiliza a conexão de cada cliente
+        clientes_lentos: Conexões lentas mantidas abertas durante o teste
+        timeout: Tempo limite de cada requisição, em segundos
+        prazo_maximo: Para de enviar requisições após este tempo, mesmo sem
+            completar `requisicoes`
+        abortar_apos_timeouts: Para de enviar requisições após este número de
+            tempos esgotados
+
+    Returns:
+        dict: requests, errors, bytes, seconds, requests_per_second,
+            latency_ms (p50, p95, p99, max) e aborted (motivo, ou None)
+    """
+    partes = urlsplit(url)
+    host, porta = partes.hostname or "localhost", partes.port or 80
+
+    parar_lentos = threading.Event()
+    lentos = [threading.Thread(target=manter_cliente_lento, args=(host, porta, parar_lentos), daemon=True)
+              for _ in range(clientes_lentos)]
+    for lento in lentos:
+        lento.start()
+    if lentos:
+        time.sleep(0.5)  # Deixar as conexões lentas ocuparem o servidor
+
+    lock = threading.Lock()
+    contador = [0]
+    latencias: List[float] = []
+    erros = [0]
+    tempos_esgotados = [0]
+    abortado: List[Optional[str]] = [None]
+    total_bytes = [0]
+    inicio = time.perf_counter()
+    fim = inicio + duracao if duracao else None
+    limite = inicio + prazo_maximo if prazo_maximo else None
+
+    def proxima() -> Optional[int]:
+        with lock:
+            if abortado[0] is not None:
+                return None
+            if fim is None and contador[0] >= requisicoes:
+                return None
+            if fim is not None and time.perf_counter() >= fim:
+                return None
+            if limite is not None and time.perf_counter() >= limite:
+                abortado[0] = f"prazo de {prazo_maximo:g}s atingido"
+                return None
+            contador[0] += 1
+            return contador[0]
+
+    def cliente() -> None:
+        conexao = None
+        locais: List[float] = []
+        while True:
+            numero = proxima()
+            if numero is None:
+                break
+            caminho = caminhos[numero % len(caminhos)]
+            t0 = time.perf_counter()
+            try:
+                if conexao is None:
+                    conexao = http.client.HTTPConnection(host, porta, timeout=timeout)
+                conexao.request("GET", caminho, headers={} if keepalive else {"Connection": "close"})
+                resposta = conexao.getresponse()
+                corpo = resposta.read()
+                if resposta.status >= 400:
+                    raise http.client.HTTPException(f"HTTP {resposta.status}")
+                locais.append(time.perf_counter() - t0)
+                with lock:
+                    total_bytes[0] += len(corpo)
+                if not keepalive or resposta.will_close:
+                    conexao.close()
+                    conexao = None
+            except (OSError, http.client.HTTPException) as e:
+                logger.debug(f"Erro em {caminho}: {e}")
+                with lock:
+                    erros[0] += 1
+                    if isinstance(e, socket.timeout):
+                        tempos_esgotados[0] += 1
+                        if abortar_apos_timeouts and tempos_esgotados[0] >= abortar_apos_timeouts \
+                                and abortado[0] is None:
+                            abortado[0] = f"{tempos_esgotados[0]} tempo(s) esgotado(s)"
+                if conexao is not None:
+                    conexao.close()
+                    conexao = None
+        if conexao is not None:
+            conexao.close()
+        with lock:
+            latencias.extend(locais)
+
+    threads = [threading.Thread(target=cliente, daemon=True) for _ in range(max(1, concorrencia))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    segundos = time.perf_counter() - inicio
+
+    parar_lentos.set()
+
+    latencias.sort()
+    return {
+        "requests": len(latencias),
+        "errors": erros[0],
+        "bytes": total_bytes[0],
+        "seconds": segundos,
+        "requests_per_second": len(latencias) / segundos if segundos > 0 else 0.0,
+        "latency_ms": {
+            "p50": percentil(latencias, 50) * 1000,
+            "p95": percentil(latencias, 95) * 1000,
+            "p99": percentil(latencias, 99) * 1000,
+            "max": (latencias[-1] if latencias else 0.0) * 1000
+        },
+        "aborted": abortado[0]
+    }
+
+def mostrar_resultado(titulo: str, resultado: Dict[str, Any]) -> None:
+    """
+    Exibe o resultado de um teste de carga.
+
+    Args:
+        titulo: Título do teste
+        resultado: Resultado de `executar_carga`
+    """
+    latencia = resultado["latency_ms"]
+    cor = Colors.GREEN if resultado["errors"] == 0 else Colors.YELLOW
+    print(f"\n{Colors.BOLD}{titulo}{Colors.ENDC}")
+    print(f"{cor}  Requisições: {resultado['requests']} ({resultado['errors']} erro(s)) "
+          f"em {resultado['seconds']:.2f}s{Colors.ENDC}")
+    print(f"  Vazão: {resultado['requests_per_second']:.1f} req/s, "
+          f"{resultado['bytes'] / max(resultado['seconds'], 1e-9) / 1024 / 1024:.2f} MiB/s")
+    print(f"  Latência (ms): p50 {latencia['p50']:.1f}  p95 {latencia['p95']:.1f}  "
+          f"p99 {latencia['p99']:.1f}  máx {latencia['max']:.1f}")
+    if resultado.get("aborted"):
+        print(f"{Colors.YELLOW}  Interrompido: {resultado['aborted']}{Colors.ENDC}")
+
+def comparar_servidores(diretorio: str, caminhos: List[str], **opcoes) -> int:
+    """
+    Compara o servidor antigo (uma requisição por vez) com o servidor com pool.
+
+    Args:
+        diretorio: Diretório da documentação servido pelos dois
+        caminhos: Caminhos requisitados
+        **opcoes: Opções repassadas a `executar_carga` e `workers`/`timeout` do servidor novo
+
+    Returns:
+        int: Código de saída
+    """
+    workers = opcoes.pop("workers", WORKERS)
+    timeout_servidor = opcoes.pop("timeout_servidor", TIMEOUT)
+    limite_antigo = opcoes.pop("limite_antigo", LIMITE_ANTIGO)
+
+    class HandlerSilencioso(http.server.SimpleHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+    class ServidorAntigo(socketserver.TCPServer):
+        def handle_error(self, request, client_address):
+            # Clientes que desistem por tempo limite geram BrokenPipeError
+            logger.debug(f"Conexão interrompida: {client_address}")
+
+    antigo = ServidorAntigo(("127.0.0.1", 0),
+                            functools.partial(HandlerSilencioso, directory=os.path.abspath(diretorio)))
+    novo = criar_servidor(diretorio, 0, workers, timeout_servidor, host="127.0.0.1")
+
+    resultados = {}
+    try:
+        # O servidor antigo bloqueia atrás dos clientes lentos: cada requisição
+        # esperaria o tempo limite, então a fase termina no primeiro tempo esgotado
+        limites_antigo = {"prazo_maximo": limite_antigo, "abortar_apos_timeouts": 1}
+        for nome, servidor, limites in (("TCPServer (uma requisição por vez)", antigo, limites_antigo),
+                                        (f"DocsHTTPServer ({workers or 'sem limite de'} workers, keep-alive)",
+                                         novo, {})):
+            iniciar_em_thread(servidor)
+            url = f"http://127.0.0.1:{servidor.server_address[1]}"
+            print(f"{Colors.BLUE}🔄 Testando {nome} em {url}...{Colors.ENDC}", flush=True)
+            resultados[nome] = executar_carga(url, caminhos, **opcoes, **limites)
+            mostrar_resultado(nome, resultados[nome])
+            servidor.shutdown()
+    finally:
+        antigo.server_close()
+        novo.server_close()
+
+    antigo_rps, novo_rps = [r["requests_per_second"] for r in resultados.values()]
+    if antigo_rps > 0:
+        print(f"\n{Colors.GREEN}✅ Vazão {novo_rps / antigo_rps:.1f}x maior com o servidor com pool{Colors.ENDC}")
+    else:
+        print(f"\n{Colors.GREEN}✅ O servidor antigo ficou bloqueado; o servidor com pool atendeu "
+              f"{novo_rps:.1f} req/s{Colors.ENDC}")
+    return 0
+
+def main():
+    """Função principal do script."""
+    parser = argparse.ArgumentParser(
+        description="Documentação 4.0 - Teste de carga do servidor de documentação",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+
+    alvo = parser.add_mutually_exclusive_group(required=True)
+    alvo.add_argument("--url", "-u", type=str,
+                      help="URL de um servidor em execução (ex.: http://localhost:8000)")
+    alvo.add_argument("--comparar", type=str, metavar="DIR",
+                      help="Subir o servidor antigo e o novo servindo DIR e comparar os dois")
+
+    parser.add_argument("--caminhos", "-p", nargs="+", default=["/"],
+                        help="Caminhos requisitados em rodízio")
+    parser.add_argument("--concorrencia", "-c", type=int, default=10,
+                        help="Número de clientes simultâneos")
+    parser.add_argument("--requisicoes", "-n", type=int, default=1000,
+                        help="Total de requisições")
+    parser.add_argument("--duracao", "-d", type=float,
+                        help="Duração do teste em segundos (substitui --requisicoes)")
+    parser.add_argument("--sem-keepalive", action="store_true",
+                        help="Abrir uma conexão por requisição")
+    parser.add_argument("--clientes-lentos", type=int, default=0,
+                        help="Conexões lentas mantidas abertas durante o teste")
+    parser.add_argument("--timeout", type=float, default=10.0,
+                        help="Tempo limite de cada requisição em segundos")
+    parser.add_argument("--workers", "-w", type=int, default=WORKERS,
+                        help="Workers do servidor novo em --comparar (0: uma thread por conexão)")
+    parser.add_argument("--limite-antigo", type=float, default=LIMITE_ANTIGO,
+                        help="Duração máxima da fase do servidor antigo em --comparar, em segundos")
+
+    args = parser.parse_args()
+
+    opcoes = {
+        "concorrencia": args.concorrencia,
+        "requisicoes": args.requisicoes,
+        "duracao": args.duracao,
+        "keepalive": not args.sem_keepalive,
+        "clientes_lentos": args.clientes_lentos,
+        "timeout": args.timeout
+    }
+
+    if args.comparar:
+        if not os.path.isdir(args.comparar):
+            print(f"{Colors.RED}❌ Diretório não encontrado: {args.comparar}{Colors.ENDC}")
+            return 1
+        return comparar_servidores(args.comparar, args.caminhos, workers=args.workers or None,
+                                   limite_antigo=args.limite_antigo, **opcoes)
+
+    print(f"{Colors.BLUE}🔄 Testando {args.url} com {args.concorrencia} cliente(s)...{Colors.ENDC}", flush=True)
+    resultado = executar_carga(args.url, args.caminhos, **opcoes)
+    mostrar_resultado(args.url, resultado)
+    return 0 if resultado["errors"] == 0 else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Documentação 4.0 - Verificação do Ambiente com Cache
+Campus Party 2025 - Lucas Dórea Cardoso e Aulus Diniz
+
+Localiza o `claude-code` com `shutil.which` e guarda a versão e o estado da
+API key em um pequeno arquivo de estado (`~/.cache/doc40/ambiente.json`),
+indexado pelo caminho do binário e seu mtime/tamanho. Assim os scripts só
+executam `claude-code --version` e `claude-code config get api_key` quando
+o binário muda, em vez de a cada comando.
+
+A API key é considerada configurada por até API_KEY_TTL segundos; um
+resultado negativo nunca fica em cache, para que `claude-code config set`
+tenha efeito imediato.
+
+Uso:
+    python doc40_ambiente.py            # mostra o estado (usando o cache)
+    python doc40_ambiente.py --forcar   # ignora o cache
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import subprocess
+import threading
+import logging
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger('doc40-ambiente')
+
+# Nome do executável procurado no PATH (pode ser trocado por DOC40_CLAUDE_CODE)
+CLAUDE_CODE = os.environ.get("DOC40_CLAUDE_CODE", "claude-code")
+
+# Arquivo de estado compartilhado por todos os scripts
+ESTADO_PADRAO = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")),
+    "doc40", "ambiente.json"
+)
+
+# Por quanto tempo uma API key configurada é considerada válida sem reverificar
+API_KEY_TTL = 3600
+
+# Tempo máximo para as verificações que executam o CLI
+TIMEOUT_VERIFICACAO = 15
+
+# Resultado já calculado neste processo
+_sondagem: Optional[Dict[str, Any]] = None
+_lock = threading.Lock()
+
+
+def _carregar_estado(caminho: str) -> Dict[str, Any]:
+    """Lê o arquivo de estado, ignorando arquivos ausentes ou corrompidos."""
+    try:
+        with open(caminho, 'r') as f:
+            estado = json.load(f)
+        return estado if isinstance(estado, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _salvar_estado(caminho: str, estado: Dict[str, Any]) -> None:
+    """Grava o arquivo de estado de forma atômica."""
+    try:
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        temporario = f"{caminho}.{os.getpid()}.tmp"
+        with open(temporario, 'w') as f:
+            json.dump(estado, f, indent=2)
+        os.replace(temporario, caminho)
+    except OSError as e:
+        logger.debug(f"Não foi possível gravar o estado do ambiente: {e}")
+
+
+def _assinatura(binario: str) -> Dict[str, Any]:
+    """Identifica uma versão instalada do binário pelo mtime e tamanho."""
+    info = os.stat(binario)
+    return {"mtime_ns": info.st_mtime_ns, "size": info.st_size}
+
+
+def _executar(comando: list) -> Optional[subprocess.CompletedProcess]:
+    """Executa uma verificação do CLI, retornando None se ela falhar."""
+    try:
+        return subprocess.run(comando, capture_output=True, text=True, timeout=TIMEOUT_VERIFICACAO)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        logger.error(f"Erro ao executar {' '.join(comando[1:])}: {e}")
+        return None
+
+
+def localizar_claude_code() -> Optional[str]:
+    """
+    Localiza o executável do Claude Code no PATH.
+
+    Returns:
+        str: Caminho absoluto do executável ou None se não estiver instalado
+    """
+    binario = shutil.which(CLAUDE_CODE)
+    return os.path.realpath(binario) if binario else None
+
+
+def sondar_ambiente(forcar: bool = False, verificar_api_key: bool = False,
+                    caminho_estado: str = ESTADO_PADRAO) -> Dict[str, Any]:
+    """
+    Retorna o estado do Claude Code, usando o cache sempre que possível.
+
+    Args:
+        forcar: Ignora o cache e executa as verificações novamente
+        verificar_api_key: Também verifica a API key (senão o campo pode ser None)
+        caminho_estado: Arquivo de estado
+
+    Returns:
+        dict: installed, path, version e api_key_configured
+    """
+    global _sondagem
+
+    with _lock:
+        if (_sondagem is not None and not forcar
+                and (not verificar_api_key or _sondagem["api_key_configured"] is not None)):
+            return dict(_sondagem)
+
+        binario = localizar_claude_code()
+        if binario is None:
+            _sondagem = {"installed": False, "path": None, "version": None, "api_key_configured": False}
+            return dict(_sondagem)
+
+        estado = _carregar_estado(caminho_estado)
+        binarios = estado.setdefault("binaries", {})
+        assinatura = _assinatura(binario)
+        entrada = binarios.get(binario)
+        if forcar or not entrada or entrada.get("signature") != assinatura:
+            entrada = {"signature": assinatura}
+        alterado = False
+
+        if "version" not in entrada:
+            resultado = _executar([binario, "--version"])
+            entrada["version"] = resultado.stdout.strip() if resultado and resultado.returncode == 0 else None
+            alterado = True
+
+        api_key = None
+        if entrada.get("api_key_checked", 0) + API_KEY_TTL > time.time():
+            api_key = True
+        elif verificar_api_key:
+            resultado = _executar([binario, "config", "get", "api_key"])
+            api_key = bool(resultado and resultado.returncode == 0 and "api_key" in resultado.stdout)
+            if api_key:
+                entrada["api_key_checked"] = time.time()
+            else:
+                entrada.pop("api_key_checked", None)
+            alterado = True
+
+        if alterado:
+            binarios[binario] = entrada
+            _salvar_estado(caminho_estado, estado)
+
+        _sondagem = {
+            "installed": True,
+            "path": binario,
+            "version": entrada["version"],
+            "api_key_configured": api_key
+        }
+        return dict(_sondagem)
+
+
+def claude_code_instalado() -> bool:
+    """
+    Indica se o Claude Code CLI está instalado.
+
+    Returns:
+        bool: True se estiver instalado, False caso contrário
+    """
+    return sondar_ambiente()["installed"]
+
+
+def api_key_configurada() -> bool:
+    """
+    Indica se a API key do Claude Code está configurada.
+
+    Returns:
+        bool: True se a API key estiver configurada, False caso contrário
+    """
+    return bool(sondar_ambiente(verificar_api_key=True)["api_key_configured"])
+
+
+def main():
+    """Mostra o estado do ambiente."""
+    parser = argparse.ArgumentParser(description="Documentação 4.0 - Verificação do ambiente")
+    parser.add_argument("--forcar", action="store_true", help="Ignorar o cache e verificar novamente")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    ambiente = sondar_ambiente(forcar=args.forcar, verificar_api_key=True)
+    ambiente["seconds"] = round(time.perf_counter() - inicio, 4)
+    print(json.dumps(ambiente, indent=2, ensure_ascii=False))
+    return 0 if ambiente["installed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,526 @@
+#!/usr/bin/env python3
+"""
+Documentação 4.0 - Busca Local na Documentação Gerada
+Campus Party 2025 - Lucas Dórea Cardoso e Aulus Diniz
+
+Índice invertido sobre os documentos do diretório de saída (Markdown, HTML,
+JSON/YAML e texto), com ranking BM25. Uma busca por palavra-chave responde
+em milissegundos, sem chamar o Claude Code.
+
+- Tokenização: palavras em minúsculas e sem acentos ("Configuração" e
+  "configuracao" são o mesmo termo), sem palavras vazias do português e do
+  inglês; identificadores como `process_payment` e `processPayment` também
+  geram suas partes (`process`, `payment`).
+- Persistência: as frequências de cada documento ficam em
+  `~/.cache/doc40/busca/<hash do diretório>.json`, junto com o mtime e o
+  tamanho do arquivo; o índice invertido é montado ao carregar. O índice
+  fica fora da documentação: não aparece no servidor nem no `git status`.
+- Atualização incremental: só documentos novos, alterados ou removidos são
+  reprocessados (os informados pelo agente, ou todos cuja assinatura mudou).
+
+Uso:
+    atualizar_indice_busca("docs", alterados=["api.md"])
+    buscar("docs", "reembolso de pagamento")
+
+    python doc40_busca.py --dir docs "reembolso de pagamento"
+"""
+
+import os
+import re
+import sys
+import html
+import json
+import math
+import time
+import heapq
+import hashlib
+import argparse
+import tempfile
+import threading
+import unicodedata
+import logging
+from collections import Counter
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+from doc40_indice import INDICE, indice_gerado
+
+logger = logging.getLogger('doc40-busca')
+
+# Índices persistidos fora do diretório servido, um por diretório de documentação
+PASTA_INDICES = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")),
+    "doc40", "busca"
+)
+# Onde versões anteriores gravavam o índice (dentro da documentação)
+ARQUIVO_LEGADO = ".doc40-busca.json"
+VERSAO_INDICE = 1
+EXTENSOES_INDEXADAS = (".md", ".html", ".htm", ".json", ".yaml", ".yml", ".txt")
+LIMITE = 10
+TAMANHO_TRECHO = 200
+
+# Parâmetros do BM25
+K1 = 1.2
+B = 0.75
+
+STOPWORDS = frozenset("""
+a o as os um uma uns umas de do da dos das em no na nos nas por pelo pela pelos pelas para pra
+com sem sob sobre e ou mas que se nao sim ao aos como mais menos muito ja ha eh e foi ser sao esta
+este esse isso isto aquele aquela seu sua seus suas meu minha the an and or of to in on at by for
+with is are was be it this that as from not
+""".split())
+
+_PALAVRA = re.compile(r"\w+")
+_ACENTOS = re.compile(r"[\u0300-\u036f]")
+_PARTES = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+")
+_SEM_TEXTO = re.compile(r"<(script|style)\b.*?</\1>", re.IGNORECASE | re.DOTALL)
+_TAG = re.compile(r"<[^>]+>")
+_TITULO_MD = re.compile(r"^#\s+(.+?)\s*#*\s*$", re.MULTILINE)
+_TITULO_HTML = re.compile(r"<title>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+TAMANHO_MAXIMO_TERMO = 64
+
+
+def dobrar_acentos(texto: str) -> str:
+    """Remove acentos e cedilhas ("configuração" → "configuracao")."""
+    return _ACENTOS.sub("", unicodedata.normalize("NFKD", texto))
+
+
+def tokenizar(texto: str) -> List[str]:
+    """
+    Extrai os termos indexáveis de um texto.
+
+    Args:
+        texto: O texto
+
+    Returns:
+        list: Os termos, com repetição, em minúsculas e sem acentos
+    """
+    termos = []
+    for palavra in _PALAVRA.findall(dobrar_acentos(texto)):
+        if len(palavra) > TAMANHO_MAXIMO_TERMO:
+            continue
+        minuscula = palavra.lower()
+        if len(minuscula) >= 2 and minuscula not in STOPWORDS:
+            termos.append(minuscula)
+        # Partes de identificadores: process_payment, processPayment, HTTPServer
+        if "_" in palavra or not (palavra.islower() or palavra.isupper()):
+            partes = [p.lower() for p in _PARTES.findall(palavra)]
+            if len(partes) > 1:
+                termos.extend(p for p in partes if len(p) >= 2 and p not in STOPWORDS and p != minuscula)
+    return termos
+
+
+def _texto_documento(caminho: str) -> Tuple[str, str]:
+    """
+    Lê um documento e devolve seu texto (sem marcação HTML) e título.
+
+    Args:
+        caminho: Caminho do documento
+
+    Returns:
+        tuple: (texto, título)
+    """
+    with open(caminho, 'r', encoding='utf-8', errors='replace') as f:
+        conteudo = f.read()
+    titulo = None
+    if caminho.lower().endswith((".html", ".htm")):
+        encontrado = _TITULO_HTML.search(conteudo)
+        if encontrado:
+            titulo = html.unescape(encontrado.group(1)).strip()
+        conteudo = html.unescape(_TAG.sub(" ", _SEM_TEXTO.sub(" ", conteudo)))
+    elif caminho.lower().endswith(".json"):
+        # Uma chave por linha e sem escapes \uXXXX (trechos legíveis, acentos indexados)
+        try:
+            conteudo = json.dumps(json.loads(conteudo), ensure_ascii=False, indent=1)
+        except ValueError:
+            pass
+    elif caminho.lower().endswith(".md"):
+        encontrado = _TITULO_MD.search(conteudo)
+        if encontrado:
+            titulo = re.sub(r"[`*]", "", encontrado.group(1))
+    return conteudo, titulo or os.path.basename(caminho)
+
+
+def _trecho(texto: str, termos: Iterable[str]) -> str:
+    """
+    Linha do documento que contém mais termos da consulta.
+
+    Linhas longas (como um JSON minificado) são cortadas em volta da
+    primeira ocorrência, com no máximo TAMANHO_TRECHO caracteres.
+    """
+    procurados = set(termos)
+    melhor, dobrada_melhor, acertos_melhor = "", "", 0
+    for linha in texto.splitlines():
+        linha = linha.strip()
+        if not linha:
+            continue
+        dobrada = dobrar_acentos(linha).lower()
+        if not any(termo in dobrada for termo in procurados):
+            continue
+        acertos = len(procurados.intersection(tokenizar(linha)))
+        if acertos > acertos_melhor:
+            melhor, dobrada_melhor, acertos_melhor = linha, dobrada, acertos
+            if acertos == len(procurados):
+                break
+    if len(melhor) <= TAMANHO_TRECHO:
+        return melhor
+    posicao = min((dobrada_melhor.find(termo) for termo in procurados if termo in dobrada_melhor), default=0)
+    inicio = max(0, min(posicao - TAMANHO_TRECHO // 4, len(melhor) - TAMANHO_TRECHO))
+    trecho = melhor[inicio:inicio + TAMANHO_TRECHO - 2].strip()
+    return ("…" if inicio > 0 else "") + trecho + ("…" if inicio + TAMANHO_TRECHO - 2 < len(melhor) else "")
+
+
+def arquivo_indice(diretorio: str) -> str:
+    """
+    Caminho do índice persistido de um diretório de documentação.
+
+    Args:
+        diretorio: O diretório da documentação
+
+    Returns:
+        str: `<PASTA_INDICES>/<hash do caminho absoluto>.json`
+    """
+    chave = hashlib.sha256(os.path.abspath(diretorio).encode('utf-8', 'surrogateescape')).hexdigest()[:24]
+    return os.path.join(PASTA_INDICES, chave + ".json")
+
+
+class SearchIndex:
+    """Índice BM25 dos documentos de um diretório de saída."""
+
+    def __init__(self, diretorio: str, arquivo: Optional[str] = None):
+        """
+        Cria o índice (vazio até `load` ou `update`).
+
+        Args:
+            diretorio: O diretório indexado
+            arquivo: Onde persistir o índice (padrão: `arquivo_indice(diretorio)`)
+        """
+        self.diretorio = os.path.abspath(diretorio)
+        self.arquivo = arquivo or arquivo_indice(self.diretorio)
+        # documento -> {"sig": [mtime_ns, tamanho], "length": n, "title": t, "terms": {termo: tf}}
+        self.docs: Dict[str, Dict[str, Any]] = {}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._total_termos = 0
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def load(self) -> bool:
+        """
+        Carrega o índice persistido.
+
+        Returns:
+            bool: True se havia um índice válido
+        """
+        try:
+            with open(self.arquivo, 'r', encoding='utf-8') as f:
+                dados = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if not isinstance(dados, dict) or dados.get("version") != VERSAO_INDICE:
+            return False
+        self.docs = {}
+        self._postings = {}
+        self._total_termos = 0
+        for documento, info in dados.get("docs", {}).items():
+            self._adicionar(documento, info)
+        return True
+
+    def save(self) -> None:
+        """Grava o índice em disco (atomicamente)."""
+        os.makedirs(os.path.dirname(self.arquivo), exist_ok=True)
+        # Nome temporário único: o agente e o servidor podem gravar ao mesmo tempo
+        fd, temporario = tempfile.mkstemp(prefix=".doc40-", dir=os.path.dirname(self.arquivo))
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(json.dumps({"version": VERSAO_INDICE, "docs": self.docs},
+                                   ensure_ascii=False, separators=(",", ":")))
+            os.replace(temporario, self.arquivo)
+        except BaseException:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+            raise
+
+    def _adicionar(self, documento: str, info: Dict[str, Any]) -> None:
+        """Inclui um documento no índice invertido."""
+        self.docs[documento] = info
+        self._total_termos += info["length"]
+        for termo, frequencia in info["terms"].items():
+            self._postings.setdefault(termo, {})[documento] = frequencia
+
+    def _remover(self, documento: str) -> None:
+        """Retira um documento do índice invertido."""
+        info = self.docs.pop(documento, None)
+        if info is None:
+            return
+        self._total_termos -= info["length"]
+        for termo in info["terms"]:
+            lista = self._postings.get(termo)
+            if lista is not None:
+                lista.pop(documento, None)
+                if not lista:
+                    del self._postings[termo]
+
+    def _indexavel(self, relativo: str) -> bool:
+        """Indica se um caminho (relativo ao diretório) entra no índice."""
+        nome = os.path.basename(relativo)
+        if nome.startswith(".") or not nome.lower().endswith(EXTENSOES_INDEXADAS):
+            return False
+        if any(parte.startswith(".") for parte in relativo.split(os.sep)[:-1]):
+            return False
+        # O index.html gerado é só uma listagem de arquivos
+        return not (relativo == INDICE and indice_gerado(self.diretorio))
+
+    def _listar(self) -> Iterable[str]:
+        """Documentos indexáveis do diretório, relativos a ele."""
+        pendentes = [""]
+        while pendentes:
+            atual = pendentes.pop()
+            try:
+                with os.scandir(os.path.join(self.diretorio, atual)) as entradas:
+                    for entrada in entradas:
+                        relativo = os.path.join(atual, entrada.name) if atual else entrada.name
+                        if entrada.name.startswith("."):
+                            continue
+                        if entrada.is_dir(follow_symlinks=False):
+                            pendentes.append(relativo)
+                        elif self._indexavel(relativo):
+                            yield relativo
+            except OSError:
+                continue
+
+    def update(self, alterados: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """
+        Reindexa documentos novos, alterados ou removidos.
+
+        Args:
+            alterados: Documentos escritos ou apagados (relativos ao diretório
+                ou absolutos); None verifica todos pela assinatura (mtime, tamanho)
+
+        Returns:
+            dict: indexed, removed e unchanged
+        """
+        if alterados is None:
+            candidatos = set(self._listar()) | set(self.docs)
+        else:
+            candidatos = set()
+            for caminho in alterados:
+                relativo = os.path.relpath(caminho, self.diretorio) if os.path.isabs(caminho) \
+                    else os.path.normpath(caminho)
+                if not relativo.startswith(os.pardir) and self._indexavel(relativo):
+                    candidatos.add(relativo)
+
+        contagem = {"indexed": 0, "removed": 0, "unchanged": 0}
+        for relativo in sorted(candidatos):
+            caminho = os.path.join(self.diretorio, relativo)
+            try:
+                fs = os.stat(caminho)
+            except OSError:
+                if relativo in self.docs:
+                    self._remover(relativo)
+                    contagem["removed"] += 1
+                continue
+            assinatura = [fs.st_mtime_ns, fs.st_size]
+            anterior = self.docs.get(relativo)
+            if anterior is not None and anterior["sig"] == assinatura:
+                contagem["unchanged"] += 1
+                continue
+            try:
+                texto, titulo = _texto_documento(caminho)
+            except OSError as e:
+                logger.warning(f"Não foi possível indexar {relativo}: {e}")
+                continue
+            termos = tokenizar(texto) + tokenizar(os.path.splitext(os.path.basename(relativo))[0])
+            self._remover(relativo)
+            self._adicionar(relativo, {"sig": assinatura, "length": len(termos), "title": titulo,
+                                       "terms": dict(Counter(termos))})
+            contagem["indexed"] += 1
+        return contagem
+
+    def search(self, consulta: str, limite: int = LIMITE, trechos: bool = True) -> List[Dict[str, Any]]:
+        """
+        Busca documentos pela consulta, com ranking BM25.
+
+        Args:
+            consulta: As palavras-chave
+            limite: Número máximo de resultados
+            trechos: Inclui a linha mais relevante de cada documento
+
+        Returns:
+            list: Resultados com file, title, score, relevance (0 a 1, relativa
+                ao primeiro) e snippet, em ordem decrescente de pontuação
+        """
+        termos = list(dict.fromkeys(tokenizar(consulta)))
+        if not termos or not self.docs:
+            return []
+
+        total = len(self.docs)
+        media = self._total_termos / total or 1.0
+        pontuacoes: Dict[str, float] = {}
+        for termo in termos:
+            lista = self._postings.get(termo)
+            if not lista:
+                continue
+            idf = math.log(1 + (total - len(lista) + 0.5) / (len(lista) + 0.5))
+            for documento, frequencia in lista.items():
+                tamanho = self.docs[documento]["length"]
+                parcial = idf * frequencia * (K1 + 1) / (frequencia + K1 * (1 - B + B * tamanho / media))
+                pontuacoes[documento] = pontuacoes.get(documento, 0.0) + parcial
+
+        melhores = heapq.nlargest(limite, pontuacoes.items(), key=lambda item: (item[1], item[0]))
+        if not melhores:
+            return []
+        maximo = melhores[0][1] or 1.0
+        resultados = []
+        for documento, pontuacao in melhores:
+            resultado = {
+                "file": documento.replace(os.sep, "/"),
+                "title": self.docs[documento]["title"],
+                "score": round(pontuacao, 4),
+                "relevance": round(pontuacao / maximo, 3)
+            }
+            if trechos:
+                try:
+                    texto, _ = _texto_documento(os.path.join(self.diretorio, documento))
+                    resultado["snippet"] = _trecho(texto, termos)
+                except OSError:
+                    resultado["snippet"] = ""
+            resultados.append(resultado)
+        return resultados
+
+
+# Índices carregados por diretório, recarregados quando o arquivo em disco muda
+_indices: Dict[str, Tuple[Optional[int], SearchIndex]] = {}
+_lock = threading.Lock()
+
+
+def indice_busca(diretorio: str) -> SearchIndex:
+    """
+    Retorna o índice de um diretório, carregado uma vez por processo.
+
+    Se outro processo (o agente) regravou o índice, ele é recarregado; se
+    ainda não existir, é construído e gravado.
+
+    Args:
+        diretorio: O diretório da documentação
+
+    Returns:
+        SearchIndex: O índice
+    """
+    diretorio = os.path.abspath(diretorio)
+    arquivo = arquivo_indice(diretorio)
+    with _lock:
+        try:
+            mtime = os.stat(arquivo).st_mtime_ns
+        except OSError:
+            mtime = None
+        atual = _indices.get(diretorio)
+        if atual is not None and atual[0] == mtime and mtime is not None:
+            return atual[1]
+
+        indice = SearchIndex(diretorio)
+        if mtime is None or not indice.load():
+            indice.update()
+            try:
+                indice.save()
+                mtime = os.stat(arquivo).st_mtime_ns
+            except OSError as e:
+                logger.warning(f"Não foi possível gravar o índice de busca em {diretorio}: {e}")
+        _indices[diretorio] = (mtime, indice)
+        return indice
+
+
+def atualizar_indice_busca(diretorio: str, alterados: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """
+    Atualiza e grava o índice de busca após uma geração ou atualização.
+
+    Args:
+        diretorio: O diretório da documentação
+        alterados: Documentos escritos ou apagados; None verifica todos
+
+    Returns:
+        dict: success, indexed, removed, unchanged, documents e duration_seconds
+    """
+    inicio = time.perf_counter()
+    if not os.path.isdir(diretorio):
+        return {"success": False, "error": "DirectoryNotFound",
+                "message": f"Diretório não encontrado: {diretorio}"}
+    indice = SearchIndex(diretorio)
+    if not indice.load():
+        alterados = None
+    try:
+        os.remove(os.path.join(diretorio, ARQUIVO_LEGADO))
+    except OSError:
+        pass
+    contagem = indice.update(alterados)
+    if contagem["indexed"] or contagem["removed"] or not os.path.exists(indice.arquivo):
+        try:
+            indice.save()
+        except OSError as e:
+            logger.warning(f"Não foi possível gravar o índice de busca de {diretorio}: {e}")
+    resultado = {"success": True, **contagem, "documents": len(indice),
+                 "duration_seconds": time.perf_counter() - inicio}
+    logger.debug(f"Índice de busca: {contagem['indexed']} indexado(s), {contagem['removed']} removido(s)")
+    return resultado
+
+
+def buscar(diretorio: str, consulta: str, limite: int = LIMITE) -> Dict[str, Any]:
+    """
+    Busca na documentação gerada usando o índice local.
+
+    Args:
+        diretorio: O diretório da documentação
+        consulta: As palavras-chave
+        limite: Número máximo de resultados
+
+    Returns:
+        dict: success, query, results e took_ms
+    """
+    inicio = time.perf_counter()
+    if not os.path.isdir(diretorio):
+        return {"success": False, "error": "DirectoryNotFound",
+                "message": f"Diretório não encontrado: {diretorio}"}
+    resultados = indice_busca(diretorio).search(consulta, limite)
+    return {"success": True, "query": consulta, "results": resultados,
+            "took_ms": round((time.perf_counter() - inicio) * 1000, 2)}
+
+
+def main():
+    """Busca na documentação pela linha de comando."""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description="Documentação 4.0 - Busca local na documentação")
+    parser.add_argument("consulta", nargs="?", help="Palavras-chave")
+    parser.add_argument("--dir", "-d", default="docs", help="Diretório da documentação")
+    parser.add_argument("--limite", "-n", type=int, default=LIMITE, help="Número máximo de resultados")
+    parser.add_argument("--atualizar", action="store_true", help="Atualizar o índice antes de buscar")
+    parser.add_argument("--json", action="store_true", help="Saída em JSON")
+    args = parser.parse_args()
+
+    if args.atualizar or not args.consulta:
+        resultado = atualizar_indice_busca(args.dir)
+        if not resultado["success"]:
+            print(f"❌ {resultado['message']}")
+            return 1
+        print(f"✅ Índice: {resultado['documents']} documento(s), {resultado['indexed']} indexado(s), "
+              f"{resultado['removed']} removido(s) em {resultado['duration_seconds'] * 1000:.1f} ms")
+        if not args.consulta:
+            return 0
+
+    resultado = buscar(args.dir, args.consulta, args.limite)
+    if not resultado["success"]:
+        print(f"❌ {resultado['message']}")
+        return 1
+    if args.json:
+        print(json.dumps(resultado, ensure_ascii=False, indent=2))
+        return 0
+
+    print(f"{len(resultado['results'])} resultado(s) para \"{args.consulta}\" em {resultado['took_ms']} ms")
+    for item in resultado["results"]:
+        print(f"\n- {item['file']} ({item['relevance']:.2f}) {item['title']}")
+        if item.get("snippet"):
+            print(f"  {item['snippet']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,943 @@
+#!/usr/bin/env python3
+"""
+Documentação 4.0 - Cache de Consultas Endereçado por Conteúdo
+Campus Party 2025 - Lucas Dórea Cardoso e Aulus Diniz
+
+Este módulo implementa o cache das consultas ao Claude Code. A chave de cada
+entrada combina a pergunta normalizada, o diretório consultado, o estado do
+repositório (commit HEAD mais o hash dos arquivos modificados e não
+versionados) e o formato de saída. Assim, uma resposta deixa de valer assim
+que o código muda, mas continua válida por quanto tempo o código ficar igual.
+
+As entradas ficam em um backend plugável: SQLite em modo WAL (padrão, um
+único arquivo com suporte a leitores concorrentes de vários processos) ou
+o formato legado de um arquivo JSON por pergunta. Na frente do backend há
+uma camada LRU em memória, compartilhada por todas as consultas do processo.
+
+Uso (manutenção do cache):
+    python doc40_cache.py stats --dir ./meu-projeto
+    python doc40_cache.py migrate --dir ./meu-projeto
+    python doc40_cache.py export --dir ./meu-projeto --file cache.jsonl
+    python doc40_cache.py import --dir ./meu-projeto --file cache.jsonl
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import sqlite3
+import hashlib
+import argparse
+import threading
+import subprocess
+import logging
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, Iterator, Tuple
+
+from doc40_git import ler_head
+from doc40_watcher import localizar_git_dir
+
+logger = logging.getLogger('doc40-cache')
+
+# Versão do formato da chave; alterar invalida todas as entradas antigas
+KEY_VERSION = 1
+
+# Backend usado quando nenhum outro é especificado
+DEFAULT_BACKEND = "sqlite"
+
+# Tempo (segundos) em que o estado é reaproveitado sem nem conferir a assinatura
+STATE_TTL = 2.0
+
+# Tempo (segundos) em que a impressão digital da árvore de trabalho (um os.walk
+# com stat de cada arquivo) é reaproveitada enquanto HEAD e index não mudam
+TREE_TTL = float(os.environ.get("DOC40_TREE_TTL", "60"))
+
+# Limites padrão da camada em memória
+MEMORY_MAX_ENTRIES = 1000
+MEMORY_MAX_BYTES = 32 * 1024 * 1024
+
+# Diretórios ignorados ao calcular o estado do código
+IGNORED_DIRS = {'.git', '.doc40', '__pycache__', 'node_modules', '.venv', 'venv'}
+
+
+def normalizar_pergunta(pergunta: str) -> str:
+    """
+    Normaliza uma pergunta para uso na chave do cache.
+
+    Ignora diferenças de caixa, espaços repetidos e pontuação final.
+
+    Args:
+        pergunta: A pergunta em linguagem natural
+
+    Returns:
+        str: A pergunta normalizada
+    """
+    pergunta = re.sub(r"\s+", " ", pergunta.strip().lower())
+    return pergunta.rstrip("?!.; ")
+
+
+def _git(diretorio: str, *args: str) -> Optional[str]:
+    """Executa um comando Git no diretório e retorna o stdout, ou None em caso de erro."""
+    try:
+        result = subprocess.run(
+            ["git", *args],
+            cwd=diretorio,
+            capture_output=True,
+            text=True
+        )
+    except Exception as e:
+        logger.debug(f"Falha ao executar git {' '.join(args)}: {e}")
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout
+
+
+def _hash_arquivos(raiz: str, arquivos: List[str]) -> str:
+    """Calcula o hash do conteúdo de uma lista de arquivos relativos à raiz."""
+    digest = hashlib.sha256()
+    for arquivo in sorted(arquivos):
+        digest.update(arquivo.encode())
+        caminho = os.path.join(raiz, arquivo)
+        try:
+            with open(caminho, 'rb') as f:
+                for bloco in iter(lambda: f.read(65536), b""):
+                    digest.update(bloco)
+        except OSError:
+            digest.update(b"<removido>")
+    return digest.hexdigest()
+
+
+def _estado_arvore(diretorio: str) -> str:
+    """Calcula uma impressão digital (caminho, tamanho, mtime) de uma árvore sem Git."""
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(diretorio):
+        dirs[:] = sorted(d for d in dirs if d not in IGNORED_DIRS and not d.startswith('.'))
+        for file in sorted(files):
+            caminho = os.path.join(root, file)
+            try:
+                st = os.stat(caminho)
+            except OSError:
+                continue
+            digest.update(f"{os.path.relpath(caminho, diretorio)}:{st.st_size}:{st.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+def estado_repositorio(diretorio: str) -> str:
+    """
+    Identifica o estado atual do código em um diretório.
+
+    Em repositórios Git, usa o commit HEAD e, se a árvore de trabalho tiver
+    alterações, o hash do conteúdo dos arquivos modificados e não versionados.
+    Fora do Git, usa uma impressão digital dos arquivos da árvore.
+
+    Args:
+        diretorio: O diretório do projeto
+
+    Returns:
+        str: Identificador do estado do código
+    """
+    head = _git(diretorio, "rev-parse", "HEAD")
+    if head is None:
+        return "tree:" + _estado_arvore(diretorio)
+
+    estado = "git:" + head.strip()
+
+    status = _git(diretorio, "status", "--porcelain", "-z", "--untracked-files=all", "--", ".")
+    if status:
+        # Entradas: "XY caminho\0" (renomeações trazem o caminho de origem a seguir)
+        raiz = (_git(diretorio, "rev-parse", "--show-toplevel") or diretorio).strip()
+        arquivos = []
+        entradas = status.split("\0")
+        i = 0
+        while i < len(entradas):
+            entrada = entradas[i]
+            i += 1
+            if len(entrada) < 4:
+                continue
+            arquivos.append(entrada[3:])
+            if entrada[0] in "RC":
+                i += 1  # pular o caminho de origem
+        arquivos = [a for a in arquivos if not IGNORED_DIRS.intersection(a.split("/"))]
+        if arquivos:
+            estado += "+dirty:" + _hash_arquivos(raiz, arquivos)
+
+    return estado
+
+
+def _assinatura_git(diretorio: str) -> Optional[Tuple[Any, ...]]:
+    """Lê o HEAD (`doc40_git.ler_head`) e o `stat` do `.git/index`; None fora do Git."""
+    git_dir = localizar_git_dir(diretorio)
+    if git_dir is None:
+        return None
+    try:
+        info = os.stat(os.path.join(git_dir, "index"))
+        indice = (info.st_mtime_ns, info.st_size)
+    except OSError:
+        indice = None
+    return (ler_head(diretorio), indice)
+
+
+def assinatura_estado(diretorio: str) -> Optional[Tuple[Any, ...]]:
+    """
+    Assinatura barata do estado de um repositório Git, sem executar o Git.
+
+    Combina o HEAD lido de `.git` (`doc40_git.ler_head`), o `stat` do
+    `.git/index` e a impressão digital (caminho, tamanho, mtime) da árvore
+    de trabalho. Se ela não mudou, o resultado de `git status` também não.
+
+    Args:
+        diretorio: O diretório do projeto
+
+    Returns:
+        tuple: A assinatura, ou None fora de um repositório Git
+    """
+    git = _assinatura_git(diretorio)
+    if git is None:
+        return None
+    return git + (_estado_arvore(diretorio),)
+
+
+# Diretório -> (instante da conferência, instante da última varredura da árvore,
+#               HEAD/index, impressão digital da árvore, estado)
+_estados: Dict[str, Tuple[float, float, Optional[Tuple[Any, ...]], str, str]] = {}
+_estados_lock = threading.Lock()
+
+
+def estado_repositorio_recente(diretorio: str, validade: float = STATE_TTL,
+                               validade_arvore: float = TREE_TTL) -> str:
+    """
+    Retorna o estado do repositório, reaproveitando o último cálculo.
+
+    Cada conferência lê só o HEAD e o `stat` do `.git/index`. A árvore de
+    trabalho só é varrida de novo quando eles mudam ou quando a última
+    varredura tem mais de `validade_arvore` segundos; o Git (`rev-parse`,
+    `status`) só é executado quando a assinatura completa
+    (`assinatura_estado`) muda. Durante `validade` segundos após uma
+    conferência, nada é lido. Fora do Git, a impressão digital da árvore é o
+    estado e vale por `validade_arvore` segundos.
+
+    Uma edição ainda não adicionada ao index pode, portanto, levar até
+    `validade_arvore` segundos para mudar o estado (`DOC40_TREE_TTL`; 0
+    varre a árvore a cada conferência).
+
+    Args:
+        diretorio: O diretório do projeto
+        validade: Segundos em que o estado é reaproveitado sem conferir nada
+            (0 confere sempre)
+        validade_arvore: Segundos em que a varredura da árvore é reaproveitada
+            enquanto HEAD e index não mudam
+
+    Returns:
+        str: Identificador do estado do código
+    """
+    caminho = os.path.abspath(diretorio)
+    agora = time.monotonic()
+    with _estados_lock:
+        anterior = _estados.get(caminho)
+    if anterior is not None and agora - anterior[0] < validade:
+        return anterior[4]
+
+    git = _assinatura_git(caminho)
+    if anterior is not None and anterior[2] == git and agora - anterior[1] < validade_arvore:
+        with _estados_lock:
+            _estados[caminho] = (agora,) + anterior[1:]
+        return anterior[4]
+
+    arvore = _estado_arvore(caminho)
+    if git is None:
+        estado = "tree:" + arvore
+    elif anterior is not None and (anterior[2], anterior[3]) == (git, arvore):
+        estado = anterior[4]
+    else:
+        estado = estado_repositorio(caminho)
+        # O `git status` pode regravar o index; a assinatura guardada é a de depois
+        depois = _assinatura_git(caminho)
+        if depois is None or depois[0] != git[0] or _estado_arvore(caminho) != arvore:
+            return estado  # a árvore mudou durante o cálculo: não reaproveitar
+        git = depois
+    with _estados_lock:
+        _estados[caminho] = (agora, agora, git, arvore, estado)
+    return estado
+
+
+def chave_consulta(pergunta: str, diretorio: str, formato: str = "json",
+                   estado: Optional[str] = None) -> str:
+    """
+    Calcula a chave de cache de uma consulta.
+
+    Args:
+        pergunta: A pergunta em linguagem natural
+        diretorio: O diretório do projeto
+        formato: O formato de saída da consulta
+        estado: O estado do repositório (calculado se omitido)
+
+    Returns:
+        str: Hash SHA-256 que identifica a consulta
+    """
+    if estado is None:
+        estado = estado_repositorio(diretorio)
+    partes = [KEY_VERSION, normalizar_pergunta(pergunta), os.path.abspath(diretorio), estado, formato]
+    return hashlib.sha256(json.dumps(partes, ensure_ascii=False).encode()).hexdigest()
+
+
+class CacheBackend:
+    """
+    Interface dos backends de armazenamento do cache de consultas.
+
+    Cada entrada é um dicionário com as chaves `key`, `question`, `response`,
+    `created` e `hits`.
+    """
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Retorna a entrada da chave ou None (contabilizando o acerto, se suportado)."""
+        raise NotImplementedError
+
+    def set(self, key: str, entry: Dict[str, Any]) -> None:
+        """Grava (ou substitui) a entrada da chave."""
+        raise NotImplementedError
+
+    def entries(self) -> Iterator[Dict[str, Any]]:
+        """Itera sobre todas as entradas armazenadas."""
+        raise NotImplementedError
+
+    def count(self) -> int:
+        """Número de entradas armazenadas."""
+        return sum(1 for _ in self.entries())
+
+    def close(self) -> None:
+        """Libera os recursos do backend."""
+
+
+class JsonCacheBackend(CacheBackend):
+    """Backend legado: um arquivo JSON por pergunta em `.doc40/cache/queries`."""
+
+    def __init__(self, cache_dir: str):
+        """
+        Args:
+            cache_dir: Diretório dos arquivos de cache
+        """
+        self.cache_dir = cache_dir
+
+    def _path(self, key: str) -> str:
+        """Caminho do arquivo de uma entrada."""
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(key), 'r') as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error(f"Erro ao ler cache: {e}")
+            return None
+        entry["key"] = key
+        return entry
+
+    def set(self, key: str, entry: Dict[str, Any]) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        dados = {k: v for k, v in entry.items() if k != "key"}
+        temporario = self._path(key) + ".tmp"
+        try:
+            with open(temporario, 'w') as f:
+                json.dump(dados, f, ensure_ascii=False)
+            os.replace(temporario, self._path(key))
+        except OSError as e:
+            logger.error(f"Erro ao gravar cache: {e}")
+
+    def entries(self) -> Iterator[Dict[str, Any]]:
+        """
+        Itera sobre as entradas do diretório.
+
+        Arquivos antigos (chave md5 da pergunta, com a resposta pura) não
+        registram a pergunta e por isso são ignorados.
+        """
+        if not os.path.isdir(self.cache_dir):
+            return
+        with os.scandir(self.cache_dir) as it:
+            for item in it:
+                if not item.name.endswith(".json"):
+                    continue
+                key = item.name[:-len(".json")]
+                entry = self.get(key)
+                if entry is None or "response" not in entry or "created" not in entry:
+                    logger.debug(f"Entrada legada ignorada: {item.name}")
+                    continue
+                yield entry
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """Backend SQLite (modo WAL) com todas as entradas em um único arquivo."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS queries (
+            key TEXT PRIMARY KEY,
+            question TEXT,
+            response TEXT NOT NULL,
+            created REAL NOT NULL,
+            last_hit REAL,
+            hits INTEGER NOT NULL DEFAULT 0
+        )
+    """
+
+    # Acertos acumulados antes de gravar a contagem, e idade máxima da contagem pendente
+    HIT_FLUSH_COUNT = 32
+    HIT_FLUSH_SECONDS = 5.0
+    # Espera máxima (ms) pela trava de escrita ao gravar os acertos; se ocupada, tenta depois
+    HIT_BUSY_TIMEOUT_MS = 50
+
+    def __init__(self, path: str, timeout: float = 30):
+        """
+        Args:
+            path: Caminho do arquivo SQLite
+            timeout: Tempo máximo de espera por travas de escrita em segundos
+        """
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        # Todas as conexões abertas (uma por thread), para `close` fechar todas
+        self._conns: List[sqlite3.Connection] = []
+        self._conns_lock = threading.Lock()
+        self._generation = 0
+        # Acertos ainda não gravados: chave -> (quantidade, último acerto)
+        self._hits: Dict[str, tuple] = {}
+        self._hits_lock = threading.Lock()
+        self._hits_since = time.monotonic()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = self._conn()
+        conn.execute(self.SCHEMA)
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        """Conexão da thread atual (conexões SQLite não são compartilhadas entre threads)."""
+        atual = getattr(self._local, "conn", None)
+        if atual is not None and atual[0] == self._generation:
+            return atual[1]
+        # Usada só por esta thread; check_same_thread=False permite que `close` a feche
+        conn = sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conns_lock:
+            self._conns.append(conn)
+            self._local.conn = (self._generation, conn)
+        return conn
+
+    def _flush_hits(self, conn: sqlite3.Connection, force: bool = False) -> None:
+        """
+        Grava a contagem de acertos acumulada, sem esperar por escritores.
+
+        A contagem é secundária: se a trava de escrita estiver ocupada por mais
+        de HIT_BUSY_TIMEOUT_MS, os acertos ficam pendentes para a próxima vez.
+
+        Args:
+            conn: A conexão da thread atual
+            force: Grava mesmo abaixo dos limites de quantidade e idade
+        """
+        with self._hits_lock:
+            if not self._hits:
+                return
+            if not force and len(self._hits) < self.HIT_FLUSH_COUNT \
+                    and time.monotonic() - self._hits_since < self.HIT_FLUSH_SECONDS:
+                return
+            pendentes, self._hits = self._hits, {}
+            self._hits_since = time.monotonic()
+        try:
+            conn.execute(f"PRAGMA busy_timeout = {self.HIT_BUSY_TIMEOUT_MS}")
+            with conn:
+                conn.executemany(
+                    "UPDATE queries SET hits = hits + ?, last_hit = MAX(COALESCE(last_hit, 0), ?) WHERE key = ?",
+                    [(quantidade, ultimo, key) for key, (quantidade, ultimo) in pendentes.items()]
+                )
+        except sqlite3.Error as e:
+            logger.debug(f"Não foi possível registrar acertos no cache: {e}")
+            with self._hits_lock:
+                for key, (quantidade, ultimo) in pendentes.items():
+                    anterior = self._hits.get(key, (0, 0.0))
+                    self._hits[key] = (anterior[0] + quantidade, max(anterior[1], ultimo))
+        finally:
+            try:
+                conn.execute(f"PRAGMA busy_timeout = {int(self.timeout * 1000)}")
+            except sqlite3.Error:
+                pass
+
+    @staticmethod
+    def _entry(row) -> Dict[str, Any]:
+        """Converte uma linha da tabela em entrada."""
+        key, question, response, created, hits = row
+        return {
+            "key": key,
+            "question": question,
+            "response": json.loads(response),
+            "created": created,
+            "hits": hits
+        }
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT key, question, response, created, hits FROM queries WHERE key = ?",
+            (key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        # A contagem de acertos é secundária: acumulada em memória e gravada em
+        # lote, sem bloquear leitores por ela
+        with self._hits_lock:
+            quantidade, _ = self._hits.get(key, (0, 0.0))
+            self._hits[key] = (quantidade + 1, time.time())
+            pendentes = quantidade + 1
+        self._flush_hits(conn)
+
+        entry = self._entry(row)
+        entry["hits"] += pendentes
+        return entry
+
+    def set(self, key: str, entry: Dict[str, Any]) -> None:
+        self.set_many([dict(entry, key=key)])
+
+    def set_many(self, entries: List[Dict[str, Any]]) -> int:
+        """
+        Grava várias entradas em uma única transação.
+
+        Args:
+            entries: Entradas com as chaves `key`, `response` e `created`
+
+        Returns:
+            int: Número de entradas gravadas
+        """
+        conn = self._conn()
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO queries (key, question, response, created, hits) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (
+                            e["key"],
+                            e.get("question"),
+                            json.dumps(e["response"], ensure_ascii=False),
+                            e.get("created", time.time()),
+                            e.get("hits", 0)
+                        )
+                        for e in entries
+                    ]
+                )
+        except sqlite3.Error as e:
+            logger.error(f"Erro ao gravar cache: {e}")
+            return 0
+        # Entradas substituídas recomeçam a contagem
+        with self._hits_lock:
+            for e in entries:
+                self._hits.pop(e["key"], None)
+        return len(entries)
+
+    def entries(self) -> Iterator[Dict[str, Any]]:
+        self._flush_hits(self._conn(), force=True)
+        cursor = self._conn().execute(
+            "SELECT key, question, response, created, hits FROM queries ORDER BY created"
+        )
+        for row in cursor:
+            yield self._entry(row)
+
+    def count(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM queries").fetchone()[0]
+
+    def close(self) -> None:
+        """Grava os acertos pendentes e fecha as conexões de todas as threads."""
+        if self._hits:
+            try:
+                self._flush_hits(self._conn(), force=True)
+            except sqlite3.Error:
+                pass
+        with self._conns_lock:
+            conns, self._conns = self._conns, []
+            # Threads que voltarem a usar o backend abrem uma conexão nova
+            self._generation += 1
+        for conn in conns:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                logger.debug(f"Erro ao fechar conexão do cache: {e}")
+
+
+class MemoryLRU:
+    """Camada LRU em memória, limitada por número de entradas e por tamanho."""
+
+    def __init__(self, max_entries: int = MEMORY_MAX_ENTRIES, max_bytes: int = MEMORY_MAX_BYTES):
+        """
+        Args:
+            max_entries: Número máximo de entradas
+            max_bytes: Tamanho máximo aproximado (JSON serializado) em bytes
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._dados: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Busca um valor, marcando-o como usado recentemente.
+
+        Args:
+            key: A chave
+
+        Returns:
+            O valor armazenado ou None
+        """
+        with self._lock:
+            item = self._dados.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            self._dados.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def set(self, key: str, value: Any, size: Optional[int] = None) -> None:
+        """
+        Armazena um valor, descartando os menos usados se necessário.
+
+        Args:
+            key: A chave
+            value: O valor
+            size: Tamanho em bytes (estimado pelo JSON do valor se omitido)
+        """
+        if size is None:
+            size = len(json.dumps(value, ensure_ascii=False, default=str))
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            anterior = self._dados.pop(key, None)
+            if anterior is not None:
+                self.bytes -= anterior[1]
+            self._dados[key] = (value, size)
+            self.bytes += size
+            while len(self._dados) > self.max_entries or self.bytes > self.max_bytes:
+                _, (_, removido) = self._dados.popitem(last=False)
+                self.bytes -= removido
+                self.evictions += 1
+
+    def discard(self, key: str) -> None:
+        """Remove uma chave, se existir."""
+        with self._lock:
+            item = self._dados.pop(key, None)
+            if item is not None:
+                self.bytes -= item[1]
+
+    def clear(self) -> None:
+        """Remove todas as entradas (os contadores são mantidos)."""
+        with self._lock:
+            self._dados.clear()
+            self.bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Retorna os contadores da camada.
+
+        Returns:
+            dict: entries, bytes, hits, misses e evictions
+        """
+        with self._lock:
+            return {
+                "entries": len(self._dados),
+                "bytes": self.bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
+
+
+# Camada em memória compartilhada por todas as consultas do processo
+MEMORY_CACHE = MemoryLRU()
+
+
+# Backends abertos, reaproveitados entre consultas do mesmo processo
+_backends: Dict[tuple, CacheBackend] = {}
+_backends_lock = threading.Lock()
+
+
+def abrir_backend(directory: str, backend: str = DEFAULT_BACKEND) -> CacheBackend:
+    """
+    Abre (ou reaproveita) o backend de cache de um projeto.
+
+    Args:
+        directory: O diretório do projeto
+        backend: Tipo do backend (sqlite, json)
+
+    Returns:
+        CacheBackend: O backend do projeto
+    """
+    cache_root = os.path.join(os.path.abspath(directory), ".doc40", "cache")
+    chave = (cache_root, backend)
+    with _backends_lock:
+        if chave not in _backends:
+            if backend == "sqlite":
+                _backends[chave] = SQLiteCacheBackend(os.path.join(cache_root, "queries.sqlite3"))
+            elif backend == "json":
+                _backends[chave] = JsonCacheBackend(os.path.join(cache_root, "queries"))
+            else:
+                raise ValueError(f"Backend de cache não suportado: {backend}")
+        return _backends[chave]
+
+
+class QueryCache:
+    """Cache de respostas do Claude Code endereçado pelo estado do repositório."""
+
+    def __init__(self, directory: str, ttl: Optional[float] = None,
+                 backend: Any = DEFAULT_BACKEND, memory: Optional[MemoryLRU] = MEMORY_CACHE,
+                 state_ttl: float = STATE_TTL, tree_ttl: float = TREE_TTL):
+        """
+        Inicializa o cache de consultas de um projeto.
+
+        Args:
+            directory: O diretório do projeto
+            ttl: Validade máxima das entradas em segundos (padrão: sem expiração,
+                pois a chave já muda quando o código muda)
+            backend: Nome do backend (sqlite, json) ou instância de CacheBackend
+            memory: Camada LRU em memória (padrão: a compartilhada pelo processo;
+                None desativa)
+            state_ttl: Por quantos segundos reaproveitar o estado do repositório
+                sem conferir a assinatura (HEAD, index e stat da árvore)
+            tree_ttl: Por quantos segundos reaproveitar a varredura da árvore de
+                trabalho enquanto HEAD e index não mudam
+        """
+        self.directory = directory
+        self.ttl = ttl
+        self.memory = memory
+        self.state_ttl = state_ttl
+        self.tree_ttl = tree_ttl
+        if isinstance(backend, CacheBackend):
+            self.backend = backend
+        else:
+            self.backend = abrir_backend(directory, backend)
+
+    def key(self, question: str, output_format: str = "json") -> str:
+        """
+        Calcula a chave de uma pergunta no estado atual do repositório.
+
+        Args:
+            question: A pergunta em linguagem natural
+            output_format: O formato de saída da consulta
+
+        Returns:
+            str: A chave do cache
+        """
+        estado = estado_repositorio_recente(self.directory, self.state_ttl, self.tree_ttl)
+        return chave_consulta(question, self.directory, output_format, estado)
+
+    def _expirada(self, entry: Dict[str, Any]) -> bool:
+        """Indica se a entrada passou do ttl."""
+        return self.ttl is not None and time.time() - entry.get("created", 0) > self.ttl
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Busca uma resposta no cache, primeiro em memória e depois no backend.
+
+        Args:
+            key: A chave da consulta
+
+        Returns:
+            dict: A resposta armazenada ou None se não houver entrada válida
+        """
+        if self.memory is not None:
+            entry = self.memory.get(key)
+            if entry is not None:
+                if not self._expirada(entry):
+                    return entry["response"]
+                self.memory.discard(key)
+
+        entry = self.backend.get(key)
+        if entry is None or self._expirada(entry):
+            return None
+
+        if self.memory is not None:
+            self.memory.set(key, entry)
+        return entry.get("response")
+
+    def set(self, key: str, response: Dict[str, Any], question: Optional[str] = None) -> None:
+        """
+        Armazena uma resposta no cache.
+
+        Args:
+            key: A chave da consulta
+            response: A resposta do Claude Code
+            question: A pergunta original (apenas informativa)
+        """
+        entry = {"created": time.time(), "question": question, "response": response, "hits": 0}
+        self.backend.set(key, entry)
+        if self.memory is not None:
+            self.memory.set(key, dict(entry, key=key))
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Retorna os contadores da camada em memória.
+
+        Returns:
+            dict: entries, bytes, hits, misses e evictions (vazio sem camada em memória)
+        """
+        return self.memory.stats() if self.memory is not None else {}
+
+
+def exportar(backend: CacheBackend, arquivo: str) -> int:
+    """
+    Exporta todas as entradas de um backend para um arquivo JSONL.
+
+    Args:
+        backend: O backend de origem
+        arquivo: O arquivo JSONL de destino
+
+    Returns:
+        int: Número de entradas exportadas
+    """
+    total = 0
+    with open(arquivo, 'w') as f:
+        for entry in backend.entries():
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            total += 1
+    return total
+
+
+def importar(backend: CacheBackend, arquivo: str, lote: int = 500) -> int:
+    """
+    Importa entradas de um arquivo JSONL para um backend.
+
+    Args:
+        backend: O backend de destino
+        arquivo: O arquivo JSONL de origem
+        lote: Número de entradas gravadas por transação
+
+    Returns:
+        int: Número de entradas importadas
+    """
+    def linhas():
+        with open(arquivo, 'r') as f:
+            for linha in f:
+                if linha.strip():
+                    yield json.loads(linha)
+
+    return copiar_entradas(linhas(), backend, lote)
+
+
+def copiar_entradas(entradas: Iterator[Dict[str, Any]], destino: CacheBackend, lote: int = 500,
+                    copiadas: Optional[List[str]] = None) -> int:
+    """
+    Copia entradas para um backend, em lotes quando ele suportar.
+
+    Args:
+        entradas: As entradas a copiar
+        destino: O backend de destino
+        lote: Número de entradas gravadas por transação
+        copiadas: Lista que recebe as chaves efetivamente gravadas (opcional)
+
+    Returns:
+        int: Número de entradas copiadas
+    """
+    total = 0
+    pendentes = []
+
+    def gravar_lote() -> int:
+        gravadas = destino.set_many(pendentes)
+        if gravadas and copiadas is not None:
+            copiadas.extend(e["key"] for e in pendentes)
+        return gravadas
+
+    for entry in entradas:
+        if isinstance(destino, SQLiteCacheBackend):
+            pendentes.append(entry)
+            if len(pendentes) >= lote:
+                total += gravar_lote()
+                pendentes = []
+        else:
+            destino.set(entry["key"], entry)
+            if copiadas is not None:
+                copiadas.append(entry["key"])
+            total += 1
+    if pendentes:
+        total += gravar_lote()
+    return total
+
+
+def migrar_json(directory: str, remover: bool = False) -> int:
+    """
+    Migra o cache de um arquivo JSON por pergunta para o backend SQLite.
+
+    Entradas legadas que `JsonCacheBackend.entries` ignora (chave md5, sem a
+    pergunta) não são migradas e continuam no diretório mesmo com `remover`.
+
+    Args:
+        directory: O diretório do projeto
+        remover: Remover os arquivos JSON migrados
+
+    Returns:
+        int: Número de entradas migradas
+    """
+    origem = abrir_backend(directory, "json")
+    destino = abrir_backend(directory, "sqlite")
+    copiadas: List[str] = []
+    total = copiar_entradas(origem.entries(), destino, copiadas=copiadas)
+
+    if remover:
+        for key in copiadas:
+            try:
+                os.remove(origem._path(key))
+            except OSError as e:
+                logger.warning(f"Não foi possível remover {origem._path(key)}: {e}")
+
+    return total
+
+
+def main():
+    """Função principal: manutenção do cache de consultas."""
+    parser = argparse.ArgumentParser(
+        description="Documentação 4.0 - Manutenção do cache de consultas",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    subparsers = parser.add_subparsers(dest="command", help="Comando a executar")
+
+    for nome, ajuda in [("stats", "Exibir estatísticas do cache"),
+                        ("migrate", "Migrar o cache JSON legado para SQLite"),
+                        ("export", "Exportar o cache para JSONL"),
+                        ("import", "Importar o cache de um JSONL")]:
+        sub = subparsers.add_parser(nome, help=ajuda)
+        sub.add_argument("--dir", "-d", type=str, default=os.getcwd(),
+                         help="Diretório do projeto (padrão: diretório atual)")
+        sub.add_argument("--backend", "-b", type=str, default=DEFAULT_BACKEND,
+                         choices=["sqlite", "json"], help="Backend do cache")
+        if nome in ("export", "import"):
+            sub.add_argument("--file", "-f", type=str, required=True,
+                             help="Arquivo JSONL")
+        if nome == "migrate":
+            sub.add_argument("--remover", action="store_true",
+                             help="Remover os arquivos JSON migrados (entradas legadas sem a pergunta são mantidas)")
+
+    args = parser.parse_args()
+
+    if args.command == "migrate":
+        print(f"Entradas migradas: {migrar_json(args.dir, args.remover)}")
+    elif args.command == "export":
+        print(f"Entradas exportadas: {exportar(abrir_backend(args.dir, args.backend), args.file)}")
+    elif args.command == "import":
+        print(f"Entradas importadas: {importar(abrir_backend(args.dir, args.backend), args.file)}")
+    elif args.command == "stats":
+        backend = abrir_backend(args.dir, args.backend)
+        entradas = list(backend.entries())
+        print(f"Backend: {args.backend}")
+        print(f"Entradas: {len(entradas)}")
+        print(f"Acertos: {sum(e.get('hits', 0) for e in entradas)}")
+    else:
+        parser.print_help()
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
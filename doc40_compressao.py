@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Documentação 4.0 - Pré-compressão da Documentação Gerada
+Campus Party 2025 - Lucas Dórea Cardoso e Aulus Diniz
+
+Depois de cada geração ou atualização, grava ao lado de cada documento
+textual uma cópia comprimida (`openapi.json.gz` e, se o pacote `brotli`
+estiver instalado, `openapi.json.br`). O servidor da documentação
+(`doc40_servidor.py`) negocia `Accept-Encoding` e envia essas cópias
+diretamente, sem comprimir nada durante a requisição.
+
+Cada cópia recebe o mesmo mtime do original: uma cópia com mtime diferente
+está desatualizada, é refeita na próxima compressão e ignorada pelo
+servidor até lá. Arquivos inalterados custam apenas um `stat`.
+
+Uso:
+    python doc40_compressao.py --dir docs
+"""
+
+import os
+import sys
+import gzip
+import argparse
+import tempfile
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger('doc40-compressao')
+
+# Codificações na ordem de preferência: (nome em Accept-Encoding, sufixo)
+CODIFICACOES = (("br", ".br"), ("gzip", ".gz"))
+
+EXTENSOES_COMPRIMIVEIS = (".html", ".htm", ".md", ".json", ".yaml", ".yml", ".css",
+                          ".js", ".svg", ".txt", ".xml", ".csv")
+TAMANHO_MINIMO = 1024
+# A cópia só é mantida se economizar pelo menos 10%
+RAZAO_MAXIMA = 0.9
+NIVEL_GZIP = 9
+QUALIDADE_BROTLI = 11
+
+
+def codificacoes_disponiveis() -> List[Tuple[str, str]]:
+    """
+    Codificações que podem ser geradas neste ambiente.
+
+    Returns:
+        list: Pares (codificação, sufixo); brotli só aparece se o pacote estiver instalado
+    """
+    return [(nome, sufixo) for nome, sufixo in CODIFICACOES if nome != "br" or brotli is not None]
+
+
+def variante_atualizada(caminho: str, sufixo: str, fs: os.stat_result) -> Optional[os.stat_result]:
+    """
+    Verifica se a cópia comprimida de um arquivo corresponde à versão atual.
+
+    Args:
+        caminho: Caminho do arquivo original
+        sufixo: Sufixo da cópia (".gz" ou ".br")
+        fs: Resultado de os.stat do original
+
+    Returns:
+        os.stat_result: O stat da cópia, ou None se ela não existir ou estiver desatualizada
+    """
+    try:
+        fs_variante = os.stat(caminho + sufixo)
+    except OSError:
+        return None
+    return fs_variante if fs_variante.st_mtime_ns == fs.st_mtime_ns else None
+
+
+def _comprimir(dados: bytes, codificacao: str) -> bytes:
+    """Comprime os dados na codificação pedida (gzip sem data no cabeçalho, para ser reproduzível)."""
+    if codificacao == "br":
+        return brotli.compress(dados, quality=QUALIDADE_BROTLI)
+    return gzip.compress(dados, compresslevel=NIVEL_GZIP, mtime=0)
+
+
+def _gravar_atomico(destino: str, dados: bytes, fs: os.stat_result) -> None:
+    """Grava `destino` via arquivo temporário e copia permissões e mtime do original."""
+    fd, temporario = tempfile.mkstemp(prefix=".doc40-", dir=os.path.dirname(destino))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(dados)
+        os.chmod(temporario, fs.st_mode & 0o777)
+        os.utime(temporario, ns=(fs.st_atime_ns, fs.st_mtime_ns))
+        os.replace(temporario, destino)
+    except BaseException:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        raise
+
+
+def _remover(caminho: str) -> bool:
+    """Remove um arquivo, se existir."""
+    try:
+        os.remove(caminho)
+        return True
+    except OSError:
+        return False
+
+
+def comprimir_arquivo(caminho: str, minimo: int = TAMANHO_MINIMO) -> Dict[str, Any]:
+    """
+    Cria ou atualiza as cópias comprimidas de um arquivo.
+
+    Args:
+        caminho: Caminho do arquivo original
+        minimo: Tamanho mínimo, em bytes, para valer a pena comprimir
+
+    Returns:
+        dict: written (codificações gravadas), current (já atualizadas),
+            removed (cópias descartadas) e bytes (original e por codificação)
+    """
+    resultado = {"written": [], "current": [], "removed": [], "bytes": {}}
+    fs = os.stat(caminho)
+    codificacoes = codificacoes_disponiveis()
+
+    if fs.st_size < minimo:
+        for _, sufixo in CODIFICACOES:
+            if _remover(caminho + sufixo):
+                resultado["removed"].append(caminho + sufixo)
+        return resultado
+
+    # Cópias desatualizadas de codificações indisponíveis (ex.: .br sem o pacote brotli)
+    for nome, sufixo in CODIFICACOES:
+        if (nome, sufixo) not in codificacoes and os.path.isfile(caminho + sufixo) \
+                and variante_atualizada(caminho, sufixo, fs) is None:
+            _remover(caminho + sufixo)
+            resultado["removed"].append(caminho + sufixo)
+
+    pendentes = []
+    for nome, sufixo in codificacoes:
+        fs_variante = variante_atualizada(caminho, sufixo, fs)
+        if fs_variante is not None:
+            resultado["current"].append(nome)
+            resultado["bytes"][nome] = fs_variante.st_size
+        elif not os.path.exists(caminho + sufixo) or os.path.isfile(caminho + sufixo):
+            pendentes.append((nome, sufixo))
+    if not pendentes:
+        return resultado
+
+    with open(caminho, 'rb') as f:
+        dados = f.read()
+    # O arquivo pode ter sido reescrito entre o stat e a leitura
+    fs = os.stat(caminho)
+    resultado["bytes"]["identity"] = len(dados)
+
+    for nome, sufixo in pendentes:
+        comprimido = _comprimir(dados, nome)
+        if len(comprimido) > len(dados) * RAZAO_MAXIMA:
+            if _remover(caminho + sufixo):
+                resultado["removed"].append(caminho + sufixo)
+            continue
+        _gravar_atomico(caminho + sufixo, comprimido, fs)
+        resultado["written"].append(nome)
+        resultado["bytes"][nome] = len(comprimido)
+    return resultado
+
+
+def comprimir_diretorio(diretorio: str, extensoes=EXTENSOES_COMPRIMIVEIS,
+                        minimo: int = TAMANHO_MINIMO, workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Pré-comprime os documentos de um diretório (recursivamente).
+
+    Também apaga cópias órfãs, cujo original foi removido.
+
+    Args:
+        diretorio: O diretório da documentação
+        extensoes: Extensões dos arquivos comprimidos
+        minimo: Tamanho mínimo, em bytes, para valer a pena comprimir
+        workers: Threads de compressão (padrão: até 4)
+
+    Returns:
+        dict: success, files (arquivos considerados), written, current,
+            removed, original_bytes e compressed_bytes (por codificação, dos gravados)
+    """
+    if not os.path.isdir(diretorio):
+        return {"success": False, "error": "DirectoryNotFound",
+                "message": f"Diretório não encontrado: {diretorio}"}
+
+    sufixos = tuple(sufixo for _, sufixo in CODIFICACOES)
+    originais, orfaos = [], []
+    for raiz, pastas, arquivos in os.walk(diretorio):
+        pastas[:] = [p for p in pastas if not p.startswith(".")]
+        nomes = set(arquivos)
+        for nome in arquivos:
+            if nome.startswith(".doc40-"):
+                continue
+            if nome.endswith(sufixos):
+                base = nome[:-3]
+                if base.lower().endswith(tuple(extensoes)) and base not in nomes:
+                    orfaos.append(os.path.join(raiz, nome))
+            elif nome.lower().endswith(tuple(extensoes)):
+                originais.append(os.path.join(raiz, nome))
+
+    resumo = {"success": True, "files": len(originais), "written": 0, "current": 0,
+              "removed": [], "original_bytes": 0, "compressed_bytes": {}}
+    for orfao in orfaos:
+        if _remover(orfao):
+            resumo["removed"].append(orfao)
+
+    workers = workers or min(4, os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futuros = [(caminho, pool.submit(comprimir_arquivo, caminho, minimo)) for caminho in originais]
+        for caminho, futuro in futuros:
+            try:
+                item = futuro.result()
+            except OSError as e:
+                # Arquivo apagado ou reescrito durante a compressão
+                logger.warning(f"Não foi possível comprimir {caminho}: {e}")
+                continue
+            resumo["removed"].extend(item["removed"])
+            resumo["current"] += len(item["current"])
+            if item["written"]:
+                resumo["written"] += len(item["written"])
+                resumo["original_bytes"] += item["bytes"]["identity"]
+                for nome in item["written"]:
+                    resumo["compressed_bytes"][nome] = resumo["compressed_bytes"].get(nome, 0) + item["bytes"][nome]
+
+    if resumo["written"]:
+        logger.info(f"Pré-compressão: {resumo['written']} cópia(s) gravada(s) em {diretorio}")
+    return resumo
+
+
+def main():
+    """Pré-comprime um diretório de documentação pela linha de comando."""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description="Documentação 4.0 - Pré-compressão da documentação")
+    parser.add_argument("--dir", "-d", default="docs", help="Diretório da documentação")
+    parser.add_argument("--minimo", type=int, default=TAMANHO_MINIMO,
+                        help="Tamanho mínimo em bytes para comprimir")
+    args = parser.parse_args()
+
+    resumo = comprimir_diretorio(args.dir, minimo=args.minimo)
+    if not resumo["success"]:
+        print(f"❌ {resumo['message']}")
+        return 1
+
+    codificacoes = ", ".join(nome for nome, _ in codificacoes_disponiveis())
+    print(f"✅ {resumo['files']} arquivo(s) considerados ({codificacoes}): {resumo['written']} cópia(s) gravada(s), "
+          f"{resumo['current']} já atualizada(s), {len(resumo['removed'])} removida(s)")
+    if resumo["original_bytes"]:
+        for nome, tamanho in sorted(resumo["compressed_bytes"].items()):
+            print(f"   {nome}: {tamanho / max(resumo['original_bytes'], 1):.0%} do tamanho original")
+    if brotli is None:
+        print("   (instale o pacote brotli para gerar também cópias .br)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Documentação 4.0 - Stub Local do Claude Code CLI
+Campus Party 2025 - Lucas Dórea Cardoso e Aulus Diniz
+
+Imitação offline do `claude-code` usada em benchmarks e demonstrações sem
+rede ou API key. Simula o custo de inicialização do CLI (variável
+DOC40_FAKE_STARTUP, padrão 0.3s) e a latência de cada consulta
+(DOC40_FAKE_LATENCIA, padrão 0.05s).
+
+Uso:
+    python doc40_fake_claude_code.py --version
+    python doc40_fake_claude_code.py query --directory . --query "..." --output json
+    python doc40_fake_claude_code.py worker --stdio
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+
+VERSION = "claude-code 0.0.0-fake"
+
+STARTUP = float(os.environ.get("DOC40_FAKE_STARTUP", "0.3"))
+LATENCIA = float(os.environ.get("DOC40_FAKE_LATENCIA", "0.05"))
+
+
+def _inicializar() -> None:
+    """Simula a inicialização do CLI e a indexação do projeto."""
+    time.sleep(STARTUP)
+
+
+def _responder(diretorio: str, pergunta: str) -> dict:
+    """Gera uma resposta determinística para a pergunta."""
+    time.sleep(LATENCIA)
+
+    fontes = []
+    for root, dirs, files in os.walk(diretorio):
+        dirs[:] = [d for d in dirs if not d.startswith('.')]
+        for file in sorted(files):
+            if file.endswith('.py'):
+                fontes.append(os.path.relpath(os.path.join(root, file), diretorio))
+        if len(fontes) >= 3:
+            break
+
+    return {
+        "response": f"Resposta simulada para: {pergunta}",
+        "sources": [
+            {"file": fonte, "relevance": round(0.9 - i * 0.1, 2)}
+            for i, fonte in enumerate(fontes[:3])
+        ]
+    }
+
+
+def _worker_stdio() -> int:
+    """Atende requisições JSON delimitadas por linha até o fim de stdin."""
+    for linha in sys.stdin:
+        if not linha.strip():
+            continue
+        try:
+            mensagem = json.loads(linha)
+        except json.JSONDecodeError as e:
+            print(json.dumps({"id": None, "ok": False, "error": "JSONDecodeError", "message": str(e)}), flush=True)
+            continue
+
+        req_id = mensagem.get("id")
+        command = mensagem.get("command")
+        args = mensagem.get("args", {})
+
+        if command == "ping":
+            resposta = {"id": req_id, "ok": True, "result": "pong"}
+        elif command == "query":
+            resultado = _responder(args.get("directory", "."), args.get("query", ""))
+            resposta = {"id": req_id, "ok": True, "result": resultado}
+        else:
+            resposta = {"id": req_id, "ok": False, "error": "UnknownCommand",
+                        "message": f"Comando desconhecido: {command}"}
+
+        print(json.dumps(resposta, ensure_ascii=False), flush=True)
+    return 0
+
+
+def _gerar_documentos(diretorio: str, saida: str, nome: str = "README.md",
+                      arquivos: list = None) -> int:
+    """Escreve um documento simples para cada módulo Python (ou só para `arquivos`)."""
+    os.makedirs(saida, exist_ok=True)
+    modulos = []
+    for root, dirs, files in os.walk(diretorio):
+        dirs[:] = [d for d in dirs if not d.startswith('.') and os.path.join(root, d) != os.path.abspath(saida)]
+        for file in sorted(files):
+            if file.endswith('.py'):
+                modulos.append(os.path.relpath(os.path.join(root, file), diretorio))
+    if arquivos:
+        modulos = [m for m in modulos if m in arquivos]
+
+    for modulo in modulos:
+        time.sleep(LATENCIA)
+        print(f"Analisando {modulo}", flush=True)
+        destino = os.path.join(saida, os.path.splitext(os.path.basename(modulo))[0] + ".md")
+        with open(destino, 'w') as f:
+            f.write(f"# {modulo}\n\nDocumentação simulada para `{modulo}`.\n")
+        print(f"Escrevendo {os.path.relpath(destino, saida)}", flush=True)
+
+    if not arquivos:
+        with open(os.path.join(saida, nome), 'w') as f:
+            f.write("# Documentação\n\n" + "\n".join(f"- {m}" for m in modulos) + "\n")
+    return 0
+
+
+def main():
+    """Ponto de entrada do stub."""
+    if len(sys.argv) > 1 and sys.argv[1] == "--version":
+        print(VERSION)
+        return 0
+
+    parser = argparse.ArgumentParser(description="Stub local do claude-code")
+    subparsers = parser.add_subparsers(dest="command")
+
+    config_parser = subparsers.add_parser("config")
+    config_parser.add_argument("acao")
+    config_parser.add_argument("chave")
+
+    query_parser = subparsers.add_parser("query")
+    query_parser.add_argument("--directory", default=".")
+    query_parser.add_argument("--query", required=True)
+    query_parser.add_argument("--output", default="json")
+
+    worker_parser = subparsers.add_parser("worker")
+    worker_parser.add_argument("--stdio", action="store_true")
+
+    for nome in ("document", "document-api", "update-docs"):
+        doc_parser = subparsers.add_parser(nome)
+        doc_parser.add_argument("--directory", default=".")
+        doc_parser.add_argument("--format", default="markdown")
+        doc_parser.add_argument("--output-dir", default="docs")
+        doc_parser.add_argument("--commit", default="HEAD")
+        doc_parser.add_argument("--scope", default="all")
+        doc_parser.add_argument("--files", nargs="*")
+
+    generate_parser = subparsers.add_parser("generate")
+    generate_parser.add_argument("--prompt", required=True)
+    generate_parser.add_argument("--output", required=True)
+
+    args = parser.parse_args()
+
+    if args.command == "config":
+        print("api_key=sk_ant_fake")
+        return 0
+
+    _inicializar()
+
+    if args.command == "query":
+        print(json.dumps(_responder(args.directory, args.query), ensure_ascii=False))
+        return 0
+    if args.command == "worker":
+        return _worker_stdio()
+    if args.command in ("document", "document-api", "update-docs"):
+        return _gerar_documentos(args.directory, args.output_dir, arquivos=args.files)
+    if args.command == "generate":
+        with open(args.output, 'w') as f:
+            f.write(f'"""Código simulado."""\n\n# {args.prompt.strip().splitlines()[0]}\n')
+        return 0
+
+    parser.print_help()
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
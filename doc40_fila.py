@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Documentação 4.0 - Fila de Atualizações com Agrupamento
+Campus Party 2025 - Lucas Dórea Cardoso e Aulus Diniz
+
+Evita uma atualização de documentação por commit quando vários commits
+chegam em sequência (rebase, merge train, hooks em rajada):
+
+- `CoalescingUpdateQueue` junta as notificações de mudança do agente e só
+  libera uma atualização quando o repositório fica quieto por `debounce`
+  segundos, ou quando a primeira notificação pendente completa
+  `max_latency` segundos. Quem consome lê o HEAD nesse momento e documenta
+  de uma vez o intervalo `último commit..HEAD`.
+- `executar_agrupado` faz o mesmo entre processos (hooks post-commit): só
+  uma atualização roda por vez; as que chegam enquanto ela roda apenas
+  marcam que há trabalho pendente, e a que está rodando repete uma única
+  vez no final.
+- `registrar_agente` / `agente_em_execucao` usam um arquivo de PID para o
+  hook não competir com um agente já ativo.
+"""
+
+import os
+import time
+import threading
+import logging
+from typing import Any, Callable, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+logger = logging.getLogger('doc40-fila')
+
+# Padrões da fila do agente (segundos)
+DEBOUNCE = 2.0
+MAX_LATENCY = 30.0
+
+
+def _caminho_estado(diretorio: str, nome: str) -> str:
+    """Caminho de um arquivo de controle em `.doc40` do projeto."""
+    pasta = os.path.join(os.path.abspath(diretorio), ".doc40")
+    os.makedirs(pasta, exist_ok=True)
+    return os.path.join(pasta, nome)
+
+
+class CoalescingUpdateQueue:
+    """Agrupa notificações de mudança em lotes com debounce e latência máxima."""
+
+    def __init__(self, debounce: float = DEBOUNCE, max_latency: float = MAX_LATENCY):
+        """
+        Cria a fila.
+
+        Args:
+            debounce: Silêncio necessário após a última notificação, em segundos
+            max_latency: Espera máxima desde a primeira notificação pendente, em segundos
+        """
+        self.debounce = debounce
+        self.max_latency = max(max_latency, debounce)
+        self._condicao = threading.Condition()
+        self._primeira: Optional[float] = None
+        self._ultima: Optional[float] = None
+        self._pendentes = 0
+
+    def notify(self) -> None:
+        """Registra que algo mudou e uma atualização será necessária."""
+        with self._condicao:
+            agora = time.monotonic()
+            if self._primeira is None:
+                self._primeira = agora
+            self._ultima = agora
+            self._pendentes += 1
+            self._condicao.notify_all()
+
+    @property
+    def pending(self) -> int:
+        """Quantidade de notificações aguardando o próximo lote."""
+        with self._condicao:
+            return self._pendentes
+
+    def wait_batch(self, timeout: Optional[float] = None) -> int:
+        """
+        Aguarda até um lote ficar pronto.
+
+        Args:
+            timeout: Tempo máximo de espera em segundos (None espera indefinidamente)
+
+        Returns:
+            int: Número de notificações agrupadas no lote, ou 0 se o tempo acabou
+        """
+        limite = None if timeout is None else time.monotonic() + timeout
+        with self._condicao:
+            while True:
+                agora = time.monotonic()
+                espera = None
+                if self._primeira is not None:
+                    pronto_em = min(self._ultima + self.debounce, self._primeira + self.max_latency)
+                    if agora >= pronto_em:
+                        lote = self._pendentes
+                        self._primeira = self._ultima = None
+                        self._pendentes = 0
+                        return lote
+                    espera = pronto_em - agora
+                if limite is not None:
+                    if agora >= limite:
+                        return 0
+                    espera = limite - agora if espera is None else min(espera, limite - agora)
+                self._condicao.wait(espera)
+
+
+def registrar_agente(diretorio: str) -> str:
+    """
+    Registra o processo atual como o agente do projeto.
+
+    Args:
+        diretorio: O diretório do projeto
+
+    Returns:
+        str: Caminho do arquivo de PID
+    """
+    caminho = _caminho_estado(diretorio, "agent.pid")
+    with open(caminho, 'w') as f:
+        f.write(str(os.getpid()))
+    return caminho
+
+
+def remover_registro_agente(diretorio: str) -> None:
+    """
+    Remove o registro do agente, se pertencer ao processo atual.
+
+    Args:
+        diretorio: O diretório do projeto
+    """
+    caminho = os.path.join(os.path.abspath(diretorio), ".doc40", "agent.pid")
+    try:
+        with open(caminho, 'r') as f:
+            if f.read().strip() == str(os.getpid()):
+                os.remove(caminho)
+    except OSError:
+        pass
+
+
+def agente_em_execucao(diretorio: str) -> bool:
+    """
+    Indica se há um agente vivo cuidando do projeto.
+
+    Args:
+        diretorio: O diretório do projeto
+
+    Returns:
+        bool: True se o processo registrado ainda existir
+    """
+    caminho = os.path.join(os.path.abspath(diretorio), ".doc40", "agent.pid")
+    try:
+        with open(caminho, 'r') as f:
+            pid = int(f.read().strip())
+    except (OSError, ValueError):
+        return False
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+def executar_agrupado(diretorio: str, funcao: Callable[[], Any]) -> Optional[Any]:
+    """
+    Executa uma atualização sem sobrepor outra já em andamento.
+
+    Se outra atualização do projeto estiver rodando, apenas marca trabalho
+    pendente e retorna None; a atualização em andamento roda mais uma vez ao
+    terminar, cobrindo todos os commits que chegaram nesse meio-tempo.
+
+    Args:
+        diretorio: O diretório do projeto
+        funcao: A atualização (deve documentar o estado atual do HEAD)
+
+    Returns:
+        O resultado da última execução de `funcao`, ou None se foi agrupada
+    """
+    if fcntl is None:
+        return funcao()
+
+    pendente = _caminho_estado(diretorio, "update.pending")
+    resultado = None
+    primeira = True
+
+    with open(_caminho_estado(diretorio, "update.lock"), 'w') as trava:
+        while True:
+            try:
+                fcntl.flock(trava, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                # Quem detém a trava verá a marca de pendência ao terminar
+                open(pendente, 'w').close()
+                if primeira:
+                    logger.info("Atualização já em andamento; mudança agrupada na próxima rodada")
+                return resultado
+            primeira = False
+
+            try:
+                while True:
+                    if os.path.exists(pendente):
+                        os.remove(pendente)
+                    resultado = funcao()
+                    if not os.path.exists(pendente):
+                        break
+                    logger.info("Novos commits durante a atualização; atualizando novamente")
+            finally:
+                fcntl.flock(trava, fcntl.LOCK_UN)
+
+            # Uma marca criada entre a última verificação e a liberação da trava
+            if not os.path.exists(pendente):
+                return resultado
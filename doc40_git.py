@@ -0,0 +1,502 @@
+#!/usr/bin/env python3
+"""
+Documentação 4.0 - Metadados do Git em uma Única Chamada
+Campus Party 2025 - Lucas Dórea Cardoso e Aulus Diniz
+
+Obtém commits, autores, mensagens e arquivos alterados de um intervalo
+inteiro com um único `git log --name-status -z`, em vez de um
+`git rev-parse`, um `git diff --name-only` e um `git log -1` por ciclo (e um
+`stat` por arquivo). A saída é lida em blocos e interpretada por um parser
+incremental, então intervalos de centenas de commits não são carregados
+de uma vez.
+
+O HEAD é lido diretamente de `.git/HEAD`, das referências soltas e do
+`packed-refs` (`ler_head`), com cache pelo `stat` desses arquivos: saber
+se algo mudou custa algumas chamadas `stat`, sem executar o Git.
+
+Uso:
+    for commit in iter_commits("./meu-projeto", "abc123"):
+        print(commit.short, commit.subject, commit.changes)
+
+    intervalo = obter_intervalo("./meu-projeto", "abc123")
+    intervalo["changed"], intervalo["removed"]
+"""
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+import threading
+import logging
+from typing import Dict, Any, Optional, List, Tuple, Iterable, Iterator
+
+from doc40_watcher import localizar_git_dir, git_dir_comum
+
+logger = logging.getLogger('doc40-git')
+
+# Separadores do formato do `git log` (não aparecem em hashes, nomes ou e-mails)
+_INICIO = b"\x1e"
+_CAMPO = b"\x1f"
+
+# %m marca commits de fronteira com "-" quando usado com --boundary
+FORMATO_LOG = "%x1e%m%x1f%H%x1f%P%x1f%an%x1f%ae%x1f%at%x1f%B%x1f"
+
+# Tamanho dos blocos lidos do `git log`
+TAMANHO_BLOCO = 64 * 1024
+
+# Uma alteração: (status, caminho, caminho anterior em renomeações/cópias)
+Change = Tuple[str, str, Optional[str]]
+
+# Profundidade máxima de referências simbólicas (ref: -> ref: -> hash)
+MAX_SIMBOLICAS = 5
+
+
+class CommitInfo:
+    """Metadados compactos de um commit."""
+
+    __slots__ = ("sha", "parents", "author", "email", "timestamp", "message", "changes", "boundary")
+
+    def __init__(self, sha: str, parents: Tuple[str, ...], author: str, email: str,
+                 timestamp: int, message: str, boundary: bool = False):
+        self.sha = sha
+        self.parents = parents
+        self.author = author
+        self.email = email
+        self.timestamp = timestamp
+        self.message = message
+        self.changes: List[Change] = []
+        self.boundary = boundary
+
+    @property
+    def short(self) -> str:
+        """Hash abreviado."""
+        return self.sha[:8]
+
+    @property
+    def subject(self) -> str:
+        """Primeira linha da mensagem."""
+        return self.message.split("\n", 1)[0]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Representação serializável em JSON."""
+        return {
+            "sha": self.sha,
+            "parents": list(self.parents),
+            "author": self.author,
+            "email": self.email,
+            "timestamp": self.timestamp,
+            "message": self.message,
+            "changes": [{"status": s, "path": p, "old_path": o} for s, p, o in self.changes]
+        }
+
+    def __repr__(self) -> str:
+        return f"CommitInfo({self.short} {self.subject!r}, {len(self.changes)} alteração(ões))"
+
+
+def _cabecalho(token: bytes) -> CommitInfo:
+    """Interpreta o cabeçalho de um commit (o trecho entre \\x1e e o primeiro \\0)."""
+    marca, sha, pais, autor, email, data, mensagem = token[1:].split(_CAMPO, 6)
+    if mensagem.endswith(_CAMPO):
+        mensagem = mensagem[:-1]
+    return CommitInfo(
+        sha.decode("ascii"),
+        tuple(pais.decode("ascii").split()),
+        autor.decode("utf-8", "replace"),
+        email.decode("utf-8", "replace"),
+        int(data or 0),
+        mensagem.decode("utf-8", "replace").strip(),
+        boundary=marca == b"-"
+    )
+
+
+def parse_log_stream(blocos: Iterable[bytes]) -> Iterator[CommitInfo]:
+    """
+    Interpreta incrementalmente a saída de `git log -z --name-status --format=FORMATO_LOG`.
+
+    Args:
+        blocos: Pedaços consecutivos da saída, de qualquer tamanho
+
+    Yields:
+        CommitInfo: Cada commit, assim que todas as suas alterações foram lidas
+    """
+    atual: Optional[CommitInfo] = None
+    pendentes: List[str] = []   # status e caminhos de uma alteração incompleta
+    resto = b""
+
+    for bloco in blocos:
+        tokens = (resto + bloco).split(b"\0")
+        resto = tokens.pop()
+        for token in tokens:
+            if not pendentes:
+                # O `git log` separa o cabeçalho das alterações com "\n"
+                token = token.lstrip(b"\n")
+            if not pendentes and token.startswith(_INICIO):
+                if atual is not None:
+                    yield atual
+                atual = _cabecalho(token)
+                pendentes = []
+                continue
+            if atual is None:
+                continue
+
+            if not pendentes:
+                status = token.decode("ascii", "replace")
+                if status:
+                    pendentes.append(status)
+                continue
+
+            pendentes.append(os.fsdecode(token))
+            # Renomeações e cópias (R100, C075) trazem origem e destino
+            caminhos = 2 if pendentes[0][:1] in ("R", "C") else 1
+            if len(pendentes) == caminhos + 1:
+                if caminhos == 2:
+                    atual.changes.append((pendentes[0][:1], pendentes[2], pendentes[1]))
+                else:
+                    atual.changes.append((pendentes[0][:1], pendentes[1], None))
+                pendentes = []
+
+    resto = resto.lstrip(b"\n")
+    if resto.startswith(_INICIO):
+        if atual is not None:
+            yield atual
+        atual = _cabecalho(resto)
+    if atual is not None:
+        yield atual
+
+
+def iter_commits(diretorio: str, inicio: Optional[str] = None, fim: str = "HEAD",
+                 limite: Optional[int] = None, boundary: bool = False) -> Iterator[CommitInfo]:
+    """
+    Lista os commits de `inicio..fim` (do mais novo ao mais antigo) com um único `git log`.
+
+    Args:
+        diretorio: O diretório do repositório
+        inicio: Commit já processado (None lista todo o histórico de `fim`)
+        fim: Último commit do intervalo (padrão: HEAD)
+        limite: Número máximo de commits
+        boundary: Também produz os commits de fronteira (com `boundary=True`)
+
+    Yields:
+        CommitInfo: Os commits do intervalo
+
+    Raises:
+        RuntimeError: Se o `git log` falhar
+    """
+    comando = ["git", "log", "-z", "--name-status", "-M", f"--format={FORMATO_LOG}"]
+    if boundary:
+        comando.append("--boundary")
+    if limite is not None:
+        comando.append(f"--max-count={limite}")
+    comando.append(f"{inicio}..{fim}" if inicio else fim)
+    comando.append("--")
+
+    processo = subprocess.Popen(comando, cwd=diretorio, stdin=subprocess.DEVNULL,
+                                stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    try:
+        for commit in parse_log_stream(iter(lambda: processo.stdout.read(TAMANHO_BLOCO), b"")):
+            if boundary or not commit.boundary:
+                yield commit
+        erro = processo.stderr.read().decode("utf-8", "replace").strip()
+        if processo.wait() != 0:
+            raise RuntimeError(erro or f"git log terminou com código {processo.returncode}")
+    finally:
+        if processo.poll() is None:
+            processo.kill()
+            processo.wait()
+        processo.stdout.close()
+        processo.stderr.close()
+
+
+def resumir_alteracoes(commits: List[CommitInfo]) -> Tuple[List[str], List[str]]:
+    """
+    Calcula o efeito final de uma sequência de commits sobre os arquivos.
+
+    Args:
+        commits: Commits do mais novo ao mais antigo (ordem do `git log`)
+
+    Returns:
+        tuple: (arquivos alterados ou criados, arquivos removidos), ordenados
+    """
+    existe: Dict[str, bool] = {}
+    for commit in reversed(commits):
+        for status, caminho, anterior in commit.changes:
+            if status == "R" and anterior:
+                existe[anterior] = False
+            existe[caminho] = status != "D"
+    return (sorted(c for c, e in existe.items() if e),
+            sorted(c for c, e in existe.items() if not e))
+
+
+def _eh_hash(ref: str) -> bool:
+    """Indica se `ref` já é um hash completo (SHA-1 ou SHA-256)."""
+    return len(ref) in (40, 64) and all(c in "0123456789abcdef" for c in ref)
+
+
+def _rev_parse(diretorio: str, ref: str) -> Optional[str]:
+    """Resolve uma referência com o Git."""
+    resultado = subprocess.run(["git", "rev-parse", "--verify", "-q", f"{ref}^{{commit}}"],
+                               cwd=diretorio, capture_output=True, text=True)
+    return resultado.stdout.strip() if resultado.returncode == 0 else None
+
+
+class _LayoutNaoSuportado(Exception):
+    """O repositório usa algo que o leitor não interpreta; usar o Git."""
+
+
+class RefReader:
+    """
+    Resolve HEAD e referências lendo `.git` diretamente, sem executar o Git.
+
+    Lê `HEAD`, as referências soltas em `refs/` e o `packed-refs`. O
+    resultado fica em cache junto com o `stat` dos arquivos consultados, então
+    verificar se o HEAD mudou custa poucas chamadas `stat`. Formatos que o
+    leitor não interpreta (reftable, HEAD inválido, referência ausente) caem
+    no `git rev-parse`.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Prepara o leitor.
+
+        Args:
+            directory: Um diretório dentro do repositório
+        """
+        self.directory = os.path.abspath(directory)
+        self.git_dir = localizar_git_dir(self.directory)
+        self.common_dir = git_dir_comum(self.git_dir) if self.git_dir else None
+        self._lock = threading.Lock()
+        self._cache: Dict[str, Tuple[Tuple[Any, ...], Optional[str]]] = {}
+        self._packed: Optional[Tuple[Any, Dict[str, str]]] = None
+
+    @staticmethod
+    def _stat(caminho: str) -> Optional[Tuple[int, int, int]]:
+        """Assinatura (mtime, tamanho, inode) de um arquivo, ou None se não existir."""
+        try:
+            info = os.stat(caminho)
+        except OSError:
+            return None
+        return (info.st_mtime_ns, info.st_size, info.st_ino)
+
+    def _ler(self, caminho: str) -> Optional[str]:
+        """Conteúdo de um arquivo de referência, ou None se não existir."""
+        try:
+            with open(caminho, 'r', encoding='utf-8') as f:
+                return f.read().strip()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            raise _LayoutNaoSuportado(str(e))
+
+    def _packed_refs(self) -> Dict[str, str]:
+        """Conteúdo do `packed-refs`, relido apenas quando o arquivo muda."""
+        caminho = os.path.join(self.common_dir, "packed-refs")
+        assinatura = self._stat(caminho)
+        if self._packed is not None and self._packed[0] == assinatura:
+            return self._packed[1]
+
+        refs: Dict[str, str] = {}
+        if assinatura is not None:
+            with open(caminho, 'r', encoding='utf-8') as f:
+                for linha in f:
+                    if linha.startswith(("#", "^")):
+                        continue
+                    partes = linha.split()
+                    if len(partes) == 2:
+                        refs[partes[1]] = partes[0]
+        self._packed = (assinatura, refs)
+        return refs
+
+    def _arquivo_ref(self, nome: str) -> str:
+        """Caminho da referência solta (HEAD e afins ficam no git dir do worktree)."""
+        base = self.common_dir if nome.startswith("refs/") else self.git_dir
+        return os.path.join(base, *nome.split("/"))
+
+    def _resolver(self, nome: str) -> Tuple[Optional[str], List[str]]:
+        """Segue a referência até um hash, retornando também os arquivos consultados."""
+        if os.path.isdir(os.path.join(self.common_dir, "reftable")):
+            raise _LayoutNaoSuportado("reftable")
+
+        consultados = []
+        for _ in range(MAX_SIMBOLICAS):
+            caminho = self._arquivo_ref(nome)
+            consultados.append(caminho)
+            conteudo = self._ler(caminho)
+            if conteudo is None and nome.startswith("refs/"):
+                consultados.append(os.path.join(self.common_dir, "packed-refs"))
+                conteudo = self._packed_refs().get(nome)
+            if conteudo is None:
+                # Branch sem commits ou referência desconhecida
+                raise _LayoutNaoSuportado(f"referência não encontrada: {nome}")
+            if conteudo.startswith("ref:"):
+                nome = conteudo[4:].strip()
+                continue
+            if _eh_hash(conteudo):
+                return conteudo, consultados
+            raise _LayoutNaoSuportado(f"conteúdo inesperado em {caminho}")
+        raise _LayoutNaoSuportado(f"referências simbólicas demais a partir de {nome}")
+
+    def resolve(self, ref: str = "HEAD") -> Optional[str]:
+        """
+        Resolve `HEAD` ou um nome completo de referência (`refs/heads/main`).
+
+        Args:
+            ref: A referência
+
+        Returns:
+            str: O hash do commit, ou None se a referência não existir
+        """
+        if _eh_hash(ref):
+            return ref
+        if self.git_dir is None or not (ref == "HEAD" or ref.startswith("refs/")):
+            return _rev_parse(self.directory, ref)
+
+        with self._lock:
+            em_cache = self._cache.get(ref)
+            if em_cache is not None:
+                assinatura, sha = em_cache
+                if tuple((c, self._stat(c)) for c, _ in assinatura) == assinatura:
+                    return sha
+
+            try:
+                sha, consultados = self._resolver(ref)
+            except (_LayoutNaoSuportado, OSError, UnicodeDecodeError) as e:
+                logger.debug(f"Leitura direta de {ref} indisponível ({e}); usando git rev-parse")
+                return _rev_parse(self.directory, ref)
+
+            self._cache[ref] = (tuple((c, self._stat(c)) for c in consultados), sha)
+            return sha
+
+    def head(self) -> Optional[str]:
+        """
+        Hash do commit atual.
+
+        Returns:
+            str: O hash do HEAD, ou None se o repositório não tiver commits
+        """
+        return self.resolve("HEAD")
+
+
+# Um leitor por repositório, compartilhado pelo processo
+_leitores: Dict[str, RefReader] = {}
+_leitores_lock = threading.Lock()
+
+
+def leitor_refs(diretorio: str) -> RefReader:
+    """
+    Retorna o leitor de referências (com cache) de um repositório.
+
+    Args:
+        diretorio: O diretório do repositório
+
+    Returns:
+        RefReader: O leitor compartilhado
+    """
+    chave = os.path.abspath(diretorio)
+    with _leitores_lock:
+        leitor = _leitores.get(chave)
+        if leitor is None:
+            leitor = _leitores[chave] = RefReader(chave)
+        return leitor
+
+
+def ler_head(diretorio: str) -> Optional[str]:
+    """
+    Hash do HEAD lido diretamente de `.git` (sem processos enquanto nada muda).
+
+    Args:
+        diretorio: O diretório do repositório
+
+    Returns:
+        str: O hash do HEAD, ou None se não houver commits
+    """
+    return leitor_refs(diretorio).head()
+
+
+def resolver_ref(diretorio: str, ref: str) -> Optional[str]:
+    """
+    Converte uma referência (HEAD, branch, hash abreviado) no hash completo.
+
+    `HEAD` e nomes completos em `refs/` são lidos diretamente de `.git`; as
+    demais formas (`HEAD~2`, `main`, hashes abreviados) usam o Git.
+
+    Args:
+        diretorio: O diretório do repositório
+        ref: A referência
+
+    Returns:
+        str: O hash, ou None se a referência não existir
+    """
+    return leitor_refs(diretorio).resolve(ref)
+
+
+def obter_intervalo(diretorio: str, inicio: Optional[str], fim: str = "HEAD") -> Dict[str, Any]:
+    """
+    Obtém tudo o que o agente precisa saber sobre `inicio..fim` com um único `git log`.
+
+    Com hashes completos em `inicio` e `fim` (o caso do agente) nenhum outro
+    processo é executado; referências simbólicas são resolvidas antes.
+
+    Args:
+        diretorio: O diretório do repositório
+        inicio: Último commit documentado (None considera apenas o commit `fim`)
+        fim: Último commit do intervalo (padrão: HEAD)
+
+    Returns:
+        dict: head, commits (CommitInfo, do mais novo ao mais antigo), changed,
+            removed e linear (False se `inicio` não é ancestral de `fim`, como
+            após um rebase ou reset; nesse caso `changed`/`removed` não cobrem
+            os commits descartados)
+
+    Raises:
+        RuntimeError: Se o `git log` falhar
+    """
+    if inicio and not _eh_hash(inicio):
+        inicio = resolver_ref(diretorio, inicio) or inicio
+
+    if inicio:
+        todos = list(iter_commits(diretorio, inicio, fim, boundary=True))
+    else:
+        todos = list(iter_commits(diretorio, None, fim, limite=1))
+
+    commits = [c for c in todos if not c.boundary]
+    alterados, removidos = resumir_alteracoes(commits)
+
+    if commits:
+        head = commits[0].sha
+        linear = not inicio or any(c.sha == inicio for c in todos if c.boundary)
+    else:
+        # Intervalo vazio: `fim` é o próprio `inicio` ou um ancestral dele
+        head = resolver_ref(diretorio, fim)
+        linear = head == inicio
+
+    return {
+        "head": head,
+        "commits": commits,
+        "changed": alterados,
+        "removed": removidos,
+        "linear": linear
+    }
+
+
+def main():
+    """Mostra os commits e arquivos alterados de um intervalo."""
+    parser = argparse.ArgumentParser(description="Documentação 4.0 - Metadados do Git")
+    parser.add_argument("--dir", "-d", default=os.getcwd(), help="Diretório do repositório")
+    parser.add_argument("--desde", help="Commit inicial (exclusivo)")
+    parser.add_argument("--ate", default="HEAD", help="Commit final (padrão: HEAD)")
+    args = parser.parse_args()
+
+    try:
+        intervalo = obter_intervalo(args.dir, args.desde, args.ate)
+    except (OSError, RuntimeError) as e:
+        print(f"❌ {e}")
+        return 1
+
+    intervalo["commits"] = [c.to_dict() for c in intervalo["commits"]]
+    print(json.dumps(intervalo, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
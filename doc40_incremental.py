@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+"""
+Documentação 4.0 - Regeneração Incremental da Documentação
+Campus Party 2025 - Lucas Dórea Cardoso e Aulus Diniz
+
+Mantém um manifesto (`.doc40/manifest.json`) que liga cada arquivo-fonte
+aos documentos gerados a partir dele, junto com o hash do conteúdo usado
+na última geração. Quando o código muda, só os documentos dos arquivos
+realmente alterados são regenerados (`claude-code update-docs --files ...`);
+os documentos de arquivos removidos são apagados e todo o resto fica
+intacto.
+
+O mapeamento fonte → documentos é aprendido com os eventos de progresso da
+saída em streaming (doc40_stream): os arquivos escritos depois de
+"Analisando X" pertencem a X. Sem eventos, vale a convenção
+`<nome do módulo>.md` no diretório de saída.
+
+Uso:
+    python doc40_incremental.py --dir ./meu-projeto --saida docs
+    python doc40_incremental.py --dir ./meu-projeto --arquivos src/app.py src/db.py
+"""
+
+import os
+import sys
+import json
+import hashlib
+import argparse
+import subprocess
+import logging
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Callable, Tuple
+
+from doc40_stream import executar_com_progresso, progresso_console
+from doc40_compressao import comprimir_diretorio
+from doc40_indice import construir_indice
+from doc40_busca import atualizar_indice_busca
+
+logger = logging.getLogger('doc40-incremental')
+
+# Versão do formato do manifesto; versões diferentes forçam uma geração completa
+MANIFEST_VERSION = 1
+
+# Extensões consideradas código-fonte
+SOURCE_EXTENSIONS = {
+    '.py', '.js', '.jsx', '.ts', '.tsx', '.java', '.go', '.rb', '.php',
+    '.rs', '.c', '.h', '.cpp', '.hpp', '.cs', '.kt', '.swift', '.scala'
+}
+
+# Diretórios nunca considerados código-fonte
+IGNORED_DIRS = {'.git', '.doc40', '__pycache__', 'node_modules', '.venv', 'venv'}
+
+# Máximo de arquivos por chamada do claude-code (limita o tamanho da linha de comando)
+FILES_PER_CALL = 200
+
+
+def _git(diretorio: str, *args: str) -> Optional[str]:
+    """Executa um comando Git no diretório e retorna o stdout, ou None em caso de erro."""
+    try:
+        result = subprocess.run(["git", *args], cwd=diretorio, capture_output=True, text=True)
+    except OSError:
+        return None
+    return result.stdout if result.returncode == 0 else None
+
+
+def hash_arquivo(caminho: str) -> Optional[str]:
+    """
+    Calcula o hash do conteúdo de um arquivo.
+
+    Args:
+        caminho: Caminho do arquivo
+
+    Returns:
+        str: sha1 do conteúdo, ou None se o arquivo não existir
+    """
+    h = hashlib.sha1()
+    try:
+        with open(caminho, 'rb') as f:
+            for bloco in iter(lambda: f.read(1 << 16), b""):
+                h.update(bloco)
+    except OSError:
+        return None
+    return h.hexdigest()
+
+
+class DocManifest:
+    """Manifesto persistido das dependências fonte → documentos."""
+
+    def __init__(self, directory: str, output_dir: str):
+        """
+        Carrega (ou cria) o manifesto de um projeto.
+
+        Args:
+            directory: O diretório do projeto
+            output_dir: O diretório de saída da documentação
+        """
+        self.directory = os.path.abspath(directory)
+        self.output_dir = os.path.abspath(output_dir)
+        self.path = os.path.join(self.directory, ".doc40", "manifest.json")
+        self.commit: Optional[str] = None
+        self.sources: Dict[str, Dict[str, Any]] = {}
+        self.exists = False
+        self._carregar()
+
+    def _carregar(self) -> None:
+        """Lê o manifesto do disco, descartando versões ou saídas diferentes."""
+        try:
+            with open(self.path, 'r') as f:
+                dados = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Manifesto ilegível, será recriado: {e}")
+            return
+
+        if dados.get("version") != MANIFEST_VERSION:
+            logger.info("Manifesto de versão diferente, será recriado")
+            return
+        if os.path.abspath(os.path.join(self.directory, dados.get("output_dir", ""))) != self.output_dir:
+            logger.info("Manifesto de outro diretório de saída, será recriado")
+            return
+
+        self.commit = dados.get("commit")
+        self.sources = dados.get("sources", {})
+        self.exists = True
+
+    def save(self) -> None:
+        """Grava o manifesto de forma atômica."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        dados = {
+            "version": MANIFEST_VERSION,
+            "output_dir": os.path.relpath(self.output_dir, self.directory),
+            "commit": self.commit,
+            "updated": datetime.now().isoformat(timespec="seconds"),
+            "sources": self.sources
+        }
+        temporario = self.path + ".tmp"
+        with open(temporario, 'w') as f:
+            json.dump(dados, f, indent=2, sort_keys=True)
+        os.replace(temporario, self.path)
+        self.exists = True
+
+    def docs_for(self, source: str) -> List[str]:
+        """Documentos (relativos à saída) gerados a partir de um arquivo-fonte."""
+        return list(self.sources.get(source, {}).get("docs", []))
+
+    def record(self, source: str, docs: List[str]) -> None:
+        """Registra os documentos de um arquivo-fonte com o hash atual do arquivo."""
+        self.sources[source] = {
+            "hash": hash_arquivo(os.path.join(self.directory, source)),
+            "docs": sorted(set(docs))
+        }
+
+    def remove(self, source: str) -> List[str]:
+        """
+        Esquece um arquivo-fonte.
+
+        Returns:
+            list: Documentos que não pertencem a nenhum outro arquivo-fonte
+        """
+        docs = self.sources.pop(source, {}).get("docs", [])
+        compartilhados = {d for info in self.sources.values() for d in info.get("docs", [])}
+        return [d for d in docs if d not in compartilhados]
+
+    def is_current(self, source: str) -> bool:
+        """Indica se o arquivo-fonte não mudou desde a última geração."""
+        info = self.sources.get(source)
+        return bool(info) and info.get("hash") == hash_arquivo(os.path.join(self.directory, source))
+
+
+def eh_fonte(caminho: str, output_dir_rel: Optional[str] = None) -> bool:
+    """
+    Indica se um caminho relativo ao projeto é código-fonte documentável.
+
+    Args:
+        caminho: Caminho relativo ao diretório do projeto
+        output_dir_rel: Diretório de saída relativo ao projeto (ignorado)
+
+    Returns:
+        bool: True se o arquivo deve ter documentação
+    """
+    partes = caminho.replace(os.sep, "/").split("/")
+    if IGNORED_DIRS.intersection(partes[:-1]):
+        return False
+    if output_dir_rel and not output_dir_rel.startswith("..") and \
+            (caminho + "/").startswith(output_dir_rel.rstrip("/") + "/"):
+        return False
+    return os.path.splitext(caminho)[1] in SOURCE_EXTENSIONS
+
+
+def listar_fontes(diretorio: str, output_dir: str) -> List[str]:
+    """
+    Lista os arquivos-fonte de um projeto.
+
+    Args:
+        diretorio: O diretório do projeto
+        output_dir: O diretório de saída (ignorado na busca)
+
+    Returns:
+        list: Caminhos relativos ao projeto
+    """
+    saida_rel = os.path.relpath(os.path.abspath(output_dir), os.path.abspath(diretorio))
+    fontes = []
+    for root, dirs, files in os.walk(diretorio):
+        dirs[:] = [d for d in dirs if d not in IGNORED_DIRS and not d.startswith('.')]
+        for file in files:
+            caminho = os.path.relpath(os.path.join(root, file), diretorio)
+            if eh_fonte(caminho, saida_rel):
+                fontes.append(caminho)
+    return sorted(fontes)
+
+
+def arquivos_alterados_desde(diretorio: str, commit: Optional[str]) -> Optional[List[str]]:
+    """
+    Lista os arquivos alterados desde um commit, incluindo mudanças não commitadas.
+
+    Args:
+        diretorio: O diretório do projeto
+        commit: O commit de referência
+
+    Returns:
+        list: Caminhos relativos ao projeto, ou None se não for possível usar o Git
+    """
+    if not commit:
+        return None
+    alterados = _git(diretorio, "diff", "--name-only", "--relative", "-z", commit)
+    novos = _git(diretorio, "ls-files", "--others", "--exclude-standard", "-z")
+    if alterados is None or novos is None:
+        return None
+    return sorted({a for a in (alterados + novos).split("\0") if a})
+
+
+def _mapear_documentos(analisados: List[Tuple[Optional[str], str]], output_dir: str) -> Dict[str, List[str]]:
+    """Agrupa os documentos escritos pelo arquivo-fonte analisado antes deles."""
+    mapa: Dict[str, List[str]] = {}
+    for fonte, doc in analisados:
+        if fonte is None:
+            continue
+        if os.path.isabs(doc):
+            doc = os.path.relpath(doc, output_dir)
+        mapa.setdefault(fonte, []).append(doc)
+    return mapa
+
+
+def _documento_convencional(fonte: str, output_dir: str) -> List[str]:
+    """Documento `<módulo>.md` de um arquivo-fonte, se existir."""
+    nome = os.path.splitext(os.path.basename(fonte))[0] + ".md"
+    return [nome] if os.path.exists(os.path.join(output_dir, nome)) else []
+
+
+def _executar_lote(comando: List[str], progresso: Optional[Callable[[Dict[str, Any]], None]],
+                   log_parcial: str, cwd: Optional[str] = None) -> Tuple[Dict[str, Any], List[Tuple[Optional[str], str]]]:
+    """Executa o claude-code registrando os pares (fonte analisada, documento escrito)."""
+    pares: List[Tuple[Optional[str], str]] = []
+    atual: List[Optional[str]] = [None]
+
+    def acompanhar(evento: Dict[str, Any]) -> None:
+        if evento["type"] == "analyzed":
+            atual[0] = evento["file"]
+        elif evento["type"] == "written":
+            pares.append((atual[0], evento["file"]))
+        if progresso is not None:
+            progresso(evento)
+
+    return executar_com_progresso(comando, acompanhar, log_parcial, cwd=cwd), pares
+
+
+def atualizar_incremental(diretorio: str, saida: str = "docs",
+                          arquivos: Optional[List[str]] = None,
+                          commit: str = "HEAD", formato: str = "markdown",
+                          progresso: Optional[Callable[[Dict[str, Any]], None]] = progresso_console,
+                          completo: bool = False) -> Dict[str, Any]:
+    """
+    Regenera apenas a documentação afetada pelos arquivos alterados.
+
+    Sem manifesto (primeira execução) ou com `completo=True`, gera toda a
+    documentação e constrói o manifesto. Sem `arquivos`, usa o Git para
+    descobrir o que mudou desde o commit registrado no manifesto.
+
+    Args:
+        diretorio: O diretório do projeto
+        saida: O diretório de saída da documentação
+        arquivos: Arquivos alterados, relativos ao projeto (opcional)
+        commit: O commit sendo documentado
+        formato: O formato da documentação (usado na geração completa)
+        progresso: Callback chamado com cada evento de progresso (None desativa)
+        completo: Força a geração completa
+
+    Returns:
+        dict: success, mode (full, incremental ou noop), regenerated, removed,
+            skipped e duration_seconds
+    """
+    diretorio = os.path.abspath(diretorio)
+    saida = os.path.abspath(os.path.join(diretorio, saida))
+    os.makedirs(saida, exist_ok=True)
+    log_parcial = os.path.join(saida, "progresso.log")
+    saida_rel = os.path.relpath(saida, diretorio)
+
+    manifesto = DocManifest(diretorio, saida)
+    commit_id = (_git(diretorio, "rev-parse", commit) or "").strip() or None
+    duracao = 0.0
+
+    # Primeira execução: geração completa para construir o manifesto
+    if completo or not manifesto.exists:
+        logger.info(f"Geração completa da documentação de {diretorio}")
+        comando = ["claude-code", "document", "--directory", diretorio,
+                   "--format", formato, "--output-dir", saida]
+        resultado, pares = _executar_lote(comando, progresso, log_parcial, cwd=diretorio)
+        if resultado["returncode"] != 0:
+            return {"success": False, "error": "GenerationError",
+                    "message": resultado["stderr"], "duration_seconds": resultado["duration_seconds"]}
+
+        mapa = _mapear_documentos(pares, saida)
+        manifesto.sources = {}
+        for fonte in listar_fontes(diretorio, saida):
+            manifesto.record(fonte, mapa.get(fonte) or _documento_convencional(fonte, saida))
+        manifesto.commit = commit_id
+        manifesto.save()
+        construir_indice(saida)
+        atualizar_indice_busca(saida)
+        comprimir_diretorio(saida)
+        return {"success": True, "mode": "full", "regenerated": sorted(manifesto.sources),
+                "removed": [], "skipped": [], "duration_seconds": resultado["duration_seconds"]}
+
+    # Descobrir o que mudou
+    if arquivos is None:
+        arquivos = arquivos_alterados_desde(diretorio, manifesto.commit)
+        if arquivos is None:
+            arquivos = sorted(set(listar_fontes(diretorio, saida)) | set(manifesto.sources))
+    arquivos = [os.path.relpath(a, diretorio) if os.path.isabs(a) else os.path.normpath(a) for a in arquivos]
+    candidatos = sorted({a for a in arquivos if eh_fonte(a, saida_rel)})
+
+    regenerar, remover, inalterados = [], [], []
+    for fonte in candidatos:
+        if not os.path.exists(os.path.join(diretorio, fonte)):
+            if fonte in manifesto.sources:
+                remover.append(fonte)
+        elif manifesto.is_current(fonte):
+            inalterados.append(fonte)
+        else:
+            regenerar.append(fonte)
+
+    # Documentos de arquivos removidos
+    apagados = []
+    for fonte in remover:
+        for doc in manifesto.remove(fonte):
+            caminho = os.path.join(saida, doc)
+            if os.path.exists(caminho):
+                os.remove(caminho)
+                apagados.append(doc)
+        logger.info(f"Fonte removida: {fonte}")
+
+    # Regenerar apenas o que mudou, em lotes
+    escritos: List[str] = []
+    for inicio in range(0, len(regenerar), FILES_PER_CALL):
+        lote = regenerar[inicio:inicio + FILES_PER_CALL]
+        comando = ["claude-code", "update-docs", "--directory", diretorio,
+                   "--commit", commit_id or commit, "--output-dir", saida, "--files", *lote]
+        resultado, pares = _executar_lote(comando, progresso, log_parcial, cwd=diretorio)
+        duracao += resultado["duration_seconds"]
+        if resultado["returncode"] != 0:
+            manifesto.save()
+            return {"success": False, "error": "UpdateError", "message": resultado["stderr"],
+                    "regenerated": regenerar[:inicio], "removed": remover, "duration_seconds": duracao}
+
+        escritos.extend(doc for _, doc in pares)
+        mapa = _mapear_documentos(pares, saida)
+        for fonte in lote:
+            manifesto.record(fonte, mapa.get(fonte) or manifesto.docs_for(fonte)
+                             or _documento_convencional(fonte, saida))
+
+    if commit_id:
+        manifesto.commit = commit_id
+    manifesto.save()
+
+    # Índice dos diretórios afetados, índice de busca e cópias .gz/.br (só dos documentos reescritos)
+    if regenerar or remover:
+        construir_indice(saida, escritos + apagados)
+        atualizar_indice_busca(saida, escritos + apagados)
+        comprimir_diretorio(saida)
+
+    logger.info(f"Atualização incremental: {len(regenerar)} regenerados, {len(remover)} removidos, "
+                f"{len(inalterados)} inalterados")
+    return {
+        "success": True,
+        "mode": "incremental" if regenerar or remover else "noop",
+        "regenerated": regenerar,
+        "removed": remover,
+        "written_docs": escritos,
+        "deleted_docs": apagados,
+        "skipped": inalterados,
+        "duration_seconds": duracao
+    }
+
+
+def main():
+    """Executa uma atualização incremental pela linha de comando."""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description="Documentação 4.0 - Regeneração incremental")
+    parser.add_argument("--dir", "-d", default=os.getcwd(), help="Diretório do projeto")
+    parser.add_argument("--saida", "-o", default="docs", help="Diretório de saída")
+    parser.add_argument("--commit", "-c", default="HEAD", help="Commit documentado")
+    parser.add_argument("--arquivos", nargs="*", help="Arquivos alterados (padrão: detectar pelo Git)")
+    parser.add_argument("--completo", action="store_true", help="Forçar a geração completa")
+    args = parser.parse_args()
+
+    resultado = atualizar_incremental(args.dir, args.saida, args.arquivos, args.commit,
+                                      completo=args.completo)
+    if not resultado["success"]:
+        print(f"❌ Erro: {resultado['message']}")
+        return 1
+
+    print(f"✅ {resultado['mode']}: {len(resultado['regenerated'])} regenerado(s), "
+          f"{len(resultado['removed'])} removido(s), {len(resultado['skipped'])} inalterado(s) "
+          f"em {resultado['duration_seconds']:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
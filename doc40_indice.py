@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+Documentação 4.0 - Índice da Documentação (index.html)
+Campus Party 2025 - Lucas Dórea Cardoso e Aulus Diniz
+
+Gera o `index.html` do diretório de documentação, agrupando os arquivos por
+diretório (inclusive subdiretórios como `docs/api`) e por tipo. A árvore é
+lida em uma única varredura com `os.scandir` e o HTML é escrito em fluxo
+para um arquivo temporário, trocado no final; nada é montado em memória
+por concatenação, então o índice continua rápido com dezenas de milhares de
+arquivos.
+
+A listagem de cada diretório fica em `.doc40-indice.json`. Quando o agente
+informa quais documentos mudou, só os diretórios desses documentos são
+relidos e o índice é reescrito a partir do estado guardado. Um `index.html`
+que não foi gerado por este módulo nunca é sobrescrito.
+
+Uso:
+    construir_indice("docs")                                  # varredura completa
+    construir_indice("docs", alterados=["api/openapi.json"])  # incremental
+
+    python doc40_indice.py --dir docs [--alterados api/openapi.json]
+"""
+
+import os
+import sys
+import json
+import html
+import time
+import argparse
+import tempfile
+import logging
+from urllib.parse import quote
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger('doc40-indice')
+
+INDICE = "index.html"
+ESTADO = ".doc40-indice.json"
+VERSAO_ESTADO = 1
+# Comentário que identifica um index.html gerado por este módulo
+MARCA = "<!-- doc40-indice -->"
+# Texto do índice criado pelas versões anteriores do DocumentationServer
+MARCA_ANTIGA = "Documentação gerada automaticamente pelo sistema Documentação 4.0"
+
+# Grupos por tipo, na ordem da página; None reúne o restante
+TIPOS: List[Tuple[str, Optional[Tuple[str, ...]]]] = [
+    ("Documentação Markdown", (".md",)),
+    ("Documentação HTML", (".html", ".htm")),
+    ("API", (".json", ".yaml", ".yml")),
+    ("Outros Arquivos", None),
+]
+# Não listados: logs, cópias pré-comprimidas e arquivos ocultos
+IGNORADOS = (".log", ".gz", ".br")
+
+_CABECALHO = """<!DOCTYPE html>
+<html lang="pt-BR">
+""" + MARCA + """
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Documentação 4.0</title>
+    <style>
+        body { font-family: Arial, sans-serif; line-height: 1.6; margin: 0; padding: 20px; background-color: #f4f5f7; }
+        .container { max-width: 900px; margin: 0 auto; background-color: white; padding: 20px;
+                     border-radius: 5px; box-shadow: 0 2px 5px rgba(0,0,0,0.1); }
+        h1 { color: #2a67c2; border-bottom: 2px solid #eaecef; padding-bottom: 10px; }
+        h3 { color: #2a67c2; margin: 15px 0 5px; font-size: 1em; }
+        summary { cursor: pointer; font-weight: bold; color: #2a67c2; padding: 5px 0; }
+        details details { margin-left: 20px; }
+        ul { list-style-type: none; padding: 0; margin: 0; }
+        li { margin-bottom: 6px; padding: 5px 10px; background-color: #f6f8fa; border-radius: 3px; }
+        .tamanho { float: right; color: #6a737d; font-size: 0.85em; }
+        a { color: #2a67c2; text-decoration: none; }
+        a:hover { text-decoration: underline; }
+        footer { margin-top: 30px; font-size: 0.8em; color: #6a737d; text-align: center; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>Documentação 4.0</h1>
+"""
+
+_RODAPE = """        <footer>
+            <p>Gerado por Documentação 4.0 - Campus Party 2025</p>
+        </footer>
+    </div>
+</body>
+</html>
+"""
+
+
+def _listado(nome: str) -> bool:
+    """Indica se um arquivo aparece no índice."""
+    return not nome.startswith(".") and nome != INDICE and not nome.lower().endswith(IGNORADOS)
+
+
+_GRUPO_POR_EXTENSAO = {extensao: posicao for posicao, (_, extensoes) in enumerate(TIPOS)
+                       for extensao in extensoes or ()}
+
+
+def _tipo(nome: str) -> int:
+    """Posição do grupo de um arquivo em TIPOS."""
+    _, ponto, extensao = nome.rpartition(".")
+    return _GRUPO_POR_EXTENSAO.get("." + extensao.lower() if ponto else "", len(TIPOS) - 1)
+
+
+def _tamanho_legivel(tamanho: int) -> str:
+    """Formata um tamanho em bytes (ex.: 12.3 KB)."""
+    for unidade in ("B", "KB", "MB"):
+        if tamanho < 1024:
+            return f"{tamanho:.0f} {unidade}" if unidade == "B" else f"{tamanho:.1f} {unidade}"
+        tamanho /= 1024
+    return f"{tamanho:.1f} GB"
+
+
+def _ler_diretorio(raiz: str, relativo: str) -> Optional[Dict[str, Any]]:
+    """
+    Lê um diretório com uma chamada a os.scandir.
+
+    Args:
+        raiz: O diretório da documentação
+        relativo: O diretório lido, relativo à raiz ("" para a raiz)
+
+    Returns:
+        dict: subdirs (nomes) e files ([nome, tamanho]), ou None se o diretório não existir
+    """
+    subdirs, arquivos = [], []
+    try:
+        with os.scandir(os.path.join(raiz, relativo)) as entradas:
+            for entrada in entradas:
+                if entrada.name.startswith("."):
+                    continue
+                try:
+                    if entrada.is_dir(follow_symlinks=False):
+                        subdirs.append(entrada.name)
+                    elif entrada.is_file() and _listado(entrada.name):
+                        arquivos.append([entrada.name, entrada.stat().st_size])
+                except OSError:
+                    continue  # Removido durante a varredura
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    subdirs.sort()
+    arquivos.sort()
+    return {"subdirs": subdirs, "files": arquivos}
+
+
+def _varrer(raiz: str, relativo: str, diretorios: Dict[str, Dict[str, Any]]) -> None:
+    """Lê `relativo` e todos os seus subdiretórios (sem recursão na pilha do Python)."""
+    pendentes = [relativo]
+    while pendentes:
+        atual = pendentes.pop()
+        listagem = _ler_diretorio(raiz, atual)
+        if listagem is None:
+            continue
+        diretorios[atual] = listagem
+        pendentes.extend(os.path.join(atual, sub) if atual else sub for sub in listagem["subdirs"])
+
+
+def _remover_subarvore(relativo: str, diretorios: Dict[str, Dict[str, Any]]) -> None:
+    """Esquece um diretório e seus descendentes."""
+    prefixo = relativo + os.sep
+    for chave in [c for c in diretorios if c == relativo or c.startswith(prefixo)]:
+        del diretorios[chave]
+
+
+def _atualizar_diretorios(raiz: str, afetados: Iterable[str], diretorios: Dict[str, Dict[str, Any]]) -> int:
+    """
+    Relê apenas os diretórios afetados por uma atualização.
+
+    Um diretório que sumiu ou ainda não é conhecido é tratado pelo ancestral
+    conhecido mais próximo: subdiretórios novos são lidos por inteiro e os
+    que sumiram são esquecidos.
+
+    Returns:
+        int: Quantidade de diretórios relidos
+    """
+    relidos = set()
+    for relativo in afetados:
+        while relativo and (relativo not in diretorios or not os.path.isdir(os.path.join(raiz, relativo))):
+            relativo = os.path.dirname(relativo)
+        if relativo in relidos:
+            continue
+        relidos.add(relativo)
+
+        listagem = _ler_diretorio(raiz, relativo)
+        if listagem is None:
+            _remover_subarvore(relativo, diretorios)
+            continue
+        anteriores = set(diretorios.get(relativo, {}).get("subdirs", []))
+        diretorios[relativo] = listagem
+        for sub in anteriores - set(listagem["subdirs"]):
+            _remover_subarvore(os.path.join(relativo, sub) if relativo else sub, diretorios)
+        for sub in listagem["subdirs"]:
+            caminho = os.path.join(relativo, sub) if relativo else sub
+            if caminho not in diretorios:
+                _varrer(raiz, caminho, diretorios)
+    return len(relidos)
+
+
+def _total_arquivos(relativo: str, diretorios: Dict[str, Dict[str, Any]], totais: Dict[str, int]) -> int:
+    """Conta os arquivos listados em um diretório e seus descendentes (memoizado em `totais`)."""
+    if relativo not in totais:
+        listagem = diretorios.get(relativo, {"subdirs": [], "files": []})
+        totais[relativo] = len(listagem["files"]) + sum(
+            _total_arquivos(os.path.join(relativo, sub) if relativo else sub, diretorios, totais)
+            for sub in listagem["subdirs"])
+    return totais[relativo]
+
+
+def _escrever_html(destino: str, diretorios: Dict[str, Dict[str, Any]]) -> None:
+    """Escreve o índice em fluxo em um arquivo temporário e o coloca no lugar de `destino`."""
+    totais: Dict[str, int] = {}
+    _total_arquivos("", diretorios, totais)
+    fd, temporario = tempfile.mkstemp(prefix=".doc40-", suffix=".html", dir=os.path.dirname(destino))
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', buffering=1 << 16) as saida:
+            saida.write(_CABECALHO)
+            saida.write(f"        <p>Documentação gerada automaticamente pelo sistema Documentação 4.0 "
+                        f"({totais['']} arquivo(s)).</p>\n")
+
+            # Pilha de (diretório, profundidade); o marcador None fecha um <details>
+            pilha: List[Optional[Tuple[str, int]]] = [("", 0)]
+            while pilha:
+                item = pilha.pop()
+                if item is None:
+                    saida.write("</details>\n")
+                    continue
+                relativo, profundidade = item
+                listagem = diretorios.get(relativo)
+                if listagem is None or (relativo and totais.get(relativo, 0) == 0):
+                    continue
+
+                if relativo:
+                    nome = html.escape(os.path.basename(relativo))
+                    saida.write(f"<details{' open' if profundidade == 1 else ''}><summary>📁 {nome}/ "
+                                f"({totais[relativo]})</summary>\n")
+                    pilha.append(None)
+
+                grupos: List[List[Tuple[str, int]]] = [[] for _ in TIPOS]
+                for nome, tamanho in listagem["files"]:
+                    grupos[_tipo(nome)].append((nome, tamanho))
+                for (titulo, _), arquivos in zip(TIPOS, grupos):
+                    if not arquivos:
+                        continue
+                    saida.write(f"<h3>{titulo}</h3>\n<ul>\n")
+                    for nome, tamanho in arquivos:
+                        caminho = f"{relativo}/{nome}" if relativo else nome
+                        saida.write(f'<li><a href="{quote(caminho.replace(os.sep, "/"))}">{html.escape(nome)}</a>'
+                                    f'<span class="tamanho">{_tamanho_legivel(tamanho)}</span></li>\n')
+                    saida.write("</ul>\n")
+
+                for sub in reversed(listagem["subdirs"]):
+                    pilha.append((os.path.join(relativo, sub) if relativo else sub, profundidade + 1))
+
+            saida.write(_RODAPE)
+        os.chmod(temporario, 0o644)
+        os.replace(temporario, destino)
+    except BaseException:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        raise
+
+
+def _ler_estado(diretorio: str) -> Optional[Dict[str, Dict[str, Any]]]:
+    """Carrega as listagens guardadas, ou None se não houver estado válido."""
+    try:
+        with open(os.path.join(diretorio, ESTADO), 'r', encoding='utf-8') as f:
+            dados = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(dados, dict) or dados.get("version") != VERSAO_ESTADO:
+        return None
+    return dados.get("directories")
+
+
+def _gravar_estado(diretorio: str, diretorios: Dict[str, Dict[str, Any]]) -> None:
+    """Guarda as listagens para a próxima atualização incremental."""
+    caminho = os.path.join(diretorio, ESTADO)
+    temporario = caminho + ".tmp"
+    with open(temporario, 'w', encoding='utf-8') as f:
+        # json.dumps usa o codificador em C (json.dump escreve em pedaços, em Python puro)
+        f.write(json.dumps({"version": VERSAO_ESTADO, "directories": diretorios}, separators=(",", ":")))
+    os.replace(temporario, caminho)
+
+
+def indice_gerado(diretorio: str) -> bool:
+    """
+    Indica se o index.html do diretório pode ser (re)escrito por este módulo.
+
+    Args:
+        diretorio: O diretório da documentação
+
+    Returns:
+        bool: True se não houver index.html ou se ele tiver sido gerado aqui
+    """
+    try:
+        with open(os.path.join(diretorio, INDICE), 'r', encoding='utf-8', errors='replace') as f:
+            inicio = f.read(4096)
+        return MARCA in inicio or MARCA_ANTIGA in inicio
+    except FileNotFoundError:
+        return True
+    except OSError:
+        return False
+
+
+def construir_indice(diretorio: str, alterados: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """
+    Gera ou atualiza o index.html da documentação.
+
+    Args:
+        diretorio: O diretório da documentação
+        alterados: Documentos escritos ou apagados desde a última geração
+            (relativos ao diretório ou absolutos); None relê a árvore inteira
+
+    Returns:
+        dict: success, mode (full, incremental ou skipped), files, directories,
+            rescanned e duration_seconds
+    """
+    inicio = time.perf_counter()
+    diretorio = os.path.abspath(diretorio)
+    if not os.path.isdir(diretorio):
+        return {"success": False, "error": "DirectoryNotFound",
+                "message": f"Diretório não encontrado: {diretorio}"}
+    if not indice_gerado(diretorio):
+        logger.info(f"{INDICE} de {diretorio} não foi gerado pelo Documentação 4.0; mantido como está")
+        return {"success": True, "mode": "skipped", "files": 0, "directories": 0, "rescanned": 0,
+                "duration_seconds": time.perf_counter() - inicio}
+
+    diretorios = _ler_estado(diretorio) if alterados is not None else None
+    if diretorios is None or not os.path.exists(os.path.join(diretorio, INDICE)):
+        modo = "full"
+        diretorios = {}
+        _varrer(diretorio, "", diretorios)
+        relidos = len(diretorios)
+    else:
+        modo = "incremental"
+        afetados = set()
+        for caminho in alterados:
+            relativo = os.path.relpath(caminho, diretorio) if os.path.isabs(caminho) else os.path.normpath(caminho)
+            if relativo.startswith(os.pardir):
+                continue
+            afetados.add(os.path.dirname(relativo))
+        relidos = _atualizar_diretorios(diretorio, afetados, diretorios)
+
+    _escrever_html(os.path.join(diretorio, INDICE), diretorios)
+    _gravar_estado(diretorio, diretorios)
+
+    arquivos = sum(len(listagem["files"]) for listagem in diretorios.values())
+    duracao = time.perf_counter() - inicio
+    logger.debug(f"Índice {modo}: {arquivos} arquivo(s), {relidos} diretório(s) lido(s) em {duracao:.3f}s")
+    return {"success": True, "mode": modo, "files": arquivos, "directories": len(diretorios),
+            "rescanned": relidos, "duration_seconds": duracao}
+
+
+def main():
+    """Gera o índice de um diretório de documentação pela linha de comando."""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description="Documentação 4.0 - Índice da documentação")
+    parser.add_argument("--dir", "-d", default="docs", help="Diretório da documentação")
+    parser.add_argument("--alterados", nargs="*",
+                        help="Documentos alterados (atualização incremental)")
+    args = parser.parse_args()
+
+    resultado = construir_indice(args.dir, args.alterados)
+    if not resultado["success"]:
+        print(f"❌ {resultado['message']}")
+        return 1
+    if resultado["mode"] == "skipped":
+        print(f"⚠️ {INDICE} existente não foi gerado pelo Documentação 4.0; nada a fazer")
+        return 0
+
+    print(f"✅ Índice {resultado['mode']}: {resultado['files']} arquivo(s) em {resultado['directories']} "
+          f"diretório(s), {resultado['rescanned']} lido(s) em {resultado['duration_seconds'] * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
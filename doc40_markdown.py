@@ -0,0 +1,493 @@
+#!/usr/bin/env python3
+"""
+Documentação 4.0 - Renderização de Markdown no Servidor
+Campus Party 2025 - Lucas Dórea Cardoso e Aulus Diniz
+
+Converte os documentos `.md` gerados em páginas HTML para o navegador. Usa
+o pacote `markdown` (Python-Markdown) se estiver instalado; caso contrário,
+um renderizador próprio cobre o que a documentação gerada usa: títulos,
+parágrafos, listas (inclusive aninhadas), blocos de código com cerca,
+citações, tabelas, réguas e marcações inline (código, negrito, itálico,
+links e imagens).
+
+Os dois caminhos tratam o documento como não confiável (o texto vem de
+docstrings e da prosa gerada pelo Claude Code): HTML bruto é escapado,
+links com esquemas executáveis (`javascript:`, `vbscript:`, `data:`) viram
+"#" e atributos de evento (`onclick=...`) são descartados.
+
+`MarkdownCache` guarda as páginas renderizadas em memória (LRU limitado por
+número de páginas e bytes), com chave (caminho, mtime, tamanho): quando o
+agente reescreve um documento, a próxima requisição renderiza de novo e
+substitui a entrada antiga.
+
+Uso:
+    python doc40_markdown.py docs/README.md > README.html
+"""
+
+import os
+import re
+import sys
+import html
+import gzip
+import hashlib
+import argparse
+import threading
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import markdown
+    from markdown.extensions import Extension
+    from markdown.treeprocessors import Treeprocessor
+except ImportError:
+    markdown = None
+
+logger = logging.getLogger('doc40-markdown')
+
+# Limites do cache de páginas renderizadas
+MAX_PAGINAS = 256
+MAX_BYTES = 64 * 1024 * 1024
+NIVEL_GZIP = 6
+
+_CERCA = re.compile(r"^\s{0,3}(```+|~~~+)\s*([\w+#.-]*)")
+_TITULO = re.compile(r"^\s{0,3}(#{1,6})\s+(.*?)(?:\s+#+)?\s*$")
+_SUBLINHADO = re.compile(r"^\s{0,3}(=+|-+)\s*$")
+_REGUA = re.compile(r"^\s{0,3}([-*_])(?:\s*\1){2,}\s*$")
+_ITEM = re.compile(r"^(\s*)([-*+]|\d{1,9}[.)])\s+(.*)$")
+_SEPARADOR_TABELA = re.compile(r"^\s*\|?\s*:?-+:?\s*(\|\s*:?-+:?\s*)*\|?\s*$")
+_CODIGO_INLINE = re.compile(r"(`+)(.+?)\1")
+# Destino de link: aceita um nível de parênteses ("wiki/Foo_(bar)")
+_DESTINO = r"((?:[^()\s]|\([^()\s]*\))+)"
+_IMAGEM = re.compile(r"!\[([^\]]*)\]\(" + _DESTINO + r"\)")
+_LINK = re.compile(r"\[([^\]]+)\]\(" + _DESTINO + r"\)")
+_AUTOLINK = re.compile(r"&lt;(https?://[^\s&]+)&gt;")
+_NEGRITO = re.compile(r"(\*\*|__)(?=\S)(.+?)(?<=\S)\1")
+_ITALICO = re.compile(r"(?<![\w*])\*(?=\S)(.+?)(?<=\S)\*(?![\w*])|(?<![\w_])_(?=\S)(.+?)(?<=\S)_(?![\w_])")
+_RISCADO = re.compile(r"~~(?=\S)(.+?)(?<=\S)~~")
+
+_ESTILO = """
+        body { font-family: Arial, sans-serif; line-height: 1.6; margin: 0; padding: 20px; background-color: #f4f5f7; }
+        .container { max-width: 900px; margin: 0 auto; background-color: white; padding: 20px 30px;
+                     border-radius: 5px; box-shadow: 0 2px 5px rgba(0,0,0,0.1); }
+        h1, h2 { color: #2a67c2; border-bottom: 2px solid #eaecef; padding-bottom: 6px; }
+        h3, h4, h5, h6 { color: #2a67c2; }
+        a { color: #2a67c2; text-decoration: none; }
+        a:hover { text-decoration: underline; }
+        code { background-color: #f6f8fa; padding: 2px 4px; border-radius: 3px; font-size: 0.9em; }
+        pre { background-color: #f6f8fa; padding: 12px; border-radius: 5px; overflow-x: auto; }
+        pre code { padding: 0; }
+        blockquote { margin: 0; padding: 0 15px; color: #6a737d; border-left: 4px solid #dfe2e5; }
+        table { border-collapse: collapse; margin: 15px 0; }
+        th, td { border: 1px solid #dfe2e5; padding: 6px 12px; }
+        th { background-color: #f6f8fa; }
+        img { max-width: 100%; }
+        nav { font-size: 0.9em; margin-bottom: 10px; }
+        footer { margin-top: 30px; font-size: 0.8em; color: #6a737d; text-align: center; }
+"""
+
+
+def _url(destino: str) -> str:
+    """Escapa o destino de um link e neutraliza esquemas executáveis."""
+    # O navegador ignora entidades e caracteres de controle no esquema
+    # ("&#106;avascript:", "java\tscript:")
+    esquema = re.sub(r"[\x00-\x20]", "", html.unescape(html.unescape(destino))).lower()
+    if re.match(r"(javascript|vbscript|data):", esquema) and not esquema.startswith("data:image/"):
+        return "#"
+    return destino.replace('"', "%22")
+
+
+def _atributo(valor: str) -> str:
+    """Escapa, para um atributo entre aspas, um trecho já escapado como texto."""
+    return html.escape(html.unescape(valor), quote=True)
+
+
+def _inline(texto: str) -> str:
+    """
+    Renderiza as marcações inline de um trecho (o texto é escapado antes).
+
+    Args:
+        texto: O trecho em Markdown
+
+    Returns:
+        str: O trecho em HTML
+    """
+    codigos: List[str] = []
+
+    def guardar(trecho: str) -> str:
+        # Código e URLs ficam fora das regras de ênfase ("#classe__init__")
+        codigos.append(trecho)
+        return f"\x00{len(codigos) - 1}\x00"
+
+    texto = _CODIGO_INLINE.sub(lambda m: guardar(f"<code>{html.escape(m.group(2).strip())}</code>"), texto)
+    texto = html.escape(texto, quote=False)
+    texto = _IMAGEM.sub(lambda m: f'<img src="{guardar(_atributo(_url(m.group(2))))}" '
+                                  f'alt="{guardar(_atributo(m.group(1)))}">', texto)
+    texto = _LINK.sub(lambda m: f'<a href="{guardar(_atributo(_url(m.group(2))))}">{m.group(1)}</a>', texto)
+    texto = _AUTOLINK.sub(lambda m: f'<a href="{guardar(_atributo(m.group(1)))}">{guardar(m.group(1))}</a>', texto)
+    texto = _NEGRITO.sub(r"<strong>\2</strong>", texto)
+    texto = _ITALICO.sub(lambda m: f"<em>{m.group(1) or m.group(2)}</em>", texto)
+    texto = _RISCADO.sub(r"<del>\1</del>", texto)
+    return re.sub("\x00(\\d+)\x00", lambda m: codigos[int(m.group(1))], texto)
+
+
+def _ancora(texto: str, usadas: Dict[str, int]) -> str:
+    """Gera um id único para um título (estilo GitHub)."""
+    base = re.sub(r"[`*~\[\]()]", "", texto).strip().lower()
+    base = re.sub(r"[^\w\- ]", "", base)
+    base = re.sub(r"\s+", "-", base) or "secao"
+    if base in usadas:
+        usadas[base] += 1
+        return f"{base}-{usadas[base]}"
+    usadas[base] = 0
+    return base
+
+
+def _celulas(linha: str) -> List[str]:
+    """Separa as células de uma linha de tabela."""
+    linha = linha.strip()
+    if linha.startswith("|"):
+        linha = linha[1:]
+    if linha.endswith("|") and not linha.endswith("\\|"):
+        linha = linha[:-1]
+    return [c.strip().replace("\\|", "|") for c in re.split(r"(?<!\\)\|", linha)]
+
+
+def _tabela(linhas: List[str], i: int, saida: List[str]) -> int:
+    """Renderiza uma tabela a partir de `linhas[i]` e retorna a linha seguinte."""
+    cabecalho = _celulas(linhas[i])
+    alinhamentos = []
+    for celula in _celulas(linhas[i + 1]):
+        if celula.startswith(":") and celula.endswith(":"):
+            alinhamentos.append(' style="text-align: center"')
+        elif celula.endswith(":"):
+            alinhamentos.append(' style="text-align: right"')
+        else:
+            alinhamentos.append("")
+    alinhamentos += [""] * (len(cabecalho) - len(alinhamentos))
+
+    partes = ["<table>", "<thead><tr>"]
+    partes += [f"<th{alinhamentos[n]}>{_inline(c)}</th>" for n, c in enumerate(cabecalho)]
+    partes.append("</tr></thead>")
+    i += 2
+    corpo = []
+    while i < len(linhas) and "|" in linhas[i] and linhas[i].strip():
+        celulas = _celulas(linhas[i])[:len(cabecalho)]
+        celulas += [""] * (len(cabecalho) - len(celulas))
+        corpo.append("<tr>" + "".join(f"<td{alinhamentos[n]}>{_inline(c)}</td>"
+                                      for n, c in enumerate(celulas)) + "</tr>")
+        i += 1
+    if corpo:
+        partes += ["<tbody>"] + corpo + ["</tbody>"]
+    partes.append("</table>")
+    saida.append("".join(partes))
+    return i
+
+
+def _lista(linhas: List[str], i: int, saida: List[str]) -> int:
+    """Renderiza uma lista (e suas sublistas) a partir de `linhas[i]` e retorna a linha seguinte."""
+    primeiro = _ITEM.match(linhas[i])
+    recuo = len(primeiro.group(1))
+    ordenada = primeiro.group(2)[0].isdigit()
+    itens: List[List[str]] = []
+
+    while i < len(linhas):
+        m = _ITEM.match(linhas[i])
+        if m and len(m.group(1)) == recuo and m.group(2)[0].isdigit() == ordenada:
+            itens.append([_inline(m.group(3))])
+            i += 1
+        elif m and len(m.group(1)) > recuo and itens:
+            sublista: List[str] = []
+            i = _lista(linhas, i, sublista)
+            itens[-1].append(sublista[0])
+        elif itens and linhas[i].strip() and not m and linhas[i].startswith(" " * (recuo + 2)):
+            itens[-1][0] += " " + _inline(linhas[i].strip())
+            i += 1
+        elif not linhas[i].strip() and i + 1 < len(linhas) and _ITEM.match(linhas[i + 1]) \
+                and len(_ITEM.match(linhas[i + 1]).group(1)) >= recuo:
+            i += 1
+        else:
+            break
+
+    tag = "ol" if ordenada else "ul"
+    inicio = ""
+    if ordenada:
+        numero = int(primeiro.group(2)[:-1])
+        inicio = f' start="{numero}"' if numero != 1 else ""
+    saida.append(f"<{tag}{inicio}>" + "".join(f"<li>{''.join(partes)}</li>" for partes in itens) + f"</{tag}>")
+    return i
+
+
+def _renderizar_simples(texto: str, ancoras: Optional[Dict[str, int]] = None) -> str:
+    """
+    Renderizador Markdown usado quando o pacote `markdown` não está instalado.
+
+    Args:
+        texto: O documento em Markdown
+        ancoras: Ids de títulos já usados (compartilhado com citações aninhadas)
+
+    Returns:
+        str: O HTML do documento (sem <html>/<body>)
+    """
+    ancoras = {} if ancoras is None else ancoras
+    linhas = texto.replace("\r\n", "\n").replace("\t", "    ").split("\n")
+    saida: List[str] = []
+    paragrafo: List[str] = []
+
+    def fechar_paragrafo() -> None:
+        if paragrafo:
+            saida.append(f"<p>{_inline(' '.join(l.strip() for l in paragrafo))}</p>")
+            paragrafo.clear()
+
+    i = 0
+    while i < len(linhas):
+        linha = linhas[i]
+
+        cerca = _CERCA.match(linha)
+        if cerca:
+            fechar_paragrafo()
+            marcador, linguagem = cerca.group(1), cerca.group(2)
+            codigo = []
+            i += 1
+            while i < len(linhas) and not linhas[i].strip().startswith(marcador):
+                codigo.append(linhas[i])
+                i += 1
+            i += 1
+            classe = f' class="language-{html.escape(linguagem)}"' if linguagem else ""
+            conteudo = html.escape("\n".join(codigo))
+            saida.append(f"<pre><code{classe}>{conteudo}</code></pre>")
+            continue
+
+        if not linha.strip():
+            fechar_paragrafo()
+            i += 1
+            continue
+
+        titulo = _TITULO.match(linha)
+        if titulo:
+            fechar_paragrafo()
+            nivel, conteudo = len(titulo.group(1)), titulo.group(2)
+            saida.append(f'<h{nivel} id="{_ancora(conteudo, ancoras)}">{_inline(conteudo)}</h{nivel}>')
+            i += 1
+            continue
+
+        sublinhado = _SUBLINHADO.match(linha)
+        if sublinhado and len(paragrafo) == 1:
+            nivel = 1 if sublinhado.group(1)[0] == "=" else 2
+            conteudo = paragrafo.pop().strip()
+            saida.append(f'<h{nivel} id="{_ancora(conteudo, ancoras)}">{_inline(conteudo)}</h{nivel}>')
+            i += 1
+            continue
+
+        if _REGUA.match(linha):
+            fechar_paragrafo()
+            saida.append("<hr>")
+            i += 1
+            continue
+
+        if linha.lstrip().startswith(">"):
+            fechar_paragrafo()
+            citacao = []
+            while i < len(linhas) and linhas[i].lstrip().startswith(">"):
+                citacao.append(re.sub(r"^\s*>\s?", "", linhas[i]))
+                i += 1
+            saida.append(f"<blockquote>{_renderizar_simples(chr(10).join(citacao), ancoras)}</blockquote>")
+            continue
+
+        if "|" in linha and i + 1 < len(linhas) and "-" in linhas[i + 1] \
+                and _SEPARADOR_TABELA.match(linhas[i + 1]):
+            fechar_paragrafo()
+            i = _tabela(linhas, i, saida)
+            continue
+
+        if _ITEM.match(linha) and not paragrafo:
+            i = _lista(linhas, i, saida)
+            continue
+
+        paragrafo.append(linha)
+        i += 1
+
+    fechar_paragrafo()
+    return "\n".join(saida)
+
+
+if markdown is not None:
+    class _LimparAtributos(Treeprocessor):
+        """Neutraliza URLs perigosas e remove atributos de evento da árvore."""
+
+        def run(self, raiz):
+            for elemento in raiz.iter():
+                for nome in list(elemento.attrib):
+                    if nome.lower().startswith("on"):
+                        del elemento.attrib[nome]
+                    elif nome.lower() in ("href", "src"):
+                        elemento.set(nome, _url(elemento.get(nome)))
+
+    class _SemHtml(Extension):
+        """Desliga o HTML bruto do Python-Markdown (ele passa a ser escapado)."""
+
+        def extendMarkdown(self, md):
+            md.preprocessors.deregister("html_block", strict=False)
+            md.inlinePatterns.deregister("html", strict=False)
+            # Depois de attr_list (8), toc (5) e do unescape (0)
+            md.treeprocessors.register(_LimparAtributos(md), "doc40_limpar", -1)
+
+
+def renderizar_markdown(texto: str) -> str:
+    """
+    Converte Markdown em HTML.
+
+    Args:
+        texto: O documento em Markdown
+
+    Returns:
+        str: O HTML do documento (sem <html>/<body>)
+    """
+    if markdown is not None:
+        return markdown.markdown(texto, extensions=["extra", "sane_lists", "toc", _SemHtml()])
+    return _renderizar_simples(texto)
+
+
+def renderizar_pagina(texto: str, titulo: str) -> str:
+    """
+    Gera a página HTML completa de um documento Markdown.
+
+    Args:
+        texto: O documento em Markdown
+        titulo: Título usado se o documento não tiver um título de nível 1
+
+    Returns:
+        str: A página HTML
+    """
+    titulo_doc = _TITULO.match(next((l for l in texto.splitlines() if l.startswith("# ")), ""))
+    if titulo_doc:
+        titulo = re.sub(r"[`*_]", "", titulo_doc.group(2))
+    return f"""<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{html.escape(titulo)}</title>
+    <style>{_ESTILO}    </style>
+</head>
+<body>
+    <div class="container">
+        <nav><a href="/">← Documentação 4.0</a></nav>
+{renderizar_markdown(texto)}
+        <footer>
+            <p>Gerado por Documentação 4.0 - Campus Party 2025</p>
+        </footer>
+    </div>
+</body>
+</html>
+"""
+
+
+class PaginaRenderizada:
+    """Uma página renderizada, com ETag e versão gzip calculada sob demanda."""
+
+    __slots__ = ("html", "etag", "mtime", "_gzip")
+
+    def __init__(self, conteudo: bytes, mtime: float):
+        self.html = conteudo
+        self.etag = f'"{hashlib.sha1(conteudo).hexdigest()}"'
+        self.mtime = mtime
+        self._gzip: Optional[Tuple[bytes, str]] = None
+
+    def comprimida(self) -> Tuple[bytes, str]:
+        """
+        Versão gzip da página (comprimida uma única vez).
+
+        Returns:
+            tuple: (bytes comprimidos, ETag da versão comprimida)
+        """
+        if self._gzip is None:
+            self._gzip = (gzip.compress(self.html, compresslevel=NIVEL_GZIP, mtime=0),
+                          self.etag[:-1] + '-gzip"')
+        return self._gzip
+
+
+class MarkdownCache:
+    """Páginas renderizadas em um LRU limitado, com chave (caminho, mtime, tamanho)."""
+
+    def __init__(self, max_paginas: int = MAX_PAGINAS, max_bytes: int = MAX_BYTES):
+        """
+        Cria o cache.
+
+        Args:
+            max_paginas: Número máximo de páginas em memória
+            max_bytes: Total máximo de HTML em memória (páginas maiores não são guardadas)
+        """
+        self.max_paginas = max_paginas
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._itens: "OrderedDict[str, Tuple[Tuple[int, int], PaginaRenderizada]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._itens)
+
+    def obter(self, caminho: str) -> PaginaRenderizada:
+        """
+        Retorna a página de um documento, renderizando-o se ele mudou.
+
+        Args:
+            caminho: Caminho do arquivo .md
+
+        Returns:
+            PaginaRenderizada: A página
+
+        Raises:
+            OSError: Se o arquivo não puder ser lido
+        """
+        with open(caminho, 'rb') as f:
+            fs = os.fstat(f.fileno())
+            assinatura = (fs.st_mtime_ns, fs.st_size)
+            with self._lock:
+                item = self._itens.get(caminho)
+                if item is not None and item[0] == assinatura:
+                    self._itens.move_to_end(caminho)
+                    self.hits += 1
+                    return item[1]
+                self.misses += 1
+            dados = f.read()
+
+        texto = dados.decode("utf-8", errors="replace")
+        titulo = os.path.splitext(os.path.basename(caminho))[0]
+        pagina = PaginaRenderizada(renderizar_pagina(texto, titulo).encode("utf-8"), fs.st_mtime)
+
+        with self._lock:
+            antigo = self._itens.pop(caminho, None)
+            if antigo is not None:
+                self._bytes -= len(antigo[1].html)
+            if len(pagina.html) <= self.max_bytes:
+                self._itens[caminho] = (assinatura, pagina)
+                self._bytes += len(pagina.html)
+                while len(self._itens) > self.max_paginas or self._bytes > self.max_bytes:
+                    _, (_, removida) = self._itens.popitem(last=False)
+                    self._bytes -= len(removida.html)
+        return pagina
+
+
+def main():
+    """Renderiza um arquivo Markdown para a saída padrão."""
+    parser = argparse.ArgumentParser(description="Documentação 4.0 - Renderização de Markdown")
+    parser.add_argument("arquivo", help="Arquivo .md")
+    args = parser.parse_args()
+
+    try:
+        with open(args.arquivo, 'r', encoding='utf-8', errors='replace') as f:
+            texto = f.read()
+    except OSError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+
+    titulo = os.path.splitext(os.path.basename(args.arquivo))[0]
+    sys.stdout.write(renderizar_pagina(texto, titulo))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+Documentação 4.0 - Pool de Workers Persistentes do Claude Code
+Campus Party 2025 - Lucas Dórea Cardoso e Aulus Diniz
+
+Este módulo mantém um conjunto de processos `claude-code` de longa duração
+que conversam por um protocolo JSON delimitado por linha (stdin/stdout),
+evitando pagar a inicialização do CLI e a reindexação do projeto a cada
+pergunta. Inclui verificação de saúde periódica e recriação automática
+de workers que morrem ou travam.
+
+Protocolo (uma mensagem JSON por linha):
+    requisição: {"id": 1, "command": "query", "args": {"directory": "...", "query": "..."}}
+    resposta:   {"id": 1, "ok": true, "result": {...}}
+    erro:       {"id": 1, "ok": false, "error": "QueryError", "message": "..."}
+    saúde:      {"id": 2, "command": "ping"} -> {"id": 2, "ok": true, "result": "pong"}
+"""
+
+import os
+import sys
+import json
+import time
+import queue
+import argparse
+import itertools
+import subprocess
+import threading
+import logging
+from typing import Dict, Any, Optional, List
+
+logger = logging.getLogger('doc40-pool')
+
+# Comando padrão para iniciar um worker persistente
+DEFAULT_WORKER_COMMAND = ["claude-code", "worker", "--stdio"]
+
+# Caminho do stub local usado para benchmarks offline
+FAKE_CLAUDE_CODE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "doc40_fake_claude_code.py")
+
+
+class WorkerError(Exception):
+    """Erro de comunicação com um worker do Claude Code."""
+
+
+class _Worker:
+    """Processo `claude-code` persistente com leitura assíncrona de stdout."""
+
+    def __init__(self, comando: List[str], nome: str):
+        """
+        Inicia o processo do worker.
+
+        Args:
+            comando: Comando para iniciar o worker
+            nome: Nome do worker (usado nos logs)
+        """
+        self.nome = nome
+        self.comando = comando
+        self._ids = itertools.count(1)
+        self._respostas: "queue.Queue[Optional[str]]" = queue.Queue()
+        self.processo = subprocess.Popen(
+            comando,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            bufsize=1
+        )
+        threading.Thread(target=self._ler_stdout, daemon=True).start()
+        threading.Thread(target=self._ler_stderr, daemon=True).start()
+
+    def _ler_stdout(self) -> None:
+        """Encaminha cada linha de stdout para a fila de respostas."""
+        for linha in self.processo.stdout:
+            self._respostas.put(linha)
+        self._respostas.put(None)  # EOF: o processo terminou
+
+    def _ler_stderr(self) -> None:
+        """Encaminha o stderr do worker para o log."""
+        for linha in self.processo.stderr:
+            logger.debug(f"[{self.nome}] {linha.rstrip()}")
+
+    def vivo(self) -> bool:
+        """Indica se o processo ainda está em execução."""
+        return self.processo.poll() is None
+
+    def enviar(self, command: str, args: Optional[Dict[str, Any]] = None,
+               timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Envia uma requisição e aguarda a resposta correspondente.
+
+        Args:
+            command: O comando do protocolo (query, ping, ...)
+            args: Argumentos do comando
+            timeout: Tempo máximo de espera em segundos
+
+        Returns:
+            dict: A mensagem de resposta do worker
+
+        Raises:
+            WorkerError: Se o worker morrer, travar ou responder algo inválido
+        """
+        if not self.vivo():
+            raise WorkerError(f"{self.nome} não está em execução")
+
+        req_id = next(self._ids)
+        mensagem = {"id": req_id, "command": command, "args": args or {}}
+        try:
+            self.processo.stdin.write(json.dumps(mensagem, ensure_ascii=False) + "\n")
+            self.processo.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            raise WorkerError(f"{self.nome}: falha ao enviar requisição: {e}")
+
+        limite = None if timeout is None else time.monotonic() + timeout
+        while True:
+            restante = None if limite is None else max(0.0, limite - time.monotonic())
+            try:
+                linha = self._respostas.get(timeout=restante)
+            except queue.Empty:
+                raise WorkerError(f"{self.nome}: tempo esgotado após {timeout}s")
+
+            if linha is None:
+                raise WorkerError(f"{self.nome}: processo terminou inesperadamente")
+
+            try:
+                resposta = json.loads(linha)
+            except json.JSONDecodeError:
+                logger.debug(f"[{self.nome}] linha ignorada: {linha.rstrip()}")
+                continue
+
+            # Respostas atrasadas de requisições que expiraram são descartadas
+            if resposta.get("id") == req_id:
+                return resposta
+
+    def encerrar(self) -> None:
+        """Encerra o processo do worker."""
+        try:
+            if self.vivo():
+                self.processo.stdin.close()
+                try:
+                    self.processo.wait(timeout=2)
+                except subprocess.TimeoutExpired:
+                    self.processo.kill()
+                    self.processo.wait()
+        except Exception as e:
+            logger.debug(f"Erro ao encerrar {self.nome}: {e}")
+
+
+class ClaudeCodeWorkerPool:
+    """Pool de processos `claude-code` persistentes."""
+
+    def __init__(self, tamanho: int = 2, comando: Optional[List[str]] = None,
+                 timeout: float = 300, intervalo_saude: float = 30):
+        """
+        Inicializa o pool e inicia os workers.
+
+        Args:
+            tamanho: Número de workers persistentes
+            comando: Comando para iniciar cada worker (padrão: claude-code worker --stdio)
+            timeout: Tempo máximo por requisição em segundos
+            intervalo_saude: Intervalo entre verificações de saúde em segundos (0 desativa)
+        """
+        if tamanho < 1:
+            raise ValueError("O pool precisa de pelo menos um worker")
+
+        self.tamanho = tamanho
+        self.comando = comando or DEFAULT_WORKER_COMMAND
+        self.timeout = timeout
+        self.intervalo_saude = intervalo_saude
+        self.estatisticas = {"requests": 0, "errors": 0, "respawns": 0}
+
+        self._lock = threading.Lock()
+        self._contador = itertools.count(1)
+        self._livres: "queue.Queue[_Worker]" = queue.Queue()
+        self._fechado = threading.Event()
+
+        for _ in range(tamanho):
+            self._livres.put(self._novo_worker())
+
+        self._thread_saude = None
+        if intervalo_saude > 0:
+            self._thread_saude = threading.Thread(target=self._monitorar_saude, daemon=True)
+            self._thread_saude.start()
+
+        logger.info(f"Pool iniciado com {tamanho} worker(s): {' '.join(self.comando)}")
+
+    def _novo_worker(self) -> _Worker:
+        """Cria um novo processo worker."""
+        return _Worker(self.comando, f"worker-{next(self._contador)}")
+
+    def _recriar(self, worker: _Worker, motivo: str) -> _Worker:
+        """
+        Encerra um worker defeituoso e inicia outro no lugar.
+
+        Raises:
+            WorkerError: Se o novo processo não puder ser iniciado (o worker
+                encerrado continua ocupando a vaga e é recriado no próximo uso)
+        """
+        logger.warning(f"Recriando {worker.nome}: {motivo}")
+        worker.encerrar()
+        with self._lock:
+            self.estatisticas["respawns"] += 1
+        try:
+            return self._novo_worker()
+        except OSError as e:
+            raise WorkerError(f"não foi possível iniciar um novo worker: {e}")
+
+    def executar(self, command: str, args: Optional[Dict[str, Any]] = None,
+                 timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Executa um comando em um worker livre.
+
+        Args:
+            command: O comando do protocolo
+            args: Argumentos do comando
+            timeout: Tempo máximo em segundos (padrão: timeout do pool)
+
+        Returns:
+            dict: O resultado do comando ou um dicionário com a chave "error"
+        """
+        if self._fechado.is_set():
+            return {"error": "PoolClosed", "message": "O pool de workers foi encerrado"}
+
+        timeout = self.timeout if timeout is None else timeout
+        worker = self._livres.get()
+        try:
+            with self._lock:
+                self.estatisticas["requests"] += 1
+
+            try:
+                if not worker.vivo():
+                    worker = self._recriar(worker, "processo não está em execução")
+            except WorkerError as e:
+                logger.error(str(e))
+                with self._lock:
+                    self.estatisticas["errors"] += 1
+                return {"error": "WorkerError", "message": str(e)}
+
+            try:
+                resposta = worker.enviar(command, args, timeout)
+            except WorkerError as e:
+                with self._lock:
+                    self.estatisticas["errors"] += 1
+                try:
+                    worker = self._recriar(worker, str(e))
+                except WorkerError as erro:
+                    logger.error(str(erro))
+                return {"error": "WorkerError", "message": str(e)}
+
+            if not resposta.get("ok"):
+                with self._lock:
+                    self.estatisticas["errors"] += 1
+                return {
+                    "error": resposta.get("error", "CommandError"),
+                    "message": resposta.get("message", "Erro desconhecido")
+                }
+
+            return resposta.get("result")
+        finally:
+            self._livres.put(worker)
+
+    def query(self, directory: str, question: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Consulta o código usando um worker persistente.
+
+        Args:
+            directory: O diretório do projeto
+            question: A pergunta em linguagem natural
+            timeout: Tempo máximo em segundos
+
+        Returns:
+            dict: A resposta no mesmo formato de `claude-code query --output json`
+        """
+        resultado = self.executar(
+            "query",
+            {"directory": os.path.abspath(directory), "query": question, "output": "json"},
+            timeout
+        )
+        if not isinstance(resultado, dict):
+            return {"error": "JSONDecodeError", "message": "Resposta inválida do worker"}
+        return resultado
+
+    def verificar_saude(self, timeout: float = 5) -> int:
+        """
+        Envia ping para os workers ociosos e recria os que não respondem.
+
+        Um worker por vez sai do pool e volta logo após o ping, então as
+        consultas continuam usando os demais durante a verificação.
+
+        Args:
+            timeout: Tempo máximo de resposta ao ping em segundos
+
+        Returns:
+            int: Número de workers recriados
+        """
+        recriados = 0
+        for _ in range(self._livres.qsize()):
+            try:
+                worker = self._livres.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                try:
+                    resposta = worker.enviar("ping", timeout=timeout)
+                    if not resposta.get("ok"):
+                        raise WorkerError(resposta.get("message", "ping falhou"))
+                except WorkerError as e:
+                    worker = self._recriar(worker, str(e))
+                    recriados += 1
+            except WorkerError as e:
+                logger.error(str(e))
+            finally:
+                self._livres.put(worker)
+
+        return recriados
+
+    def _monitorar_saude(self) -> None:
+        """Loop de verificação de saúde executado em segundo plano."""
+        while not self._fechado.wait(self.intervalo_saude):
+            try:
+                self.verificar_saude()
+            except Exception as e:
+                logger.error(f"Erro na verificação de saúde do pool: {e}")
+
+    def close(self) -> None:
+        """Encerra todos os workers do pool."""
+        if self._fechado.is_set():
+            return
+        self._fechado.set()
+
+        for _ in range(self.tamanho):
+            try:
+                worker = self._livres.get(timeout=self.timeout)
+            except queue.Empty:
+                break
+            worker.encerrar()
+
+        logger.info("Pool de workers encerrado")
+
+    def __enter__(self) -> "ClaudeCodeWorkerPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def benchmark(workers: int, consultas: int, diretorio: str, fake: bool = True) -> Dict[str, float]:
+    """
+    Compara chamadas avulsas de `claude-code query` com o pool persistente.
+
+    Args:
+        workers: Tamanho do pool
+        consultas: Número de consultas por modo
+        diretorio: Diretório do projeto consultado
+        fake: Usar o stub local em vez do claude-code real
+
+    Returns:
+        dict: Tempos totais (segundos) de cada modo
+    """
+    base = [sys.executable, FAKE_CLAUDE_CODE] if fake else ["claude-code"]
+    perguntas = [f"Pergunta de benchmark {i}" for i in range(consultas)]
+
+    inicio = time.perf_counter()
+    for pergunta in perguntas:
+        subprocess.run(
+            base + ["query", "--directory", diretorio, "--query", pergunta, "--output", "json"],
+            capture_output=True,
+            text=True
+        )
+    avulso = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    with ClaudeCodeWorkerPool(workers, base + ["worker", "--stdio"], intervalo_saude=0) as pool:
+        pronto = time.perf_counter() - inicio
+        threads = [
+            threading.Thread(target=pool.query, args=(diretorio, pergunta))
+            for pergunta in perguntas
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    com_pool = time.perf_counter() - inicio
+
+    return {"subprocess_run": avulso, "pool": com_pool, "pool_startup": pronto}
+
+
+def main():
+    """Executa o benchmark do pool de workers."""
+    parser = argparse.ArgumentParser(
+        description="Documentação 4.0 - Benchmark do pool de workers do Claude Code",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument("--workers", "-w", type=int, default=4,
+                        help="Número de workers persistentes")
+    parser.add_argument("--consultas", "-n", type=int, default=40,
+                        help="Número de consultas por modo")
+    parser.add_argument("--dir", "-d", type=str, default=os.getcwd(),
+                        help="Diretório do projeto consultado")
+    parser.add_argument("--real", action="store_true",
+                        help="Usar o claude-code real em vez do stub local")
+
+    args = parser.parse_args()
+    tempos = benchmark(args.workers, args.consultas, args.dir, fake=not args.real)
+
+    print(f"Consultas: {args.consultas} | Workers: {args.workers}")
+    print(f"subprocess.run por consulta: {tempos['subprocess_run']:.2f}s "
+          f"({args.consultas / tempos['subprocess_run']:.1f} consultas/s)")
+    print(f"Pool persistente:            {tempos['pool']:.2f}s "
+          f"({args.consultas / tempos['pool']:.1f} consultas/s, "
+          f"inicialização {tempos['pool_startup']:.2f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
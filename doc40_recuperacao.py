@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Documentação 4.0 - Recuperação Híbrida para Consultas
+Campus Party 2025 - Lucas Dórea Cardoso e Aulus Diniz
+
+Consulta em duas etapas: primeiro os índices locais escolhem os arquivos
+mais relevantes para a pergunta, e só depois o Claude Code é chamado, com
+o `--directory` restrito à pasta comum a esses arquivos e com a lista de
+arquivos e trechos na pergunta. Em repositórios grandes, o modelo recebe
+menos contexto e responde mais rápido; a lista `sources` da resposta vem
+do índice, com a relevância de cada arquivo.
+
+A etapa local combina:
+- o índice BM25 do código-fonte (`<projeto>/.doc40/busca-fontes.json`),
+  atualizado pelo mtime/tamanho dos arquivos só quando o estado do
+  repositório muda (`doc40_cache.estado_repositorio_recente`: HEAD e index,
+  com a árvore varrida só quando eles mudam ou a cada `DOC40_TREE_TTL`
+  segundos, sem executar o Git enquanto nada muda);
+- o índice de símbolos (`doc40_simbolos.py`): classes e funções cujo nome
+  contém os termos da pergunta, com o intervalo de linhas na pergunta;
+- o índice da documentação gerada (`doc40_busca.py`), cujos documentos são
+  ligados aos arquivos-fonte pelo manifesto (`.doc40/manifest.json`).
+
+Os índices do projeto ficam em `.doc40/`, fora do estado usado na chave do
+cache de consultas: uma consulta não "suja" o repositório.
+
+Uso:
+    recuperar("como funciona o reembolso?", "./meu-projeto")
+    consulta_hibrida(pergunta, "./meu-projeto", lambda p, d: executar(p, d))
+
+    python doc40_recuperacao.py --dir ./meu-projeto "como funciona o reembolso?"
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import logging
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+from doc40_busca import SearchIndex, indice_busca
+from doc40_cache import estado_repositorio_recente
+from doc40_incremental import eh_fonte, listar_fontes
+from doc40_simbolos import SymbolIndex
+
+logger = logging.getLogger('doc40-recuperacao')
+
+ARQUIVO_INDICE_FONTES = os.path.join(".doc40", "busca-fontes.json")
+TOP_K = 5
+# Arquivos abaixo desta fração da pontuação do primeiro são descartados
+RELEVANCIA_MINIMA = 0.2
+# Peso de um documento gerado na pontuação do arquivo-fonte que o originou
+PESO_DOCUMENTACAO = 0.5
+# Peso do melhor símbolo de um arquivo cujo nome casa com a pergunta
+PESO_SIMBOLOS = 1.0
+SIMBOLOS_POR_ARQUIVO = 3
+
+
+class SourceSearchIndex(SearchIndex):
+    """Índice BM25 dos arquivos-fonte de um projeto."""
+
+    def __init__(self, diretorio: str, saida: str):
+        """
+        Cria o índice do código-fonte.
+
+        Args:
+            diretorio: O diretório do projeto
+            saida: O diretório da documentação (fora do índice)
+        """
+        super().__init__(diretorio, os.path.join(os.path.abspath(diretorio), ARQUIVO_INDICE_FONTES))
+        self.saida = os.path.abspath(saida)
+        self.saida_rel = os.path.relpath(self.saida, self.diretorio)
+
+    def _indexavel(self, relativo: str) -> bool:
+        return eh_fonte(relativo, self.saida_rel)
+
+    def _listar(self) -> List[str]:
+        return listar_fontes(self.diretorio, self.saida)
+
+
+class _IndiceCompartilhado:
+    """Um índice do projeto compartilhado pelas consultas do processo, com trava própria."""
+
+    def __init__(self, indice: Any):
+        self.indice = indice
+        self.lock = threading.Lock()
+        # Estado do repositório na última atualização (None: ainda não carregado)
+        self.estado: Optional[str] = None
+
+
+# Índices por (projeto, saída); consultas em lote compartilham o mesmo. `_lock`
+# protege só os dicionários: cada índice tem a sua trava.
+_indices: Dict[Tuple[str, str], _IndiceCompartilhado] = {}
+_simbolos: Dict[Tuple[str, str], _IndiceCompartilhado] = {}
+_lock = threading.Lock()
+
+
+def _compartilhado(tabela: Dict[Tuple[str, str], _IndiceCompartilhado], chave: Tuple[str, str],
+                   criar: Callable[[], Any]) -> _IndiceCompartilhado:
+    """Entrada da tabela para a chave, criada (sem carregar) na primeira vez."""
+    with _lock:
+        entrada = tabela.get(chave)
+        if entrada is None:
+            entrada = tabela[chave] = _IndiceCompartilhado(criar())
+        return entrada
+
+
+def _atualizar(entrada: _IndiceCompartilhado, estado: str, nome: str) -> None:
+    """
+    Carrega e atualiza o índice se o estado do repositório mudou (chamar com `entrada.lock`).
+
+    Args:
+        entrada: O índice compartilhado
+        estado: O estado atual do repositório
+        nome: Descrição do índice nas mensagens de log
+    """
+    if entrada.estado == estado:
+        return
+    indice = entrada.indice
+    if entrada.estado is None:
+        indice.load()
+    contagem = indice.update()
+    if contagem.get("indexed") or contagem.get("parsed") or contagem["removed"] \
+            or not os.path.exists(indice.arquivo):
+        try:
+            indice.save()
+        except OSError as e:
+            logger.warning(f"Não foi possível gravar o índice {nome}: {e}")
+    entrada.estado = estado
+
+
+def _buscar_fontes(diretorio: str, saida: str, estado: str, pergunta: str, limite: int) -> List[Dict[str, Any]]:
+    """Busca no índice BM25 do código-fonte, atualizado se o estado mudou."""
+    entrada = _compartilhado(_indices, (diretorio, saida), lambda: SourceSearchIndex(diretorio, saida))
+    with entrada.lock:
+        _atualizar(entrada, estado, "do código-fonte")
+        return entrada.indice.search(pergunta, limite)
+
+
+def _buscar_simbolos(diretorio: str, saida: str, estado: str, pergunta: str, limite: int) -> List[Dict[str, Any]]:
+    """Busca no índice de símbolos, atualizado se o estado mudou."""
+    entrada = _compartilhado(_simbolos, (diretorio, saida), lambda: SymbolIndex(diretorio, saida))
+    with entrada.lock:
+        _atualizar(entrada, estado, "de símbolos")
+        return entrada.indice.search(pergunta, limite)
+
+
+def _ler_manifesto(diretorio: str) -> Dict[str, Any]:
+    """Manifesto fonte → documentos do projeto (vazio se não existir)."""
+    try:
+        with open(os.path.join(diretorio, ".doc40", "manifest.json"), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def recuperar(pergunta: str, diretorio: str, k: int = TOP_K,
+              saida: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Escolhe, nos índices locais, os arquivos mais relevantes para a pergunta.
+
+    Args:
+        pergunta: A pergunta em linguagem natural
+        diretorio: O diretório do projeto
+        k: Número máximo de arquivos
+        saida: O diretório da documentação (padrão: o do manifesto, ou `docs`)
+
+    Returns:
+        dict: files (file relativo ao projeto, kind "source" ou "doc",
+            relevance de 0 a 1, snippet e symbols com name, line e
+            end_line), project e directory (pasta comum
+            aos arquivos-fonte), absolutos, e took_ms
+    """
+    inicio = time.perf_counter()
+    diretorio = os.path.abspath(diretorio)
+    manifesto = _ler_manifesto(diretorio)
+    saida = os.path.abspath(saida or os.path.join(diretorio, manifesto.get("output_dir", "docs")))
+
+    pontuacoes: Dict[str, float] = {}
+    trechos: Dict[str, str] = {}
+    simbolos_por_arquivo: Dict[str, List[Dict[str, Any]]] = {}
+    # Sem mudanças no repositório, os índices não são relidos nem regravados
+    estado = estado_repositorio_recente(diretorio)
+    fontes = _buscar_fontes(diretorio, saida, estado, pergunta, k * 2)
+    simbolos = _buscar_simbolos(diretorio, saida, estado, pergunta, k * 4)
+    for item in fontes:
+        pontuacoes[item["file"]] = item["relevance"]
+        trechos[item["file"]] = item["snippet"]
+
+    # Só o melhor símbolo de cada arquivo pontua (senão arquivos de teste dominam)
+    for simbolo in simbolos:
+        lista = simbolos_por_arquivo.setdefault(simbolo["file"], [])
+        if not lista:
+            pontuacoes[simbolo["file"]] = pontuacoes.get(simbolo["file"], 0.0) + PESO_SIMBOLOS * simbolo["relevance"]
+        if len(lista) < SIMBOLOS_POR_ARQUIVO:
+            lista.append({"name": simbolo["name"], "line": simbolo["line"], "end_line": simbolo["end_line"]})
+
+    # Documentos gerados contam a favor do arquivo-fonte de origem
+    if os.path.isdir(saida):
+        fontes_por_documento: Dict[str, List[str]] = {}
+        for fonte, info in manifesto.get("sources", {}).items():
+            for documento in info.get("docs", []):
+                fontes_por_documento.setdefault(documento.replace(os.sep, "/"), []).append(fonte.replace(os.sep, "/"))
+        for item in indice_busca(saida).search(pergunta, k * 2):
+            destinos = fontes_por_documento.get(item["file"])
+            if not destinos:
+                relativo = os.path.relpath(os.path.join(saida, item["file"]), diretorio)
+                if relativo.startswith(os.pardir):
+                    continue
+                destinos = [relativo.replace(os.sep, "/")]
+            for destino in destinos:
+                pontuacoes[destino] = pontuacoes.get(destino, 0.0) + PESO_DOCUMENTACAO * item["relevance"]
+                if not trechos.get(destino):
+                    trechos[destino] = item["snippet"]
+
+    arquivos = []
+    if pontuacoes:
+        maximo = max(pontuacoes.values())
+        for arquivo, pontuacao in sorted(pontuacoes.items(), key=lambda item: (-item[1], item[0]))[:k]:
+            relevancia = pontuacao / maximo
+            if relevancia < RELEVANCIA_MINIMA:
+                break
+            tipo = "source" if eh_fonte(arquivo, os.path.relpath(saida, diretorio)) else "doc"
+            arquivos.append({"file": arquivo, "kind": tipo, "relevance": round(relevancia, 3),
+                             "snippet": trechos.get(arquivo, ""), "symbols": simbolos_por_arquivo.get(arquivo, [])})
+
+    # O escopo vem só do código-fonte; documentos entram na pergunta como trechos
+    escopo = diretorio
+    pastas = [os.path.dirname(os.path.join(diretorio, a["file"])) for a in arquivos if a["kind"] == "source"]
+    if pastas:
+        escopo = os.path.commonpath(pastas)
+    return {"files": arquivos, "project": diretorio, "directory": escopo,
+            "took_ms": round((time.perf_counter() - inicio) * 1000, 2)}
+
+
+def montar_pergunta(pergunta: str, recuperacao: Dict[str, Any]) -> str:
+    """
+    Acrescenta à pergunta os arquivos e trechos escolhidos pela etapa local.
+
+    Args:
+        pergunta: A pergunta original
+        recuperacao: Resultado de `recuperar`
+
+    Returns:
+        str: A pergunta enviada ao Claude Code (caminhos relativos ao escopo)
+    """
+    fontes = [a for a in recuperacao["files"] if a["kind"] == "source"]
+    documentos = [a for a in recuperacao["files"] if a["kind"] == "doc" and a["snippet"]]
+    linhas = [pergunta]
+    if fontes:
+        linhas += ["", "Arquivos mais relevantes segundo o índice local (comece por eles):"]
+        for arquivo in fontes:
+            caminho = os.path.relpath(os.path.join(recuperacao["project"], arquivo["file"]),
+                                      recuperacao["directory"])
+            linha = f"- {caminho.replace(os.sep, '/')}"
+            if arquivo["snippet"]:
+                linha += f": {arquivo['snippet']}"
+            linhas.append(linha)
+            for simbolo in arquivo["symbols"]:
+                linhas.append(f"  - {simbolo['name']} (linhas {simbolo['line']}-{simbolo['end_line']})")
+    if documentos:
+        linhas += ["", "Trechos da documentação gerada:"]
+        linhas += [f"- {arquivo['file']}: {arquivo['snippet']}" for arquivo in documentos]
+    return "\n".join(linhas)
+
+
+def consulta_hibrida(pergunta: str, diretorio: str, executar: Callable[[str, str], Dict[str, Any]],
+                     k: int = TOP_K, saida: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Responde a pergunta com recuperação local seguida do Claude Code.
+
+    Args:
+        pergunta: A pergunta em linguagem natural
+        diretorio: O diretório do projeto
+        executar: Função (pergunta, diretório) que consulta o Claude Code
+        k: Número máximo de arquivos recuperados
+        saida: O diretório da documentação (padrão: o do manifesto, ou `docs`)
+
+    Returns:
+        dict: A resposta do Claude Code com `sources` vindas do índice e
+            `retrieval` (directory relativo ao projeto, files e took_ms), ou o erro
+    """
+    recuperacao = recuperar(pergunta, diretorio, k, saida)
+    if not recuperacao["files"]:
+        logger.info("Nenhum arquivo relevante no índice local; consultando o projeto inteiro")
+        return executar(pergunta, diretorio)
+
+    escopo = recuperacao["directory"]
+    logger.info(f"Recuperação local: {len(recuperacao['files'])} arquivo(s) em {recuperacao['took_ms']} ms, "
+                f"escopo {escopo}")
+    return anexar_fontes(executar(montar_pergunta(pergunta, recuperacao), escopo), recuperacao, diretorio)
+
+
+def anexar_fontes(response: Dict[str, Any], recuperacao: Dict[str, Any], diretorio: str) -> Dict[str, Any]:
+    """
+    Completa a resposta do Claude Code com as fontes da recuperação local.
+
+    Args:
+        response: A resposta do Claude Code (ou o erro, devolvido como está)
+        recuperacao: O resultado de `recuperar`
+        diretorio: O diretório do projeto
+
+    Returns:
+        dict: A resposta com `sources` e `retrieval`
+    """
+    if "error" in response:
+        return response
+
+    escopo = recuperacao["directory"]
+    response = dict(response)
+    response["sources"] = [{"file": a["file"], "relevance": a["relevance"], "snippet": a["snippet"],
+                            "symbols": a["symbols"]} for a in recuperacao["files"]]
+    response["retrieval"] = {
+        "directory": os.path.relpath(escopo, os.path.abspath(diretorio)),
+        "files": len(recuperacao["files"]),
+        "took_ms": recuperacao["took_ms"]
+    }
+    return response
+
+
+def main():
+    """Mostra a etapa local de uma consulta pela linha de comando."""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description="Documentação 4.0 - Recuperação local para consultas")
+    parser.add_argument("pergunta", help="Pergunta em linguagem natural")
+    parser.add_argument("--dir", "-d", default=os.getcwd(), help="Diretório do projeto")
+    parser.add_argument("--saida", "-o", help="Diretório da documentação (padrão: o do manifesto)")
+    parser.add_argument("--top-k", "-k", type=int, default=TOP_K, help="Número máximo de arquivos")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.dir):
+        print(f"❌ Diretório não encontrado: {args.dir}")
+        return 1
+
+    recuperacao = recuperar(args.pergunta, args.dir, args.top_k, args.saida)
+    print(f"Escopo: {os.path.relpath(recuperacao['directory'], os.path.abspath(args.dir))} "
+          f"({recuperacao['took_ms']} ms)")
+    for arquivo in recuperacao["files"]:
+        print(f"- {arquivo['file']} ({arquivo['relevance']:.2f})")
+        if arquivo["snippet"]:
+            print(f"    {arquivo['snippet']}")
+        for simbolo in arquivo["symbols"]:
+            print(f"    {simbolo['name']} (linhas {simbolo['line']}-{simbolo['end_line']})")
+    print()
+    print(montar_pergunta(args.pergunta, recuperacao))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,599 @@
+#!/usr/bin/env python3
+"""
+Documentação 4.0 - Referência da API a partir das Docstrings
+Campus Party 2025 - Lucas Dórea Cardoso e Aulus Diniz
+
+Gera a referência da API sem o Claude Code: as classes, funções e métodos
+vêm do índice de símbolos (`doc40_simbolos.py`, analisado com `ast`) e as
+docstrings no estilo Google (Args, Returns, Raises, Examples, Note...) são
+convertidas em páginas Markdown ou HTML, uma por módulo, mais o índice
+`index.md`, todas em `<saida>/referencia/`: as páginas escritas pelo
+Claude Code (`claude-code document`) ficam em `<saida>` e nunca são
+sobrescritas.
+
+- Tudo roda localmente, sem rede: a análise e a renderização são divididas
+  entre processos quando há muitos arquivos.
+- Só as páginas cujo conteúdo mudou são regravadas, e as páginas de
+  módulos removidos são apagadas (registro em `<saida>/referencia/.doc40-referencia.json`).
+- `undocumented` lista os módulos sem docstring ou com símbolos sem
+  docstring: só esses precisam de texto do Claude Code (`geral --local --prosa`).
+
+Uso:
+    gerar_referencia("./meu-projeto", "./meu-projeto/docs")
+    analisar_docstring(texto)
+
+    python doc40_referencia.py --dir ./meu-projeto --saida docs --formato html
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, List, Optional, Tuple
+
+from doc40_markdown import renderizar_pagina
+from doc40_simbolos import CONTEXTO_PROCESSOS, MINIMO_PROCESSOS, SymbolIndex
+
+logger = logging.getLogger('doc40-referencia')
+
+ARQUIVO_REGISTRO = ".doc40-referencia.json"
+VERSAO_REGISTRO = 1
+SUBDIRETORIO = "referencia"
+PAGINA_INDICE = "index"
+FORMATOS = {"markdown": ".md", "html": ".html"}
+ESCOPOS = ("all", "api", "internal", "public")
+
+# Título da seção (sem acentos e em minúsculas) -> chave no resultado de analisar_docstring
+SECOES = {
+    "args": "params", "arguments": "params", "parameters": "params", "params": "params",
+    "parametros": "params", "argumentos": "params",
+    "keyword args": "params", "keyword arguments": "params", "other parameters": "params",
+    "returns": "returns", "return": "returns", "retorna": "returns", "retorno": "returns",
+    "yields": "yields", "yield": "yields", "gera": "yields",
+    "raises": "raises", "exceptions": "raises", "excecoes": "raises", "levanta": "raises",
+    "attributes": "attributes", "atributos": "attributes",
+    "examples": "examples", "example": "examples", "exemplos": "examples", "exemplo": "examples",
+    "note": "notes", "notes": "notes", "nota": "notes", "notas": "notes",
+    "warning": "warnings", "warnings": "warnings", "aviso": "warnings", "atencao": "warnings",
+    "see also": "see_also", "veja tambem": "see_also",
+}
+_SEM_ACENTO = str.maketrans("áàâãéêíóôõúüç", "aaaaeeiooouuc")
+_TITULO_SECAO = re.compile(r"^([A-ZÀ-Ýa-zà-ý][\w ]{0,40}):$")
+# "amount (float, optional): Valor" / "amount: Valor" / "**kwargs: Extras" / "TypeError"
+_ENTRADA = re.compile(r"^(\*{0,2}[\w.]+)\s*(?:\(([^)]*)\))?\s*(?::(?:\s+(.*))?)?$")
+# "Dict[str, Any]: Resposta" (só o tipo antes dos dois-pontos, sem frase)
+_TIPO_RETORNO = re.compile(r"^([\w.]+(?:\[(?:[^\[\]]|\[[^\[\]]*\])*\])?(?:\s*\|\s*[\w.]+(?:\[(?:[^\[\]]|\[[^\[\]]*\])*\])?)*)\s*:\s+(.*)$")
+# "amount: float = 1.0" / "*args" / "currency="USD""
+_PARAMETRO = re.compile(r"^(\*{0,2}\w+)(?:\s*:\s*(.*?))?(?:\s*=\s*(.*))?$", re.S)
+ROTULOS_TIPO = {"class": "classe", "function": "função", "method": "método"}
+
+
+def _desindentar(linhas: List[str]) -> List[str]:
+    """Remove a indentação comum das linhas não vazias."""
+    recuos = [len(l) - len(l.lstrip()) for l in linhas if l.strip()]
+    recuo = min(recuos) if recuos else 0
+    return [l[recuo:] for l in linhas]
+
+
+def _paragrafo(linhas: List[str]) -> str:
+    """Junta linhas em um texto, preservando as linhas em branco."""
+    return "\n".join(linhas).strip()
+
+
+def _entradas(linhas: List[str]) -> List[Dict[str, str]]:
+    """
+    Lê as entradas "nome (tipo): descrição" de uma seção, com continuações.
+
+    Args:
+        linhas: O corpo da seção, já sem a indentação comum
+
+    Returns:
+        list: Entradas com name, type e description
+    """
+    entradas: List[Dict[str, str]] = []
+    for linha in linhas:
+        if not linha.strip():
+            if entradas:
+                entradas[-1]["description"] += "\n"
+            continue
+        recuada = linha[:1].isspace()
+        m = None if recuada else _ENTRADA.match(linha.strip())
+        if m:
+            entradas.append({"name": m.group(1), "type": (m.group(2) or "").strip(),
+                             "description": (m.group(3) or "").strip()})
+        elif entradas:
+            separador = "\n" if entradas[-1]["description"].endswith("\n") else " "
+            entradas[-1]["description"] = (entradas[-1]["description"] + separador + linha.strip()).strip()
+        else:
+            # Texto solto antes da primeira entrada ("Nenhum")
+            entradas.append({"name": "", "type": "", "description": linha.strip()})
+    for entrada in entradas:
+        entrada["description"] = " ".join(entrada["description"].split())
+    return entradas
+
+
+def _excecoes(linhas: List[str]) -> List[Dict[str, str]]:
+    """Entradas "Excecao: quando" de uma seção Raises (o nome é o tipo)."""
+    return [{"type": e["name"] or e["type"], "description": e["description"]} for e in _entradas(linhas)]
+
+
+def _retorno(linhas: List[str]) -> Dict[str, str]:
+    """Tipo (opcional) e descrição de uma seção Returns ou Yields."""
+    texto = " ".join(" ".join(linhas).split())
+    m = _TIPO_RETORNO.match(texto)
+    if m:
+        return {"type": m.group(1), "description": m.group(2)}
+    return {"type": "", "description": texto}
+
+
+def _exemplos(linhas: List[str]) -> str:
+    """Exemplos como Markdown: blocos de doctest sem cerca ganham uma cerca python."""
+    texto = _paragrafo(linhas)
+    if "```" in texto or ">>>" not in texto:
+        return texto
+    saida, bloco = [], []
+    for linha in texto.split("\n"):
+        if linha.lstrip().startswith(">>>") or (bloco and linha.strip()):
+            bloco.append(linha)
+            continue
+        if bloco:
+            saida.extend(["```python"] + bloco + ["```"])
+            bloco = []
+        saida.append(linha)
+    if bloco:
+        saida.extend(["```python"] + bloco + ["```"])
+    return "\n".join(saida)
+
+
+def analisar_docstring(texto: str) -> Dict[str, Any]:
+    """
+    Separa uma docstring no estilo Google em resumo, descrição e seções.
+
+    Reconhece os títulos em inglês e em português (Args/Parâmetros,
+    Returns/Retorna, Raises, Examples/Exemplos, Note/Nota...). Seções
+    desconhecidas ("Implementation Details:") ficam em `sections`.
+
+    Args:
+        texto: A docstring, já sem a indentação (inspect.cleandoc)
+
+    Returns:
+        dict: summary, description, params, returns, yields, raises,
+            attributes, examples, notes, warnings, see_also e sections
+            (lista de (título, texto))
+    """
+    resultado: Dict[str, Any] = {
+        "summary": "", "description": "", "params": [], "returns": None, "yields": None,
+        "raises": [], "attributes": [], "examples": "", "notes": [], "warnings": [],
+        "see_also": "", "sections": []
+    }
+    linhas = texto.expandtabs().split("\n")
+    if ":\n" not in texto:
+        # Sem seções (a maioria das docstrings curtas)
+        resumo, _, descricao = "\n".join(linhas).strip().partition("\n\n")
+        resultado["summary"] = " ".join(resumo.split())
+        resultado["description"] = descricao.strip()
+        return resultado
+
+    # Divide nos títulos de seção sem recuo seguidos de um bloco recuado
+    blocos: List[Tuple[Optional[str], List[str]]] = [(None, [])]
+    for i, linha in enumerate(linhas):
+        m = _TITULO_SECAO.match(linha.rstrip())
+        if m and next((l for l in linhas[i + 1:] if l.strip()), "")[:1].isspace():
+            blocos.append((m.group(1).strip(), []))
+        else:
+            blocos[-1][1].append(linha)
+
+    introducao = _paragrafo(blocos[0][1])
+    resumo, _, descricao = introducao.partition("\n\n")
+    resultado["summary"] = " ".join(resumo.split())
+    resultado["description"] = descricao.strip()
+
+    for titulo, corpo in blocos[1:]:
+        corpo = _desindentar(corpo)
+        chave = SECOES.get(titulo.lower().translate(_SEM_ACENTO))
+        if chave == "params":
+            resultado["params"].extend(_entradas(corpo))
+        elif chave == "attributes":
+            resultado["attributes"].extend(_entradas(corpo))
+        elif chave == "raises":
+            resultado["raises"].extend(_excecoes(corpo))
+        elif chave in ("returns", "yields"):
+            resultado[chave] = _retorno(corpo)
+        elif chave == "examples":
+            resultado["examples"] = "\n\n".join(filter(None, [resultado["examples"], _exemplos(corpo)]))
+        elif chave in ("notes", "warnings"):
+            resultado[chave].append(_paragrafo(corpo))
+        elif chave == "see_also":
+            resultado["see_also"] = _paragrafo(corpo)
+        else:
+            resultado["sections"].append((titulo, _paragrafo(corpo)))
+    return resultado
+
+
+def _dividir(texto: str) -> List[str]:
+    """Separa por vírgulas fora de colchetes, parênteses, chaves e strings."""
+    partes, atual, nivel, aspas = [], [], 0, ""
+    for c in texto:
+        if aspas:
+            if c == aspas:
+                aspas = ""
+        elif c in "'\"":
+            aspas = c
+        elif c in "([{":
+            nivel += 1
+        elif c in ")]}":
+            nivel -= 1
+        elif c == "," and nivel == 0:
+            partes.append("".join(atual).strip())
+            atual = []
+            continue
+        atual.append(c)
+    if "".join(atual).strip():
+        partes.append("".join(atual).strip())
+    return partes
+
+
+def parametros_assinatura(assinatura: str) -> List[Tuple[str, str, str]]:
+    """
+    Parâmetros de uma assinatura do índice de símbolos.
+
+    Args:
+        assinatura: "(self, amount: float, currency: str = "USD") -> dict"
+
+    Returns:
+        list: (nome com * ou **, tipo, padrão), sem self, cls, / e *
+    """
+    if not assinatura.startswith("("):
+        return []
+    nivel, fim = 0, len(assinatura)
+    for i, c in enumerate(assinatura):
+        nivel += c in "([{"
+        nivel -= c in ")]}"
+        if nivel == 0:
+            fim = i
+            break
+    parametros = []
+    for parte in _dividir(assinatura[1:fim]):
+        m = _PARAMETRO.match(parte)
+        if not m or m.group(1) in ("self", "cls"):
+            continue
+        parametros.append((m.group(1), m.group(2) or "", m.group(3) or ""))
+    return parametros
+
+
+def publico(nome: str) -> bool:
+    """Indica se um nome pontuado é público (nenhuma parte começa com _, exceto __dunder__)."""
+    return all(not p.startswith("_") or (p.startswith("__") and p.endswith("__"))
+               for p in nome.split("."))
+
+
+def ancora(nome: str) -> str:
+    """Âncora de um título como o GitHub e a extensão toc do markdown a geram."""
+    return re.sub(r"[^\w\- ]", "", nome.lower()).replace(" ", "-")
+
+
+def _celula(texto: str) -> str:
+    """Texto de uma célula de tabela Markdown, em uma linha."""
+    return " ".join(texto.split()).replace("|", "\\|") or "—"
+
+
+def _codigo(texto: str) -> str:
+    """Texto como código inline, se houver."""
+    return f"`{texto}`" if texto else "—"
+
+
+def _renderizar_simbolo(simbolo: Dict[str, Any], doc: Dict[str, Any], nivel: int) -> List[str]:
+    """Seção Markdown de uma classe, função ou método (doc: a docstring já analisada)."""
+    nome = simbolo["name"]
+    linhas = [f"{'#' * nivel} `{nome}`", ""]
+
+    curto = nome.split(".")[-1]
+    if simbolo["kind"] == "class":
+        definicao = f"class {curto}{simbolo['signature']}"
+    else:
+        definicao = f"{'async ' if simbolo.get('async') else ''}def {curto}{simbolo['signature']}"
+    linhas += ["```python"] + [f"@{d}" for d in simbolo["decorators"]] + [definicao, "```", ""]
+
+    if doc["summary"]:
+        linhas += [doc["summary"], ""]
+    if doc["description"]:
+        linhas += [doc["description"], ""]
+
+    # Parâmetros: a ordem e os tipos da assinatura, as descrições da docstring
+    descritos = {p["name"].lstrip("*"): p for p in doc["params"] if p["name"]}
+    tabela = []
+    assinados = parametros_assinatura(simbolo["signature"]) if simbolo["kind"] != "class" else []
+    for nome_param, tipo, padrao in assinados:
+        entrada = descritos.pop(nome_param.lstrip("*"), {})
+        tabela.append((nome_param, tipo or entrada.get("type", ""), padrao, entrada.get("description", "")))
+    for entrada in doc["params"]:
+        if entrada["name"].lstrip("*") in descritos:
+            tabela.append((entrada["name"], entrada["type"], "", entrada["description"]))
+    if tabela:
+        linhas += ["**Parâmetros**", "", "| Nome | Tipo | Padrão | Descrição |", "|------|------|--------|-----------|"]
+        linhas += [f"| `{n}` | {_celula(_codigo(t))} | {_celula(_codigo(p))} | {_celula(d)} |" for n, t, p, d in tabela]
+        linhas.append("")
+
+    if doc["attributes"]:
+        linhas += ["**Atributos**", "", "| Nome | Tipo | Descrição |", "|------|------|-----------|"]
+        linhas += [f"| `{a['name']}` | {_celula(_codigo(a['type']))} | {_celula(a['description'])} |"
+                   for a in doc["attributes"]]
+        linhas.append("")
+
+    retorno_anotado = simbolo["signature"].partition(" -> ")[2] if simbolo["kind"] != "class" else ""
+    for chave, rotulo in (("returns", "Retorna"), ("yields", "Gera")):
+        secao = doc[chave]
+        tipo = (secao["type"] if secao else "") or (retorno_anotado if chave == "returns" else "")
+        if secao or (tipo and tipo != "None"):
+            partes = [p for p in (_codigo(tipo) if tipo else "", secao["description"] if secao else "") if p]
+            linhas += [f"**{rotulo}:** {' — '.join(partes)}", ""]
+
+    if doc["raises"]:
+        linhas += ["**Exceções**", ""]
+        linhas += [f"- `{e['type']}`" + (f": {e['description']}" if e["description"] else "") for e in doc["raises"]]
+        linhas.append("")
+
+    if doc["examples"]:
+        linhas += ["**Exemplos**", "", doc["examples"], ""]
+
+    for chave, rotulo in (("notes", "Nota"), ("warnings", "Atenção")):
+        for texto in doc[chave]:
+            linhas += [f"> **{rotulo}:** " + "\n> ".join(texto.split("\n")), ""]
+
+    for titulo, texto in doc["sections"]:
+        linhas += [f"**{titulo}**", "", texto, ""]
+
+    if doc["see_also"]:
+        linhas += [f"**Veja também:** {' '.join(doc['see_also'].split())}", ""]
+
+    linhas += [f"*Linhas {simbolo['line']}-{simbolo['end_line']}*", ""]
+    return linhas
+
+
+def renderizar_modulo(relativo: str, registro: Dict[str, Any], escopo: str = "all") -> Tuple[str, Dict[str, Any]]:
+    """
+    Página Markdown da referência de um módulo.
+
+    Args:
+        relativo: Caminho do arquivo, relativo ao projeto
+        registro: O registro do arquivo no índice de símbolos (module, doc, symbols)
+        escopo: all/internal incluem tudo; api/public só os nomes públicos
+
+    Returns:
+        tuple: (Markdown, estatísticas com summary, symbols e undocumented)
+    """
+    simbolos = [s for s in registro["symbols"] if escopo not in ("api", "public") or publico(s["name"])]
+    modulo = analisar_docstring(registro.get("doc", ""))
+    docs = [analisar_docstring(s["doc"]) for s in simbolos]
+    linhas = [f"# `{registro['module']}`", ""]
+    if modulo["summary"]:
+        linhas += [modulo["summary"], ""]
+    if modulo["description"]:
+        linhas += [modulo["description"], ""]
+    linhas += [f"**Arquivo:** `{relativo.replace(os.sep, '/')}`", ""]
+    if "error" in registro:
+        linhas += [f"> **Atenção:** o arquivo não pôde ser analisado ({registro['error']}).", ""]
+
+    if simbolos:
+        linhas += ["## Conteúdo", "", "| Nome | Tipo | Descrição |", "|------|------|-----------|"]
+        linhas += [f"| [`{s['name']}`](#{ancora(s['name'])}) | {ROTULOS_TIPO[s['kind']]} | "
+                   f"{_celula(d['summary'])} |" for s, d in zip(simbolos, docs)]
+        linhas.append("")
+
+    classes = [(s, d) for s, d in zip(simbolos, docs) if s["kind"] != "function"]
+    funcoes = [(s, d) for s, d in zip(simbolos, docs) if s["kind"] == "function"]
+    if classes:
+        linhas += ["## Classes", ""]
+        for simbolo, doc in classes:
+            linhas += _renderizar_simbolo(simbolo, doc, 3 if simbolo["kind"] == "class" else 4)
+    if funcoes:
+        linhas += ["## Funções", ""]
+        for simbolo, doc in funcoes:
+            linhas += _renderizar_simbolo(simbolo, doc, 3)
+
+    estatisticas = {
+        "summary": modulo["summary"],
+        "symbols": len(simbolos),
+        "undocumented": [s["name"] for s in simbolos if not s["doc"]] + ([] if registro.get("doc") else ["<módulo>"])
+    }
+    return "\n".join(linhas).rstrip() + "\n", estatisticas
+
+
+def _gravar_se_mudou(caminho: str, conteudo: str) -> bool:
+    """Grava o arquivo só se o conteúdo mudou (mantém o mtime, os ETags e as cópias .gz)."""
+    dados = conteudo.encode('utf-8')
+    try:
+        with open(caminho, 'rb') as f:
+            if f.read() == dados:
+                return False
+    except OSError:
+        pass
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    temporario = caminho + ".tmp"
+    with open(temporario, 'wb') as f:
+        f.write(dados)
+    os.replace(temporario, caminho)
+    return True
+
+
+def _renderizar_arquivo(tarefa: Tuple[str, Dict[str, Any], str, str, str, str]) -> Tuple[str, bool, Dict[str, Any]]:
+    """
+    Renderiza e grava a página de um módulo.
+
+    Executada em processos auxiliares quando há muitos arquivos.
+
+    Args:
+        tarefa: (relativo, registro, escopo, formato, saída, página relativa à saída)
+
+    Returns:
+        tuple: (relativo, True se a página foi regravada, estatísticas)
+    """
+    relativo, registro, escopo, formato, saida, pagina = tarefa
+    texto, estatisticas = renderizar_modulo(relativo, registro, escopo)
+    if formato == "html":
+        texto = renderizar_pagina(texto, registro["module"])
+    return relativo, _gravar_se_mudou(os.path.join(saida, pagina), texto), estatisticas
+
+
+def _pagina(relativo: str, formato: str) -> str:
+    """Página de um módulo, espelhando o caminho do arquivo ("src/api/auth.py" → "src/api/auth.md")."""
+    return os.path.splitext(relativo)[0] + FORMATOS[formato]
+
+
+def _renderizar_indice(paginas: List[Tuple[str, str, Dict[str, Any]]], formato: str) -> str:
+    """Índice da referência: um módulo por linha, com o resumo e o número de símbolos."""
+    linhas = ["# Referência da API", "",
+              "Gerada localmente a partir das docstrings do código.", "",
+              "| Módulo | Descrição | Símbolos |", "|--------|-----------|----------|"]
+    for pagina, modulo, estatisticas in paginas:
+        destino = pagina.replace(os.sep, "/").replace(" ", "%20")
+        linhas.append(f"| [`{modulo}`]({destino}) | {_celula(estatisticas['summary'])} | {estatisticas['symbols']} |")
+    texto = "\n".join(linhas) + "\n"
+    return renderizar_pagina(texto, "Referência da API") if formato == "html" else texto
+
+
+def _carregar_registro(caminho: str) -> Dict[str, str]:
+    """Páginas gravadas na geração anterior (fonte → página)."""
+    try:
+        with open(caminho, 'r', encoding='utf-8') as f:
+            dados = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(dados, dict) or dados.get("version") != VERSAO_REGISTRO:
+        return {}
+    return dados.get("pages", {})
+
+
+def gerar_referencia(diretorio: str, saida: Optional[str] = None, formato: str = "markdown",
+                     escopo: str = "all", workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Gera a referência da API de um projeto a partir das docstrings.
+
+    Args:
+        diretorio: O diretório do projeto
+        saida: O diretório da documentação (padrão: `docs`)
+        formato: markdown ou html
+        escopo: all, api, internal ou public
+        workers: Processos para a análise e a renderização (1 usa a thread atual)
+
+    Returns:
+        dict: success, output_dir, format, modules, symbols, written,
+            unchanged, removed e file_list (relativos a `saida`, dentro de
+            `referencia/`), undocumented (arquivo → nomes sem docstring),
+            errors e duration_seconds
+    """
+    inicio = time.perf_counter()
+    if not os.path.isdir(diretorio):
+        return {"success": False, "error": "DirectoryNotFound",
+                "message": f"Diretório não encontrado: {diretorio}"}
+    if formato not in FORMATOS:
+        return {"success": False, "error": "UnsupportedFormat",
+                "message": f"Formato não suportado na geração local: {formato} (use {', '.join(FORMATOS)})"}
+    if escopo not in ESCOPOS:
+        return {"success": False, "error": "UnsupportedScope", "message": f"Escopo não suportado: {escopo}"}
+
+    # Símbolos: só os arquivos alterados desde a última análise são relidos
+    indice = SymbolIndex(diretorio, saida)
+    completo = not indice.load()
+    analise = indice.update(workers=workers)
+    if completo or analise["parsed"] or analise["removed"]:
+        indice.save()
+    saida = indice.saida
+
+    # Subárvore própria: as páginas do Claude Code em <saida> não são tocadas
+    destino = os.path.join(saida, SUBDIRETORIO)
+    arquivos = sorted(r for r in indice.files
+                      if escopo not in ("api", "public") or publico(indice.files[r]["module"]))
+    tarefas = [(r, indice.files[r], escopo, formato, destino, _pagina(r, formato)) for r in arquivos]
+    resultados = _renderizar(tarefas, workers)
+
+    # Páginas de módulos que saíram do projeto (ou do escopo)
+    arquivo_registro = os.path.join(destino, ARQUIVO_REGISTRO)
+    indice_pagina = PAGINA_INDICE + FORMATOS[formato]
+    paginas = {r: _pagina(r, formato) for r in arquivos}
+    atuais = set(paginas.values()) | {indice_pagina}
+    removidas = []
+    for relativo, pagina in _carregar_registro(arquivo_registro).items():
+        if pagina not in atuais:
+            try:
+                os.remove(os.path.join(destino, pagina))
+                removidas.append(os.path.join(SUBDIRETORIO, pagina))
+            except OSError:
+                pass
+
+    estatisticas = {relativo: e for relativo, _, e in resultados}
+    escritas = sum(1 for _, escrito, _ in resultados if escrito)
+    if _gravar_se_mudou(os.path.join(destino, indice_pagina),
+                        _renderizar_indice([(paginas[r], indice.files[r]["module"], estatisticas[r])
+                                            for r in arquivos], formato)):
+        escritas += 1
+    with open(arquivo_registro, 'w', encoding='utf-8') as f:
+        json.dump({"version": VERSAO_REGISTRO, "format": formato, "pages": {"": indice_pagina, **paginas}},
+                  f, ensure_ascii=False, indent=1)
+
+    return {
+        "success": True,
+        "output_dir": saida,
+        "format": formato,
+        "modules": len(arquivos),
+        "symbols": sum(e["symbols"] for e in estatisticas.values()),
+        "parsed": analise["parsed"],
+        "written": escritas,
+        "unchanged": len(resultados) + 1 - escritas,
+        "removed": removidas,
+        "file_list": [os.path.join(SUBDIRETORIO, p) for p in [indice_pagina] + [paginas[r] for r in arquivos]],
+        "undocumented": {r: e["undocumented"] for r, e in estatisticas.items() if e["undocumented"]},
+        "errors": [r for r in arquivos if "error" in indice.files[r]],
+        "duration_seconds": time.perf_counter() - inicio
+    }
+
+
+def _renderizar(tarefas: List[Tuple[str, Dict[str, Any], str, str, str, str]],
+                workers: Optional[int]) -> List[Tuple[str, bool, Dict[str, Any]]]:
+    """Renderiza as páginas, em processos auxiliares se forem muitas."""
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(tarefas) >= MINIMO_PROCESSOS:
+        try:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=CONTEXTO_PROCESSOS) as pool:
+                return list(pool.map(_renderizar_arquivo, tarefas,
+                                     chunksize=max(1, len(tarefas) // (workers * 4))))
+        except (OSError, BrokenProcessPool) as e:
+            logger.warning(f"Renderização em processos indisponível ({e}); renderizando na thread atual")
+    return [_renderizar_arquivo(tarefa) for tarefa in tarefas]
+
+
+def main():
+    """Gera a referência da API pela linha de comando."""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description="Documentação 4.0 - Referência da API a partir das docstrings")
+    parser.add_argument("--dir", "-d", default=os.getcwd(), help="Diretório do projeto")
+    parser.add_argument("--saida", "-o", help="Diretório da documentação (padrão: docs)")
+    parser.add_argument("--formato", "-f", default="markdown", choices=list(FORMATOS), help="Formato das páginas")
+    parser.add_argument("--escopo", "-s", default="all", choices=list(ESCOPOS), help="Escopo da referência")
+    parser.add_argument("--workers", "-w", type=int, help="Processos para a análise e a renderização")
+    parser.add_argument("--json", action="store_true", help="Imprime o resultado em JSON")
+    args = parser.parse_args()
+
+    resultado = gerar_referencia(args.dir, args.saida, args.formato, args.escopo, args.workers)
+    if args.json or not resultado["success"]:
+        print(json.dumps(resultado, ensure_ascii=False, indent=2))
+        return 0 if resultado["success"] else 1
+
+    print(f"{resultado['modules']} módulos, {resultado['symbols']} símbolos em {resultado['output_dir']} "
+          f"({resultado['written']} páginas gravadas, {resultado['unchanged']} inalteradas, "
+          f"{len(resultado['removed'])} removidas) em {resultado['duration_seconds']:.2f}s")
+    if resultado["undocumented"]:
+        print(f"Módulos sem docstring ou com símbolos sem docstring: {len(resultado['undocumented'])}")
+    for arquivo in resultado["errors"]:
+        print(f"  erro de sintaxe: {arquivo}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
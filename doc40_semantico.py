@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+Documentação 4.0 - Cache Semântico de Consultas
+Campus Party 2025 - Lucas Dórea Cardoso e Aulus Diniz
+
+Camada opcional na frente do Claude Code que reconhece perguntas quase
+iguais ("como funciona o reembolso?" / "Como o reembolso funciona") e
+devolve a resposta já armazenada no cache de consultas. As perguntas são
+vetorizadas localmente, só com CPU, por n-gramas de caracteres e palavras
+(hashing + TF-IDF) em uma matriz NumPy pré-alocada. As perguntas ficam em
+`.doc40/cache/semantic.jsonl`, uma por linha: cada resposta acrescenta uma
+linha (sob uma trava de arquivo), e cada processo lê só as linhas novas,
+então respostas gravadas ao mesmo tempo por vários processos não se perdem.
+
+Como no cache exato, só são comparadas perguntas feitas sobre o mesmo
+diretório, no mesmo estado do repositório e com o mesmo formato; as
+entradas de estados anteriores são descartadas ao abrir o índice e ao
+acrescentar uma resposta em um estado novo.
+
+Requer NumPy; sem ele a camada fica desativada.
+"""
+
+import os
+import re
+import json
+import zlib
+import tempfile
+import threading
+import contextlib
+import unicodedata
+import logging
+from typing import Dict, Any, Optional, List, Tuple, Iterator
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - dependência opcional
+    np = None
+
+from doc40_cache import QueryCache, normalizar_pergunta, estado_repositorio_recente, STATE_TTL
+
+logger = logging.getLogger('doc40-semantico')
+
+# Similaridade mínima padrão para considerar duas perguntas equivalentes
+DEFAULT_THRESHOLD = 0.85
+
+# Dimensão dos vetores (hashing trick)
+DEFAULT_DIM = 1024
+
+# Tamanhos dos n-gramas de caracteres
+NGRAM_SIZES = (3, 4, 5)
+
+
+def disponivel() -> bool:
+    """Indica se o NumPy está instalado e a camada semântica pode ser usada."""
+    return np is not None
+
+
+def _dobrar_acentos(texto: str) -> str:
+    """Remove acentos para que "não" e "nao" tenham a mesma representação."""
+    decomposto = unicodedata.normalize("NFKD", texto)
+    return "".join(c for c in decomposto if not unicodedata.combining(c))
+
+
+def termos(pergunta: str) -> List[str]:
+    """
+    Extrai os termos (palavras e n-gramas de caracteres) de uma pergunta.
+
+    Args:
+        pergunta: A pergunta em linguagem natural
+
+    Returns:
+        list: Os termos, com repetição
+    """
+    texto = _dobrar_acentos(normalizar_pergunta(pergunta))
+    palavras = re.findall(r"\w+", texto)
+    resultado = [f"w:{p}" for p in palavras]
+    for palavra in palavras:
+        marcada = f" {palavra} "
+        for n in NGRAM_SIZES:
+            resultado.extend(f"c:{marcada[i:i + n]}" for i in range(len(marcada) - n + 1))
+    return resultado
+
+
+def vetorizar(pergunta: str, dim: int = DEFAULT_DIM) -> "np.ndarray":
+    """
+    Converte uma pergunta em um vetor de frequências (TF sublinear).
+
+    Args:
+        pergunta: A pergunta em linguagem natural
+        dim: Dimensão do vetor
+
+    Returns:
+        np.ndarray: Vetor float32 de tamanho `dim`
+    """
+    vetor = np.zeros(dim, dtype=np.float32)
+    for termo in termos(pergunta):
+        vetor[zlib.crc32(termo.encode()) % dim] += 1.0
+    nao_nulos = vetor > 0
+    vetor[nao_nulos] = 1.0 + np.log(vetor[nao_nulos])
+    return vetor
+
+
+class SemanticCache:
+    """Índice de perguntas respondidas, consultado por similaridade de cosseno."""
+
+    # Capacidade inicial da matriz de vetores (dobrada quando enche)
+    CAPACIDADE_INICIAL = 64
+
+    def __init__(self, directory: str, dim: int = DEFAULT_DIM):
+        """
+        Carrega (ou cria) o índice semântico de um projeto.
+
+        Args:
+            directory: O diretório do projeto
+            dim: Dimensão dos vetores
+
+        Raises:
+            RuntimeError: Se o NumPy não estiver instalado
+        """
+        if not disponivel():
+            raise RuntimeError("O cache semântico requer NumPy (pip install numpy)")
+
+        self.directory = os.path.abspath(directory)
+        self.dim = dim
+        self.path = os.path.join(self.directory, ".doc40", "cache", "semantic.jsonl")
+
+        self._lock = threading.Lock()
+        self._limpar()
+        with self._lock:
+            self._sincronizar()
+            self._podar(estado_repositorio_recente(self.directory, STATE_TTL))
+
+    def _limpar(self) -> None:
+        """Esvazia o índice em memória."""
+        self.vectors = np.zeros((self.CAPACIDADE_INICIAL, self.dim), dtype=np.float32)
+        self.scopes = np.zeros(self.CAPACIDADE_INICIAL, dtype=np.int32)
+        self.size = 0
+        self.df = np.zeros(self.dim, dtype=np.float32)
+        self.entries: List[Dict[str, Any]] = []
+        self.scope_ids: Dict[Tuple[str, str], int] = {}
+        # Posição lida do arquivo e sua identidade (inode), para ler só o que outros processos acrescentaram
+        self._offset = 0
+        self._inode: Optional[int] = None
+
+    def _incluir(self, entrada: Dict[str, Any]) -> None:
+        """Acrescenta uma entrada ao índice em memória (crescimento amortizado)."""
+        if self.size == len(self.vectors):
+            capacidade = 2 * len(self.vectors)
+            vetores = np.zeros((capacidade, self.dim), dtype=np.float32)
+            vetores[:self.size] = self.vectors[:self.size]
+            escopos = np.zeros(capacidade, dtype=np.int32)
+            escopos[:self.size] = self.scopes[:self.size]
+            self.vectors, self.scopes = vetores, escopos
+        escopo = (entrada["state"], entrada["format"])
+        if escopo not in self.scope_ids:
+            self.scope_ids[escopo] = len(self.scope_ids)
+        vetor = vetorizar(entrada["question"], self.dim)
+        self.vectors[self.size] = vetor
+        self.scopes[self.size] = self.scope_ids[escopo]
+        self.df += (vetor > 0)
+        self.entries.append(entrada)
+        self.size += 1
+
+    @contextlib.contextmanager
+    def _trava_arquivo(self) -> Iterator[None]:
+        """Trava exclusiva entre processos para acrescentar ou compactar o arquivo."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        if fcntl is None:
+            yield
+            return
+        with open(self.path + ".lock", 'w') as trava:
+            fcntl.flock(trava, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(trava, fcntl.LOCK_UN)
+
+    def _sincronizar(self) -> None:
+        """
+        Lê as entradas acrescentadas ao arquivo desde a última leitura (chamado com a trava).
+
+        Cada processo só acrescenta linhas ao arquivo, então as respostas de
+        todos os processos são vistas por todos. Se o arquivo foi compactado
+        por outro processo, o índice é recarregado do início.
+        """
+        try:
+            info = os.stat(self.path)
+        except FileNotFoundError:
+            if self._inode is not None:
+                self._limpar()
+            return
+        except OSError as e:
+            logger.error(f"Erro ao ler índice semântico: {e}")
+            return
+        if info.st_ino != self._inode or info.st_size < self._offset:
+            self._limpar()
+            self._inode = info.st_ino
+        if info.st_size == self._offset:
+            return
+
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(self._offset)
+                dados = f.read(info.st_size - self._offset)
+        except OSError as e:
+            logger.error(f"Erro ao ler índice semântico: {e}")
+            return
+        # Uma linha sem "\n" ainda está sendo escrita: fica para a próxima leitura
+        completo = dados.rfind(b"\n") + 1
+        for linha in dados[:completo].splitlines():
+            try:
+                entrada = json.loads(linha)
+                if entrada.get("dim", self.dim) == self.dim:
+                    self._incluir(entrada)
+            except (ValueError, KeyError, TypeError, AttributeError):
+                logger.debug("Linha inválida no índice semântico ignorada")
+        self._offset += completo
+
+    def _podar(self, estado: str) -> None:
+        """
+        Descarta as entradas de outros estados do repositório (chamado com a trava).
+
+        Elas nunca mais seriam encontradas, já que a busca só considera o
+        estado atual; o arquivo é regravado só com as entradas atuais.
+
+        Args:
+            estado: O estado atual do repositório
+        """
+        if all(entrada["state"] == estado for entrada in self.entries):
+            return
+        try:
+            with self._trava_arquivo():
+                # Reler sob a trava para não perder entradas de outros processos
+                self._sincronizar()
+                atuais = [entrada for entrada in self.entries if entrada["state"] == estado]
+                fd, temporario = tempfile.mkstemp(prefix=".semantic-", dir=os.path.dirname(self.path))
+                try:
+                    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                        f.writelines(json.dumps(entrada, ensure_ascii=False) + "\n" for entrada in atuais)
+                    os.replace(temporario, self.path)
+                except BaseException:
+                    if os.path.exists(temporario):
+                        os.remove(temporario)
+                    raise
+        except OSError as e:
+            logger.error(f"Erro ao compactar índice semântico: {e}")
+            return
+        removidas = len(self.entries) - len(atuais)
+        self._limpar()
+        self._sincronizar()
+        logger.debug(f"Índice semântico: {removidas} entrada(s) de estados anteriores removida(s)")
+
+    def _escopo(self, output_format: str) -> Tuple[str, str]:
+        """Identifica o estado do repositório e o formato da consulta (o diretório é o do índice)."""
+        return estado_repositorio_recente(self.directory, STATE_TTL), output_format
+
+    def _idf(self) -> "np.ndarray":
+        """Pesos IDF suavizados a partir das frequências de documento."""
+        n = self.size
+        return np.log((1.0 + n) / (1.0 + self.df)) + 1.0
+
+    def search(self, question: str, output_format: str = "json",
+               threshold: float = DEFAULT_THRESHOLD) -> Optional[Tuple[Dict[str, Any], float]]:
+        """
+        Procura a pergunta já respondida mais parecida com `question`.
+
+        Args:
+            question: A pergunta em linguagem natural
+            output_format: O formato de saída da consulta
+            threshold: Similaridade mínima (0 a 1) para aceitar a correspondência
+
+        Returns:
+            tuple: (entrada do índice, similaridade) da melhor correspondência
+                acima do limiar, ou None
+        """
+        escopo = self._escopo(output_format)
+        with self._lock:
+            self._sincronizar()
+            scope_id = self.scope_ids.get(escopo)
+            if scope_id is None or not self.size:
+                return None
+
+            linhas = np.nonzero(self.scopes[:self.size] == scope_id)[0]
+            if len(linhas) == 0:
+                return None
+
+            idf = self._idf()
+            consulta = vetorizar(question, self.dim) * idf
+            norma = np.linalg.norm(consulta)
+            if norma == 0:
+                return None
+
+            candidatos = self.vectors[linhas] * idf
+            normas = np.linalg.norm(candidatos, axis=1)
+            normas[normas == 0] = 1.0
+            similaridades = candidatos @ consulta / (normas * norma)
+
+            melhor = int(np.argmax(similaridades))
+            similaridade = float(similaridades[melhor])
+            if similaridade < threshold:
+                return None
+            return self.entries[int(linhas[melhor])], similaridade
+
+    def get(self, question: str, query_cache: QueryCache, output_format: str = "json",
+            threshold: float = DEFAULT_THRESHOLD) -> Optional[Dict[str, Any]]:
+        """
+        Retorna a resposta de uma pergunta equivalente, se houver.
+
+        A resposta devolvida inclui a chave `semantic_cache` com a similaridade
+        e a pergunta original, para calibrar o limiar.
+
+        Args:
+            question: A pergunta em linguagem natural
+            query_cache: Cache exato onde as respostas estão armazenadas
+            output_format: O formato de saída da consulta
+            threshold: Similaridade mínima (0 a 1) para reaproveitar uma resposta
+
+        Returns:
+            dict: A resposta armazenada ou None
+        """
+        encontrado = self.search(question, output_format, threshold)
+        if encontrado is None:
+            return None
+
+        entrada, similaridade = encontrado
+        response = query_cache.get(entrada["key"])
+        if response is None:
+            return None
+
+        response = dict(response)
+        response["semantic_cache"] = {
+            "similarity": round(similaridade, 4),
+            "threshold": threshold,
+            "matched_question": entrada["question"]
+        }
+        logger.info(f"Cache semântico: '{question}' ~ '{entrada['question']}' ({similaridade:.3f})")
+        return response
+
+    def add(self, question: str, key: str, output_format: str = "json") -> None:
+        """
+        Indexa uma pergunta respondida.
+
+        A entrada é acrescentada ao arquivo em uma linha (sem regravar o
+        índice); entradas de estados anteriores do repositório são podadas.
+
+        Args:
+            question: A pergunta em linguagem natural
+            key: A chave da resposta no cache exato
+            output_format: O formato de saída da consulta
+        """
+        estado, formato = self._escopo(output_format)
+        linha = json.dumps({"question": question, "key": key, "state": estado, "format": formato},
+                           ensure_ascii=False) + "\n"
+        with self._lock:
+            self._podar(estado)
+            try:
+                with self._trava_arquivo():
+                    with open(self.path, 'a', encoding='utf-8') as f:
+                        f.write(linha)
+            except OSError as e:
+                logger.error(f"Erro ao gravar índice semântico: {e}")
+                return
+            self._sincronizar()
+
+
+# Índices abertos, reaproveitados entre consultas do mesmo processo
+_indices: Dict[str, SemanticCache] = {}
+_indices_lock = threading.Lock()
+
+
+def abrir_cache_semantico(directory: str) -> Optional[SemanticCache]:
+    """
+    Abre (ou reaproveita) o cache semântico de um projeto.
+
+    Args:
+        directory: O diretório do projeto
+
+    Returns:
+        SemanticCache: O cache semântico, ou None se o NumPy não estiver instalado
+    """
+    if not disponivel():
+        logger.warning("Cache semântico desativado: NumPy não está instalado")
+        return None
+
+    chave = os.path.abspath(directory)
+    with _indices_lock:
+        if chave not in _indices:
+            _indices[chave] = SemanticCache(chave)
+        return _indices[chave]
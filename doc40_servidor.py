@@ -0,0 +1,705 @@
+#!/usr/bin/env python3
+"""
+Documentação 4.0 - Servidor HTTP da Documentação
+Campus Party 2025 - Lucas Dórea Cardoso e Aulus Diniz
+
+Servidor de arquivos estáticos usado por `DocumentationServer` em
+`doc40-completo.py` e `doc40-sistema.py`. Diferente do
+`socketserver.TCPServer`, que atende uma requisição por vez (um cliente
+lento ou o download de um `openapi.json` grande bloqueia todos), este
+servidor atende cada conexão em um pool limitado de threads, mantém
+conexões HTTP/1.1 abertas (keep-alive) e encerra conexões ociosas após um
+tempo limite.
+
+Uma conexão keep-alive ocupa um worker enquanto estiver aberta. Para que
+conexões ociosas não deixem novas conexões esperando na fila do pool, uma
+conexão ociosa há mais de `OCIOSIDADE_MINIMA` segundos é fechada assim que
+outra conexão espera por um worker (o cliente simplesmente reconecta). O
+limite que resta: conexões ativas e clientes lentos no meio de uma
+requisição (cabeçalho ou corpo chegando aos poucos) prendem o seu worker
+até terminar ou até o tempo limite; com `workers` conexões assim ao mesmo
+tempo, as demais esperam na fila.
+
+Cada arquivo é servido com um ETag forte (hash do conteúdo, recalculado só
+quando o mtime ou o tamanho mudam) e um `Cache-Control` escolhido pela
+extensão; `If-None-Match` e `If-Modified-Since` respondem `304 Not
+Modified` sem reenviar o corpo. Assim, após uma atualização do agente, o
+navegador (ou o proxy reverso) só baixa de novo os arquivos que mudaram.
+
+Quando existe uma cópia pré-comprimida atualizada (`.br`/`.gz`, gravada por
+`doc40_compressao.py` após cada geração), ela é enviada conforme o
+`Accept-Encoding` do cliente, sem compressão durante a requisição.
+
+Documentos `.md` pedidos por um navegador (Accept com text/html) são
+renderizados como páginas HTML na primeira requisição e servidos da memória
+nas seguintes (`doc40_markdown.MarkdownCache`); `?raw` devolve o Markdown.
+
+`/search?q=...&limit=10` responde em JSON a uma busca por palavra-chave no
+índice BM25 da documentação (`doc40_busca.py`), sem chamar o Claude Code.
+
+Uso:
+    servidor = criar_servidor("./docs", porta=8000, workers=32, timeout=30)
+    servidor.serve_forever()
+
+    python doc40_servidor.py --dir ./docs --porta 8000 --workers 32
+"""
+
+import io
+import os
+import re
+import sys
+import json
+import time
+import socket
+import hashlib
+import argparse
+import datetime
+import email.utils
+import functools
+import http.server
+import selectors
+import threading
+import logging
+from http import HTTPStatus
+from urllib.parse import urlsplit, parse_qs
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from doc40_compressao import CODIFICACOES, variante_atualizada
+from doc40_markdown import MarkdownCache
+from doc40_busca import LIMITE, buscar
+
+logger = logging.getLogger('doc40-servidor')
+
+# Padrões do servidor
+WORKERS = 32
+TIMEOUT = 30.0
+MAX_ETAGS = 10000
+# Intervalo em que uma conexão ociosa confere se outra conexão espera por um worker
+INTERVALO_OCIOSO = 0.05
+# Ociosidade mínima para fechar uma conexão em favor da fila (clientes ativos
+# reenviam em milissegundos e não devem ter a conexão fechada no meio do uso)
+OCIOSIDADE_MINIMA = 0.25
+ROTA_BUSCA = "/search"
+
+# Cache-Control por nome de arquivo, por extensão, para assets com hash no
+# nome ("hash") e padrão ("*"). Documentos gerados são reescritos no mesmo
+# caminho a cada atualização: o navegador revalida (um 304 barato via ETag).
+CACHE_CONTROL = {
+    "index.html": "no-cache",
+    ".html": "public, max-age=60",
+    ".md": "public, max-age=60",
+    ".json": "public, max-age=60",
+    ".yaml": "public, max-age=60",
+    ".css": "public, max-age=3600",
+    ".js": "public, max-age=3600",
+    ".png": "public, max-age=86400",
+    ".jpg": "public, max-age=86400",
+    ".svg": "public, max-age=86400",
+    ".ico": "public, max-age=86400",
+    ".woff2": "public, max-age=86400",
+    "hash": "public, max-age=31536000, immutable",
+    "*": "public, max-age=300",
+}
+
+# Nomes como app.3f2a1b9c.js ou estilo-0123abcd4567.css
+_NOME_COM_HASH = re.compile(r"[.-][0-9a-fA-F]{8,64}\.[A-Za-z0-9]+$")
+
+
+def politica_cache(caminho: str, politicas: Optional[Dict[str, str]] = None) -> str:
+    """
+    Escolhe o Cache-Control de um arquivo.
+
+    A ordem é: nome exato, asset com hash no nome, extensão e padrão.
+
+    Args:
+        caminho: Caminho do arquivo
+        politicas: Políticas (padrão: CACHE_CONTROL)
+
+    Returns:
+        str: O valor do cabeçalho Cache-Control
+    """
+    politicas = CACHE_CONTROL if politicas is None else politicas
+    nome = os.path.basename(caminho)
+    if nome in politicas:
+        return politicas[nome]
+    if "hash" in politicas and _NOME_COM_HASH.search(nome):
+        return politicas["hash"]
+    extensao = os.path.splitext(nome)[1].lower()
+    if extensao in politicas:
+        return politicas[extensao]
+    return politicas.get("*", CACHE_CONTROL["*"])
+
+
+class EtagCache:
+    """ETags fortes (SHA-1 do conteúdo), recalculados só quando o arquivo muda."""
+
+    def __init__(self, max_entradas: int = MAX_ETAGS):
+        """
+        Cria o cache.
+
+        Args:
+            max_entradas: Número máximo de arquivos lembrados
+        """
+        self.max_entradas = max_entradas
+        self._itens: Dict[str, Tuple[Tuple[int, int, int], str]] = {}
+        self._lock = threading.Lock()
+
+    def obter(self, caminho: str, arquivo, fs: os.stat_result) -> str:
+        """
+        Retorna o ETag de um arquivo aberto.
+
+        Args:
+            caminho: Caminho do arquivo (chave do cache)
+            arquivo: O arquivo aberto em modo binário (volta ao início após o hash)
+            fs: Resultado de os.fstat do arquivo
+
+        Returns:
+            str: O ETag, já entre aspas
+        """
+        assinatura = (fs.st_mtime_ns, fs.st_size, fs.st_ino)
+        with self._lock:
+            item = self._itens.get(caminho)
+        if item is not None and item[0] == assinatura:
+            return item[1]
+
+        digest = hashlib.sha1()
+        for bloco in iter(lambda: arquivo.read(65536), b""):
+            digest.update(bloco)
+        arquivo.seek(0)
+        etag = f'"{digest.hexdigest()}"'
+
+        with self._lock:
+            self._itens.pop(caminho, None)
+            if len(self._itens) >= self.max_entradas:
+                self._itens.pop(next(iter(self._itens)))
+            self._itens[caminho] = (assinatura, etag)
+        return etag
+
+
+class DocsRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """Serve a documentação com keep-alive, tempo limite por conexão, ETags e Markdown renderizado."""
+
+    # Conexões persistentes (requer Content-Length, que o SimpleHTTPRequestHandler envia)
+    protocol_version = "HTTP/1.1"
+    server_version = "Doc40/1.0"
+
+    def __init__(self, *args, directory: Optional[str] = None, timeout: Optional[float] = TIMEOUT,
+                 cache_control: Optional[Dict[str, str]] = None, renderizar_markdown: bool = True,
+                 **kwargs):
+        # `timeout` é aplicado ao socket por StreamRequestHandler.setup
+        self.timeout = timeout
+        self.cache_control = cache_control
+        self.renderizar_markdown = renderizar_markdown
+        super().__init__(*args, directory=directory, **kwargs)
+
+    def setup(self) -> None:
+        """
+        Desativa o algoritmo de Nagle na conexão.
+
+        Com keep-alive, o corpo enviado logo após o cabeçalho esperaria o ACK
+        atrasado do cliente (~40 ms) a cada requisição.
+        """
+        super().setup()
+        try:
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except OSError:
+            pass
+
+    def log_message(self, format: str, *args) -> None:
+        """Registra os acessos no logger em vez de escrever em stderr."""
+        logger.debug(f"{self.address_string()} - {format % args}")
+
+    def handle(self) -> None:
+        """Atende as requisições da conexão, liberando o worker se ela ficar ociosa."""
+        self.close_connection = True
+        self.handle_one_request()
+        while not self.close_connection and self._aguardar_requisicao():
+            self.handle_one_request()
+
+    def _dados_pendentes(self) -> bool:
+        """Indica, sem bloquear, se a próxima requisição já chegou (no buffer ou no socket)."""
+        try:
+            self.connection.setblocking(False)
+            try:
+                return bool(self.rfile.peek(1))
+            finally:
+                self.connection.settimeout(self.timeout)
+        except (OSError, ValueError):
+            return False
+
+    def _aguardar_requisicao(self) -> bool:
+        """
+        Espera a próxima requisição de uma conexão keep-alive.
+
+        Returns:
+            bool: True se chegou uma requisição; False se a conexão ficou ociosa
+                além do tempo limite ou se outra conexão espera por um worker
+        """
+        if self._dados_pendentes():
+            return True
+        esperando = getattr(self.server, "conexoes_esperando", None)
+        inicio = time.monotonic()
+        prazo = None if self.timeout is None else inicio + self.timeout
+        with selectors.DefaultSelector() as seletor:
+            try:
+                seletor.register(self.connection, selectors.EVENT_READ)
+            except (OSError, ValueError):
+                return False
+            while True:
+                if esperando is not None and esperando() > 0 \
+                        and time.monotonic() - inicio >= OCIOSIDADE_MINIMA:
+                    logger.debug(f"{self.address_string()} - conexão ociosa fechada para liberar o worker")
+                    return False
+                espera = INTERVALO_OCIOSO
+                if prazo is not None:
+                    restante = prazo - time.monotonic()
+                    if restante <= 0:
+                        return False
+                    espera = min(espera, restante)
+                if seletor.select(espera):
+                    return True
+
+    def handle_one_request(self) -> None:
+        """Atende uma requisição, encerrando a conexão se o cliente ficar ocioso."""
+        try:
+            super().handle_one_request()
+        except socket.timeout:
+            self.close_connection = True
+        except (ConnectionResetError, BrokenPipeError):
+            self.close_connection = True
+
+    def _arquivo_requisitado(self) -> Optional[str]:
+        """
+        Resolve o arquivo regular pedido (incluindo o index.html de um diretório).
+
+        Returns:
+            str: O caminho do arquivo, ou None para redirecionamentos, listagens
+                e erros, que ficam com o SimpleHTTPRequestHandler
+        """
+        caminho = self.translate_path(self.path)
+        if os.path.isdir(caminho):
+            if not urlsplit(self.path).path.endswith("/"):
+                return None
+            for indice in ("index.html", "index.htm"):
+                candidato = os.path.join(caminho, indice)
+                if os.path.isfile(candidato):
+                    return candidato
+            return None
+        if caminho.endswith("/") or not os.path.isfile(caminho):
+            return None
+        return caminho
+
+    def _nao_modificado(self, etag: str, mtime: float) -> bool:
+        """
+        Avalia If-None-Match (comparação fraca) e, na ausência dele, If-Modified-Since.
+
+        Args:
+            etag: O ETag atual do arquivo
+            mtime: Data de modificação do arquivo
+
+        Returns:
+            bool: True se o cliente já tem a versão atual
+        """
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            if if_none_match.strip() == "*":
+                return True
+            for tag in if_none_match.split(","):
+                tag = tag.strip()
+                if tag.startswith("W/"):
+                    tag = tag[2:]
+                if tag == etag:
+                    return True
+            return False
+
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since is None:
+            return False
+        try:
+            data = email.utils.parsedate_to_datetime(if_modified_since)
+        except (TypeError, IndexError, OverflowError, ValueError):
+            return False
+        if data.tzinfo is None:
+            data = data.replace(tzinfo=datetime.timezone.utc)
+        modificado = datetime.datetime.fromtimestamp(int(mtime), datetime.timezone.utc)
+        return modificado <= data
+
+    def _codificacoes_aceitas(self) -> Dict[str, float]:
+        """
+        Lê o Accept-Encoding da requisição.
+
+        Returns:
+            dict: Qualidade (q) de cada codificação citada, em minúsculas
+        """
+        aceitas = {}
+        for parte in self.headers.get("Accept-Encoding", "").split(","):
+            nome, _, parametros = parte.partition(";")
+            nome = nome.strip().lower()
+            if not nome:
+                continue
+            qualidade = 1.0
+            for parametro in parametros.split(";"):
+                chave, _, valor = parametro.partition("=")
+                if chave.strip().lower() == "q":
+                    try:
+                        qualidade = float(valor)
+                    except ValueError:
+                        qualidade = 0.0
+            aceitas[nome] = qualidade
+        return aceitas
+
+    def _escolher_variante(self, caminho: str) -> Tuple[str, Optional[str], bool]:
+        """
+        Escolhe entre o arquivo original e suas cópias pré-comprimidas.
+
+        Args:
+            caminho: Caminho do arquivo original
+
+        Returns:
+            tuple: (arquivo a enviar, Content-Encoding ou None, se há variantes
+                e a resposta depende do Accept-Encoding)
+        """
+        try:
+            fs = os.stat(caminho)
+        except OSError:
+            return caminho, None, False
+
+        variantes = [(nome, sufixo) for nome, sufixo in CODIFICACOES
+                     if variante_atualizada(caminho, sufixo, fs) is not None]
+        if not variantes:
+            return caminho, None, False
+
+        aceitas = self._codificacoes_aceitas()
+        escolha, melhor = None, 0.0
+        for nome, sufixo in variantes:
+            qualidade = aceitas.get(nome, aceitas.get("*", 0.0))
+            if qualidade > melhor:
+                escolha, melhor = (nome, sufixo), qualidade
+        if escolha is None:
+            return caminho, None, True
+        return caminho + escolha[1], escolha[0], True
+
+    def _enviar_cabecalhos_cache(self, caminho: str, etag: str, mtime: float,
+                                 varia: Tuple[str, ...] = ()) -> None:
+        """Envia ETag, Last-Modified, Cache-Control e Vary (em respostas 200 e 304)."""
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", self.date_time_string(mtime))
+        self.send_header("Cache-Control", politica_cache(caminho, self.cache_control))
+        if varia:
+            self.send_header("Vary", ", ".join(varia))
+
+    def _quer_markdown_renderizado(self, caminho: str) -> bool:
+        """
+        Indica se um .md deve ser enviado como página HTML.
+
+        Args:
+            caminho: Caminho do arquivo requisitado
+
+        Returns:
+            bool: True para navegadores (Accept com text/html), exceto com `?raw`
+        """
+        if not self.renderizar_markdown or not caminho.lower().endswith(".md"):
+            return False
+        if "raw" in parse_qs(urlsplit(self.path).query, keep_blank_values=True):
+            return False
+        return "text/html" in self.headers.get("Accept", "")
+
+    def _enviar_markdown(self, caminho: str):
+        """
+        Envia um .md renderizado, a partir do cache de páginas.
+
+        Args:
+            caminho: Caminho do arquivo .md
+
+        Returns:
+            io.BytesIO: O corpo da resposta, ou None (304 ou erro)
+        """
+        paginas = getattr(self.server, "markdown", None)
+        if paginas is None:
+            paginas = _PAGINAS
+        try:
+            pagina = paginas.obter(caminho)
+        except OSError:
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return None
+
+        corpo, etag, codificacao = pagina.html, pagina.etag, None
+        aceitas = self._codificacoes_aceitas()
+        if aceitas.get("gzip", aceitas.get("*", 0.0)) > 0:
+            (corpo, etag), codificacao = pagina.comprimida(), "gzip"
+        varia = ("Accept", "Accept-Encoding")
+
+        if self._nao_modificado(etag, pagina.mtime):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self._enviar_cabecalhos_cache(caminho, etag, pagina.mtime, varia)
+            self.end_headers()
+            return None
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-type", "text/html; charset=utf-8")
+        if codificacao:
+            self.send_header("Content-Encoding", codificacao)
+        self.send_header("Content-Length", str(len(corpo)))
+        self._enviar_cabecalhos_cache(caminho, etag, pagina.mtime, varia)
+        self.end_headers()
+        return io.BytesIO(corpo)
+
+    def _enviar_json(self, status: HTTPStatus, dados: Dict) -> io.BytesIO:
+        """
+        Envia uma resposta JSON que não deve ser guardada em cache.
+
+        Args:
+            status: O status HTTP
+            dados: O corpo da resposta
+
+        Returns:
+            io.BytesIO: O corpo da resposta
+        """
+        corpo = json.dumps(dados, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(corpo)))
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        return io.BytesIO(corpo)
+
+    def _enviar_busca(self) -> io.BytesIO:
+        """
+        Responde a `/search?q=...&limit=N` com os resultados do índice local.
+
+        Returns:
+            io.BytesIO: O corpo JSON (resultados ou erro)
+        """
+        parametros = parse_qs(urlsplit(self.path).query)
+        consulta = parametros.get("q", [""])[0].strip()
+        if not consulta:
+            return self._enviar_json(HTTPStatus.BAD_REQUEST, {
+                "success": False, "error": "MissingQuery", "message": "Informe a consulta em ?q="})
+        try:
+            limite = max(1, min(100, int(parametros.get("limit", [LIMITE])[0])))
+        except ValueError:
+            return self._enviar_json(HTTPStatus.BAD_REQUEST, {
+                "success": False, "error": "InvalidLimit", "message": "limit deve ser um número inteiro"})
+        return self._enviar_json(HTTPStatus.OK, buscar(self.directory, consulta, limite))
+
+    def send_head(self):
+        """
+        Envia status e cabeçalhos de GET/HEAD, com ETag, respostas 304,
+        cópias pré-comprimidas, Markdown renderizado e a rota de busca.
+
+        Returns:
+            O arquivo aberto a ser copiado para o cliente, ou None
+        """
+        if urlsplit(self.path).path == ROTA_BUSCA:
+            return self._enviar_busca()
+        caminho = self._arquivo_requisitado()
+        if caminho is None:
+            return super().send_head()
+        if self._quer_markdown_renderizado(caminho):
+            return self._enviar_markdown(caminho)
+        arquivo, codificacao, comprimido = self._escolher_variante(caminho)
+        varia = ("Accept-Encoding",) if comprimido else ()
+        if self.renderizar_markdown and caminho.lower().endswith(".md"):
+            varia = ("Accept",) + varia
+        try:
+            f = open(arquivo, 'rb')
+        except OSError:
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return None
+
+        try:
+            # Cada variante tem seu próprio ETag (hash do conteúdo enviado)
+            fs = os.fstat(f.fileno())
+            etags = getattr(self.server, "etags", None) or _ETAGS
+            etag = etags.obter(arquivo, f, fs)
+
+            if self._nao_modificado(etag, fs.st_mtime):
+                f.close()
+                self.send_response(HTTPStatus.NOT_MODIFIED)
+                self._enviar_cabecalhos_cache(caminho, etag, fs.st_mtime, varia)
+                self.end_headers()
+                return None
+
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-type", self.guess_type(caminho))
+            if codificacao:
+                self.send_header("Content-Encoding", codificacao)
+            self.send_header("Content-Length", str(fs.st_size))
+            self._enviar_cabecalhos_cache(caminho, etag, fs.st_mtime, varia)
+            self.end_headers()
+            return f
+        except BaseException:
+            f.close()
+            raise
+
+
+# Usados por handlers montados fora de um DocsHTTPServer
+_ETAGS = EtagCache()
+_PAGINAS = MarkdownCache()
+
+
+class DocsHTTPServer(http.server.ThreadingHTTPServer):
+    """
+    Servidor HTTP com um pool limitado de threads.
+
+    Cada conexão ocupa um worker enquanto estiver aberta; conexões além de
+    `workers` esperam na fila do pool. Uma conexão ociosa é fechada após o
+    tempo limite do handler, ou antes disso se houver conexões na fila
+    (`conexoes_esperando`) e ela estiver ociosa há `OCIOSIDADE_MINIMA`. Com `workers=None` usa uma thread por conexão.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 128
+
+    def __init__(self, address: Tuple[str, int], handler, workers: Optional[int] = WORKERS):
+        """
+        Cria o servidor e abre a porta.
+
+        Args:
+            address: (host, porta)
+            handler: Classe (ou fábrica) do handler de requisições
+            workers: Máximo de conexões atendidas ao mesmo tempo (None: sem limite)
+        """
+        self.workers = workers
+        self.etags = EtagCache()
+        self.markdown = MarkdownCache()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="doc40-http") if workers else None
+        self._esperando = 0
+        self._esperando_lock = threading.Lock()
+        super().__init__(address, handler)
+
+    def conexoes_esperando(self) -> int:
+        """Conexões aceitas que ainda esperam por um worker do pool."""
+        return self._esperando
+
+    def process_request(self, request, client_address) -> None:
+        """Entrega a conexão a um worker do pool."""
+        if self._pool is None:
+            super().process_request(request, client_address)
+            return
+        with self._esperando_lock:
+            self._esperando += 1
+        self._pool.submit(self._atender, request, client_address)
+
+    def _atender(self, request, client_address) -> None:
+        """Atende a conexão no worker que a recebeu."""
+        with self._esperando_lock:
+            self._esperando -= 1
+        self.process_request_thread(request, client_address)
+
+    def server_close(self) -> None:
+        """Fecha a porta e libera o pool (conexões abertas terminam sozinhas)."""
+        super().server_close()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+
+
+def criar_servidor(diretorio: str, porta: int = 8000, workers: Optional[int] = WORKERS,
+                   timeout: Optional[float] = TIMEOUT, host: str = "",
+                   handler_class=DocsRequestHandler,
+                   cache_control: Optional[Dict[str, str]] = None,
+                   renderizar_markdown: bool = True) -> DocsHTTPServer:
+    """
+    Cria um servidor para um diretório de documentação.
+
+    Args:
+        diretorio: O diretório servido
+        porta: A porta (0 escolhe uma livre)
+        workers: Máximo de conexões atendidas ao mesmo tempo (None: uma thread por conexão)
+        timeout: Tempo limite de uma conexão ociosa, em segundos
+        host: Endereço de escuta (padrão: todas as interfaces)
+        handler_class: Classe do handler de requisições
+        cache_control: Políticas de Cache-Control que substituem as de CACHE_CONTROL
+        renderizar_markdown: Envia .md como HTML para navegadores
+
+    Returns:
+        DocsHTTPServer: O servidor, ainda não iniciado
+    """
+    politicas = {**CACHE_CONTROL, **(cache_control or {})}
+    handler = functools.partial(handler_class, directory=os.path.abspath(diretorio), timeout=timeout,
+                                cache_control=politicas, renderizar_markdown=renderizar_markdown)
+    return DocsHTTPServer((host, porta), handler, workers)
+
+
+def iniciar_em_thread(servidor: DocsHTTPServer) -> threading.Thread:
+    """
+    Executa `serve_forever` em uma thread daemon.
+
+    Args:
+        servidor: O servidor
+
+    Returns:
+        threading.Thread: A thread do servidor
+    """
+    thread = threading.Thread(target=servidor.serve_forever, name="doc40-http-accept", daemon=True)
+    thread.start()
+    return thread
+
+
+def ler_politicas_cache(itens) -> Dict[str, str]:
+    """
+    Converte opções "CHAVE=VALOR" em políticas de Cache-Control.
+
+    Args:
+        itens: Opções como ".html=no-cache" ou "hash=public, max-age=31536000, immutable"
+
+    Returns:
+        dict: Políticas por chave
+
+    Raises:
+        ValueError: Se alguma opção não tiver o formato CHAVE=VALOR
+    """
+    politicas = {}
+    for item in itens or []:
+        chave, separador, valor = item.partition("=")
+        if not separador or not chave.strip() or not valor.strip():
+            raise ValueError(f"Política de cache inválida: {item} (use CHAVE=VALOR)")
+        chave = chave.strip()
+        politicas[chave.lower() if chave.startswith(".") else chave] = valor.strip()
+    return politicas
+
+
+def main():
+    """Serve um diretório de documentação."""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description="Documentação 4.0 - Servidor da documentação")
+    parser.add_argument("--dir", "-d", default="docs", help="Diretório da documentação")
+    parser.add_argument("--porta", "-p", type=int, default=8000, help="Porta do servidor")
+    parser.add_argument("--workers", "-w", type=int, default=WORKERS,
+                        help="Máximo de conexões simultâneas (0: uma thread por conexão)")
+    parser.add_argument("--timeout", "-t", type=float, default=TIMEOUT,
+                        help="Tempo limite de conexões ociosas, em segundos")
+    parser.add_argument("--cache-control", "-c", action="append", default=[], metavar="CHAVE=VALOR",
+                        help="Cache-Control por extensão, nome, 'hash' ou '*' (ex.: .html=no-cache)")
+    parser.add_argument("--sem-markdown", action="store_true",
+                        help="Servir arquivos .md sem renderizar")
+    args = parser.parse_args()
+
+    try:
+        politicas = ler_politicas_cache(args.cache_control)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+
+    if not os.path.isdir(args.dir):
+        print(f"❌ Diretório de documentação não encontrado: {args.dir}")
+        return 1
+
+    servidor = criar_servidor(args.dir, args.porta, args.workers or None, args.timeout,
+                              cache_control=politicas, renderizar_markdown=not args.sem_markdown)
+    print(f"Servindo {os.path.abspath(args.dir)} em http://localhost:{servidor.server_address[1]} "
+          f"({args.workers or 'sem limite de'} workers). Ctrl+C para sair.")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
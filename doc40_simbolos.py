@@ -0,0 +1,567 @@
+#!/usr/bin/env python3
+"""
+Documentação 4.0 - Índice de Símbolos do Projeto
+Campus Party 2025 - Lucas Dórea Cardoso e Aulus Diniz
+
+Lê os arquivos Python do projeto com o módulo `ast` e registra, para cada
+módulo, as classes, funções e métodos com assinatura, docstring,
+decoradores e intervalo de linhas (`PaymentProcessor.refund_payment`,
+linhas 160-225). O índice fica em `<projeto>/.doc40/simbolos.json`.
+
+- Atualização incremental: arquivos com mtime/tamanho inalterados custam só
+  um `stat`; os demais são relidos, mas só reanalisados se o hash do
+  conteúdo mudou. `update` informa os símbolos adicionados, removidos e
+  alterados (assinatura ou docstring) de cada arquivo.
+- Construção a frio: com muitos arquivos pendentes, a análise é dividida
+  entre processos (`ProcessPoolExecutor`), já que o `ast.parse` não libera
+  o GIL. Os processos são criados com "spawn": o índice também é
+  atualizado de processos com várias threads (servidor, agente, consultas
+  em lote), e um fork ali pode herdar travas presas por outras threads.
+
+Outras linguagens de SOURCE_EXTENSIONS não são indexadas.
+
+Uso:
+    atualizar_simbolos("./meu-projeto")
+    indice = SymbolIndex("./meu-projeto"); indice.load()
+    indice.lookup("refund_payment")
+
+    python doc40_simbolos.py --dir ./meu-projeto --buscar refund_payment
+"""
+
+import os
+import sys
+import ast
+import json
+import time
+import hashlib
+import inspect
+import argparse
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+from doc40_busca import tokenizar
+from doc40_incremental import eh_fonte, listar_fontes
+
+logger = logging.getLogger('doc40-simbolos')
+
+ARQUIVO_SIMBOLOS = os.path.join(".doc40", "simbolos.json")
+VERSAO_SIMBOLOS = 1
+EXTENSOES_SIMBOLOS = (".py",)
+# Abaixo disso, criar processos custa mais do que analisar na thread atual
+MINIMO_PROCESSOS = 64
+# Processos auxiliares sem fork (seguro mesmo se o processo atual tiver threads)
+CONTEXTO_PROCESSOS = multiprocessing.get_context("spawn")
+LIMITE = 10
+
+
+def _segmento(linhas: List[str], no: ast.AST) -> str:
+    """
+    Trecho do código de um nó, em uma linha.
+
+    Equivale a `ast.get_source_segment`, que divide o código inteiro em
+    linhas a cada chamada. As colunas do `ast` são offsets em bytes UTF-8.
+    """
+    fim = getattr(no, "end_lineno", None)
+    if fim is None:
+        return "..."
+    inicio, coluna, coluna_fim = no.lineno - 1, no.col_offset, no.end_col_offset
+    if inicio == fim - 1:
+        texto = linhas[inicio].encode('utf-8')[coluna:coluna_fim].decode('utf-8', errors='replace')
+    else:
+        texto = " ".join([linhas[inicio].encode('utf-8')[coluna:].decode('utf-8', errors='replace')]
+                         + linhas[inicio + 1:fim - 1]
+                         + [linhas[fim - 1].encode('utf-8')[:coluna_fim].decode('utf-8', errors='replace')])
+    return " ".join(texto.split())
+
+
+def _parametro(arg: ast.arg, padrao: Optional[ast.AST], linhas: List[str]) -> str:
+    """Um parâmetro com anotação e valor padrão."""
+    texto = arg.arg
+    if arg.annotation is not None:
+        texto += f": {_segmento(linhas, arg.annotation)}"
+    if padrao is not None:
+        texto += f" = {_segmento(linhas, padrao)}" if arg.annotation is not None else f"={_segmento(linhas, padrao)}"
+    return texto
+
+
+def _assinatura(no: ast.AST, linhas: List[str]) -> str:
+    """
+    Assinatura de uma função ou classe como aparece no código.
+
+    Args:
+        no: Nó FunctionDef, AsyncFunctionDef ou ClassDef
+        linhas: Linhas do código do módulo
+
+    Returns:
+        str: "(self, amount: float) -> dict" ou, para classes, as bases "(Exception)"
+    """
+    if isinstance(no, ast.ClassDef):
+        bases = [_segmento(linhas, b) for b in no.bases] + [_segmento(linhas, k) for k in no.keywords]
+        return f"({', '.join(bases)})" if bases else ""
+
+    args = no.args
+    partes = []
+    posicionais = list(getattr(args, "posonlyargs", [])) + list(args.args)
+    padroes = [None] * (len(posicionais) - len(args.defaults)) + list(args.defaults)
+    for i, (arg, padrao) in enumerate(zip(posicionais, padroes)):
+        partes.append(_parametro(arg, padrao, linhas))
+        if i == len(getattr(args, "posonlyargs", [])) - 1:
+            partes.append("/")
+    if args.vararg is not None:
+        partes.append("*" + _parametro(args.vararg, None, linhas))
+    elif args.kwonlyargs:
+        partes.append("*")
+    for arg, padrao in zip(args.kwonlyargs, args.kw_defaults):
+        partes.append(_parametro(arg, padrao, linhas))
+    if args.kwarg is not None:
+        partes.append("**" + _parametro(args.kwarg, None, linhas))
+    retorno = f" -> {_segmento(linhas, no.returns)}" if no.returns is not None else ""
+    return f"({', '.join(partes)}){retorno}"
+
+
+def _docstring(no: ast.AST) -> str:
+    """Docstring limpa de um nó (ast.get_docstring sem a checagem lenta de ast.Str)."""
+    corpo = no.body
+    if corpo and isinstance(corpo[0], ast.Expr) and isinstance(corpo[0].value, ast.Constant) \
+            and isinstance(corpo[0].value.value, str):
+        return inspect.cleandoc(corpo[0].value.value)
+    return ""
+
+
+def _coletar(corpo: List[ast.stmt], linhas: List[str], prefixo: str, em_classe: bool,
+             simbolos: List[Dict[str, Any]]) -> None:
+    """Percorre classes e funções (sem entrar no corpo das funções)."""
+    for no in corpo:
+        if not isinstance(no, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        nome = f"{prefixo}{no.name}"
+        if isinstance(no, ast.ClassDef):
+            tipo = "class"
+        else:
+            tipo = "method" if em_classe else "function"
+        simbolo = {
+            "name": nome,
+            "kind": tipo,
+            "signature": _assinatura(no, linhas),
+            "doc": _docstring(no),
+            "decorators": [_segmento(linhas, d) for d in no.decorator_list],
+            # Decoradores fazem parte da definição
+            "line": min([no.lineno] + [d.lineno for d in no.decorator_list]),
+            "end_line": getattr(no, "end_lineno", no.lineno),
+            # Termos do nome para a busca, calculados aqui (em paralelo na construção a frio)
+            "terms": sorted(set(tokenizar(nome)))
+        }
+        if isinstance(no, ast.AsyncFunctionDef):
+            simbolo["async"] = True
+        simbolos.append(simbolo)
+        if isinstance(no, ast.ClassDef):
+            _coletar(no.body, linhas, nome + ".", True, simbolos)
+
+
+def nome_modulo(relativo: str) -> str:
+    """Nome pontuado do módulo de um arquivo ("src/api/auth.py" → "src.api.auth")."""
+    partes = os.path.splitext(relativo)[0].replace(os.sep, "/").split("/")
+    if partes[-1] == "__init__" and len(partes) > 1:
+        partes = partes[:-1]
+    return ".".join(partes)
+
+
+def analisar_fonte(fonte: str, relativo: str) -> Dict[str, Any]:
+    """
+    Extrai os símbolos de um código Python.
+
+    Args:
+        fonte: O código
+        relativo: Caminho do arquivo, relativo ao projeto
+
+    Returns:
+        dict: module, doc (docstring do módulo), symbols e, se o código não
+            puder ser analisado, error
+    """
+    registro = {"module": nome_modulo(relativo), "doc": "", "symbols": []}
+    try:
+        arvore = ast.parse(fonte, filename=relativo)
+    except (SyntaxError, ValueError) as e:
+        linha = getattr(e, "lineno", None)
+        registro["error"] = f"{type(e).__name__}: {getattr(e, 'msg', e)}" + (f" (linha {linha})" if linha else "")
+        return registro
+    registro["doc"] = _docstring(arvore)
+    # split("\n") numera as linhas como o parser (splitlines também quebra em \f, \x1c...)
+    _coletar(arvore.body, fonte.split("\n"), "", False, registro["symbols"])
+    return registro
+
+
+def _analisar_arquivo(tarefa: Tuple[str, str, Optional[str]]) -> Tuple[str, Optional[str], Optional[Dict[str, Any]]]:
+    """
+    Lê, calcula o hash e, se o conteúdo mudou, analisa um arquivo.
+
+    Executada em processos auxiliares na construção a frio.
+
+    Args:
+        tarefa: (caminho absoluto, caminho relativo, hash anterior)
+
+    Returns:
+        tuple: (relativo, hash, registro); hash None se o arquivo sumiu,
+            registro None se o conteúdo não mudou
+    """
+    caminho, relativo, hash_anterior = tarefa
+    try:
+        with open(caminho, 'rb') as f:
+            dados = f.read()
+    except OSError:
+        return relativo, None, None
+    hash_atual = hashlib.sha1(dados).hexdigest()
+    if hash_atual == hash_anterior:
+        return relativo, hash_atual, None
+    fonte = dados.decode('utf-8', errors='replace')
+    return relativo, hash_atual, analisar_fonte(fonte, relativo)
+
+
+def _interface(simbolos: List[Dict[str, Any]]) -> Dict[str, Tuple]:
+    """Nome → o que define o símbolo, sem as linhas (que mudam com edições acima dele)."""
+    return {s["name"]: (s["kind"], s["signature"], s["doc"], tuple(s["decorators"]), s.get("async", False))
+            for s in simbolos}
+
+
+def diferenca_simbolos(anteriores: List[Dict[str, Any]], atuais: List[Dict[str, Any]]) -> Dict[str, List[str]]:
+    """
+    Compara os símbolos de duas versões de um arquivo.
+
+    Args:
+        anteriores: Símbolos da versão indexada
+        atuais: Símbolos da nova versão
+
+    Returns:
+        dict: added, removed e modified (assinatura, docstring, tipo ou
+            decoradores diferentes), com nomes qualificados
+    """
+    antes, depois = _interface(anteriores), _interface(atuais)
+    return {
+        "added": sorted(set(depois) - set(antes)),
+        "removed": sorted(set(antes) - set(depois)),
+        "modified": sorted(n for n in set(antes) & set(depois) if antes[n] != depois[n])
+    }
+
+
+class SymbolIndex:
+    """Índice persistido dos símbolos Python de um projeto."""
+
+    def __init__(self, diretorio: str, saida: Optional[str] = None):
+        """
+        Cria o índice (vazio até `load` ou `update`).
+
+        Args:
+            diretorio: O diretório do projeto
+            saida: O diretório da documentação (fora do índice; padrão: `docs`)
+        """
+        self.diretorio = os.path.abspath(diretorio)
+        self.saida = os.path.abspath(saida or os.path.join(self.diretorio, "docs"))
+        self.saida_rel = os.path.relpath(self.saida, self.diretorio)
+        self.arquivo = os.path.join(self.diretorio, ARQUIVO_SIMBOLOS)
+        # arquivo -> {"hash", "sig": [mtime_ns, tamanho], "module", "doc", "symbols", "error"?}
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self._termos: Optional[Dict[str, List[Tuple[str, int]]]] = None
+
+    def __len__(self) -> int:
+        return sum(len(info["symbols"]) for info in self.files.values())
+
+    def load(self) -> bool:
+        """
+        Carrega o índice persistido.
+
+        Returns:
+            bool: True se havia um índice válido
+        """
+        try:
+            with open(self.arquivo, 'r', encoding='utf-8') as f:
+                dados = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if not isinstance(dados, dict) or dados.get("version") != VERSAO_SIMBOLOS:
+            return False
+        self.files = dados.get("files", {})
+        self._termos = None
+        return True
+
+    def save(self) -> None:
+        """Grava o índice em disco (atomicamente)."""
+        os.makedirs(os.path.dirname(self.arquivo), exist_ok=True)
+        temporario = self.arquivo + ".tmp"
+        with open(temporario, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({"version": VERSAO_SIMBOLOS, "files": self.files},
+                               ensure_ascii=False, separators=(",", ":")))
+        os.replace(temporario, self.arquivo)
+
+    def _indexavel(self, relativo: str) -> bool:
+        """Indica se um caminho relativo ao projeto entra no índice."""
+        return relativo.endswith(EXTENSOES_SIMBOLOS) and eh_fonte(relativo, self.saida_rel)
+
+    def update(self, arquivos: Optional[Iterable[str]] = None,
+               workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Reanalisa os arquivos novos ou alterados e esquece os removidos.
+
+        Args:
+            arquivos: Arquivos alterados (relativos ao projeto ou absolutos);
+                None verifica todos os arquivos Python do projeto
+            workers: Processos para a análise (padrão: número de CPUs; 1
+                analisa na thread atual)
+
+        Returns:
+            dict: parsed, unchanged, removed, errors (arquivos com erro de
+                sintaxe) e changed_symbols (por arquivo já indexado: added,
+                removed, modified)
+        """
+        if arquivos is None:
+            candidatos = {f for f in listar_fontes(self.diretorio, self.saida) if self._indexavel(f)}
+            candidatos |= set(self.files)
+        else:
+            candidatos = set()
+            for caminho in arquivos:
+                relativo = os.path.relpath(caminho, self.diretorio) if os.path.isabs(caminho) \
+                    else os.path.normpath(caminho)
+                if not relativo.startswith(os.pardir) and self._indexavel(relativo):
+                    candidatos.add(relativo)
+
+        resultado = {"parsed": 0, "unchanged": 0, "removed": [], "errors": [], "changed_symbols": {}}
+        tarefas, assinaturas = [], {}
+        for relativo in sorted(candidatos):
+            caminho = os.path.join(self.diretorio, relativo)
+            try:
+                fs = os.stat(caminho)
+            except OSError:
+                if self._esquecer(relativo, resultado):
+                    resultado["removed"].append(relativo)
+                continue
+            assinatura = [fs.st_mtime_ns, fs.st_size]
+            anterior = self.files.get(relativo)
+            if anterior is not None and anterior["sig"] == assinatura:
+                resultado["unchanged"] += 1
+                continue
+            assinaturas[relativo] = assinatura
+            tarefas.append((caminho, relativo, anterior["hash"] if anterior else None))
+
+        for relativo, hash_atual, registro in self._analisar(tarefas, workers):
+            if hash_atual is None:
+                if self._esquecer(relativo, resultado):
+                    resultado["removed"].append(relativo)
+                continue
+            if registro is None:
+                # Só o mtime mudou (checkout, touch)
+                self.files[relativo]["sig"] = assinaturas[relativo]
+                resultado["unchanged"] += 1
+                continue
+            if relativo in self.files:
+                diferenca = diferenca_simbolos(self.files[relativo]["symbols"], registro["symbols"])
+                if any(diferenca.values()):
+                    resultado["changed_symbols"][relativo] = diferenca
+            self.files[relativo] = {"hash": hash_atual, "sig": assinaturas[relativo], **registro}
+            resultado["parsed"] += 1
+            if "error" in registro:
+                resultado["errors"].append(relativo)
+
+        if resultado["parsed"] or resultado["removed"]:
+            self._termos = None
+        return resultado
+
+    def _esquecer(self, relativo: str, resultado: Dict[str, Any]) -> bool:
+        """Remove um arquivo do índice, registrando seus símbolos como removidos."""
+        info = self.files.pop(relativo, None)
+        if info is None:
+            return False
+        if info["symbols"]:
+            resultado["changed_symbols"][relativo] = {
+                "added": [], "removed": sorted(s["name"] for s in info["symbols"]), "modified": []}
+        return True
+
+    def _analisar(self, tarefas: List[Tuple[str, str, Optional[str]]],
+                  workers: Optional[int]) -> Iterable[Tuple[str, Optional[str], Optional[Dict[str, Any]]]]:
+        """Analisa os arquivos pendentes, em processos auxiliares se forem muitos."""
+        workers = workers or os.cpu_count() or 1
+        if workers > 1 and len(tarefas) >= MINIMO_PROCESSOS:
+            try:
+                with ProcessPoolExecutor(max_workers=workers, mp_context=CONTEXTO_PROCESSOS) as pool:
+                    return list(pool.map(_analisar_arquivo, tarefas,
+                                         chunksize=max(1, len(tarefas) // (workers * 4))))
+            except (OSError, BrokenProcessPool) as e:
+                logger.warning(f"Análise em processos indisponível ({e}); analisando na thread atual")
+        return [_analisar_arquivo(tarefa) for tarefa in tarefas]
+
+    @staticmethod
+    def _resultado(relativo: str, info: Dict[str, Any], simbolo: Dict[str, Any]) -> Dict[str, Any]:
+        """Símbolo acompanhado do arquivo e do módulo (sem os termos internos da busca)."""
+        resultado = {"file": relativo.replace(os.sep, "/"), "module": info["module"], **simbolo}
+        del resultado["terms"]
+        return resultado
+
+    def symbols_in(self, arquivo: str) -> List[Dict[str, Any]]:
+        """
+        Símbolos de um arquivo, na ordem em que aparecem.
+
+        Args:
+            arquivo: Caminho relativo ao projeto
+
+        Returns:
+            list: Os símbolos (vazia se o arquivo não estiver no índice)
+        """
+        relativo = os.path.normpath(arquivo)
+        info = self.files.get(relativo)
+        if info is None:
+            return []
+        return [self._resultado(relativo, info, s) for s in info["symbols"]]
+
+    def lookup(self, nome: str) -> List[Dict[str, Any]]:
+        """
+        Procura um símbolo pelo nome.
+
+        Aceita o nome qualificado ("PaymentProcessor.refund_payment"), o final
+        dele ("refund_payment") ou o nome com o módulo
+        ("api_module.PaymentProcessor.refund_payment").
+
+        Args:
+            nome: O nome procurado
+
+        Returns:
+            list: Os símbolos encontrados, com file e module
+        """
+        encontrados = []
+        for relativo, info in self.files.items():
+            modulo = info["module"]
+            for simbolo in info["symbols"]:
+                qualificado = simbolo["name"]
+                if nome == qualificado or qualificado.endswith("." + nome) or nome == f"{modulo}.{qualificado}":
+                    encontrados.append(self._resultado(relativo, info, simbolo))
+        return sorted(encontrados, key=lambda s: (s["name"] != nome, s["file"], s["line"]))
+
+    def _indice_termos(self) -> Dict[str, List[Tuple[str, int]]]:
+        """Termo do nome → (arquivo, posição do símbolo), montado na primeira busca."""
+        if self._termos is None:
+            termos: Dict[str, List[Tuple[str, int]]] = {}
+            for relativo, info in self.files.items():
+                for posicao, simbolo in enumerate(info["symbols"]):
+                    for termo in simbolo["terms"]:
+                        termos.setdefault(termo, []).append((relativo, posicao))
+            self._termos = termos
+        return self._termos
+
+    def search(self, consulta: str, limite: int = LIMITE) -> List[Dict[str, Any]]:
+        """
+        Busca símbolos cujos nomes contêm os termos da consulta.
+
+        Args:
+            consulta: Palavras ou identificadores ("refund payment", "refund_payment")
+            limite: Número máximo de resultados
+
+        Returns:
+            list: Símbolos com file, module, score e relevance (0 a 1,
+                relativa ao primeiro), do mais ao menos relevante
+        """
+        termos = set(tokenizar(consulta))
+        if not termos:
+            return []
+        indice = self._indice_termos()
+        pontuacoes: Dict[Tuple[str, int], float] = {}
+        for termo in termos:
+            for chave in indice.get(termo, ()):
+                pontuacoes[chave] = pontuacoes.get(chave, 0.0) + 1.0
+
+        resultados = []
+        for (relativo, posicao), pontuacao in pontuacoes.items():
+            info = self.files[relativo]
+            simbolo = info["symbols"][posicao]
+            # Nome exato vale mais; nomes longos com um termo só valem menos
+            if simbolo["name"].split(".")[-1].lower() in termos:
+                pontuacao += 1.0
+            pontuacao *= 1.0 + pontuacao / max(len(simbolo["terms"]), 1)
+            resultados.append((pontuacao, relativo, simbolo, info))
+        resultados.sort(key=lambda r: (-r[0], r[1], r[2]["line"]))
+
+        if not resultados:
+            return []
+        maximo = resultados[0][0]
+        return [{**self._resultado(relativo, info, simbolo), "score": round(pontuacao, 4),
+                 "relevance": round(pontuacao / maximo, 3)}
+                for pontuacao, relativo, simbolo, info in resultados[:limite]]
+
+
+def atualizar_simbolos(diretorio: str, saida: Optional[str] = None, arquivos: Optional[Iterable[str]] = None,
+                       workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Atualiza e grava o índice de símbolos de um projeto.
+
+    Args:
+        diretorio: O diretório do projeto
+        saida: O diretório da documentação (padrão: `docs`)
+        arquivos: Arquivos alterados; None verifica todos
+        workers: Processos para a análise
+
+    Returns:
+        dict: success, files, symbols, duration_seconds e o resultado de `SymbolIndex.update`
+    """
+    inicio = time.perf_counter()
+    if not os.path.isdir(diretorio):
+        return {"success": False, "error": "DirectoryNotFound",
+                "message": f"Diretório não encontrado: {diretorio}"}
+    indice = SymbolIndex(diretorio, saida)
+    if not indice.load():
+        arquivos = None
+    resultado = indice.update(arquivos, workers)
+    if resultado["parsed"] or resultado["removed"] or not os.path.exists(indice.arquivo):
+        indice.save()
+    return {"success": True, **resultado, "files": len(indice.files), "symbols": len(indice),
+            "duration_seconds": time.perf_counter() - inicio}
+
+
+def main():
+    """Atualiza e consulta o índice de símbolos pela linha de comando."""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description="Documentação 4.0 - Índice de símbolos do projeto")
+    parser.add_argument("--dir", "-d", default=os.getcwd(), help="Diretório do projeto")
+    parser.add_argument("--saida", "-o", help="Diretório da documentação (padrão: docs)")
+    parser.add_argument("--workers", "-w", type=int, help="Processos para a análise")
+    consulta = parser.add_mutually_exclusive_group()
+    consulta.add_argument("--buscar", "-b", help="Buscar símbolos pelos termos do nome")
+    consulta.add_argument("--simbolo", "-s", help="Procurar um símbolo pelo nome (qualificado ou não)")
+    consulta.add_argument("--arquivo", "-a", help="Listar os símbolos de um arquivo")
+    parser.add_argument("--json", action="store_true", help="Saída em JSON")
+    args = parser.parse_args()
+
+    resultado = atualizar_simbolos(args.dir, args.saida, workers=args.workers)
+    if not resultado["success"]:
+        print(f"❌ {resultado['message']}")
+        return 1
+    print(f"✅ {resultado['symbols']} símbolo(s) em {resultado['files']} arquivo(s): "
+          f"{resultado['parsed']} analisado(s), {len(resultado['removed'])} removido(s) "
+          f"em {resultado['duration_seconds'] * 1000:.0f} ms", file=sys.stderr)
+    for arquivo in resultado["errors"]:
+        print(f"⚠️ Não foi possível analisar {arquivo}", file=sys.stderr)
+
+    if not (args.buscar or args.simbolo or args.arquivo):
+        return 0
+    indice = SymbolIndex(args.dir, args.saida)
+    indice.load()
+    if args.buscar:
+        simbolos = indice.search(args.buscar)
+    elif args.simbolo:
+        simbolos = indice.lookup(args.simbolo)
+    else:
+        simbolos = indice.symbols_in(args.arquivo)
+
+    if args.json:
+        print(json.dumps(simbolos, ensure_ascii=False, indent=2))
+        return 0
+    for simbolo in simbolos:
+        prefixo = "async " if simbolo.get("async") else ""
+        print(f"{simbolo['file']}:{simbolo['line']}-{simbolo['end_line']}  {simbolo['kind']:<8} "
+              f"{prefixo}{simbolo['name']}{simbolo['signature']}")
+        if simbolo["doc"]:
+            print(f"    {simbolo['doc'].splitlines()[0]}")
+    return 0 if simbolos else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
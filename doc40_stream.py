@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Documentação 4.0 - Saída em Streaming do Claude Code
+Campus Party 2025 - Lucas Dórea Cardoso e Aulus Diniz
+
+Executa comandos longos do `claude-code` (document, document-api,
+update-docs, generate) lendo stdout e stderr linha a linha enquanto o
+processo roda, em vez de esperar o fim com `capture_output=True`. Cada
+linha vira um evento de progresso, entregue por um gerador
+(`executar_streaming`) ou por callback (`executar_com_progresso`), e é
+gravada imediatamente em um log parcial.
+
+Eventos (dicionários):
+    {"type": "analyzed", "file": "src/app.py", "line": "...", "elapsed": 1.2}
+    {"type": "written",  "file": "app.md",     "line": "...", "elapsed": 1.3}
+    {"type": "output",   "line": "...", "elapsed": 1.4}
+    {"type": "stderr",   "line": "...", "elapsed": 1.5}
+    {"type": "exit",     "returncode": 0, "stderr": "...", "elapsed": 9.8}
+"""
+
+import re
+import time
+import queue
+import subprocess
+import threading
+import logging
+from typing import Dict, Any, Optional, List, Callable, Iterator
+
+logger = logging.getLogger('doc40-stream')
+
+# Linhas que indicam um arquivo lido ou escrito pelo claude-code
+PADRAO_ANALISADO = re.compile(r"^\s*(?:Analisando|Analyzing|Lendo|Reading|Processando|Processing)\s*:?\s+(.+?)\s*$",
+                              re.IGNORECASE)
+PADRAO_ESCRITO = re.compile(r"^\s*(?:Escrevendo|Writing|Wrote|Gerado|Generated|Atualizado|Updated)\s*:?\s+(.+?)\s*$",
+                            re.IGNORECASE)
+
+# Quantas linhas de stderr guardar para a mensagem de erro
+MAX_LINHAS_STDERR = 200
+
+
+def classificar_linha(linha: str) -> Dict[str, Any]:
+    """
+    Converte uma linha de stdout do claude-code em um evento.
+
+    Args:
+        linha: A linha, sem a quebra final
+
+    Returns:
+        dict: Evento `analyzed`, `written` ou `output`
+    """
+    correspondencia = PADRAO_ANALISADO.match(linha)
+    if correspondencia:
+        return {"type": "analyzed", "file": correspondencia.group(1), "line": linha}
+    correspondencia = PADRAO_ESCRITO.match(linha)
+    if correspondencia:
+        return {"type": "written", "file": correspondencia.group(1), "line": linha}
+    return {"type": "output", "line": linha}
+
+
+def _ler_linhas(fluxo, tipo: str, fila: "queue.Queue") -> None:
+    """Encaminha as linhas de um pipe para a fila até o fim do fluxo."""
+    try:
+        for linha in fluxo:
+            fila.put((tipo, linha.rstrip("\r\n")))
+    finally:
+        fila.put((tipo, None))
+
+
+def executar_streaming(comando: List[str], log_parcial: Optional[str] = None,
+                       cwd: Optional[str] = None,
+                       timeout: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Executa um comando e produz eventos de progresso à medida que ele escreve.
+
+    O último evento é sempre `exit`, com o código de saída (None em caso de
+    timeout) e o final do stderr.
+
+    Args:
+        comando: O comando e seus argumentos
+        log_parcial: Arquivo onde cada linha é gravada assim que chega (opcional)
+        cwd: Diretório de trabalho do processo
+        timeout: Tempo máximo em segundos (None desativa)
+
+    Yields:
+        dict: Os eventos de progresso
+    """
+    inicio = time.monotonic()
+    processo = subprocess.Popen(
+        comando,
+        cwd=cwd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        bufsize=1
+    )
+
+    fila: "queue.Queue" = queue.Queue()
+    leitores = [
+        threading.Thread(target=_ler_linhas, args=(processo.stdout, "stdout", fila), daemon=True),
+        threading.Thread(target=_ler_linhas, args=(processo.stderr, "stderr", fila), daemon=True)
+    ]
+    for leitor in leitores:
+        leitor.start()
+
+    log = open(log_parcial, 'w') if log_parcial else None
+    stderr: List[str] = []
+    abertos = len(leitores)
+    estourou = False
+
+    try:
+        while abertos:
+            espera = None
+            if timeout is not None:
+                espera = timeout - (time.monotonic() - inicio)
+                if espera <= 0:
+                    estourou = True
+                    break
+            try:
+                tipo, linha = fila.get(timeout=espera)
+            except queue.Empty:
+                estourou = True
+                break
+
+            if linha is None:
+                abertos -= 1
+                continue
+
+            if log is not None:
+                log.write(f"{linha}\n" if tipo == "stdout" else f"[stderr] {linha}\n")
+                log.flush()
+
+            if tipo == "stderr":
+                stderr.append(linha)
+                del stderr[:-MAX_LINHAS_STDERR]
+                evento = {"type": "stderr", "line": linha}
+            else:
+                evento = classificar_linha(linha)
+            evento["elapsed"] = time.monotonic() - inicio
+            yield evento
+
+        if estourou:
+            logger.error(f"Tempo esgotado ({timeout}s) executando: {comando[0]} {comando[1] if len(comando) > 1 else ''}")
+            processo.kill()
+            stderr.append(f"Tempo esgotado após {timeout}s")
+            returncode = None
+            processo.wait()
+        else:
+            returncode = processo.wait()
+    finally:
+        # Gerador fechado antes do fim (ou exceção): não deixar o processo órfão
+        if processo.poll() is None:
+            processo.kill()
+            processo.wait()
+        if log is not None:
+            log.close()
+
+    yield {
+        "type": "exit",
+        "returncode": returncode,
+        "stderr": "\n".join(stderr),
+        "elapsed": time.monotonic() - inicio
+    }
+
+
+def executar_com_progresso(comando: List[str],
+                           progresso: Optional[Callable[[Dict[str, Any]], None]] = None,
+                           log_parcial: Optional[str] = None,
+                           cwd: Optional[str] = None,
+                           timeout: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Executa um comando em streaming, repassando cada evento a um callback.
+
+    Args:
+        comando: O comando e seus argumentos
+        progresso: Função chamada com cada evento (opcional)
+        log_parcial: Arquivo onde cada linha é gravada assim que chega (opcional)
+        cwd: Diretório de trabalho do processo
+        timeout: Tempo máximo em segundos (None desativa)
+
+    Returns:
+        dict: returncode, stderr, analyzed, written e duration_seconds
+    """
+    analisados: List[str] = []
+    escritos: List[str] = []
+    final: Dict[str, Any] = {}
+
+    for evento in executar_streaming(comando, log_parcial, cwd, timeout):
+        if evento["type"] == "analyzed":
+            analisados.append(evento["file"])
+        elif evento["type"] == "written":
+            escritos.append(evento["file"])
+        elif evento["type"] == "exit":
+            final = evento
+
+        if progresso is not None:
+            try:
+                progresso(evento)
+            except Exception as e:
+                logger.error(f"Erro no callback de progresso: {e}")
+
+    return {
+        "returncode": final.get("returncode"),
+        "stderr": final.get("stderr", ""),
+        "analyzed": analisados,
+        "written": escritos,
+        "duration_seconds": final.get("elapsed", 0.0)
+    }
+
+
+def progresso_console(evento: Dict[str, Any]) -> None:
+    """
+    Callback padrão: mostra arquivos lidos e escritos no terminal.
+
+    Args:
+        evento: O evento de progresso
+    """
+    if evento["type"] == "analyzed":
+        print(f"  🔍 [{evento['elapsed']:6.1f}s] Analisando {evento['file']}", flush=True)
+    elif evento["type"] == "written":
+        print(f"  📝 [{evento['elapsed']:6.1f}s] Escrito {evento['file']}", flush=True)
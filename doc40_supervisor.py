@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""
+Documentação 4.0 - Supervisor de Vários Repositórios
+Campus Party 2025 - Lucas Dórea Cardoso e Aulus Diniz
+
+Mantém a documentação de muitos repositórios a partir de um único processo,
+em vez de um `doc40-agente.py iniciar` por repositório:
+
+- um único `MultiRepoWatcher` (um descritor de inotify, ou um laço de stat)
+  detecta commits em todos os repositórios;
+- cada repositório acumula mudanças com debounce e latência máxima, como a
+  fila do agente, e respeita um intervalo mínimo entre atualizações;
+- as atualizações incrementais rodam em um pool limitado de `workers`
+  threads, escolhendo primeiro os repositórios de maior prioridade;
+- uma tabela de status mostra o estado de cada repositório.
+
+O número de threads e processos não cresce com o número de repositórios:
+uma thread de observação, o laço de despacho e no máximo `workers`
+atualizações (cada uma com seu processo `claude-code`).
+
+Arquivo de configuração (JSON, ou YAML se o PyYAML estiver instalado):
+
+    {
+      "workers": 4,
+      "debounce": 2,
+      "max_latency": 30,
+      "repositories": [
+        {"path": "/srv/api", "priority": 10, "min_interval": 60},
+        {"path": "/srv/site", "name": "site", "output": "docs/ref"}
+      ]
+    }
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Any, Optional, List
+
+try:
+    import yaml
+except ImportError:  # pragma: no cover - dependência opcional
+    yaml = None
+
+from doc40_watcher import MultiRepoWatcher
+from doc40_fila import DEBOUNCE, MAX_LATENCY, registrar_agente, remover_registro_agente, executar_agrupado
+from doc40_incremental import atualizar_incremental
+
+logger = logging.getLogger('doc40-supervisor')
+
+# Padrões da configuração
+WORKERS = 4
+PRIORIDADE = 0
+INTERVALO_MINIMO = 0.0
+INTERVALO_STATUS = 60.0
+
+
+def carregar_configuracao(arquivo: str) -> Dict[str, Any]:
+    """
+    Lê a lista de repositórios supervisionados.
+
+    Aceita um objeto com `repositories` e opções globais, ou apenas a lista.
+    Cada repositório pode ser um caminho ou um objeto com `path`, `name`,
+    `output`, `priority` e `min_interval`. Caminhos relativos são resolvidos
+    a partir do diretório do arquivo.
+
+    Args:
+        arquivo: Caminho do arquivo JSON ou YAML
+
+    Returns:
+        dict: workers, debounce, max_latency e repositories (normalizados)
+
+    Raises:
+        ValueError: Se o arquivo for inválido ou o YAML não estiver disponível
+    """
+    with open(arquivo, 'r', encoding='utf-8') as f:
+        conteudo = f.read()
+
+    if arquivo.endswith(('.yaml', '.yml')):
+        if yaml is None:
+            raise ValueError("PyYAML não está instalado; use um arquivo JSON ou instale com: pip install pyyaml")
+        dados = yaml.safe_load(conteudo)
+    else:
+        dados = json.loads(conteudo)
+
+    if isinstance(dados, list):
+        dados = {"repositories": dados}
+    if not isinstance(dados, dict) or not isinstance(dados.get("repositories"), list):
+        raise ValueError(f"{arquivo}: esperada uma lista 'repositories'")
+
+    base = os.path.dirname(os.path.abspath(arquivo))
+    repositorios = []
+    nomes = set()
+    for item in dados["repositories"]:
+        if isinstance(item, str):
+            item = {"path": item}
+        if not isinstance(item, dict) or not item.get("path"):
+            raise ValueError(f"{arquivo}: repositório sem 'path': {item!r}")
+
+        caminho = os.path.abspath(os.path.join(base, os.path.expanduser(item["path"])))
+        nome = str(item.get("name") or os.path.basename(caminho))
+        if nome in nomes:
+            raise ValueError(f"{arquivo}: nome de repositório repetido: {nome}")
+        nomes.add(nome)
+
+        repositorios.append({
+            "name": nome,
+            "path": caminho,
+            "output": item.get("output", "docs"),
+            "priority": int(item.get("priority", PRIORIDADE)),
+            "min_interval": float(item.get("min_interval", INTERVALO_MINIMO))
+        })
+
+    return {
+        "workers": int(dados.get("workers", WORKERS)),
+        "debounce": float(dados.get("debounce", DEBOUNCE)),
+        "max_latency": float(dados.get("max_latency", MAX_LATENCY)),
+        "repositories": repositorios
+    }
+
+
+class _Repositorio:
+    """Estado de um repositório supervisionado."""
+
+    __slots__ = ("name", "path", "output", "priority", "min_interval", "status",
+                 "first_change", "last_change", "last_start", "last_finish",
+                 "last_duration", "last_commit", "last_result", "updates", "errors")
+
+    def __init__(self, name: str, path: str, output: str, priority: int, min_interval: float):
+        self.name = name
+        self.path = path
+        self.output = output
+        self.priority = priority
+        self.min_interval = min_interval
+        self.status = "idle"
+        self.first_change: Optional[float] = None
+        self.last_change: Optional[float] = None
+        self.last_start: Optional[float] = None
+        self.last_finish: Optional[datetime] = None
+        self.last_duration: Optional[float] = None
+        self.last_commit: Optional[str] = None
+        self.last_result = ""
+        self.updates = 0
+        self.errors = 0
+
+    def pronto_em(self, debounce: float, max_latency: float) -> Optional[float]:
+        """Instante (monotônico) em que a atualização pendente pode começar."""
+        if self.first_change is None:
+            return None
+        pronto = min(self.last_change + debounce, self.first_change + max_latency)
+        if self.last_start is not None:
+            pronto = max(pronto, self.last_start + self.min_interval)
+        return pronto
+
+
+class RepoSupervisor:
+    """Observa vários repositórios e atualiza sua documentação com um pool limitado."""
+
+    def __init__(self, repositories: List[Dict[str, Any]], workers: int = WORKERS,
+                 debounce: float = DEBOUNCE, max_latency: float = MAX_LATENCY,
+                 force_polling: bool = False):
+        """
+        Prepara o supervisor.
+
+        Args:
+            repositories: Repositórios, no formato de `carregar_configuracao`
+            workers: Máximo de atualizações simultâneas
+            debounce: Silêncio exigido antes de atualizar um repositório, em segundos
+            max_latency: Espera máxima por uma atualização pendente, em segundos
+            force_polling: Usa a comparação por stat em vez do inotify
+        """
+        self.workers = max(1, workers)
+        self.debounce = debounce
+        self.max_latency = max(max_latency, debounce)
+        self.repos: Dict[str, _Repositorio] = {}
+        self._condicao = threading.Condition()
+        self._executando = 0
+        self._parar = threading.Event()
+
+        self.watcher = MultiRepoWatcher(force_polling=force_polling)
+        for item in repositories:
+            repo = _Repositorio(item["name"], item["path"], item.get("output", "docs"),
+                                item.get("priority", PRIORIDADE), item.get("min_interval", INTERVALO_MINIMO))
+            try:
+                self.watcher.add(repo.name, repo.path)
+            except ValueError as e:
+                logger.error(str(e))
+                repo.status = "invalid"
+                repo.last_result = str(e)
+            self.repos[repo.name] = repo
+
+    def notify(self, name: str) -> None:
+        """
+        Registra que um repositório mudou.
+
+        Args:
+            name: Nome do repositório
+        """
+        with self._condicao:
+            repo = self.repos.get(name)
+            if repo is None or repo.status == "invalid":
+                return
+            agora = time.monotonic()
+            if repo.first_change is None:
+                repo.first_change = agora
+            repo.last_change = agora
+            if repo.status in ("idle", "error"):
+                repo.status = "pending"
+            self._condicao.notify_all()
+
+    def _observar(self) -> None:
+        """Thread única que repassa as mudanças de todos os repositórios."""
+        while not self._parar.is_set():
+            for name in self.watcher.esperar(timeout=1.0):
+                self.notify(name)
+
+    def _proximo(self) -> Optional[_Repositorio]:
+        """Repositório pronto de maior prioridade (mais antigo primeiro), se houver."""
+        agora = time.monotonic()
+        prontos = []
+        for repo in self.repos.values():
+            if repo.status == "running":
+                continue
+            pronto = repo.pronto_em(self.debounce, self.max_latency)
+            if pronto is not None and pronto <= agora:
+                prontos.append(repo)
+        if not prontos:
+            return None
+        return min(prontos, key=lambda r: (-r.priority, r.first_change))
+
+    def _espera(self) -> Optional[float]:
+        """Tempo até o próximo repositório ficar pronto (None se nenhum pendente)."""
+        instantes = [repo.pronto_em(self.debounce, self.max_latency)
+                     for repo in self.repos.values() if repo.status != "running"]
+        instantes = [t for t in instantes if t is not None]
+        if not instantes:
+            return None
+        return max(0.0, min(instantes) - time.monotonic())
+
+    def _atualizar(self, repo: _Repositorio) -> None:
+        """Executa a atualização incremental de um repositório (em um worker)."""
+        inicio = time.monotonic()
+        try:
+            resultado = executar_agrupado(
+                repo.path,
+                lambda: atualizar_incremental(repo.path, repo.output, progresso=None)
+            )
+            if resultado is None:
+                resumo, erro = "agrupada com outra atualização", False
+            elif resultado["success"]:
+                resumo = (f"{resultado['mode']}: {len(resultado['regenerated'])} regenerado(s), "
+                          f"{len(resultado['removed'])} removido(s)")
+                erro = False
+            else:
+                resumo, erro = resultado.get("message") or resultado.get("error", "erro"), True
+        except Exception as e:
+            logger.error(f"Exceção ao atualizar {repo.name}: {e}")
+            resumo, erro = str(e), True
+
+        with self._condicao:
+            repo.last_duration = time.monotonic() - inicio
+            repo.last_finish = datetime.now()
+            repo.last_result = resumo.strip().splitlines()[-1] if resumo.strip() else ""
+            repo.updates += 1
+            if erro:
+                repo.errors += 1
+            # Mudanças durante a atualização ficam pendentes para a próxima
+            repo.status = "error" if erro and repo.first_change is None else (
+                "pending" if repo.first_change is not None else "idle")
+            self._executando -= 1
+            self._condicao.notify_all()
+
+        nivel = logging.ERROR if erro else logging.INFO
+        logger.log(nivel, f"{repo.name}: {repo.last_result} ({repo.last_duration:.2f}s)")
+
+    def run(self, status_interval: Optional[float] = INTERVALO_STATUS,
+            status_callback=None) -> None:
+        """
+        Supervisiona os repositórios até `stop` ser chamado.
+
+        Args:
+            status_interval: Intervalo entre chamadas de `status_callback`, em segundos
+            status_callback: Função chamada periodicamente com o supervisor (opcional)
+        """
+        for repo in self.repos.values():
+            if repo.status != "invalid":
+                registrar_agente(repo.path)
+                # Documentar o que mudou enquanto o supervisor estava parado
+                self.notify(repo.name)
+
+        observador = threading.Thread(target=self._observar, name="doc40-supervisor-watch", daemon=True)
+        observador.start()
+        proximo_status = time.monotonic() + (status_interval or 0)
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="doc40-update") as pool:
+                while not self._parar.is_set():
+                    with self._condicao:
+                        repo = self._proximo() if self._executando < self.workers else None
+                        if repo is None:
+                            espera = self._espera() if self._executando < self.workers else None
+                            espera = 1.0 if espera is None else min(espera, 1.0)
+                            self._condicao.wait(espera)
+                        else:
+                            repo.status = "running"
+                            repo.first_change = repo.last_change = None
+                            repo.last_start = time.monotonic()
+                            self._executando += 1
+
+                    if repo is not None:
+                        pool.submit(self._atualizar, repo)
+
+                    if status_callback is not None and status_interval and time.monotonic() >= proximo_status:
+                        status_callback(self)
+                        proximo_status = time.monotonic() + status_interval
+        finally:
+            self._parar.set()
+            observador.join(timeout=2.0)
+            self.watcher.close()
+            for repo in self.repos.values():
+                if repo.status != "invalid":
+                    remover_registro_agente(repo.path)
+
+    def stop(self) -> None:
+        """Pede o encerramento de `run` (as atualizações em andamento terminam)."""
+        self._parar.set()
+        with self._condicao:
+            self._condicao.notify_all()
+
+    def status(self) -> List[Dict[str, Any]]:
+        """
+        Retorna o estado de cada repositório, do mais prioritário ao menos.
+
+        Returns:
+            list: name, path, priority, status, updates, errors, last_update,
+                last_duration e last_result
+        """
+        with self._condicao:
+            return [{
+                "name": repo.name,
+                "path": repo.path,
+                "priority": repo.priority,
+                "status": repo.status,
+                "updates": repo.updates,
+                "errors": repo.errors,
+                "last_update": repo.last_finish.strftime("%Y-%m-%d %H:%M:%S") if repo.last_finish else None,
+                "last_duration": repo.last_duration,
+                "last_result": repo.last_result
+            } for repo in sorted(self.repos.values(), key=lambda r: (-r.priority, r.name))]
+
+
+def tabela_status(linhas: List[Dict[str, Any]]) -> str:
+    """
+    Formata o status dos repositórios como uma tabela de texto.
+
+    Args:
+        linhas: Resultado de `RepoSupervisor.status`
+
+    Returns:
+        str: A tabela
+    """
+    cabecalho = ["REPOSITÓRIO", "PRIOR.", "ESTADO", "ATUALIZ.", "ERROS", "ÚLTIMA", "DURAÇÃO", "RESULTADO"]
+    corpo = [[
+        linha["name"],
+        str(linha["priority"]),
+        linha["status"],
+        str(linha["updates"]),
+        str(linha["errors"]),
+        linha["last_update"] or "-",
+        f"{linha['last_duration']:.1f}s" if linha["last_duration"] is not None else "-",
+        (linha["last_result"] or "")[:60]
+    ] for linha in linhas]
+
+    larguras = [max(len(c[i]) for c in [cabecalho] + corpo) for i in range(len(cabecalho))]
+    formatar = lambda c: "  ".join(v.ljust(larguras[i]) for i, v in enumerate(c)).rstrip()
+    return "\n".join([formatar(cabecalho), formatar(["-" * l for l in larguras])] + [formatar(c) for c in corpo])
+
+
+def main():
+    """Supervisiona os repositórios de um arquivo de configuração."""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description="Documentação 4.0 - Supervisor de vários repositórios")
+    parser.add_argument("--config", "-c", required=True, help="Lista de repositórios (JSON ou YAML)")
+    parser.add_argument("--workers", type=int, help="Máximo de atualizações simultâneas")
+    parser.add_argument("--status-interval", type=float, default=INTERVALO_STATUS,
+                        help="Intervalo entre tabelas de status, em segundos (0 desativa)")
+    parser.add_argument("--polling", action="store_true", help="Forçar a comparação por stat")
+    args = parser.parse_args()
+
+    try:
+        config = carregar_configuracao(args.config)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        return 1
+
+    supervisor = RepoSupervisor(config["repositories"], args.workers or config["workers"],
+                                config["debounce"], config["max_latency"], args.polling)
+    try:
+        supervisor.run(args.status_interval, lambda s: print(tabela_status(s.status()), flush=True))
+    except KeyboardInterrupt:
+        pass
+    print(tabela_status(supervisor.status()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+"""
+Documentação 4.0 - Observador de Commits
+Campus Party 2025 - Lucas Dórea Cardoso e Aulus Diniz
+
+Detecta novos commits observando `.git/HEAD`, `.git/packed-refs` e a árvore
+`.git/refs`, em vez de executar `git rev-parse HEAD` a cada intervalo. No
+Linux usa inotify (via ctypes, sem dependências) e acorda logo após o Git
+atualizar uma referência; em outros sistemas, ou se o inotify não estiver
+disponível, compara periodicamente o `stat` desses arquivos. Nos dois modos
+nenhum processo é executado enquanto nada muda.
+
+Uso:
+    with GitRefWatcher("./meu-projeto") as observador:
+        while True:
+            if observador.esperar(timeout=1.0):
+                print("Novo commit!")
+
+    python doc40_watcher.py --dir ./meu-projeto
+
+`MultiRepoWatcher` observa vários repositórios com um único descritor de
+inotify (ou um único laço de comparação por stat) e informa quais mudaram.
+"""
+
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import argparse
+import logging
+from typing import Dict, Hashable, Optional, Set, Tuple
+
+logger = logging.getLogger('doc40-watcher')
+
+# Arquivos de `.git` que mudam quando um commit é criado ou o branch muda
+ARQUIVOS_REFS = ("HEAD", "packed-refs")
+
+# Tempo de espera por eventos adicionais antes de notificar (agrupa rajadas)
+DEBOUNCE = 0.2
+
+# Intervalo do modo de comparação por stat
+INTERVALO_POLLING = 1.0
+
+# Constantes do inotify (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0x00000800
+IN_CLOEXEC = 0x00080000
+
+MASCARA = (IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE |
+           IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+
+_EVENTO = struct.Struct("iIII")
+
+
+def localizar_git_dir(diretorio: str) -> Optional[str]:
+    """
+    Localiza o diretório `.git` de um projeto sem executar o Git.
+
+    Sobe a partir de `diretorio` até encontrar `.git`, seguindo o arquivo
+    `gitdir:` usado por worktrees e submódulos.
+
+    Args:
+        diretorio: Um diretório dentro do repositório
+
+    Returns:
+        str: Caminho absoluto do diretório Git, ou None se não for um repositório
+    """
+    atual = os.path.abspath(diretorio)
+    while True:
+        candidato = os.path.join(atual, ".git")
+        if os.path.isdir(candidato):
+            return candidato
+        if os.path.isfile(candidato):
+            try:
+                with open(candidato, 'r') as f:
+                    conteudo = f.read().strip()
+            except OSError:
+                return None
+            if conteudo.startswith("gitdir:"):
+                return os.path.normpath(os.path.join(atual, conteudo[len("gitdir:"):].strip()))
+            return None
+        pai = os.path.dirname(atual)
+        if pai == atual:
+            return None
+        atual = pai
+
+
+def git_dir_comum(git_dir: str) -> str:
+    """
+    Diretório que guarda `refs` e `packed-refs` (diferente em worktrees).
+
+    Args:
+        git_dir: O diretório Git do projeto
+
+    Returns:
+        str: O diretório comum (o próprio `git_dir` fora de worktrees)
+    """
+    try:
+        with open(os.path.join(git_dir, "commondir"), 'r') as f:
+            return os.path.normpath(os.path.join(git_dir, f.read().strip()))
+    except OSError:
+        return git_dir
+
+
+def _relevante(nome: str) -> bool:
+    """Ignora arquivos de trava e temporários do Git."""
+    return bool(nome) and not nome.endswith(".lock")
+
+
+class _Inotify:
+    """Acesso mínimo ao inotify do Linux via ctypes."""
+
+    def __init__(self):
+        """
+        Cria a instância do inotify.
+
+        Raises:
+            OSError: Se o inotify não estiver disponível
+        """
+        import ctypes
+        import ctypes.util
+
+        if not sys.platform.startswith("linux"):
+            raise OSError(errno.ENOSYS, "inotify disponível apenas no Linux")
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._init = libc.inotify_init1
+        self._add = libc.inotify_add_watch
+        self._add.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._ctypes = ctypes
+
+        self.fd = self._init(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            codigo = ctypes.get_errno()
+            raise OSError(codigo, os.strerror(codigo))
+
+    def adicionar(self, caminho: str, mascara: int = MASCARA) -> int:
+        """Observa um arquivo ou diretório e retorna o descritor do watch."""
+        wd = self._add(self.fd, os.fsencode(caminho), mascara)
+        if wd < 0:
+            codigo = self._ctypes.get_errno()
+            raise OSError(codigo, os.strerror(codigo), caminho)
+        return wd
+
+    def ler(self, timeout: Optional[float]):
+        """
+        Lê os eventos pendentes, esperando até `timeout` segundos.
+
+        Yields:
+            tuple: (wd, máscara, nome)
+        """
+        prontos, _, _ = select.select([self.fd], [], [], timeout)
+        if not prontos:
+            return
+        try:
+            dados = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        posicao = 0
+        while posicao + _EVENTO.size <= len(dados):
+            wd, mascara, _, tamanho = _EVENTO.unpack_from(dados, posicao)
+            posicao += _EVENTO.size
+            nome = dados[posicao:posicao + tamanho].rstrip(b"\0").decode(errors="replace")
+            posicao += tamanho
+            yield wd, mascara, nome
+
+    def close(self) -> None:
+        """Libera o descritor do inotify."""
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class MultiRepoWatcher:
+    """
+    Observa as referências de vários repositórios Git com um único inotify.
+
+    Cada repositório é registrado com uma chave; `esperar` retorna as chaves
+    dos repositórios que mudaram. Usa um descritor de inotify e nenhuma
+    thread própria, qualquer que seja o número de repositórios.
+    """
+
+    def __init__(self, debounce: float = DEBOUNCE, poll_interval: float = INTERVALO_POLLING,
+                 force_polling: bool = False):
+        """
+        Cria o observador, ainda sem repositórios.
+
+        Args:
+            debounce: Espera por eventos adicionais antes de notificar, em segundos
+            poll_interval: Intervalo do modo de comparação por stat, em segundos
+            force_polling: Usa o modo de comparação por stat mesmo com inotify disponível
+        """
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self._repos: Dict[Hashable, Tuple[str, str]] = {}
+        self._inotify: Optional[_Inotify] = None
+        self._watches: Dict[int, str] = {}
+        self._assinaturas: Dict[Hashable, Dict[str, Tuple[int, int, int]]] = {}
+
+        if not force_polling:
+            try:
+                self._inotify = _Inotify()
+            except (OSError, AttributeError) as e:
+                logger.info(f"inotify indisponível ({e}); usando comparação por stat")
+
+    @property
+    def mode(self) -> str:
+        """Modo de observação: `inotify` ou `polling`."""
+        return "inotify" if self._inotify is not None else "polling"
+
+    def add(self, key: Hashable, directory: str) -> Tuple[str, str]:
+        """
+        Começa a observar um repositório.
+
+        Args:
+            key: Identificador devolvido por `esperar` quando o repositório mudar
+            directory: Um diretório dentro do repositório
+
+        Returns:
+            tuple: (diretório Git, diretório comum)
+
+        Raises:
+            ValueError: Se o diretório não estiver em um repositório Git
+        """
+        git_dir = localizar_git_dir(directory)
+        if git_dir is None:
+            raise ValueError(f"O diretório {directory} não é um repositório Git")
+        common_dir = git_dir_comum(git_dir)
+        self._repos[key] = (git_dir, common_dir)
+
+        if self._inotify is not None:
+            try:
+                for diretorio in {git_dir, common_dir}:
+                    self._watches[self._inotify.adicionar(diretorio)] = diretorio
+                self._observar_arvore(os.path.join(common_dir, "refs"))
+            except OSError as e:
+                # Limite de watches atingido, por exemplo: todos passam a usar stat
+                logger.warning(f"inotify falhou em {git_dir} ({e}); usando comparação por stat")
+                self._fechar_inotify()
+
+        if self._inotify is None:
+            for chave in self._repos:
+                self._assinaturas.setdefault(chave, self._assinar(chave))
+
+        logger.debug(f"Observando {git_dir} (modo {self.mode})")
+        return git_dir, common_dir
+
+    def _observar_arvore(self, raiz: str) -> None:
+        """Observa um diretório de referências e todos os seus subdiretórios."""
+        for atual, dirs, _ in os.walk(raiz):
+            try:
+                self._watches[self._inotify.adicionar(atual)] = atual
+            except OSError as e:
+                logger.debug(f"Não foi possível observar {atual}: {e}")
+
+    def _fechar_inotify(self) -> None:
+        """Encerra o inotify, se ativo."""
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+        self._watches.clear()
+
+    def _assinar(self, key: Hashable) -> Dict[str, Tuple[int, int, int]]:
+        """Retrato (mtime, tamanho, inode) dos arquivos de referência de um repositório."""
+        git_dir, common_dir = self._repos[key]
+        caminhos = [os.path.join(git_dir, "HEAD")]
+        caminhos += [os.path.join(common_dir, nome) for nome in ARQUIVOS_REFS]
+        for atual, _, files in os.walk(os.path.join(common_dir, "refs")):
+            caminhos += [os.path.join(atual, nome) for nome in files if _relevante(nome)]
+
+        assinatura = {}
+        for caminho in caminhos:
+            try:
+                info = os.stat(caminho)
+            except OSError:
+                continue
+            assinatura[caminho] = (info.st_mtime_ns, info.st_size, info.st_ino)
+        return assinatura
+
+    def _chaves_do_evento(self, wd: int, mascara: int, nome: str) -> Set[Hashable]:
+        """Repositórios afetados por um evento do inotify."""
+        diretorio = self._watches.get(wd)
+        if diretorio is None:
+            return set()
+
+        if mascara & IN_IGNORED:
+            self._watches.pop(wd, None)
+            return set()
+
+        # Novo subdiretório em refs (ex.: branch "feature/x")
+        if mascara & IN_ISDIR and mascara & (IN_CREATE | IN_MOVED_TO):
+            caminho = os.path.join(diretorio, nome)
+            if any(caminho.startswith(os.path.join(comum, "refs")) for _, comum in self._repos.values()):
+                self._observar_arvore(caminho)
+            return set()
+
+        chaves = set()
+        for chave, (git_dir, common_dir) in self._repos.items():
+            if diretorio in (git_dir, common_dir):
+                if nome in ARQUIVOS_REFS:
+                    chaves.add(chave)
+            elif diretorio.startswith(os.path.join(common_dir, "refs")) and _relevante(nome):
+                chaves.add(chave)
+        return chaves
+
+    def esperar(self, timeout: Optional[float] = None) -> Set[Hashable]:
+        """
+        Bloqueia até alguma referência mudar ou o tempo acabar.
+
+        Args:
+            timeout: Tempo máximo de espera em segundos (None espera indefinidamente)
+
+        Returns:
+            set: Chaves dos repositórios alterados (vazio se o tempo acabou)
+        """
+        if self._inotify is None:
+            return self._esperar_polling(timeout)
+
+        limite = None if timeout is None else time.monotonic() + timeout
+        while True:
+            restante = None if limite is None else max(0.0, limite - time.monotonic())
+            alterados: Set[Hashable] = set()
+            for evento in list(self._inotify.ler(restante)):
+                alterados |= self._chaves_do_evento(*evento)
+            if alterados:
+                # Agrupar a rajada de escritas de um mesmo commit
+                while True:
+                    eventos = list(self._inotify.ler(self.debounce))
+                    if not eventos:
+                        break
+                    for evento in eventos:
+                        alterados |= self._chaves_do_evento(*evento)
+                return alterados
+            if limite is not None and time.monotonic() >= limite:
+                return set()
+
+    def _esperar_polling(self, timeout: Optional[float]) -> Set[Hashable]:
+        """Compara o stat dos arquivos de referência a cada `poll_interval`."""
+        limite = None if timeout is None else time.monotonic() + timeout
+        while True:
+            alterados = set()
+            for chave in self._repos:
+                atual = self._assinar(chave)
+                if atual != self._assinaturas.get(chave):
+                    self._assinaturas[chave] = atual
+                    alterados.add(chave)
+            if alterados:
+                return alterados
+            if limite is not None:
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    return set()
+                time.sleep(min(self.poll_interval, restante))
+            else:
+                time.sleep(self.poll_interval)
+
+    def close(self) -> None:
+        """Para de observar todos os repositórios."""
+        self._fechar_inotify()
+
+    def __enter__(self) -> "MultiRepoWatcher":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class GitRefWatcher:
+    """Notifica mudanças de HEAD e das referências de um repositório Git."""
+
+    def __init__(self, directory: str, debounce: float = DEBOUNCE,
+                 poll_interval: float = INTERVALO_POLLING, force_polling: bool = False):
+        """
+        Começa a observar o repositório.
+
+        Args:
+            directory: Um diretório dentro do repositório
+            debounce: Espera por eventos adicionais antes de notificar, em segundos
+            poll_interval: Intervalo do modo de comparação por stat, em segundos
+            force_polling: Usa o modo de comparação por stat mesmo com inotify disponível
+
+        Raises:
+            ValueError: Se o diretório não estiver em um repositório Git
+        """
+        self._observador = MultiRepoWatcher(debounce, poll_interval, force_polling)
+        try:
+            self.git_dir, self.common_dir = self._observador.add(directory, directory)
+        except ValueError:
+            self._observador.close()
+            raise
+        logger.info(f"Observando {self.git_dir} (modo {self.mode})")
+
+    @property
+    def mode(self) -> str:
+        """Modo de observação: `inotify` ou `polling`."""
+        return self._observador.mode
+
+    def esperar(self, timeout: Optional[float] = None) -> bool:
+        """
+        Bloqueia até uma referência mudar ou o tempo acabar.
+
+        Args:
+            timeout: Tempo máximo de espera em segundos (None espera indefinidamente)
+
+        Returns:
+            bool: True se houve mudança, False se o tempo acabou
+        """
+        return bool(self._observador.esperar(timeout))
+
+    def close(self) -> None:
+        """Para de observar o repositório."""
+        self._observador.close()
+
+    def __enter__(self) -> "GitRefWatcher":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def main():
+    """Mostra as mudanças de referência de um repositório."""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description="Documentação 4.0 - Observador de commits")
+    parser.add_argument("--dir", "-d", default=os.getcwd(), help="Diretório do repositório")
+    parser.add_argument("--polling", action="store_true", help="Forçar a comparação por stat")
+    args = parser.parse_args()
+
+    try:
+        with GitRefWatcher(args.dir, force_polling=args.polling) as observador:
+            print(f"Observando {observador.git_dir} ({observador.mode}). Ctrl+C para sair.")
+            while True:
+                if observador.esperar():
+                    print(f"{time.strftime('%H:%M:%S')} - referências alteradas")
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())